@@ -370,6 +370,8 @@ sys.path.append(COMMON_ROOT / 'djangoapps')
 
 # For geolocation ip database
 GEOIP_PATH = REPO_ROOT / "common/static/data/geoip/GeoLite2-Country.mmdb"
+# Maximum number of IP addresses whose country each process keeps in memory
+GEOIP_COUNTRY_CACHE_SIZE = 10000
 
 DATA_DIR = COURSES_ROOT
 
@@ -724,6 +726,13 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# Directory of the per-node disk cache of course assets served by the contentserver, or None to disable it.
+COURSE_ASSETS_DISK_CACHE_DIR = None
+# Maximum total size in bytes of the assets in the disk cache, above which the least recently served are removed
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+# Assets larger than this many bytes are not stored in the disk cache
+COURSE_ASSETS_DISK_CACHE_MAX_ITEM_SIZE = 4 * 1024 * 1024
+
 MODULESTORE_BRANCH = 'draft-preferred'
 
 MODULESTORE = {
@@ -832,6 +841,10 @@ CODE_JAIL = {
 
 COURSES_WITH_UNSAFE_CODE = []
 
+# Maximum number of sandboxed code execution results that each process keeps in
+# memory, in front of the django cache. Set to 0 to disable the per-process cache.
+SAFE_EXEC_LOCAL_CACHE_SIZE = 500
+
 ############################ DJANGO_BUILTINS ################################
 # Change DEBUG in your environment settings files, not here
 DEBUG = False
@@ -1812,6 +1825,11 @@ CACHES = {
     },
 }
 
+# Maximum total size, in bytes of pickled data, of the per-process LRU cache of
+# split modulestore course structures that sits in front of the
+# course_structure_cache. Set to 0 to disable the per-process cache.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 0
+
 ############################ OAUTH2 Provider ###################################
 
 # OpenID Connect issuer ID. Normally the URL of the authentication endpoint.
@@ -1893,6 +1911,9 @@ RECALCULATE_GRADES_ROUTING_KEY = DEFAULT_PRIORITY_QUEUE
 # Queue to use for updating grades due to grading policy change
 POLICY_CHANGE_GRADES_ROUTING_KEY = 'edx.lms.core.default'
 
+# Queue to use for updating the grade counts of the grade histograms shown to staff
+GRADE_COUNTS_ROUTING_KEY = 'edx.lms.core.default'
+
 # Rate limit for regrading tasks that a grading policy change can kick off
 POLICY_CHANGE_TASK_RATE_LIMIT = '300/h'
 
@@ -208,6 +208,10 @@ if 'loc_cache' not in CACHES:
 if 'staticfiles' in CACHES:
     CACHES['staticfiles']['KEY_PREFIX'] = EDX_PLATFORM_REVISION
 
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES', COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES
+)
+
 # In order to transition from local disk asset storage to S3 backed asset storage,
 # we need to run asset collection twice, once for local disk and once for S3.
 # Once we have migrated to service assets off S3, then we can convert this back to
@@ -269,9 +273,20 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
         CODE_JAIL[name] = value
 
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
+SAFE_EXEC_LOCAL_CACHE_SIZE = ENV_TOKENS.get('SAFE_EXEC_LOCAL_CACHE_SIZE', SAFE_EXEC_LOCAL_CACHE_SIZE)
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
 
+GEOIP_COUNTRY_CACHE_SIZE = ENV_TOKENS.get('GEOIP_COUNTRY_CACHE_SIZE', GEOIP_COUNTRY_CACHE_SIZE)
+
+COURSE_ASSETS_DISK_CACHE_DIR = ENV_TOKENS.get('COURSE_ASSETS_DISK_CACHE_DIR', COURSE_ASSETS_DISK_CACHE_DIR)
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_ASSETS_DISK_CACHE_MAX_SIZE', COURSE_ASSETS_DISK_CACHE_MAX_SIZE
+)
+COURSE_ASSETS_DISK_CACHE_MAX_ITEM_SIZE = ENV_TOKENS.get(
+    'COURSE_ASSETS_DISK_CACHE_MAX_ITEM_SIZE', COURSE_ASSETS_DISK_CACHE_MAX_ITEM_SIZE
+)
+
 COMPREHENSIVE_THEME_DIRS = ENV_TOKENS.get('COMPREHENSIVE_THEME_DIRS', COMPREHENSIVE_THEME_DIRS) or []
 
 # COMPREHENSIVE_THEME_LOCALE_PATHS contain the paths to themes locale directories e.g.
@@ -480,6 +495,9 @@ CELERY_QUEUES.update(
 # Queue to use for updating grades due to grading policy change
 POLICY_CHANGE_GRADES_ROUTING_KEY = ENV_TOKENS.get('POLICY_CHANGE_GRADES_ROUTING_KEY', DEFAULT_PRIORITY_QUEUE)
 
+# Queue to use for updating the grade counts of the grade histograms shown to staff
+GRADE_COUNTS_ROUTING_KEY = ENV_TOKENS.get('GRADE_COUNTS_ROUTING_KEY', DEFAULT_PRIORITY_QUEUE)
+
 # Rate limit for regrading tasks that a grading policy change can kick off
 POLICY_CHANGE_TASK_RATE_LIMIT = ENV_TOKENS.get('POLICY_CHANGE_TASK_RATE_LIMIT', POLICY_CHANGE_TASK_RATE_LIMIT)
 
@@ -2,6 +2,8 @@
 
 import logging
 import re
+from functools import partial
+
 import six
 from six import text_type
 
@@ -16,6 +18,15 @@ from opaque_keys.edx.locator import AssetLocator
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock'
 
+# Maximum number of paths whose staticfiles_storage urls are memoized per process.
+STATICFILES_URLS_CACHE_SIZE = 10000
+
+# Maximum number of UrlRewriters kept per process.
+URL_REWRITERS_CACHE_SIZE = 1000
+
+# The compiled url replacement regexes, by prefix.
+_COMPILED_URL_REPLACE_REGEXES = {}
+
 
 def _url_replace_regex(prefix):
     """
@@ -33,6 +44,67 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+def _compiled_url_replace_regex(prefix):
+    """
+    Returns the compiled _url_replace_regex of the prefix, compiling it only once per process.
+    """
+    regex = _COMPILED_URL_REPLACE_REGEXES.get(prefix)
+    if regex is None:
+        regex = _COMPILED_URL_REPLACE_REGEXES[prefix] = re.compile(_url_replace_regex(prefix))
+    return regex
+
+
+def _static_url_prefix(data_dir):
+    """
+    Returns the regex of the prefixes of the static urls that aren't in the data directory.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
+class StaticFilesUrls(object):
+    """
+    A per-process memo of the urls of paths in staticfiles_storage, which
+    doesn't change while the process runs, and of the paths that aren't in it.
+
+    It is emptied whenever staticfiles_storage is replaced, as tests do, or
+    once it holds STATICFILES_URLS_CACHE_SIZE paths.
+    """
+    def __init__(self):
+        self._storage = None
+        self._urls = {}
+
+    def url(self, path):
+        """
+        Returns the url of the path in staticfiles_storage, or None if it
+        doesn't exist there.  Lookup errors are raised, and not memoized.
+        """
+        if self._storage is not staticfiles_storage:
+            self._storage = staticfiles_storage
+            self._urls = {}
+        try:
+            return self._urls[path]
+        except KeyError:
+            pass
+
+        url = staticfiles_storage.url(path) if staticfiles_storage.exists(path) else None
+        if len(self._urls) >= STATICFILES_URLS_CACHE_SIZE:
+            self._urls = {}
+        self._urls[path] = url
+        return url
+
+    def clear(self):
+        """
+        Forgets all memoized urls.
+        """
+        self._urls = {}
+
+
+STATICFILES_URLS = StaticFilesUrls()
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -69,12 +141,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
     output: <text> after the link rewriting rules are applied
     """
 
-    def replace_jump_to_id_url(match):
-        quote = match.group('quote')
-        rest = match.group('rest')
-        return "".join([quote, jump_to_id_base_url + rest, quote])
-
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return get_url_rewriter(course_id, jump_to_id_base_url=jump_to_id_base_url).replace_jump_to_id_urls(text)
 
 
 def replace_course_urls(text, course_key):
@@ -86,15 +153,7 @@ def replace_course_urls(text, course_key):
 
     returns: text with the links replaced
     """
-
-    course_id = text_type(course_key)
-
-    def replace_course_url(match):
-        quote = match.group('quote')
-        rest = match.group('rest')
-        return "".join([quote, '/courses/' + course_id + '/', rest, quote])
-
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return get_url_rewriter(course_key).replace_course_urls(text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -107,31 +166,32 @@ def process_static_urls(text, replacement_function, data_dir=None):
         Unwraps a match group for the captures specified in _url_replace_regex
         and forward them on as function arguments
         """
-        original = match.group(0)
-        prefix = match.group('prefix')
-        quote = match.group('quote')
-        rest = match.group('rest')
+        return _process_static_url_match(match, replacement_function)
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
+    return _compiled_url_replace_regex(_static_url_prefix(data_dir)).sub(wrap_part_extraction, text)
 
-        starts_with_static_url = full_url.startswith(six.text_type(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
-            return original
 
-        return replacement_function(original, prefix, quote, rest)
+def _process_static_url_match(match, replacement_function):
+    """
+    Returns the replacement of a static url matched by _url_replace_regex, as
+    returned by replacement_function(original, prefix, quote, rest).
+    """
+    original = match.group(0)
+    prefix = match.group('prefix')
+    quote = match.group('quote')
+    rest = match.group('rest')
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
+    # works for actual static assets and for magical course asset URLs....
+    full_url = prefix + rest
+
+    starts_with_static_url = full_url.startswith(six.text_type(settings.STATIC_URL))
+    starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
+    if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        return original
+
+    return replacement_function(original, prefix, quote, rest)
 
 
 def make_static_urls_absolute(request, html):
@@ -167,13 +227,138 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
       * the updated static URI (will match the original if unchanged)
     """
 
-    if static_paths_out is None:
-        static_paths_out = []
+    return get_url_rewriter(course_id, data_directory, static_asset_path).replace_static_urls(text, static_paths_out)
+
+
+def replace_urls(text, data_directory=None, course_id=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Replace the /static/, /course/ and, if jump_to_id_base_url is given, /jump_to_id/ urls
+    of the text in a single pass, as replace_static_urls, replace_course_urls and
+    replace_jump_to_id_urls do, except that urls quoted inside another url are left as is.
+    """
+    return get_url_rewriter(course_id, data_directory, static_asset_path, jump_to_id_base_url).replace_urls(text)
+
+
+def get_url_rewriter(course_id=None, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Returns the UrlRewriter of the given course, data directory, static asset
+    path and jump_to_id base url, which is only created once per process.
+    """
+    key = (course_id, data_directory, static_asset_path, jump_to_id_base_url, settings.STATIC_URL)
+    rewriter = _URL_REWRITERS.get(key)
+    if rewriter is None:
+        if len(_URL_REWRITERS) >= URL_REWRITERS_CACHE_SIZE:
+            _URL_REWRITERS.clear()
+        rewriter = _URL_REWRITERS[key] = UrlRewriter(course_id, data_directory, static_asset_path, jump_to_id_base_url)
+    return rewriter
+
 
-    def replace_static_url(original, prefix, quote, rest):
+class UrlRewriter(object):
+    """
+    Rewrites the urls of the content of a course, with the regexes for its
+    data directory compiled once, and the staticfiles_storage lookups of
+    STATICFILES_URLS.
+
+    It holds no state that changes between requests, so it can be shared by
+    all requests for the course.
+    """
+    def __init__(self, course_id=None, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+        """
+        Arguments:
+            course_id: The course whose urls are rewritten.
+            data_directory: The directory in which course data is stored.
+            static_asset_path: Path for static assets, which overrides data_directory and course_id, if nonempty.
+            jump_to_id_base_url: The base url of the handler that /jump_to_id/ urls are rewritten to, if any.
+        """
+        self.course_id = course_id
+        self.data_directory = data_directory
+        self.static_asset_path = static_asset_path
+        self.jump_to_id_base_url = jump_to_id_base_url
+
+        self._course_url_prefix = u'/courses/{}/'.format(text_type(course_id))
+        static_url_prefix = _static_url_prefix(static_asset_path or data_directory)
+        self._static_url_regex = _compiled_url_replace_regex(static_url_prefix)
+        self._course_url_regex = _compiled_url_replace_regex(u'/course/')
+        self._jump_to_id_url_regex = _compiled_url_replace_regex(u'/jump_to_id/')
+
+        # The prefixes are matched right after an opening quote, and none of them starts
+        # the urls that the others are rewritten to, so a single pass rewrites the urls as
+        # successive passes for each prefix would, except for urls quoted inside another
+        # url: in '/course/x?img="/static/a.png"', the single pass rewrites only the outer
+        # url, whereas the successive passes rewrite both.
+        prefixes = [static_url_prefix]
+        if course_id is not None:
+            prefixes.append(u'/course/')
+        if jump_to_id_base_url is not None:
+            prefixes.append(u'/jump_to_id/')
+        self._url_regex = _compiled_url_replace_regex(u'|'.join(u'(?:{})'.format(prefix) for prefix in prefixes))
+
+    def replace_urls(self, text):
         """
-        Replace a single matched url.
+        Replaces the static, course and jump_to_id urls of the text in a single pass.
+        """
+        def replace_url(match):
+            """
+            Replaces a single matched url.
+            """
+            prefix = match.group('prefix')
+            if prefix == u'/course/':
+                return self._replace_course_url(match)
+            elif prefix == u'/jump_to_id/':
+                return self._replace_jump_to_id_url(match)
+            return _process_static_url_match(match, self._replace_static_url)
+
+        return self._url_regex.sub(replace_url, text)
+
+    def replace_static_urls(self, text, static_paths_out=None):
+        """
+        See replace_static_urls.
+        """
+        def replace_static_url(match):
+            """
+            Replaces a single matched static url.
+            """
+            return _process_static_url_match(
+                match, partial(self._replace_static_url, static_paths_out=static_paths_out),
+            )
+
+        return self._static_url_regex.sub(replace_static_url, text)
+
+    def replace_course_urls(self, text):
         """
+        See replace_course_urls.
+        """
+        return self._course_url_regex.sub(self._replace_course_url, text)
+
+    def replace_jump_to_id_urls(self, text):
+        """
+        See replace_jump_to_id_urls.
+        """
+        return self._jump_to_id_url_regex.sub(self._replace_jump_to_id_url, text)
+
+    def _replace_course_url(self, match):
+        """
+        Replaces a single matched /course/ url.
+        """
+        quote = match.group('quote')
+        rest = match.group('rest')
+        return "".join([quote, self._course_url_prefix, rest, quote])
+
+    def _replace_jump_to_id_url(self, match):
+        """
+        Replaces a single matched /jump_to_id/ url.
+        """
+        quote = match.group('quote')
+        rest = match.group('rest')
+        return "".join([quote, self.jump_to_id_base_url + rest, quote])
+
+    def _replace_static_url(self, original, prefix, quote, rest, static_paths_out=None):
+        """
+        Replaces a single matched static url.
+        """
+        if static_paths_out is None:
+            static_paths_out = []
+
         original_uri = "".join([prefix, rest])
         # Don't mess with things that end in '?raw'
         if rest.endswith('?raw'):
@@ -186,39 +371,36 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
             return original
 
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id:
+        elif (not self.static_asset_path) and self.course_id:
             # first look in the static file pipeline and see if we are trying to reference
             # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
-            exists_in_staticfiles_storage = False
+            url = None
             try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+                url = STATICFILES_URLS.url(rest)
             except Exception as err:
                 log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
                     rest, str(err)))
 
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
+            if url is None:
                 # if not, then assume it's courseware specific content and then look in the
                 # Mongo-backed database
                 # Import is placed here to avoid model import at project startup.
                 from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
                 base_url = AssetBaseUrlConfig.get_base_url()
                 excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+                url = StaticContent.get_canonicalized_asset_path(self.course_id, rest, base_url, excluded_exts)
 
                 if AssetLocator.CANONICAL_NAMESPACE in url:
                     url = url.replace('block@', 'block/', 1)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
+            course_path = "/".join((self.static_asset_path or self.data_directory, rest))
 
             try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
-                else:
+                url = STATICFILES_URLS.url(rest)
+                if url is None:
                     url = staticfiles_storage.url(course_path)
             # And if that fails, assume that it's course content, and add manually data directory
             except Exception as err:
@@ -229,4 +411,6 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         static_paths_out.append((original_uri, url))
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+# The UrlRewriters of get_url_rewriter, by their arguments and the STATIC_URL.
+_URL_REWRITERS = {}
@@ -0,0 +1,85 @@
+"""
+Command to compare the time to rewrite the urls of a large HTML unit, url
+type by url type with cold caches, and in a single pass with warm caches.
+"""
+
+
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from six import text_type
+from six.moves import range
+
+import static_replace
+
+HTML_UNIT_PARAGRAPH = u"""
+<p>
+    Paragraph {index}, with an <img src="/static/images/figure_{index}.png" alt="figure {index}"/>,
+    a <a href="/static/handouts/handout_{index}.pdf">handout</a>, the
+    <a href="/course/info">course info</a>, a <a href="/jump_to_id/block_{index}">related unit</a>
+    and a <script type="text/javascript" src="/static/js/vendor/jquery.min.js"></script>.
+</p>
+"""
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_static_replace 'course-v1:edX+DemoX+Demo_Course' --paragraphs 500
+
+    Rewrites the urls of an HTML unit with the given number of paragraphs,
+    each with 3 static urls, a course url and a jump_to_id url:
+        - cold: with replace_static_urls, replace_course_urls and
+          replace_jump_to_id_urls, after emptying the caches of compiled
+          regexes, url rewriters and staticfiles urls,
+        - warm: with replace_urls, in a single pass, with those caches filled.
+    """
+    help = u'Compares rewriting the urls of a large HTML unit with cold caches and with warm caches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', help=u'the course whose urls are rewritten')
+        parser.add_argument(
+            '--paragraphs',
+            help=u'Number of paragraphs of the HTML unit.',
+            default=500,
+            type=int,
+        )
+        parser.add_argument(
+            '--repeat',
+            help=u'Number of times each case is timed, of which the fastest is reported.',
+            default=5,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError(u'Invalid course_id: {}'.format(options['course_id']))
+
+        html = u''.join(HTML_UNIT_PARAGRAPH.format(index=index) for index in range(options['paragraphs']))
+        jump_to_id_base_url = u'/courses/{}/jump_to_id/'.format(text_type(course_key))
+
+        def clear_caches():
+            static_replace._COMPILED_URL_REPLACE_REGEXES.clear()  # pylint: disable=protected-access
+            static_replace._URL_REWRITERS.clear()  # pylint: disable=protected-access
+            static_replace.STATICFILES_URLS.clear()
+
+        def replace_urls_by_type():
+            text = static_replace.replace_static_urls(html, course_id=course_key)
+            text = static_replace.replace_course_urls(text, course_key)
+            return static_replace.replace_jump_to_id_urls(text, course_key, jump_to_id_base_url)
+
+        def replace_urls():
+            return static_replace.replace_urls(html, course_id=course_key, jump_to_id_base_url=jump_to_id_base_url)
+
+        self.stdout.write(u'{} paragraphs, {} characters'.format(options['paragraphs'], len(html)))
+        for name, setup, rewrite in [
+            (u'cold', clear_caches, replace_urls_by_type),
+            (u'warm', lambda: None, replace_urls),
+        ]:
+            replace_urls()
+            duration = min(timeit.repeat(rewrite, setup=setup, number=1, repeat=options['repeat']))
+            self.stdout.write(u'  {:<6} {:>10.2f} ms'.format(name + u':', duration * 1000))
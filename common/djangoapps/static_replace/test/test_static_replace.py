@@ -16,10 +16,13 @@ from PIL import Image
 
 from static_replace import (
     _url_replace_regex,
+    get_url_rewriter,
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
-    replace_static_urls
+    replace_jump_to_id_urls,
+    replace_static_urls,
+    replace_urls
 )
 from xmodule.assetstore.assetmgr import AssetManager
 from xmodule.contentstore.content import StaticContent
@@ -252,6 +255,77 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     assert replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY) == post_text
 
 
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_staticfiles_lookups_memoized(mock_storage):
+    mock_storage.exists.side_effect = lambda path: path == 'file.png'
+    mock_storage.url.return_value = '/static/file.hashed.png'
+
+    for __ in range(3):
+        assert replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY) == '"/static/file.hashed.png"'
+        assert replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, COURSE_KEY) == '"/static/file.hashed.png"'
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_storage.url.assert_called_once_with('file.png')
+
+
+def test_url_rewriter_reused():
+    assert get_url_rewriter(COURSE_KEY, DATA_DIRECTORY) is get_url_rewriter(COURSE_KEY, DATA_DIRECTORY)
+    assert get_url_rewriter(COURSE_KEY, DATA_DIRECTORY) is not get_url_rewriter(COURSE_KEY, 'other_data_dir')
+
+
+@pytest.mark.django_db
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('xmodule.modulestore.django.modulestore', autospec=True)
+def test_replace_urls(mock_modulestore, mock_storage):
+    """
+    Make sure that replace_urls rewrites urls in a single pass as replace_static_urls,
+    replace_course_urls and replace_jump_to_id_urls do one after the other.
+    """
+    mock_storage.exists.side_effect = lambda path: path.startswith('js/')
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+    jump_to_id_base_url = '/courses/{}/jump_to_id/'.format(COURSE_KEY)
+
+    # xss-lint: disable=python-wrap-html
+    pre_text = (
+        '<img src="/static/file.png"/><script src=\'/static/js/file.js\'></script>'
+        '<a href="/course/info">info</a><a href="/jump_to_id/block_id">block</a>'
+        '<img src="/static/xblock/resources/file.png"/><a href="/static/file.txt?raw">raw</a>'
+    )
+    # xss-lint: disable=python-wrap-html
+    post_text = (
+        '<img src="/c4x/org/course/asset/file.png"/><script src=\'/static/hashed/js/file.js\'></script>'
+        '<a href="/courses/org/course/run/info">info</a><a href="/courses/org/course/run/jump_to_id/block_id">block</a>'
+        '<img src="/static/xblock/resources/file.png"/><a href="/static/file.txt?raw">raw</a>'
+    )
+    assert replace_urls(pre_text, DATA_DIRECTORY, COURSE_KEY, jump_to_id_base_url=jump_to_id_base_url) == post_text
+    assert replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url,
+    ) == post_text
+
+
+@pytest.mark.django_db
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('xmodule.modulestore.django.modulestore', autospec=True)
+def test_replace_urls_nested_url(mock_modulestore, mock_storage):
+    """
+    Make sure that replace_urls, unlike successive replacements, leaves a url quoted
+    inside another url as is.
+    """
+    mock_storage.exists.return_value = False
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+    # xss-lint: disable=python-wrap-html
+    pre_text = '<a href=\'/course/x?img="/static/a.png"\'>x</a>'
+
+    assert replace_urls(pre_text, DATA_DIRECTORY, COURSE_KEY) == (
+        '<a href=\'/courses/org/course/run/x?img="/static/a.png"\'>x</a>'
+    )
+    assert replace_course_urls(replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY) == (
+        '<a href=\'/courses/org/course/run/x?img="/c4x/org/course/asset/a.png"\'>x</a>'
+    )
+
+
 @ddt.ddt
 class CanonicalContentTest(SharedModuleStoreTestCase):
     """
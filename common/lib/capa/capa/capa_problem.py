@@ -14,9 +14,11 @@ This is used by capa_module.
 """
 
 
+import hashlib
 import logging
 import os.path
 import re
+import threading
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
@@ -75,6 +77,69 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# Version of the problem trees cached by ParsedProblemCache, to be incremented
+# whenever the way problem XML is parsed into those trees changes.
+PARSED_PROBLEM_CACHE_VERSION = 1
+
+# Maximum number of parsed problem trees cached per process.
+PARSED_PROBLEM_CACHE_SIZE = 1000
+
+
+class ParsedProblemCache(object):
+    """
+    A per-process, thread-safe LRU cache of the trees that problem XML is
+    parsed into before anything learner-specific is done with them, keyed by
+    the hash of the XML and PARSED_PROBLEM_CACHE_VERSION.
+
+    The cached trees are never handed out, only deep copies of them, which
+    each LoncapaProblem is then free to modify.
+    """
+    def __init__(self, max_size=PARSED_PROBLEM_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._trees = OrderedDict()
+
+    def __len__(self):
+        return len(self._trees)
+
+    @staticmethod
+    def cache_key(problem_xml):
+        """
+        Returns the key of the tree of the given problem XML (bytes).
+        """
+        return (hashlib.sha1(problem_xml).hexdigest(), PARSED_PROBLEM_CACHE_VERSION)
+
+    def get_tree(self, problem_xml, parse):
+        """
+        Returns a copy of the tree of the problem XML (bytes), which is parsed
+        with `parse(problem_xml)` if it isn't cached yet.
+        """
+        key = self.cache_key(problem_xml)
+        with self._lock:
+            tree = self._trees.pop(key, None)
+            if tree is not None:
+                # Re-insert the tree to mark it as the most recently used.
+                self._trees[key] = tree
+        if tree is None:
+            tree = parse(problem_xml)
+            if self.max_size > 0:
+                with self._lock:
+                    self._trees.pop(key, None)
+                    while len(self._trees) >= self.max_size:
+                        self._trees.popitem(last=False)
+                    self._trees[key] = tree
+        return deepcopy(tree)
+
+    def clear(self):
+        """
+        Removes all cached trees.
+        """
+        with self._lock:
+            self._trees.clear()
+
+
+PARSED_PROBLEM_CACHE = ParsedProblemCache()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -183,13 +248,12 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
+        # parse problem XML file into an element tree, or copy the one it was
+        # already parsed into for another learner
         if isinstance(problem_text, six.text_type):
             # etree chokes on Unicode XML with an encoding declaration
             problem_text = problem_text.encode('utf-8')
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
+        self.tree = PARSED_PROBLEM_CACHE.get_tree(problem_text, self._parse_problem_xml)
 
         # handle any <include file="foo"> tags
         self._process_includes()
@@ -225,6 +289,15 @@ class LoncapaProblem(object):
             if extract_tree:
                 self.extracted_tree = self._extract_html(self.tree)
 
+    def _parse_problem_xml(self, problem_xml):
+        """
+        Parses the problem XML (bytes) into an element tree, and does everything
+        to it that doesn't depend on the learner, the seed or the filestore.
+        """
+        tree = etree.XML(problem_xml)
+        self.make_xml_compatible(tree)
+        return tree
+
     def make_xml_compatible(self, tree):
         """
         Adjust tree xml in-place for compatibility before creating
@@ -2,15 +2,25 @@
 
 
 import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
 
 from codejail.safe_exec import SafeExecException, json_safe
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import safe_exec as codejail_safe_exec
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from edx_django_utils.monitoring import accumulate
 import six
 from six import text_type
 
 from . import lazymod
 
+log = logging.getLogger(__name__)
+
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
 # The name "random" is a properly-seeded stand-in for the random module.
@@ -55,6 +65,75 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# Globals that are different for every learner.  When the code cannot read
+# them, they are left out of the cache key and of the cached results, so that
+# all learners who get the same random seed share a cached result.
+LEARNER_GLOBALS = ('anonymous_student_id',)
+
+# Code that uses any of these names may read globals without naming them.
+INTROSPECTION_NAMES = ('globals', 'locals', 'vars', 'eval', 'exec', '__dict__')
+
+# Number of distinct pieces of code whose digest is kept precomputed.
+CODE_INFO_CACHE_SIZE = 1000
+
+
+class LocalLRUCache(object):
+    """
+    A per-process, thread-safe LRU cache bounded by its number of entries.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """
+        Returns the cached value for the given key, or None.
+        """
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                # Re-insert the entry to mark it as the most recently used.
+                self._entries[key] = value
+            return value
+
+    def set(self, key, value, max_size):
+        """
+        Caches the given value, evicting the least recently used entries to
+        keep at most `max_size` of them.
+        """
+        if max_size <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= max_size:
+                self._entries.popitem(last=False)
+            self._entries[key] = value
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# md5 hashers that have already consumed a piece of code, together with the
+# names in LEARNER_GLOBALS that the code cannot read, keyed by the code.
+CODE_INFO_CACHE = LocalLRUCache()
+
+# Results of executions, kept in front of the cache passed to safe_exec.
+LOCAL_RESULT_CACHE = LocalLRUCache()
+
+
+def local_result_cache_size():
+    """
+    Returns the configured maximum number of results kept in this process.
+    """
+    try:
+        return getattr(settings, 'SAFE_EXEC_LOCAL_CACHE_SIZE', 0) or 0
+    except ImproperlyConfigured:
+        return 0
+
 
 def update_hash(hasher, obj):
     """
@@ -79,6 +158,56 @@ def update_hash(hasher, obj):
         hasher.update(six.b(repr(obj)))
 
 
+def _code_info(code):
+    """
+    Returns a copy of an md5 hasher that has consumed `code`, and the set of
+    names in LEARNER_GLOBALS that `code` cannot read.
+
+    Both are computed once per distinct piece of code.
+    """
+    code_info = CODE_INFO_CACHE.get(code)
+    if code_info is None:
+        hasher = hashlib.md5()
+        hasher.update(repr(code).encode('utf-8'))
+        if any(name in code for name in INTROSPECTION_NAMES):
+            unread_globals = frozenset()
+        else:
+            unread_globals = frozenset(name for name in LEARNER_GLOBALS if name not in code)
+        code_info = (hasher, unread_globals)
+        CODE_INFO_CACHE.set(code, code_info, CODE_INFO_CACHE_SIZE)
+    hasher, unread_globals = code_info
+    return hasher.copy(), unread_globals
+
+
+def _get_cached_result(cache, key):
+    """
+    Returns the (emsg, cleaned_results) pair cached for `key`, looking in this
+    process first and then in `cache`, or None.
+    """
+    local_result = LOCAL_RESULT_CACHE.get(key)
+    if local_result is not None:
+        accumulate('safe_exec.local_cache_hits', 1)
+        emsg, results_json = local_result
+        # Each caller gets its own copy of the results, as from `cache`.
+        return emsg, json.loads(results_json)
+
+    cached = cache.get(key)
+    if cached is not None:
+        accumulate('safe_exec.cache_hits', 1)
+        _set_local_result(key, cached)
+    else:
+        accumulate('safe_exec.cache_misses', 1)
+    return cached
+
+
+def _set_local_result(key, result):
+    """
+    Keeps the (emsg, cleaned_results) pair for `key` in this process.
+    """
+    emsg, cleaned_results = result
+    LOCAL_RESULT_CACHE.set(key, (emsg, json.dumps(cleaned_results)), local_result_cache_size())
+
+
 def safe_exec(
     code,
     globals_dict,
@@ -107,7 +236,8 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    and the random seed.  Up to SAFE_EXEC_LOCAL_CACHE_SIZE results are also kept in
+    this process, and checked before `cache`.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -117,12 +247,13 @@ def safe_exec(
     """
     # Check the cache for a previous result.
     if cache:
-        safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code).encode('utf-8'))
+        md5er, unread_globals = _code_info(code)
+        safe_globals = json_safe({
+            name: value for name, value in six.iteritems(globals_dict) if name not in unread_globals
+        })
         update_hash(md5er, safe_globals)
         key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
-        cached = cache.get(key)
+        cached = _get_cached_result(cache, key)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -142,6 +273,7 @@ def safe_exec(
         exec_fn = codejail_safe_exec
 
     # Run the code!  Results are side effects in globals_dict.
+    start_time = time.time()
     try:
         exec_fn(
             code_prolog + LAZY_IMPORTS + code, globals_dict,
@@ -153,12 +285,20 @@ def safe_exec(
         emsg = text_type(e)
     else:
         emsg = None
+    exec_time = time.time() - start_time
+    accumulate('safe_exec.exec_time', exec_time)
+    log.debug(u"safe_exec of %s with seed %r took %.3f seconds", slug, random_seed, exec_time)
 
     # Put the result back in the cache.  This is complicated by the fact that
-    # the globals dict might not be entirely serializable.
+    # the globals dict might not be entirely serializable.  Globals that the
+    # code cannot read are left out, so that they never overwrite those of
+    # another learner.
     if cache:
-        cleaned_results = json_safe(globals_dict)
+        cleaned_results = json_safe({
+            name: value for name, value in six.iteritems(globals_dict) if name not in unread_globals
+        })
         cache.set(key, (emsg, cleaned_results))
+        _set_local_result(key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
     if emsg:
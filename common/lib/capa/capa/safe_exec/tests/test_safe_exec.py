@@ -12,10 +12,12 @@ import pytest
 import six
 from codejail.jail_code import is_configured
 from codejail.safe_exec import SafeExecException
+from django.test.utils import override_settings
 from six import text_type, unichr
 from six.moves import range
 
 from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec.safe_exec import LOCAL_RESULT_CACHE
 
 
 class TestSafeExec(unittest.TestCase):
@@ -114,6 +116,15 @@ class DictCache(object):
 class TestSafeExecCaching(unittest.TestCase):
     """Test that caching works on safe_exec."""
 
+    def setUp(self):
+        super(TestSafeExecCaching, self).setUp()
+        # These tests are about the cache passed to safe_exec, so the
+        # per-process cache in front of it is disabled.
+        settings_override = override_settings(SAFE_EXEC_LOCAL_CACHE_SIZE=0)
+        settings_override.__enter__()
+        self.addCleanup(settings_override.__exit__, None, None, None)
+        LOCAL_RESULT_CACHE.clear()
+
     def test_cache_miss_then_hit(self):
         g = {}
         cache = {}
@@ -181,6 +192,82 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+    def test_learner_globals_not_read(self):
+        # Learners share results of code that doesn't read their globals.
+        cache = {}
+        g = {'anonymous_student_id': 'student_1'}
+        safe_exec("a = 17", g, random_seed=3, cache=DictCache(cache))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(list(cache.values())[0], (None, {'a': 17}))
+
+        g = {'anonymous_student_id': 'student_2'}
+        safe_exec("a = 17", g, random_seed=3, cache=DictCache(cache))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(g, {'a': 17, 'anonymous_student_id': 'student_2'})
+
+    def test_learner_globals_read(self):
+        cache = {}
+        for code in ["a = anonymous_student_id", "a = globals()['anonymous_student_id']"]:
+            for student in ['student_1', 'student_2']:
+                g = {'anonymous_student_id': student}
+                safe_exec(code, g, cache=DictCache(cache))
+                self.assertEqual(g['a'], student)
+        self.assertEqual(len(cache), 4)
+
+
+class TestSafeExecLocalCaching(unittest.TestCase):
+    """Test the per-process cache in front of the cache passed to safe_exec."""
+
+    def setUp(self):
+        super(TestSafeExecLocalCaching, self).setUp()
+        settings_override = override_settings(SAFE_EXEC_LOCAL_CACHE_SIZE=2)
+        settings_override.__enter__()
+        self.addCleanup(settings_override.__exit__, None, None, None)
+        LOCAL_RESULT_CACHE.clear()
+        self.addCleanup(LOCAL_RESULT_CACHE.clear)
+
+    def test_local_cache_hit(self):
+        cache = {}
+        g = {}
+        safe_exec("a = [int(math.pi)]", g, cache=DictCache(cache))
+        self.assertEqual(g['a'], [3])
+
+        # The result is found in this process before the given cache.
+        cache[list(cache.keys())[0]] = (None, {'a': [17]})
+        g = {}
+        safe_exec("a = [int(math.pi)]", g, cache=DictCache(cache))
+        self.assertEqual(g['a'], [3])
+
+        # Each caller gets its own copy of the result.
+        g['a'].append(4)
+        g = {}
+        safe_exec("a = [int(math.pi)]", g, cache=DictCache(cache))
+        self.assertEqual(g['a'], [3])
+
+    def test_local_cache_exceptions(self):
+        cache = {}
+        for _ in range(2):
+            with self.assertRaises(SafeExecException) as cm:
+                safe_exec("1/0", {}, cache=DictCache(cache))
+            self.assertIn("ZeroDivisionError", text_type(cm.exception))
+            cache.clear()
+
+    def test_local_cache_eviction(self):
+        cache = {}
+        for value in range(3):
+            safe_exec("a = {}".format(value), {}, cache=DictCache(cache))
+
+        # Only the two most recent results are kept in this process.
+        for key in cache:
+            cache[key] = (None, {'a': 17})
+        results = []
+        for value in reversed(range(3)):
+            g = {}
+            safe_exec("a = {}".format(value), g, cache=DictCache(cache))
+            results.append(g['a'])
+        self.assertEqual(results, [2, 1, 17])
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
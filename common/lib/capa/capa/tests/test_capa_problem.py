@@ -10,8 +10,9 @@ import ddt
 import six
 from lxml import etree
 from markupsafe import Markup
-from mock import patch
+from mock import Mock, patch
 
+from capa import capa_problem
 from capa.tests.helpers import new_loncapa_problem
 from openedx.core.djangolib.markup import HTML
 
@@ -740,3 +741,82 @@ class CAPAProblemReportHelpersTest(unittest.TestCase):
         # Ensure that the answer is a string so that the dict returned from this
         # function can eventualy be serialized to json without issues.
         self.assertIsInstance(problem.get_question_answers()['1_solution_1'], six.text_type)
+
+
+@ddt.ddt
+class ParsedProblemCacheTest(unittest.TestCase):
+    """
+    Tests of the per-process cache of parsed problem trees.
+    """
+    SHUFFLED_PROBLEM = textwrap.dedent("""
+        <problem>
+            <multiplechoiceresponse>
+                <choicegroup type="MultipleChoice" shuffle="true">
+                    <choice correct="false">Apple</choice>
+                    <choice correct="false">Banana</choice>
+                    <choice correct="false">Chocolate</choice>
+                    <choice correct="true">Donut</choice>
+                </choicegroup>
+            </multiplechoiceresponse>
+            <optionresponse>
+                <optioninput>
+                    <option correct="False">dog</option>
+                    <option correct="True">cat</option>
+                </optioninput>
+            </optionresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super(ParsedProblemCacheTest, self).setUp()
+        capa_problem.PARSED_PROBLEM_CACHE.clear()
+        self.addCleanup(capa_problem.PARSED_PROBLEM_CACHE.clear)
+
+    def _patch_parse(self):
+        """
+        Returns a patch of the parsing of problem XML, which counts its calls.
+        """
+        parse_problem_xml = capa_problem.LoncapaProblem._parse_problem_xml  # pylint: disable=protected-access
+        return patch.object(
+            capa_problem.LoncapaProblem, '_parse_problem_xml', autospec=True, side_effect=parse_problem_xml,
+        )
+
+    def test_problem_parsed_once(self):
+        with self._patch_parse() as mock_parse:
+            for seed in range(5):
+                new_loncapa_problem(self.SHUFFLED_PROBLEM, seed=seed)
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(len(capa_problem.PARSED_PROBLEM_CACHE), 1)
+
+    @ddt.data(0, 1, 2, 3)
+    def test_same_html_as_uncached(self, seed):
+        uncached_html = new_loncapa_problem(self.SHUFFLED_PROBLEM, seed=seed).get_html()
+        # The problems of other learners are built from the cached tree.
+        for other_seed in range(4):
+            new_loncapa_problem(self.SHUFFLED_PROBLEM, seed=other_seed).get_html()
+        self.assertEqual(new_loncapa_problem(self.SHUFFLED_PROBLEM, seed=seed).get_html(), uncached_html)
+
+    def test_trees_not_shared(self):
+        problem = new_loncapa_problem(self.SHUFFLED_PROBLEM)
+        other_problem = new_loncapa_problem(self.SHUFFLED_PROBLEM)
+        self.assertIsNot(problem.tree, other_problem.tree)
+        # The XML was made compatible before being cached.
+        self.assertEqual(problem.tree.find('.//optioninput').get('correct'), 'cat')
+
+    def test_reparsed_on_new_version(self):
+        with self._patch_parse() as mock_parse:
+            new_loncapa_problem(self.SHUFFLED_PROBLEM)
+            with patch.object(capa_problem, 'PARSED_PROBLEM_CACHE_VERSION', 2):
+                new_loncapa_problem(self.SHUFFLED_PROBLEM)
+                new_loncapa_problem(self.SHUFFLED_PROBLEM)
+        self.assertEqual(mock_parse.call_count, 2)
+
+    def test_least_recently_used_evicted(self):
+        cache = capa_problem.ParsedProblemCache(max_size=2)
+        for problem_xml in [b'<a/>', b'<b/>', b'<a/>', b'<c/>']:
+            cache.get_tree(problem_xml, etree.XML)
+        mock_parse = Mock(side_effect=etree.XML)
+        for problem_xml in [b'<a/>', b'<c/>', b'<b/>']:
+            cache.get_tree(problem_xml, mock_parse)
+        # Only '<b/>' was evicted, to stay within the maximum size.
+        mock_parse.assert_called_once_with(b'<b/>')
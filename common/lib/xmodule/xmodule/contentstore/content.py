@@ -11,6 +11,7 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import AssetKey, CourseKey
 from opaque_keys.edx.locator import AssetLocator
 from PIL import Image
+from six.moves import range
 from six.moves.urllib.parse import parse_qsl, quote_plus, urlencode, urlparse, urlunparse   # pylint: disable=import-error
 
 from xmodule.assetstore.assetmgr import AssetManager
@@ -292,8 +293,16 @@ class StaticContent(object):
 
         return urlunparse(('', base_url, asset_path, params, urlencode(updated_query_params), ''))
 
-    def stream_data(self):
-        yield self._data
+    def stream_data(self, chunk_size=STREAM_DATA_CHUNK_SIZE):
+        for position in range(0, len(self._data), chunk_size):
+            yield self._data[position:position + chunk_size]
+
+    def stream_data_in_range(self, first_byte, last_byte, chunk_size=STREAM_DATA_CHUNK_SIZE):
+        """
+        Stream the data between first_byte and last_byte (included)
+        """
+        for position in range(first_byte, last_byte + 1, chunk_size):
+            yield self._data[position:min(position + chunk_size, last_byte + 1)]
 
     @staticmethod
     def serialize_asset_key_with_slash(asset_key):
@@ -315,26 +324,25 @@ class StaticContentStream(StaticContent):
                                                   length=length, locked=locked, content_digest=content_digest)
         self._stream = stream
 
-    def stream_data(self):
+    def stream_data(self, chunk_size=STREAM_DATA_CHUNK_SIZE):
+        self._stream.seek(0)
         while True:
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
+            chunk = self._stream.read(chunk_size)
             if len(chunk) == 0:
                 break
             yield chunk
 
-    def stream_data_in_range(self, first_byte, last_byte):
+    def stream_data_in_range(self, first_byte, last_byte, chunk_size=STREAM_DATA_CHUNK_SIZE):
         """
         Stream the data between first_byte and last_byte (included)
         """
         self._stream.seek(first_byte)
         position = first_byte
-        while True:
-            if last_byte < position + STREAM_DATA_CHUNK_SIZE - 1:
-                chunk = self._stream.read(last_byte - position + 1)
-                yield chunk
+        while position <= last_byte:
+            chunk = self._stream.read(min(chunk_size, last_byte - position + 1))
+            if len(chunk) == 0:
                 break
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
-            position += STREAM_DATA_CHUNK_SIZE
+            position += len(chunk)
             yield chunk
 
     def close(self):
@@ -21,7 +21,7 @@ from xmodule.modulestore.edit_info import EditInfoRuntimeMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import InheritanceMixin, inheriting_field_data
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
-from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader
+from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionBatch, DefinitionLazyLoader
 from xmodule.modulestore.split_mongo.id_manager import SplitMongoIdManager
 from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS
 from xmodule.x_module import XModuleMixin
@@ -86,6 +86,10 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.default_class = default_class
         self.local_modules = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
+        # The definitions of blocks that were loaded without the modulestore's lazy_definition_fields.
+        self.partial_definitions = {}
+        # The DefinitionBatches of lazily loaded definitions and fields, by (course_key, partial).
+        self._definition_batches = {}
 
     @lazy
     @contract(returns="dict(BlockKey: BlockKey)")
@@ -194,13 +198,20 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
             course_key, class_, field, self.course_entry.structure['blocks'],
         )
 
+        block_fields = block_data.fields
         if definition_id is not None and not block_data.definition_loaded:
+            partial_definition = self.partial_definitions.get(definition_id)
+            if partial_definition is not None:
+                # Only the lazy definition fields are left to be loaded.
+                block_fields = dict(block_fields)
+                block_fields.update(partial_definition.get('fields', {}))
             definition_loader = DefinitionLazyLoader(
                 self.modulestore,
                 course_key,
                 block_key.type,
                 definition_id,
                 convert_fields,
+                batch=self._get_definition_batch(course_key, partial=partial_definition is not None),
             )
         else:
             definition_loader = None
@@ -215,7 +226,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
             block_id=block_key.id,
         )
 
-        converted_fields = convert_fields(block_data.fields)
+        converted_fields = convert_fields(block_fields)
         converted_defaults = convert_fields(block_data.defaults)
         if block_key in self._parent_map:
             parent_key = self._parent_map[block_key]
@@ -288,6 +299,25 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         return module
 
+    def _get_definition_batch(self, course_key, partial):
+        """
+        Returns the DefinitionBatch to load the definitions of blocks of the course
+        with, or just their lazy definition fields if `partial`. Returns None if the
+        modulestore has no lazy definition fields, in which case each definition is
+        loaded on its own.
+        """
+        if not self.modulestore.lazy_definition_fields:
+            return None
+        batch_key = (course_key, partial)
+        if batch_key not in self._definition_batches:
+            projection = None
+            if partial:
+                projection = {u'block_type': 1}
+                for field_name in self.modulestore.lazy_definition_fields:
+                    projection[u'fields.{}'.format(field_name)] = 1
+            self._definition_batches[batch_key] = DefinitionBatch(self.modulestore, course_key, projection)
+        return self._definition_batches[batch_key]
+
     def get_edited_by(self, xblock):
         """
         See :meth: cms.lib.xblock.runtime.EditInfoRuntimeMixin.get_edited_by
@@ -1,6 +1,7 @@
 
 
 import copy
+from collections import defaultdict
 
 from opaque_keys.edx.locator import DefinitionLocator
 
@@ -12,16 +13,20 @@ class DefinitionLazyLoader(object):
     object doesn't force access during init but waits until client wants the
     definition. Only works if the modulestore is a split mongo store.
     """
-    def __init__(self, modulestore, course_key, block_type, definition_id, field_converter):
+    def __init__(self, modulestore, course_key, block_type, definition_id, field_converter, batch=None):
         """
         Simple placeholder for yet-to-be-fetched data
         :param modulestore: the pymongo db connection with the definitions
         :param definition_locator: the id of the record in the above to fetch
+        :param batch: the DefinitionBatch to fetch the definition with, if any
         """
         self.modulestore = modulestore
         self.course_key = course_key
         self.definition_locator = DefinitionLocator(block_type, definition_id)
         self.field_converter = field_converter
+        self.batch = batch
+        if batch is not None:
+            batch.add(self.definition_locator)
 
     def fetch(self):
         """
@@ -31,5 +36,50 @@ class DefinitionLazyLoader(object):
         # get_definition may return a cached value perhaps from another course or code path
         # so, we copy the result here so that updates don't cross-pollinate nor change the cached
         # value in such a way that we can't tell that the definition's been updated.
-        definition = self.modulestore.get_definition(self.course_key, self.definition_locator.definition_id)
+        if self.batch is not None:
+            definition = self.batch.fetch(self.definition_locator)
+        else:
+            definition = self.modulestore.get_definition(self.course_key, self.definition_locator.definition_id)
         return copy.deepcopy(definition)
+
+
+class DefinitionBatch(object):
+    """
+    The definitions of the lazily loaded blocks of a runtime, which are fetched
+    together, by block type, when the first of them is needed.
+    """
+    def __init__(self, modulestore, course_key, projection=None):
+        """
+        :param modulestore: the split modulestore with the definitions
+        :param course_key: the course that the definitions are fetched for
+        :param projection: a MongoDB projection of the fields of the definitions to fetch, if any
+        """
+        self.modulestore = modulestore
+        self.course_key = course_key
+        self.projection = projection
+        self._pending = defaultdict(set)
+        self._fetched = {}
+
+    def add(self, definition_locator):
+        """
+        Adds a definition to those fetched with the next definition of its block type.
+        """
+        if definition_locator.definition_id not in self._fetched:
+            self._pending[definition_locator.block_type].add(definition_locator.definition_id)
+
+    def fetch(self, definition_locator):
+        """
+        Returns the definition, fetching it along with the pending definitions of
+        its block type if it hasn't been fetched yet.
+        """
+        definition_id = definition_locator.definition_id
+        if definition_id not in self._fetched:
+            definition_ids = self._pending.pop(definition_locator.block_type, set())
+            definition_ids.add(definition_id)
+            definitions = self.modulestore.get_definitions(
+                self.course_key, list(definition_ids), projection=self.projection,
+            )
+            for definition in definitions:
+                definition.setdefault('fields', {})
+                self._fetched[definition['_id']] = definition
+        return self._fetched.get(definition_id)
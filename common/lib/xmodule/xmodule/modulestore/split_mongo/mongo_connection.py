@@ -6,11 +6,15 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 import datetime
 import logging
 import math
+import random
 import re
+import threading
 import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
+import bson
 import pymongo
 import pytz
 import six
@@ -26,11 +30,17 @@ from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
     DJANGO_AVAILABLE = False
 
+try:
+    from edx_django_utils import monitoring as monitoring_utils
+except ImportError:
+    monitoring_utils = None
+
 new_contract('BlockData', BlockData)
 log = logging.getLogger(__name__)
 
@@ -142,6 +152,32 @@ class QueryTimer(object):
 TIMER = QueryTimer(__name__, 0.01)
 
 
+# The fraction of definition loads whose BSON size is measured, as encoding
+# every loaded definition again just to measure it would slow down loading.
+DEFINITION_BYTES_SAMPLE_RATE = 0.01
+
+
+def record_definitions_loaded(definitions):
+    """
+    Adds the number of the given definitions to the total of definitions
+    loaded during the current request, when monitoring is available.
+
+    For a sample of DEFINITION_BYTES_SAMPLE_RATE of the loads, their number
+    and BSON size are also added to the split_mongo.definitions_sampled and
+    split_mongo.definition_bytes_sampled totals, from which the average size
+    of loaded definitions can be estimated.
+    """
+    if monitoring_utils is None:
+        return
+    monitoring_utils.accumulate('split_mongo.definitions_loaded', len(definitions))
+    if random.random() < DEFINITION_BYTES_SAMPLE_RATE:
+        monitoring_utils.accumulate('split_mongo.definitions_sampled', len(definitions))
+        monitoring_utils.accumulate(
+            'split_mongo.definition_bytes_sampled',
+            sum(len(bson.BSON.encode(definition)) for definition in definitions),
+        )
+
+
 def structure_from_mongo(structure, course_context=None):
     """
     Converts the 'blocks' key from a list [block_data] to a map
@@ -204,11 +240,86 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class LocalStructureCache(object):
+    """
+    A per-process, thread-safe LRU cache of pickled course structures,
+    bounded by the total size of their pickled data.
+
+    Structures are immutable by their _id, so entries never need to be
+    invalidated. The pickled data is cached rather than the structures, as
+    split modulestore updates the structures it loads in place; each caller
+    unpickles its own copy.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def max_size():
+        """
+        Returns the configured maximum total size, in bytes, of the cache.
+        """
+        if not DJANGO_AVAILABLE:
+            return 0
+        return getattr(settings, 'COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES', 0) or 0
+
+    def get(self, key):
+        """
+        Returns the cached pickled structure for the given key, or None.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            # Re-insert the entry to mark it as the most recently used.
+            self._entries[key] = entry
+            return entry[0]
+
+    def set(self, key, pickled_data):
+        """
+        Caches the given pickled structure, and returns the number of entries
+        evicted to make room for it.
+        """
+        size = len(pickled_data)
+        max_size = self.max_size()
+        if size > max_size:
+            return 0
+
+        evictions = 0
+        with self._lock:
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self._size -= previous_entry[1]
+            while self._entries and self._size + size > max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                evictions += 1
+            self._entries[key] = (pickled_data, size)
+            self._size += size
+        return evictions
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+LOCAL_STRUCTURE_CACHE = LocalStructureCache()
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    If COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES is set, the decompressed pickled
+    structures are additionally kept in a per-process LocalStructureCache,
+    which is checked before the django cache.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
@@ -226,6 +337,13 @@ class CourseStructureCache(object):
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            use_local_cache = LocalStructureCache.max_size() > 0
+            if use_local_cache:
+                pickled_data = LOCAL_STRUCTURE_CACHE.get(key)
+                tagger.tag(from_local_cache=str(pickled_data is not None).lower())
+                if pickled_data is not None:
+                    return self._loads(pickled_data)
+
             try:
                 compressed_pickled_data = self.cache.get(key)
                 tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
@@ -240,10 +358,11 @@ class CourseStructureCache(object):
                 pickled_data = zlib.decompress(compressed_pickled_data)
                 tagger.measure('uncompressed_size', len(pickled_data))
 
-                if six.PY2:
-                    return pickle.loads(pickled_data)
-                else:
-                    return pickle.loads(pickled_data, encoding='latin-1')
+                structure = self._loads(pickled_data)
+
+                if use_local_cache:
+                    self._set_local(key, pickled_data, tagger)
+                return structure
             except Exception:
                 # The cached data is corrupt in some way, get rid of it.
                 log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
@@ -266,6 +385,28 @@ class CourseStructureCache(object):
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
 
+            if LocalStructureCache.max_size() > 0:
+                self._set_local(key, pickled_data, tagger)
+
+    @staticmethod
+    def _loads(pickled_data):
+        """
+        Deserializes the given pickled structure.
+        """
+        if six.PY2:
+            return pickle.loads(pickled_data)
+        return pickle.loads(pickled_data, encoding='latin-1')
+
+    @staticmethod
+    def _set_local(key, pickled_data, tagger):
+        """
+        Adds the given pickled structure to the per-process cache, recording
+        any evictions with the given tagger.
+        """
+        evictions = LOCAL_STRUCTURE_CACHE.set(key, pickled_data)
+        if evictions:
+            tagger.measure('local_cache_evictions', evictions)
+
 
 class MongoConnection(object):
     """
@@ -548,15 +689,21 @@ class MongoConnection(object):
             definition = self.definitions.find_one({'_id': key})
             tagger.measure("fields", len(definition['fields']))
             tagger.tag(block_type=definition['block_type'])
+            record_definitions_loaded([definition])
             return definition
 
-    def get_definitions(self, definitions, course_context=None):
+    def get_definitions(self, definitions, course_context=None, projection=None):
         """
         Retrieve all definitions listed in `definitions`.
+
+        Arguments:
+            projection (dict): a MongoDB projection of the fields of the definitions
+                to retrieve, or None to retrieve whole definitions.
         """
         with TIMER.timer("get_definitions", course_context) as tagger:
             tagger.measure('definitions', len(definitions))
-            definitions = self.definitions.find({'_id': {'$in': definitions}})
+            definitions = list(self.definitions.find({'_id': {'$in': definitions}}, projection))
+            record_definitions_loaded(definitions)
             return definitions
 
     def insert_definition(self, definition, course_context=None):
@@ -426,7 +426,7 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             definition_guid = course_key.as_object_id(definition_guid)
             return self.db_connection.get_definition(definition_guid, course_key)
 
-    def get_definitions(self, course_key, ids):
+    def get_definitions(self, course_key, ids, projection=None):
         """
         Return all definitions that specified in ``ids``.
 
@@ -437,6 +437,9 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             course_key (:class:`.CourseKey`): The course that these definitions are being loaded
                 for (to respect bulk operations).
             ids (list): A list of definition ids
+            projection (dict): A MongoDB projection of the fields of the definitions to load
+                from the database, or None to load whole definitions. Definitions loaded
+                with a projection are not cached, and cached definitions are returned whole.
         """
         definitions = []
         ids = set(ids)
@@ -450,7 +453,10 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
                     ids.remove(definition_id)
                     definitions.append(definition)
 
-        if len(ids):
+        if len(ids) and projection is not None:
+            # Partial definitions must not be mistaken for whole ones by the bulk operation.
+            definitions.extend(self.db_connection.get_definitions(list(ids), course_key, projection=projection))
+        elif len(ids):
             # Query the db for the definitions.
             defs_from_db = list(self.db_connection.get_definitions(list(ids), course_key))
             defs_dict = {d.get('_id'): d for d in defs_from_db}
@@ -713,9 +719,12 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, lazy_definition_fields=(), **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param lazy_definition_fields: names of the content fields of definitions to only load when they're first
+            accessed, such as `data`. When set, the definitions of the blocks of a runtime are also loaded together
+            by block type when the first of them is needed.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
@@ -745,6 +754,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             self.services["request_cache"] = self.request_cache
 
         self.signal_handler = signal_handler
+        # The content fields of definitions, such as the `data` of problems and html blocks,
+        # which are only loaded from the database when they're first accessed.
+        self.lazy_definition_fields = tuple(lazy_definition_fields)
 
     def close_connections(self):
         """
@@ -793,7 +805,19 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
             # This method supports lazy loading, where the descendent definitions aren't loaded
             # until they're actually needed.
-            if not lazy:
+            if not lazy and self.lazy_definition_fields:
+                # Load all descendants by id, except for their lazy definition fields, which the
+                # runtime loads when they're first accessed. The blocks are shared with the
+                # structure, so the partial definitions are kept by the runtime instead.
+                descendent_definitions = self.get_definitions(
+                    course_key,
+                    [block.definition for block in six.itervalues(new_module_data) if not block.definition_loaded],
+                    projection={u'fields.{}'.format(field_name): 0 for field_name in self.lazy_definition_fields},
+                )
+                system.partial_definitions.update(
+                    (definition['_id'], definition) for definition in descendent_definitions
+                )
+            elif not lazy:
                 # Non-lazy loading: Load all descendants by id.
                 descendent_definitions = self.get_definitions(
                     course_key,
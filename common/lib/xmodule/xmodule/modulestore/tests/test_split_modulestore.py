@@ -15,7 +15,8 @@ import six
 from ccx_keys.locator import CCXBlockUsageLocator
 from contracts import contract
 from django.core.cache import InvalidCacheBackendError, caches
-from mock import patch
+from django.test.utils import override_settings
+from mock import Mock, patch
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId, VersionTree
 from path import Path as path
 from six.moves import range
@@ -36,6 +37,8 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo import mongo_connection
+from xmodule.modulestore.split_mongo.mongo_connection import LOCAL_STRUCTURE_CACHE, LocalStructureCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -1013,6 +1016,28 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=10 ** 8)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_local_structure_cache(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        LOCAL_STRUCTURE_CACHE.clear()
+        self.addCleanup(LOCAL_STRUCTURE_CACHE.clear)
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # the structure is served from the local cache, without going
+        # to mongo or to the django cache again
+        self.cache.clear()
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+        self.assertEqual(cached_structure, not_cached_structure)
+
+        # each caller gets its own copy, which it can update in place
+        cached_structure['blocks'].clear()
+        with check_mongo_calls(0):
+            self.assertEqual(self._get_structure(self.new_course), not_cached_structure)
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1022,6 +1047,69 @@ class TestCourseStructureCache(SplitModuleTest):
         )
 
 
+class TestRecordDefinitionsLoaded(unittest.TestCase):
+    """Tests for the monitoring of the definitions loaded by split"""
+
+    def setUp(self):
+        super(TestRecordDefinitionsLoaded, self).setUp()
+        self.monitoring_utils = Mock()
+        monitoring_patcher = patch.object(mongo_connection, 'monitoring_utils', self.monitoring_utils)
+        monitoring_patcher.start()
+        self.addCleanup(monitoring_patcher.stop)
+        self.definitions = [{'_id': 'id1', 'fields': {'data': 'x' * 100}}, {'_id': 'id2', 'fields': {}}]
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.random.random', return_value=0.5)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.bson.BSON.encode')
+    def test_not_sampled(self, mock_encode, _mock_random):
+        mongo_connection.record_definitions_loaded(self.definitions)
+        self.monitoring_utils.accumulate.assert_called_once_with('split_mongo.definitions_loaded', 2)
+        self.assertFalse(mock_encode.called)
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.random.random', return_value=0.0)
+    def test_sampled(self, _mock_random):
+        mongo_connection.record_definitions_loaded(self.definitions)
+        accumulated = dict(call[0] for call in self.monitoring_utils.accumulate.call_args_list)
+        self.assertEqual(accumulated['split_mongo.definitions_loaded'], 2)
+        self.assertEqual(accumulated['split_mongo.definitions_sampled'], 2)
+        self.assertGreater(accumulated['split_mongo.definition_bytes_sampled'], 100)
+
+
+class TestLocalStructureCache(unittest.TestCase):
+    """Tests for the LocalStructureCache"""
+
+    def setUp(self):
+        super(TestLocalStructureCache, self).setUp()
+        self.local_cache = LocalStructureCache()
+
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=0)
+    def test_disabled(self):
+        self.assertEqual(self.local_cache.set('key', b'x' * 10), 0)
+        self.assertIsNone(self.local_cache.get('key'))
+
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=100)
+    def test_eviction(self):
+        structure1, structure2, structure3 = b'1' * 40, b'2' * 40, b'3' * 40
+        self.assertEqual(self.local_cache.set('key1', structure1), 0)
+        self.assertEqual(self.local_cache.set('key2', structure2), 0)
+
+        # using key1 makes key2 the least recently used entry
+        self.assertEqual(self.local_cache.get('key1'), structure1)
+        self.assertEqual(self.local_cache.set('key3', structure3), 1)
+        self.assertIsNone(self.local_cache.get('key2'))
+        self.assertEqual(self.local_cache.get('key1'), structure1)
+        self.assertEqual(self.local_cache.get('key3'), structure3)
+
+        # structures larger than the cache are not cached
+        self.assertEqual(self.local_cache.set('key4', b'4' * 101), 0)
+        self.assertIsNone(self.local_cache.get('key4'))
+        self.assertEqual(self.local_cache.get('key1'), structure1)
+
+        # replacing an entry accounts for the size of the replaced entry
+        self.assertEqual(self.local_cache.set('key1', b'1' * 60), 0)
+        self.assertEqual(self.local_cache.set('key5', b'5' * 10), 1)
+        self.assertIsNone(self.local_cache.get('key3'))
+
+
 class SplitModuleItemTests(SplitModuleTest):
     '''
     Item read tests including inheritance
@@ -2224,6 +2312,76 @@ class TestPublish(SplitModuleTest):
         self.assertEqual(source_block_keys, dest_block_keys)
 
 
+class TestLazyDefinitionFields(SplitModuleTest):
+    """
+    Test loading the lazy definition fields of blocks only when they're first accessed.
+    """
+    HTML_DATA = [u'<p>html{}</p>'.format(index) for index in range(3)]
+
+    def setUp(self):
+        super(TestLazyDefinitionFields, self).setUp()
+        store = modulestore()
+        course = store.create_course('testx', 'LazyFields', 'run', self.user_id, BRANCH_NAME_DRAFT)
+        for index, data in enumerate(self.HTML_DATA):
+            store.create_child(
+                self.user_id, course.location, 'html', block_id='html{}'.format(index), fields={'data': data}
+            )
+        self.course_key = course.id.version_agnostic()
+        store.lazy_definition_fields = ('data',)
+
+    def _get_definitions_calls(self, lazy):
+        """
+        Returns the `data` of the html blocks of the course loaded with the given
+        laziness, and the calls to get definitions from the database made to do so,
+        after and before the data was accessed.
+        """
+        db_connection = modulestore().db_connection
+        get_definitions_patch = patch.object(
+            db_connection, 'get_definitions', wraps=db_connection.get_definitions
+        )
+        get_definition_patch = patch.object(db_connection, 'get_definition', wraps=db_connection.get_definition)
+        with get_definitions_patch as mock_get_definitions, get_definition_patch as mock_get_definition:
+            course = modulestore().get_course(self.course_key, depth=None, lazy=lazy)
+            html_blocks = course.get_children()
+            calls_before_access = list(mock_get_definitions.call_args_list)
+            html_data = [html_block.data for html_block in html_blocks]
+            self.assertFalse(mock_get_definition.called)
+        return html_data, calls_before_access, mock_get_definitions.call_args_list[len(calls_before_access):]
+
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_not_lazy(self, _from_json):
+        html_data, calls_before_access, calls_on_access = self._get_definitions_calls(lazy=False)
+        self.assertEqual(html_data, self.HTML_DATA)
+
+        # All definitions are loaded up front, except for their data.
+        self.assertEqual(len(calls_before_access), 1)
+        self.assertEqual(calls_before_access[0][1]['projection'], {'fields.data': 0})
+
+        # The data of all the html blocks is loaded together when the first is accessed.
+        self.assertEqual(len(calls_on_access), 1)
+        self.assertEqual(len(calls_on_access[0][0][0]), len(self.HTML_DATA))
+        self.assertEqual(calls_on_access[0][1]['projection'], {'block_type': 1, 'fields.data': 1})
+
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_lazy(self, _from_json):
+        html_data, _calls_before_access, calls_on_access = self._get_definitions_calls(lazy=True)
+        self.assertEqual(html_data, self.HTML_DATA)
+
+        # The definitions of all the html blocks are loaded together when the first is accessed.
+        self.assertEqual(len(calls_on_access), 1)
+        self.assertEqual(len(calls_on_access[0][0][0]), len(self.HTML_DATA))
+        self.assertIsNone(calls_on_access[0][1]['projection'])
+
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_partial_definitions_not_cached(self, _from_json):
+        store = modulestore()
+        with store.bulk_operations(self.course_key):
+            course = store.get_course(self.course_key, depth=None, lazy=False)
+            bulk_write_record = store._get_bulk_ops_record(self.course_key)  # pylint: disable=protected-access
+            self.assertEqual(bulk_write_record.definitions, {})
+            self.assertEqual([html_block.data for html_block in course.get_children()], self.HTML_DATA)
+
+
 class TestSchema(SplitModuleTest):
     """
     Test the db schema (and possibly eventually migrations?)
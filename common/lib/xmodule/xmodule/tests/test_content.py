@@ -216,6 +216,46 @@ class ContentTest(unittest.TestCase):
 
         self.assertEqual(total_length, last_byte - first_byte + 1)
 
+    @ddt.data(
+        (0, len(SAMPLE_STRING) - 1, 1024),
+        (100, 1500, 1024),
+        (100, 1500, 7),
+        (1500, 1500, 7),
+        (0, len(SAMPLE_STRING) - 1, 10000),
+    )
+    @ddt.unpack
+    def test_stream_data_in_range_chunk_size(self, first_byte, last_byte, chunk_size):
+        """
+        Test that stream_data_in_range of in-memory and streamed content yields
+        the requested bytes, in chunks of at most chunk_size bytes.
+        """
+        data = SAMPLE_STRING
+        item = FakeGridFsItem(data)
+        static_content_stream = StaticContentStream('loc', 'name', 'type', item, length=item.length)
+        static_content = StaticContent('loc', 'name', 'type', data, length=len(data))
+
+        for content in (static_content_stream, static_content):
+            chunks = list(content.stream_data_in_range(first_byte, last_byte, chunk_size=chunk_size))
+            self.assertEqual(''.join(chunks), data[first_byte:last_byte + 1])
+            self.assertTrue(all(len(chunk) == chunk_size for chunk in chunks[:-1]))
+            self.assertLessEqual(len(chunks[-1]), chunk_size)
+
+    @ddt.data(1, 7, 1024)
+    def test_stream_data_chunk_size(self, chunk_size):
+        """
+        Test that stream_data of in-memory and streamed content yields all the
+        bytes, in chunks of chunk_size bytes.
+        """
+        data = SAMPLE_STRING
+        item = FakeGridFsItem(data)
+        static_content_stream = StaticContentStream('loc', 'name', 'type', item, length=item.length)
+        static_content = StaticContent('loc', 'name', 'type', data, length=len(data))
+
+        for content in (static_content_stream, static_content):
+            chunks = list(content.stream_data(chunk_size=chunk_size))
+            self.assertEqual(''.join(chunks), data)
+            self.assertTrue(all(len(chunk) == chunk_size for chunk in chunks[:-1]))
+
     def test_static_content_write_js(self):
         """
         Test that only one filename starts with 000.
@@ -4,6 +4,8 @@ Models for bulk email
 
 
 import logging
+import re
+from string import Formatter
 
 import markupsafe
 import six
@@ -395,13 +397,19 @@ class CourseEmailTemplate(models.Model):
         Such encoding is left to the email code, which will use the value
         of settings.DEFAULT_CHARSET to encode the message.
         """
+        return CourseEmailTemplate._insert_message_body(format_string.format(**context), message_body, context)
+
+    @staticmethod
+    def _insert_message_body(result, message_body, context):
+        """
+        Insert the message body into a rendered template, substituting all
+        %%-encoded keywords in the message body with user data.
+        """
 
         # Substitute all %%-encoded keywords in the message body
         if 'user_id' in context and 'course_id' in context:
             message_body = substitute_keywords_with_data(message_body, context)
 
-        result = format_string.format(**context)
-
         # Note that the body tag in the template will now have been
         # "formatted", so we need to do the same to the tag being
         # searched for.
@@ -433,6 +441,95 @@ class CourseEmailTemplate(models.Model):
                 context[key] = markupsafe.escape(value)
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def get_renderer(self, plaintext, htmltext, context):
+        """
+        Returns a CourseEmailRenderer of the plain text body (`plaintext`) and
+        HTML body (`htmltext`) of an email to many recipients, using the
+        provided `context` dict of the values shared by all recipients.
+        """
+        return CourseEmailRenderer(self, plaintext, htmltext, context)
+
+
+def _escape_context(context):
+    """
+    Returns a copy of the context, with its string values HTML-escaped.
+    """
+    return {
+        key: markupsafe.escape(value) if isinstance(value, six.string_types) else value
+        for key, value in six.iteritems(context)
+    }
+
+
+class CourseEmailRenderer(object):
+    """
+    Renders the plain text and HTML messages of a course email for each of its
+    recipients, like CourseEmailTemplate.render_plaintext and render_htmltext.
+
+    The fields of the templates that are the same for all recipients are
+    formatted once, so that only the RECIPIENT_CONTEXT_KEYS fields are
+    formatted for each recipient.
+    """
+    # The keys of the context that vary between the recipients of an email.
+    RECIPIENT_CONTEXT_KEYS = frozenset(['name', 'email', 'user_id', 'unsubscribe_link'])
+
+    def __init__(self, template, plaintext, htmltext, context):
+        self.plaintext = plaintext
+        self.htmltext = htmltext
+        self.context = dict(context)
+        self.html_context = _escape_context(context)
+        self.plain_parts = self._format_shared_fields(template.plain_template, self.context)
+        self.html_parts = self._format_shared_fields(template.html_template, self.html_context)
+
+    @classmethod
+    def _format_shared_fields(cls, format_string, context):
+        """
+        Splits the format string into (text, is_field) parts, where the fields
+        that don't depend on the recipient are already formatted with the context.
+        """
+        parts = []
+        text = []
+        for literal_text, field_name, format_spec, conversion in Formatter().parse(format_string):
+            text.append(literal_text)
+            if field_name is None:
+                continue
+            field = u'{{{}{}{}}}'.format(
+                field_name,
+                u'!' + conversion if conversion else u'',
+                u':' + format_spec if format_spec else u'',
+            )
+            field_key = re.split(r'[.\[]', field_name, 1)[0]
+            if field_key in cls.RECIPIENT_CONTEXT_KEYS or u'{' in (format_spec or u''):
+                parts.append((u''.join(text), False))
+                parts.append((field, True))
+                text = []
+            else:
+                text.append(field.format(**context))
+        parts.append((u''.join(text), False))
+        return parts
+
+    @staticmethod
+    def _format_recipient_fields(parts, context):
+        """
+        Formats the remaining fields of the parts of a format string with the context.
+        """
+        return u''.join(part.format(**context) if is_field else part for part, is_field in parts)
+
+    def render(self, recipient_context):
+        """
+        Returns the plain text and HTML messages for the recipient, whose
+        values of the RECIPIENT_CONTEXT_KEYS are in `recipient_context`.
+        """
+        context = dict(self.context, **recipient_context)
+        plaintext = CourseEmailTemplate._insert_message_body(
+            self._format_recipient_fields(self.plain_parts, context), self.plaintext, context
+        )
+
+        html_context = dict(self.html_context, **_escape_context(recipient_context))
+        htmltext = CourseEmailTemplate._insert_message_body(
+            self._format_recipient_fields(self.html_parts, html_context), self.htmltext, html_context
+        )
+        return plaintext, htmltext
+
 
 @python_2_unicode_compatible
 class CourseAuthorization(models.Model):
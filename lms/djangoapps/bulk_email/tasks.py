@@ -37,6 +37,7 @@ from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import override as override_language
 from django.utils.translation import ugettext as _
+from edx_django_utils.monitoring import set_custom_metric
 from markupsafe import escape
 from six import text_type
 
@@ -509,11 +510,16 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         connection = get_connection()
         connection.open()
 
-        # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
+        # Define context values to use in all course emails, and format the parts of the
+        # templates that use them once for all recipients:
+        email_context = {'course_id': course_email.course_id}
         email_context.update(global_email_context)
+        email_renderer = course_email_template.get_renderer(
+            course_email.text_message, course_email.html_message, email_context
+        )
 
         start_time = time.time()
+        render_time = 0
         while to_list:
             # Update context with user-specific values from the user at the end of the list.
             # At the end of processing this user, they will be popped off of the to_list.
@@ -536,16 +542,16 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                 subtask_status.increment(failed=1)
                 continue
 
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-            email_context['unsubscribe_link'] = get_unsubscribed_link(current_recipient['username'],
-                                                                      text_type(course_email.course_id))
-
             # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
+            render_start_time = time.time()
+            plaintext_msg, html_msg = email_renderer.render({
+                'email': email,
+                'name': current_recipient['profile__name'],
+                'user_id': current_recipient['pk'],
+                'unsubscribe_link': get_unsubscribed_link(current_recipient['username'],
+                                                          text_type(course_email.course_id)),
+            })
+            render_time += time.time() - render_start_time
 
             # Create email:
             email_msg = EmailMultiAlternatives(
@@ -650,6 +656,7 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             recipients_info[email] += 1
             to_list.pop()
 
+        send_time = time.time() - start_time
         log.info(
             u"BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
             Failed Recipients: %s/%s, Time Taken: %s",
@@ -660,8 +667,9 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             total_recipients,
             total_recipients_failed,
             total_recipients,
-            time.time() - start_time
+            send_time
         )
+        _set_send_metrics(total_recipients_successful, total_recipients_failed, send_time, render_time)
         duplicate_recipients = [u"{0} ({1})".format(email, repetition)
                                 for email, repetition in recipients_info.most_common() if repetition > 1]
         if duplicate_recipients:
@@ -729,6 +737,18 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         connection.close()
 
 
+def _set_send_metrics(num_sent, num_failed, send_time, render_time):
+    """
+    Reports the throughput of a subtask sending emails as custom metrics.
+    """
+    set_custom_metric('bulk_email_sent', num_sent)
+    set_custom_metric('bulk_email_failed', num_failed)
+    set_custom_metric('bulk_email_send_time', send_time)
+    set_custom_metric('bulk_email_render_time', render_time)
+    if send_time > 0:
+        set_custom_metric('bulk_email_sent_per_second', num_sent / send_time)
+
+
 def _get_current_task():
     """
     Stub to make it easier to test without actually running Celery.
@@ -171,6 +171,19 @@ class NoCourseEmailTemplateTest(TestCase):
             CourseEmailTemplate.get_template()
 
 
+class _FormatCounter(object):
+    """
+    A context value that counts the number of times it is formatted.
+    """
+    def __init__(self, value):
+        self.value = value
+        self.count = 0
+
+    def __format__(self, format_spec):
+        self.count += 1
+        return format(self.value, format_spec)
+
+
 class CourseEmailTemplateTest(TestCase):
     """Test the CourseEmailTemplate model."""
 
@@ -269,6 +282,46 @@ class CourseEmailTemplateTest(TestCase):
         self.assertIn(context['course_title'], message)
         self.assertIn(context['name'], message)
 
+    def test_renderer_matches_render(self):
+        template = CourseEmailTemplate.get_template(name="branded.template")
+        global_context = self._add_xss_fields(self._get_sample_html_context())
+        plaintext = u"Dear %%USER_FULLNAME%%, thanks for enrolling in %%COURSE_DISPLAY_NAME%%."
+        htmltext = u"<p>Dear %%USER_FULLNAME%%, thanks for enrolling in %%COURSE_DISPLAY_NAME%%.</p>"
+        renderer = template.get_renderer(plaintext, htmltext, global_context)
+
+        for index, name in enumerate([u"Ann <b>", u"Bob & Co", u"Zoe"]):
+            recipient_context = {
+                'name': name,
+                'email': u'learner{}@example.com'.format(index),
+                'user_id': index,
+                'unsubscribe_link': u'/bulk_email/email/optout/{}?a=1&b=2'.format(index),
+            }
+            context = dict(global_context, **recipient_context)
+            self.assertEqual(
+                renderer.render(recipient_context),
+                (template.render_plaintext(plaintext, dict(context)), template.render_htmltext(htmltext, context)),
+            )
+
+    def test_renderer_formats_shared_fields_once(self):
+        template = CourseEmailTemplate.get_template()
+        global_context = self._get_sample_html_context()
+        course_title = _FormatCounter(u'Bogus Course Title')
+        global_context['course_title'] = course_title
+        renderer = template.get_renderer(u"My new plain text.", u"My new html text.", global_context)
+        format_count = course_title.count
+        self.assertGreater(format_count, 0)
+
+        for index in range(3):
+            plaintext, htmltext = renderer.render({
+                'name': u'Learner {}'.format(index),
+                'email': u'learner{}@example.com'.format(index),
+                'user_id': index,
+                'unsubscribe_link': u'/bulk_email/email/optout/{}'.format(index),
+            })
+            self.assertIn(u'Bogus Course Title', plaintext)
+            self.assertIn(u'/bulk_email/email/optout/{}'.format(index), htmltext)
+        self.assertEqual(course_title.count, format_count)
+
 
 class CourseAuthorizationTest(TestCase):
     """Test the CourseAuthorization model."""
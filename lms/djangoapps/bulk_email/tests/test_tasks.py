@@ -198,6 +198,27 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
             get_conn.return_value.send_messages.side_effect = cycle([None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
 
+    def test_connection_reused_and_metrics_reported(self):
+        # Select number of emails to fit into a single subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            with patch('bulk_email.tasks.set_custom_metric') as mock_set_custom_metric:
+                self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+
+        # All the emails of the subtask were sent with a single connection.
+        self.assertEqual(get_conn.call_count, 1)
+        self.assertEqual(get_conn.return_value.open.call_count, 1)
+        self.assertEqual(get_conn.return_value.send_messages.call_count, num_emails)
+
+        metrics = {args[0]: args[1] for args, _ in mock_set_custom_metric.call_args_list}
+        self.assertEqual(metrics['bulk_email_sent'], num_emails)
+        self.assertEqual(metrics['bulk_email_failed'], 0)
+        self.assertIn('bulk_email_send_time', metrics)
+        self.assertIn('bulk_email_render_time', metrics)
+
     def test_successful_twice(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
@@ -31,6 +31,7 @@ class BlocksAPITransformer(BlockStructureTransformer):
 
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_PARTIAL_COLLECT = True
     STUDENT_VIEW_DATA = 'student_view_data'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
@@ -61,6 +62,20 @@ class BlocksAPITransformer(BlockStructureTransformer):
 
         # TODO support olx_data by calling export_to_xml(?)
 
+    @classmethod
+    def collect_partial(cls, block_structure, changed_block_keys):
+        """
+        Collects the information for only the changed blocks. Only
+        StudentViewTransformer collects block data; the remaining
+        containing transformers only request xblock fields.
+        """
+        block_structure.request_xblock_fields('graded', 'format', 'display_name', 'category', 'due', 'show_correctness')
+
+        StudentViewTransformer.collect_partial(block_structure, changed_block_keys)
+        BlockCountsTransformer.collect(block_structure)
+        BlockDepthTransformer.collect(block_structure)
+        BlockNavigationTransformer.collect(block_structure)
+
     def transform(self, usage_info, block_structure):
         """
         Mutates block_structure based on the given usage_info.
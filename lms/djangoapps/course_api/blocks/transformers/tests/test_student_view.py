@@ -4,6 +4,7 @@ Tests for StudentViewTransformer.
 
 
 import ddt
+from mock import patch
 
 # pylint: disable=protected-access
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
@@ -66,3 +67,23 @@ class TestStudentViewTransformer(ModuleStoreTestCase):
                 html_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_MULTI_DEVICE,
             )
         )
+
+    def test_collect_partial(self):
+        with patch.object(self.block_structure, 'reuse_collected_transformer_block_data') as mock_reuse:
+            StudentViewTransformer.collect_partial(self.block_structure, changed_block_keys=set())
+        mock_reuse.assert_called_once_with(StudentViewTransformer)
+
+        # video data depends on edxval, so it is collected even though the video didn't change
+        video_block_key = self.course_key.make_usage_key('video', 'sample_video')
+        self.assertIsNotNone(
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA,
+            )
+        )
+
+        html_block_key = self.course_key.make_usage_key('html', 'toyhtml')
+        self.assertIsNone(
+            self.block_structure.get_transformer_block_field(
+                html_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA,
+            )
+        )
@@ -0,0 +1,105 @@
+"""
+Command to compare the time to build and render the problems of a unit for
+many learners, with and without the per-process cache of parsed problem trees.
+"""
+
+
+import gettext
+import timeit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import UsageKey
+from six.moves import range
+
+from capa.capa_problem import PARSED_PROBLEM_CACHE, LoncapaProblem, LoncapaSystem
+from edxmako.shortcuts import render_to_string
+from xmodule.capa_base import NUM_RANDOMIZATION_BINS
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.exceptions import ItemNotFoundError
+from xmodule.util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_capa_problems 'block-v1:edX+DemoX+Demo_Course+type@vertical+block@unit'
+
+    Builds and renders every problem of the unit once for each simulated
+    learner, each with their own seed:
+        - uncached: parsing the XML of every problem for every learner,
+        - cached: copying the cached parsed trees of the problems instead.
+    """
+    help = u'Compares building and rendering the problems of a unit with and without cached parsed problems.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('usage_id', help=u'the unit, usually a vertical, whose problems are rendered')
+        parser.add_argument(
+            '--learners',
+            help=u'Number of learners to render the problems for.',
+            default=1000,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            usage_key = UsageKey.from_string(options['usage_id'])
+        except InvalidKeyError:
+            raise CommandError(u'Invalid usage_id: {}'.format(options['usage_id']))
+
+        store = modulestore()
+        try:
+            unit = store.get_item(usage_key, depth=None)
+        except ItemNotFoundError:
+            raise CommandError(u'Unit not found: {}'.format(usage_key))
+        problems = [child for child in unit.get_children() if child.location.block_type == 'problem']
+        if not problems:
+            raise CommandError(u'There are no problems in {}.'.format(usage_key))
+
+        course_key = usage_key.course_key
+        python_lib_zip = get_python_lib_zip(contentstore, course_key)
+        unsafe = can_execute_unsafe_code(course_key)
+        capa_system = LoncapaSystem(
+            ajax_url=u'',
+            anonymous_student_id=u'benchmark',
+            cache=cache,
+            can_execute_unsafe_code=lambda: unsafe,
+            get_python_lib_zip=lambda: python_lib_zip,
+            DEBUG=settings.DEBUG,
+            filestore=unit.runtime.resources_fs,
+            i18n=gettext.NullTranslations(),
+            node_path=settings.NODE_PATH,
+            render_template=render_to_string,
+            seed=None,
+            STATIC_URL=settings.STATIC_URL,
+            xqueue=None,
+        )
+
+        def render_problems(clear_cache):
+            """
+            Builds and renders the problems for each learner.
+            """
+            for learner in range(options['learners']):
+                for problem in problems:
+                    if clear_cache:
+                        PARSED_PROBLEM_CACHE.clear()
+                    LoncapaProblem(
+                        problem_text=problem.data,
+                        id=problem.location.html_id(),
+                        capa_system=capa_system,
+                        capa_module=problem,
+                        seed=learner % NUM_RANDOMIZATION_BINS,
+                    ).get_html()
+
+        self.stdout.write(u'{} problems, {} learners'.format(len(problems), options['learners']))
+        renders = len(problems) * options['learners']
+        for name, clear_cache in [(u'uncached', True), (u'cached', False)]:
+            PARSED_PROBLEM_CACHE.clear()
+            duration = timeit.timeit(lambda: render_problems(clear_cache), number=1)
+            self.stdout.write(u'  {:<9} {:>10.2f} s, {:>8.2f} ms per problem'.format(
+                name + u':', duration, duration * 1000 / renders,
+            ))
+        PARSED_PROBLEM_CACHE.clear()
@@ -0,0 +1,56 @@
+"""
+Recount the learners with each grade on the problems of courses, for the
+grade histograms shown to staff, from the StudentModules of the courses.
+
+The counts are kept up to date as grades change, so this is only needed to
+fill them in for existing grades, or to correct counts that have drifted.
+It must be run with --all-courses when the grade counts are first deployed,
+or staff see empty grade histograms until it is.
+"""
+
+
+import logging
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from six import text_type
+
+from lms.djangoapps.courseware.models import StudentModuleGradeCount
+from xmodule.modulestore.django import modulestore
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms rebuild_grade_histograms 'course-v1:edX+DemoX+Demo_Course'
+        $ ./manage.py lms rebuild_grade_histograms --all-courses
+    """
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', help=u'the courses whose grade histograms are rebuilt')
+        parser.add_argument(
+            '--all-courses', '--all',
+            dest='all_courses',
+            action='store_true',
+            help=u'Rebuild the grade histograms of all courses.',
+        )
+
+    def handle(self, *args, **options):
+        if options['all_courses']:
+            course_keys = [course.id for course in modulestore().get_course_summaries()]
+        elif options['course_ids']:
+            try:
+                course_keys = [CourseKey.from_string(course_id) for course_id in options['course_ids']]
+            except InvalidKeyError as error:
+                raise CommandError(u'Invalid course_id: {}'.format(error))
+        else:
+            raise CommandError(u'At least one course or --all-courses must be specified.')
+
+        for course_key in course_keys:
+            StudentModuleGradeCount.rebuild(course_key)
+            log.info(u'Rebuilt the grade histograms of %s.', text_type(course_key))
@@ -0,0 +1,35 @@
+"""
+Tests for the rebuild_grade_histograms management command.
+"""
+
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from six import text_type
+
+from lms.djangoapps.courseware.models import StudentModule, StudentModuleGradeCount
+from lms.djangoapps.courseware.tests.factories import StudentModuleFactory, course_id, location
+
+
+class RebuildGradeHistogramsTest(TestCase):
+    """
+    Tests that the grade counts of the problems of courses are recounted.
+    """
+    def test_rebuild(self):
+        problem = location('problem')
+        for grade in [1, 1, 0]:
+            StudentModuleFactory.create(course_id=course_id, module_state_key=problem, grade=grade)
+        # Grades updated in bulk aren't counted.
+        StudentModule.objects.filter(grade=0).update(grade=0.5)
+
+        call_command('rebuild_grade_histograms', text_type(course_id))
+        self.assertEqual(StudentModuleGradeCount.get_histograms([problem])[problem], [(0.5, 1), (1, 2)])
+
+    def test_no_courses(self):
+        with self.assertRaises(CommandError):
+            call_command('rebuild_grade_histograms')
+
+    def test_invalid_course(self):
+        with self.assertRaises(CommandError):
+            call_command('rebuild_grade_histograms', 'not/a/course/key')
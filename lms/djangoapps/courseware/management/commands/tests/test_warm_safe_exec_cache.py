@@ -0,0 +1,82 @@
+"""
+Tests for the warm_safe_exec_cache management command.
+"""
+
+
+import ddt
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from mock import patch
+from six import text_type
+from six.moves import range
+
+from xmodule.capa_base import NUM_RANDOMIZATION_BINS
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+PROBLEM_DATA = u"""
+<problem>
+    <script type="loncapa/python">{}</script>
+    <p>What is 1 + 1?</p>
+    <numericalresponse answer="2">
+        <formulaequationinput/>
+    </numericalresponse>
+</problem>
+"""
+
+
+@ddt.ddt
+class WarmSafeExecCacheTest(ModuleStoreTestCase):
+    """
+    Tests that the scripts of a course's problems are executed for each seed.
+    """
+    def setUp(self):
+        super(WarmSafeExecCacheTest, self).setUp()
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        self.sequential = ItemFactory.create(parent=chapter, category='sequential')
+
+    def _create_problem(self, code, rerandomize):
+        """
+        Creates a problem with the given script code and randomization.
+        """
+        return ItemFactory.create(
+            parent=self.sequential,
+            category='problem',
+            data=PROBLEM_DATA.format(code),
+            metadata={'rerandomize': rerandomize},
+        )
+
+    def _executed_seeds(self, max_seeds=None):
+        """
+        Runs the command and returns the (code, seed) of every execution.
+        """
+        options = {} if max_seeds is None else {'max_seeds': max_seeds}
+        with patch('capa.capa_problem.safe_exec') as mock_safe_exec:
+            call_command('warm_safe_exec_cache', text_type(self.course.id), **options)
+        return [
+            (args[0], kwargs['random_seed'])
+            for args, kwargs in mock_safe_exec.call_args_list
+        ]
+
+    @ddt.data(
+        ('never', None, [1]),
+        ('per_student', None, list(range(NUM_RANDOMIZATION_BINS))),
+        ('always', None, list(range(NUM_RANDOMIZATION_BINS))),
+        ('onreset', 3, [0, 1, 2]),
+    )
+    @ddt.unpack
+    def test_seeds(self, rerandomize, max_seeds, expected_seeds):
+        self._create_problem(u'a = 1', rerandomize)
+        self.assertEqual(
+            self._executed_seeds(max_seeds),
+            [(u'a = 1', seed) for seed in expected_seeds],
+        )
+
+    def test_learner_data_skipped(self):
+        self._create_problem(u'a = anonymous_student_id', 'never')
+        self.assertEqual(self._executed_seeds(), [])
+
+    def test_invalid_course(self):
+        with self.assertRaises(CommandError):
+            call_command('warm_safe_exec_cache', 'not/a/course')
@@ -0,0 +1,115 @@
+"""
+Execute the Python scripts of every problem in a course, once for each random
+seed that learners can be given, so that the results of the sandboxed code
+execution are already cached when learners load the problems.
+
+Problems whose scripts read the learner's anonymous id are skipped, since
+their results can't be shared between learners.
+"""
+
+
+import gettext
+import logging
+from textwrap import dedent
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from six import text_type
+from six.moves import range
+
+from capa.capa_problem import LoncapaProblem, LoncapaSystem
+from capa.safe_exec.safe_exec import LEARNER_GLOBALS
+from edxmako.shortcuts import render_to_string
+from xmodule.capa_base import MAX_RANDOMIZATION_BINS, NUM_RANDOMIZATION_BINS, RANDOMIZATION
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.django import modulestore
+from xmodule.util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
+
+log = logging.getLogger(__name__)
+
+
+def problem_seeds(problem, max_seeds):
+    """
+    Returns the random seeds that learners can be given for the problem, as
+    chosen by CapaMixin.choose_new_seed.
+    """
+    if problem.rerandomize == RANDOMIZATION.NEVER:
+        return [1]
+    elif problem.rerandomize == RANDOMIZATION.PER_STUDENT:
+        return range(NUM_RANDOMIZATION_BINS)
+    return range(min(max_seeds, MAX_RANDOMIZATION_BINS))
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms warm_safe_exec_cache 'course-v1:edX+DemoX+Demo_Course' --max-seeds 100
+    """
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', help='the course whose problems are executed')
+        parser.add_argument(
+            '--max-seeds',
+            type=int,
+            default=NUM_RANDOMIZATION_BINS,
+            help=u'number of seeds to execute problems that are randomized on every attempt or reset with, '
+                 u'up to {}'.format(MAX_RANDOMIZATION_BINS),
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError(u'Invalid course_id: {}'.format(options['course_id']))
+
+        store = modulestore()
+        if store.get_course(course_key) is None:
+            raise CommandError(u'Course not found: {}'.format(course_key))
+
+        python_lib_zip = get_python_lib_zip(contentstore, course_key)
+        unsafe = can_execute_unsafe_code(course_key)
+
+        executions = 0
+        with store.bulk_operations(course_key):
+            for problem in store.get_items(course_key, qualifiers={'category': 'problem'}):
+                if '<script' not in problem.data:
+                    continue
+                if any(name in problem.data for name in LEARNER_GLOBALS):
+                    log.info(u'Skipping %s, whose scripts read learner data.', problem.location)
+                    continue
+
+                capa_system = LoncapaSystem(
+                    ajax_url=None,
+                    anonymous_student_id=None,
+                    cache=cache,
+                    can_execute_unsafe_code=lambda: unsafe,
+                    get_python_lib_zip=lambda: python_lib_zip,
+                    DEBUG=settings.DEBUG,
+                    filestore=problem.runtime.resources_fs,
+                    i18n=gettext.NullTranslations(),
+                    node_path=settings.NODE_PATH,
+                    render_template=render_to_string,
+                    seed=None,
+                    STATIC_URL=settings.STATIC_URL,
+                    xqueue=None,
+                )
+                for seed in problem_seeds(problem, options['max_seeds']):
+                    try:
+                        LoncapaProblem(
+                            problem_text=problem.data,
+                            id=problem.location.html_id(),
+                            capa_system=capa_system,
+                            capa_module=problem,
+                            seed=seed,
+                            extract_tree=False,
+                        )
+                    except Exception:  # pylint: disable=broad-except
+                        log.exception(u'Error while executing the scripts of %s with seed %r.', problem.location, seed)
+                        break
+                    executions += 1
+
+        log.info(u'Executed problem scripts %d times for %s.', executions, text_type(course_key))
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.27 on 2020-02-03 14:12
+
+
+from django.db import migrations, models
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courseware', '0013_auto_20191001_1858'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentModuleGradeCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.LearningContextKeyField(db_index=True, max_length=255)),
+                ('module_state_key', opaque_keys.edx.django.models.UsageKeyField(db_column='module_id', max_length=255)),
+                ('grade', models.FloatField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='studentmodulegradecount',
+            unique_together=set([('module_state_key', 'grade')]),
+        ),
+    ]
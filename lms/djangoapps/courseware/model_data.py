@@ -15,6 +15,7 @@ pieces of information for each scope, and thus how to cache, prefetch, and creat
 entries.
 
 UserStateCache: A cache for Scope.user_state
+BulkUserStateCache: A prefetch of Scope.user_state for many users, handing out UserStateCaches
 UserStateSummaryCache: A cache for Scope.user_state_summary
 PreferencesCache: A cache for Scope.preferences
 UserInfoCache: A cache for Scope.user_info
@@ -26,6 +27,7 @@ import json
 import logging
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict, namedtuple
+from time import time
 
 import six
 from contracts import contract, new_contract
@@ -69,6 +71,30 @@ def _all_usage_keys(descriptors, aside_types):
     return usage_ids
 
 
+def _descriptor_descendents(descriptor, depth, descriptor_filter):
+    """
+    Return a list of all child descriptors down to the specified depth
+    that match the descriptor filter. Includes `descriptor`
+
+    descriptor: The parent to search inside
+    depth: The number of levels to descend, or None for infinite depth
+    descriptor_filter(descriptor): A function that returns True
+        if descriptor should be included in the results
+    """
+    if descriptor_filter(descriptor):
+        descriptors = [descriptor]
+    else:
+        descriptors = []
+
+    if depth is None or depth > 0:
+        new_depth = depth - 1 if depth is not None else depth
+
+        for child in descriptor.get_children() + descriptor.get_required_module_descriptors():
+            descriptors.extend(_descriptor_descendents(child, new_depth, descriptor_filter))
+
+    return descriptors
+
+
 def _all_block_types(descriptors, aside_types):
     """
     Return a set of all block_types for the supplied `descriptors` and for
@@ -351,6 +377,7 @@ class UserStateCache(object):
         self.course_id = course_id
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
+        self._prefetched_block_keys = set()
 
     def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
         """
@@ -362,13 +389,33 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
+        block_keys = _all_usage_keys(xblocks, aside_types)
+        if self._prefetched_block_keys:
+            block_keys -= self._prefetched_block_keys
+            if not block_keys:
+                return
+
         block_field_state = self._client.get_many(
             self.user.username,
-            _all_usage_keys(xblocks, aside_types),
+            block_keys,
         )
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
 
+    def add_prefetched_state(self, block_keys, block_states):
+        """
+        Add state that was loaded ahead of time (see :class:`BulkUserStateCache`)
+        to this cache, so that it is not queried again by ``cache_fields``.
+
+        Arguments:
+            block_keys (set of :class:`UsageKey`): The blocks whose state was loaded.
+            block_states (dict): Maps those of ``block_keys`` that have state
+                to their field state dicts.
+        """
+        self._prefetched_block_keys.update(block_keys)
+        for block_key, state in six.iteritems(block_states):
+            self._cache[block_key] = dict(state)
+
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def set(self, kvs_key, value):
         """
@@ -494,6 +541,110 @@ class UserStateCache(object):
         return key.block_scope_id
 
 
+class BulkUserStateCache(object):
+    """
+    Prefetch of Scope.user_state xblock field data of many users for the
+    same blocks, loaded in a few chunked queries on first use, from which
+    a UserStateCache is handed out for each of the users.
+
+    This saves the queries that a FieldDataCache makes per user when
+    the same blocks are loaded for many users, as in bulk rescoring.
+    Since state may change after it is prefetched, the prefetch is checked
+    against the StudentModules of all the users, in a single query that
+    doesn't load their state, once it is older than MAX_STATE_AGE seconds.
+    The state of users whose StudentModules changed is not handed out.
+    """
+    # The number of seconds prefetched state is used for before it is checked again.
+    MAX_STATE_AGE = 5
+
+    def __init__(self, users, course_id, descriptors, asides=None):
+        """
+        Arguments:
+            users (list of :class:`User`): The users to load state for.
+            course_id: The id of the course the blocks belong to.
+            descriptors: The XModuleDescriptors to load state for.
+            asides: The list of aside types to load, or None to load no asides.
+        """
+        self.course_id = course_id
+        self.users = list(users)
+        self.block_keys = _all_usage_keys(descriptors, asides or [])
+        self._state_by_username = None
+        self._modified_by_username = None
+        self._changed_usernames = set()
+        self._checked_at = None
+
+    @classmethod
+    def for_descriptor_descendents(cls, users, course_id, descriptors, asides=None):
+        """
+        Return a BulkUserStateCache for the given users, covering the given
+        descriptors and all of their descendants, as loaded by
+        :meth:`FieldDataCache.cache_for_descriptor_descendents`.
+        """
+        all_descriptors = []
+        for descriptor in descriptors:
+            with modulestore().bulk_operations(descriptor.location.course_key):
+                all_descriptors.extend(_descriptor_descendents(descriptor, None, lambda descriptor: True))
+        return cls(users, course_id, all_descriptors, asides=asides)
+
+    def for_user(self, user):
+        """
+        Return a UserStateCache for the given user, already holding the
+        user's prefetched state, or None if the user's state has changed
+        since it was prefetched and needs to be loaded again.
+
+        Call this in the transaction that uses the state, so that the
+        check covers the changes made until then.
+        """
+        if self._state_by_username is None:
+            self._state_by_username = defaultdict(dict)
+            self._modified_by_username = defaultdict(dict)
+            self._checked_at = time()
+            block_field_state = DjangoXBlockUserStateClient().get_many_for_users(self.users, self.block_keys)
+            for user_state in block_field_state:
+                self._state_by_username[user_state.username][user_state.block_key] = user_state.state
+                self._modified_by_username[user_state.username][user_state.block_key] = user_state.updated
+        elif time() - self._checked_at > self.MAX_STATE_AGE:
+            self._check_modified()
+
+        if user.username in self._changed_usernames:
+            return None
+
+        user_state_cache = UserStateCache(user, self.course_id)
+        user_state_cache.add_prefetched_state(self.block_keys, self._state_by_username.get(user.username, {}))
+        return user_state_cache
+
+    def _check_modified(self):
+        """
+        Compares when the StudentModules of the users were last modified, as
+        they are now, with when they were when they were prefetched, and
+        records the users whose StudentModules changed.  Blocks without
+        state are left out, as they are when prefetched.
+        """
+        self._checked_at = time()
+        usernames = {user.id: user.username for user in self.users}
+        modified_by_username = defaultdict(dict)
+        student_modules = StudentModule.objects.filter(
+            student_id__in=list(usernames),
+            module_state_key__in=self.block_keys,
+        ).exclude(
+            state__isnull=True,
+        ).exclude(
+            state=u'{}',
+        ).values_list('student_id', 'module_state_key', 'course_id', 'modified')
+        for student_id, module_state_key, course_id, modified in student_modules:
+            modified_by_username[usernames[student_id]][module_state_key.map_into_course(course_id)] = modified
+
+        for username in six.itervalues(usernames):
+            if modified_by_username.get(username, {}) != self._modified_by_username.get(username, {}):
+                if username not in self._changed_usernames:
+                    log.info(
+                        u"State of user %s changed since it was prefetched for course %s, loading it again.",
+                        username,
+                        self.course_id,
+                    )
+                self._changed_usernames.add(username)
+
+
 class UserStateSummaryCache(DjangoOrmFieldCache):
     """
     Cache for Scope.user_state_summary xblock field data.
@@ -683,7 +834,7 @@ class FieldDataCache(object):
     A cache of django model objects needed to supply the data
     for a module and its descendants
     """
-    def __init__(self, descriptors, course_id, user, asides=None, read_only=False):
+    def __init__(self, descriptors, course_id, user, asides=None, read_only=False, user_state_cache=None):
         """
         Find any courseware.models objects that are needed by any descriptor
         in descriptors. Attempts to minimize the number of queries to the database.
@@ -696,6 +847,8 @@ class FieldDataCache(object):
         user: The user for which to cache data
         asides: The list of aside types to load, or None to prefetch no asides.
         read_only: We should not perform writes (they become a no-op).
+        user_state_cache: A UserStateCache for the user, such as one handed out
+            by a BulkUserStateCache, or None to create a new one.
         """
         if asides is None:
             self.asides = []
@@ -708,7 +861,7 @@ class FieldDataCache(object):
         self.read_only = read_only
 
         self.cache = {
-            Scope.user_state: UserStateCache(
+            Scope.user_state: user_state_cache or UserStateCache(
                 self.user,
                 self.course_id,
             ),
@@ -749,38 +902,15 @@ class FieldDataCache(object):
                 should be cached
         """
 
-        def get_child_descriptors(descriptor, depth, descriptor_filter):
-            """
-            Return a list of all child descriptors down to the specified depth
-            that match the descriptor filter. Includes `descriptor`
-
-            descriptor: The parent to search inside
-            depth: The number of levels to descend, or None for infinite depth
-            descriptor_filter(descriptor): A function that returns True
-                if descriptor should be included in the results
-            """
-            if descriptor_filter(descriptor):
-                descriptors = [descriptor]
-            else:
-                descriptors = []
-
-            if depth is None or depth > 0:
-                new_depth = depth - 1 if depth is not None else depth
-
-                for child in descriptor.get_children() + descriptor.get_required_module_descriptors():
-                    descriptors.extend(get_child_descriptors(child, new_depth, descriptor_filter))
-
-            return descriptors
-
         with modulestore().bulk_operations(descriptor.location.course_key):
-            descriptors = get_child_descriptors(descriptor, depth, descriptor_filter)
+            descriptors = _descriptor_descendents(descriptor, depth, descriptor_filter)
 
         self.add_descriptors_to_cache(descriptors)
 
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
                                          descriptor_filter=lambda descriptor: True,
-                                         asides=None, read_only=False):
+                                         asides=None, read_only=False, user_state_cache=None):
         """
         course_id: the course in the context of which we want StudentModules.
         user: the django user for whom to load modules.
@@ -789,8 +919,12 @@ class FieldDataCache(object):
             the supplied descriptor. If depth is None, load all descendant StudentModules
         descriptor_filter is a function that accepts a descriptor and return whether the field data
             should be cached
+        user_state_cache: A UserStateCache for the user, such as one handed out by
+            a BulkUserStateCache, or None to create a new one.
         """
-        cache = FieldDataCache([], course_id, user, asides=asides, read_only=read_only)
+        cache = FieldDataCache(
+            [], course_id, user, asides=asides, read_only=read_only, user_state_cache=user_state_cache,
+        )
         cache.add_descriptor_descendents(descriptor, depth, descriptor_filter)
         return cache
 
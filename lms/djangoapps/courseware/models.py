@@ -16,13 +16,16 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 import itertools
 import logging
+from collections import defaultdict
 
 import six
 from config_models.models import ConfigurationModel
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 from model_utils.models import TimeStampedModel
@@ -121,6 +124,15 @@ class StudentModule(models.Model):
     created = models.DateTimeField(auto_now_add=True, db_index=True)
     modified = models.DateTimeField(auto_now=True, db_index=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(StudentModule, cls).from_db(db, field_names, values)
+
+        # The grade as it was loaded or last saved, which StudentModuleGradeCount
+        # counts once saved. Deferred grades aren't loaded just to be counted.
+        instance._counted_grade = instance.__dict__.get('grade', _GRADE_NOT_LOADED)
+        return instance
+
     @classmethod
     def all_submitted_problems_read_only(cls, course_id):
         """
@@ -271,6 +283,184 @@ class StudentModuleHistory(BaseStudentModuleHistory):
         post_save.connect(save_history, sender=StudentModule)
 
 
+# The _counted_grade of StudentModules whose grade was deferred when they were loaded.
+_GRADE_NOT_LOADED = object()
+
+
+class StudentModuleGradeCount(models.Model):
+    """
+    The number of learners with each grade on a problem, kept up to date as
+    the grades of StudentModules change, so that the grade histograms shown
+    to staff are read without aggregating courseware_studentmodule.
+
+    The counts are updated by a task once the changes of StudentModules are
+    committed, so that requests don't wait on the counts of popular problems.
+    Learners without a grade aren't counted.  Counts that drift, for instance
+    from concurrent updates of the same StudentModule, are recounted by the
+    rebuild_grade_histograms management command.
+
+    Only grades changed after this model is deployed are counted, so
+    `rebuild_grade_histograms --all-courses` must be run on deploy, or staff
+    see empty grade histograms for the existing grades.
+
+    .. no_pii:
+    """
+    course_id = LearningContextKeyField(max_length=255, db_index=True)
+    module_state_key = UsageKeyField(max_length=255, db_column='module_id')
+    grade = models.FloatField()
+    count = models.IntegerField(default=0)
+
+    class Meta(object):
+        app_label = "courseware"
+        unique_together = (('module_state_key', 'grade'),)
+
+    @classmethod
+    def add(cls, course_id, module_state_key, grade, delta):
+        """
+        Adds delta to the number of learners with the grade on the problem.
+        """
+        updated = cls.objects.filter(module_state_key=module_state_key, grade=grade).update(count=F('count') + delta)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    cls.objects.create(course_id=course_id, module_state_key=module_state_key, grade=grade, count=delta)
+            except IntegrityError:
+                # The count was created concurrently.
+                cls.objects.filter(module_state_key=module_state_key, grade=grade).update(count=F('count') + delta)
+
+    @classmethod
+    def get_histograms(cls, module_state_keys):
+        """
+        Returns the grade histograms of the given problems, in a single query,
+        as a dict of sorted lists of (grade, count) by problem usage key.
+        """
+        histograms = {module_state_key: [] for module_state_key in module_state_keys}
+        grade_counts = cls.objects.filter(
+            module_state_key__in=list(histograms), count__gt=0,
+        ).order_by('grade').values_list('module_state_key', 'grade', 'count')
+        for module_state_key, grade, count in grade_counts:
+            histograms.setdefault(module_state_key, []).append((grade, count))
+        return histograms
+
+    @classmethod
+    def rebuild(cls, course_id):
+        """
+        Recounts the learners with each grade on the problems of the course
+        from its StudentModules.
+        """
+        grade_counts = StudentModule.objects.filter(
+            course_id=course_id, grade__isnull=False,
+        ).values('module_state_key', 'grade').annotate(count=models.Count('id')).order_by()
+        with transaction.atomic():
+            cls.objects.filter(course_id=course_id).delete()
+            cls.objects.bulk_create(
+                (
+                    cls(
+                        course_id=course_id,
+                        module_state_key=grade_count['module_state_key'],
+                        grade=grade_count['grade'],
+                        count=grade_count['count'],
+                    )
+                    for grade_count in grade_counts
+                ),
+                batch_size=1000,
+            )
+
+
+class _GradeCountBatch(object):
+    """
+    The changes to the StudentModuleGradeCounts made by the StudentModules
+    saved at one savepoint of a transaction, sent in a single
+    update_grade_counts task per problem once the transaction is committed.
+    """
+    def __init__(self):
+        self.grade_deltas = defaultdict(lambda: defaultdict(int))
+
+    def add(self, course_id, module_state_key, grade_deltas):
+        """
+        Adds the (grade, delta) pairs of a StudentModule of the problem.
+        """
+        for grade, delta in grade_deltas:
+            self.grade_deltas[(course_id, module_state_key)][grade] += delta
+
+    def send(self):
+        """
+        Updates the StudentModuleGradeCounts of each problem in a task.
+        """
+        # Prevent a circular import
+        from lms.djangoapps.courseware.tasks import update_grade_counts
+
+        for (course_id, module_state_key), deltas in sorted(self.grade_deltas.items()):
+            grade_deltas = [(grade, delta) for grade, delta in sorted(deltas.items()) if delta]
+            if grade_deltas:
+                update_grade_counts.delay(course_id, module_state_key, grade_deltas)
+
+
+def _update_grade_counts_on_commit(student_module, grade_deltas):
+    """
+    Updates the StudentModuleGradeCounts of the problem of the StudentModule
+    by the given (grade, delta) pairs in a task, once the current transaction
+    is committed.
+
+    The deltas of all StudentModules saved at the same savepoint of a
+    transaction are summed and sent from a single commit hook, so that
+    rescoring a problem for many learners queues one task per problem
+    rather than one per learner.  A batch whose commit hook was discarded by
+    a rollback is replaced rather than added to.
+    """
+    connection = transaction.get_connection()
+    pending_hooks = [hook for __, hook in connection.run_on_commit]
+    batches = {
+        savepoint_ids: batch
+        for savepoint_ids, batch in six.iteritems(getattr(connection, '_grade_count_batches', {}))
+        if batch.send in pending_hooks
+    }
+    connection._grade_count_batches = batches  # pylint: disable=protected-access
+
+    savepoint_ids = tuple(connection.savepoint_ids)
+    batch = batches.get(savepoint_ids)
+    is_new_batch = batch is None
+    if is_new_batch:
+        batch = batches[savepoint_ids] = _GradeCountBatch()
+    batch.add(six.text_type(student_module.course_id), six.text_type(student_module.module_state_key), grade_deltas)
+    if is_new_batch:
+        # Outside of a transaction, the batch is sent right away.
+        transaction.on_commit(batch.send)
+
+
+@receiver(post_save, sender=StudentModule)
+def count_saved_grade(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Updates the StudentModuleGradeCounts of the problem when the grade of
+    one of its StudentModules changes.
+    """
+    if 'grade' not in instance.__dict__:
+        return
+    counted_grade = None if created else getattr(instance, '_counted_grade', _GRADE_NOT_LOADED)
+    if counted_grade is _GRADE_NOT_LOADED:
+        log.warning(u'Not counting the grade of %r, whose previous grade was not loaded.', instance)
+    elif counted_grade != instance.grade:
+        grade_deltas = []
+        if counted_grade is not None:
+            grade_deltas.append((counted_grade, -1))
+        if instance.grade is not None:
+            grade_deltas.append((instance.grade, 1))
+        if grade_deltas:
+            _update_grade_counts_on_commit(instance, grade_deltas)
+    instance._counted_grade = instance.grade  # pylint: disable=protected-access
+
+
+@receiver(post_delete, sender=StudentModule)
+def uncount_deleted_grade(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Updates the StudentModuleGradeCounts of the problem when one of its
+    StudentModules is deleted.
+    """
+    counted_grade = getattr(instance, '_counted_grade', _GRADE_NOT_LOADED)
+    if counted_grade is not None and counted_grade is not _GRADE_NOT_LOADED:
+        _update_grade_counts_on_commit(instance, [(counted_grade, -1)])
+
+
 @python_2_unicode_compatible
 class XBlockFieldBase(models.Model):
     """
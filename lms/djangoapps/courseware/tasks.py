@@ -0,0 +1,28 @@
+"""
+Asynchronous tasks of the courseware app.
+"""
+
+
+from celery import task
+from celery_utils.persist_on_failure import LoggedPersistOnFailureTask
+from django.conf import settings
+from opaque_keys.edx.keys import CourseKey, UsageKey
+
+from lms.djangoapps.courseware.models import StudentModuleGradeCount
+
+
+@task(base=LoggedPersistOnFailureTask, routing_key=settings.GRADE_COUNTS_ROUTING_KEY)
+def update_grade_counts(course_id, module_state_key, grade_deltas):
+    """
+    Adds the given deltas to the numbers of learners with each grade on a problem,
+    summed over the StudentModules of the problem saved in a transaction.
+
+    Arguments:
+        course_id (str): The course of the problem.
+        module_state_key (str): The usage key of the problem.
+        grade_deltas (list): (grade, delta) pairs to add to the StudentModuleGradeCounts.
+    """
+    course_key = CourseKey.from_string(course_id)
+    usage_key = UsageKey.from_string(module_state_key)
+    for grade, delta in grade_deltas:
+        StudentModuleGradeCount.add(course_key, usage_key, grade, delta)
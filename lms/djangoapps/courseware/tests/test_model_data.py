@@ -4,8 +4,10 @@ Test for lms courseware app, module data (runtime data storage for XBlocks)
 
 
 import json
+from datetime import datetime, timedelta
 from functools import partial
 
+import pytz
 from django.db import DatabaseError
 from django.test import TestCase
 from mock import Mock, patch
@@ -13,7 +15,12 @@ from xblock.core import XBlock
 from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
-from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from lms.djangoapps.courseware.model_data import (
+    BulkUserStateCache,
+    DjangoKeyValueStore,
+    FieldDataCache,
+    InvalidScopeError
+)
 from lms.djangoapps.courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -283,6 +290,100 @@ class TestMissingStudentModule(TestCase):
             self.assertFalse(self.kvs.has(user_state_key('a_field')))
 
 
+class TestBulkUserStateCache(TestCase):
+    """Tests for prefetching user_state storage of many users at once"""
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestBulkUserStateCache, self).setUp()
+        self.users = [
+            StudentModuleFactory(state=json.dumps({'a_field': 'value_{}'.format(index)})).student
+            for index in range(3)
+        ]
+        self.users.append(UserFactory.create())
+        self.descriptor = mock_descriptor([mock_field(Scope.user_state, 'a_field')])
+
+    def _user_state_key(self, user):
+        """
+        Returns the key of the user's a_field.
+        """
+        return DjangoKeyValueStore.Key(Scope.user_state, user.id, location('usage_id'), 'a_field')
+
+    def test_prefetch(self):
+        bulk_user_state = BulkUserStateCache(self.users, course_id, [self.descriptor])
+
+        with self.assertNumQueries(1):
+            user_state_caches = [bulk_user_state.for_user(user) for user in self.users]
+
+        with self.assertNumQueries(0):
+            for index, (user, user_state_cache) in enumerate(zip(self.users, user_state_caches)):
+                field_data_cache = FieldDataCache(
+                    [self.descriptor], course_id, user, user_state_cache=user_state_cache,
+                )
+                kvs = DjangoKeyValueStore(field_data_cache)
+                if index < 3:
+                    self.assertEqual(kvs.get(self._user_state_key(user)), 'value_{}'.format(index))
+                else:
+                    self.assertFalse(kvs.has(self._user_state_key(user)))
+
+    @patch('lms.djangoapps.courseware.user_state_client.DjangoXBlockUserStateClient.BULK_USERS_PER_QUERY', 3)
+    def test_chunked_queries(self):
+        bulk_user_state = BulkUserStateCache(self.users, course_id, [self.descriptor])
+        with self.assertNumQueries(2):
+            bulk_user_state.for_user(self.users[0])
+        with self.assertNumQueries(0):
+            bulk_user_state.for_user(self.users[1])
+
+    def test_query_count_independent_of_users(self):
+        users = self.users + [
+            StudentModuleFactory(state=json.dumps({'a_field': 'more'})).student for _ in range(10)
+        ]
+        bulk_user_state = BulkUserStateCache(users, course_id, [self.descriptor])
+        with patch('lms.djangoapps.courseware.model_data.time') as mock_time:
+            mock_time.return_value = 0
+            with self.assertNumQueries(1):
+                for user in users:
+                    self.assertIsNotNone(bulk_user_state.for_user(user))
+
+            # Once the prefetch is old, it is checked for all the users at once.
+            mock_time.return_value = BulkUserStateCache.MAX_STATE_AGE + 1
+            with self.assertNumQueries(1):
+                for user in users:
+                    self.assertIsNotNone(bulk_user_state.for_user(user))
+
+    def test_changed_state_is_not_handed_out(self):
+        bulk_user_state = BulkUserStateCache(self.users, course_id, [self.descriptor])
+        with patch('lms.djangoapps.courseware.model_data.time') as mock_time:
+            mock_time.return_value = 0
+            self.assertIsNotNone(bulk_user_state.for_user(self.users[0]))
+
+            StudentModule.objects.filter(student=self.users[1]).update(
+                state=json.dumps({'a_field': 'changed'}),
+                modified=datetime.now(pytz.UTC) + timedelta(seconds=1),
+            )
+            StudentModuleFactory(student=self.users[3], state=json.dumps({'a_field': 'new'}))
+
+            # Changes are not seen until the prefetch is checked again.
+            self.assertIsNotNone(bulk_user_state.for_user(self.users[1]))
+
+            mock_time.return_value = BulkUserStateCache.MAX_STATE_AGE + 1
+            self.assertIsNone(bulk_user_state.for_user(self.users[1]))
+            self.assertIsNone(bulk_user_state.for_user(self.users[3]))
+            self.assertIsNotNone(bulk_user_state.for_user(self.users[2]))
+
+    def test_unprefetched_blocks_are_queried(self):
+        other_descriptor = mock_descriptor([mock_field(Scope.user_state, 'a_field')])
+        other_descriptor.scope_ids = ScopeIds('user1', 'mock_problem', location('def_id'), location('other_id'))
+        bulk_user_state = BulkUserStateCache(self.users, course_id, [self.descriptor])
+        user_state_cache = bulk_user_state.for_user(self.users[0])
+
+        with self.assertNumQueries(1):
+            FieldDataCache(
+                [self.descriptor, other_descriptor], course_id, self.users[0], user_state_cache=user_state_cache,
+            )
+
+
 class StorageTestBase(object):
     """
     A base class for that gets subclassed when testing each of the scopes.
@@ -0,0 +1,146 @@
+"""
+Tests of the courseware models.
+"""
+
+
+import ddt
+from django.db import transaction
+from django.test import TestCase
+from mock import call, patch
+from six import text_type
+
+from lms.djangoapps.courseware.models import StudentModule, StudentModuleGradeCount
+from lms.djangoapps.courseware.tests.factories import StudentModuleFactory, course_id, location
+
+
+@ddt.ddt
+class StudentModuleGradeCountTest(TestCase):
+    """
+    Tests that the grade counts of problems are kept up to date with their StudentModules.
+    """
+    on_commit = staticmethod(transaction.on_commit)
+
+    def setUp(self):
+        super(StudentModuleGradeCountTest, self).setUp()
+        self.problem = location('problem')
+        self.other_problem = location('other_problem')
+
+        # Test transactions are never committed, so run the commit hooks right away.
+        on_commit_patcher = patch('lms.djangoapps.courseware.models.transaction.on_commit', lambda func: func())
+        on_commit_patcher.start()
+        self.addCleanup(on_commit_patcher.stop)
+
+    def _create_student_module(self, grade, problem=None):
+        """
+        Creates a StudentModule of the problem with the given grade.
+        """
+        return StudentModuleFactory.create(
+            course_id=course_id, module_state_key=problem or self.problem, grade=grade, max_grade=1,
+        )
+
+    def _histogram(self, problem=None):
+        """
+        Returns the grade histogram of the problem.
+        """
+        problem = problem or self.problem
+        return StudentModuleGradeCount.get_histograms([problem])[problem]
+
+    def test_created(self):
+        for grade in [1, 0.5, None, 1]:
+            self._create_student_module(grade)
+        self._create_student_module(0, problem=self.other_problem)
+        self.assertEqual(self._histogram(), [(0.5, 1), (1, 2)])
+        self.assertEqual(self._histogram(self.other_problem), [(0, 1)])
+
+    @ddt.data(
+        (None, 1, [(1, 1)]),
+        (0, 1, [(1, 1)]),
+        (1, None, []),
+        (1, 1, [(1, 1)]),
+    )
+    @ddt.unpack
+    def test_grade_changed(self, old_grade, new_grade, expected_histogram):
+        student_module = self._create_student_module(old_grade)
+        student_module = StudentModule.objects.get(id=student_module.id)
+        student_module.grade = new_grade
+        student_module.save()
+        self.assertEqual(self._histogram(), expected_histogram)
+
+    def test_state_saved(self):
+        student_module = self._create_student_module(1)
+        student_module = StudentModule.objects.only('id', 'state').get(id=student_module.id)
+        student_module.state = u'{"attempts": 1}'
+        student_module.save()
+        self.assertEqual(self._histogram(), [(1, 1)])
+
+    def test_deleted(self):
+        self._create_student_module(1)
+        self._create_student_module(1).delete()
+        StudentModule.objects.filter(grade__isnull=False).delete()
+        self.assertEqual(self._histogram(), [])
+
+    def test_counted_after_commit(self):
+        with patch('lms.djangoapps.courseware.models.transaction.on_commit') as mock_on_commit:
+            self._create_student_module(1)
+            self.assertEqual(self._histogram(), [])
+
+            on_commit_hook, = mock_on_commit.call_args[0]
+            on_commit_hook()
+        self.assertEqual(self._histogram(), [(1, 1)])
+
+    @patch('lms.djangoapps.courseware.tasks.update_grade_counts.delay')
+    def test_coalesced_per_transaction(self, mock_delay):
+        with patch('lms.djangoapps.courseware.models.transaction.on_commit', side_effect=self.on_commit) as on_commit:
+            with transaction.atomic():
+                for grade in [1, 0.5, 1]:
+                    self._create_student_module(grade)
+                student_module = self._create_student_module(0, problem=self.other_problem)
+                student_module.delete()
+                self._create_student_module(1, problem=self.other_problem)
+
+        self.assertEqual(on_commit.call_count, 1)
+        on_commit_hook, = on_commit.call_args[0]
+        on_commit_hook()
+        self.assertEqual(mock_delay.call_args_list, [
+            call(text_type(course_id), text_type(self.other_problem), [(1, 1)]),
+            call(text_type(course_id), text_type(self.problem), [(0.5, 1), (1, 2)]),
+        ])
+
+    @patch('lms.djangoapps.courseware.tasks.update_grade_counts.delay')
+    def test_rolled_back_savepoint(self, mock_delay):
+        with patch('lms.djangoapps.courseware.models.transaction.on_commit', side_effect=self.on_commit) as on_commit:
+            with transaction.atomic():
+                with self.assertRaises(ValueError):
+                    with transaction.atomic():
+                        self._create_student_module(0.5)
+                        raise ValueError
+                self._create_student_module(1)
+
+        # The commit hook of the rolled back savepoint is discarded.
+        self.assertEqual(on_commit.call_count, 2)
+        (rolled_back_hook,), (on_commit_hook,) = [args for args, __ in on_commit.call_args_list]
+        pending_hooks = [hook for __, hook in transaction.get_connection().run_on_commit]
+        self.assertNotIn(rolled_back_hook, pending_hooks)
+        self.assertIn(on_commit_hook, pending_hooks)
+        on_commit_hook()
+        mock_delay.assert_called_once_with(text_type(course_id), text_type(self.problem), [(1, 1)])
+
+    def test_rebuild(self):
+        for grade in [1, 0.5, None, 1]:
+            self._create_student_module(grade)
+        StudentModuleGradeCount.objects.update(count=7)
+        StudentModule.objects.filter(grade=0.5).update(grade=0)
+
+        StudentModuleGradeCount.rebuild(course_id)
+        self.assertEqual(self._histogram(), [(0, 1), (1, 2)])
+
+    def test_histograms_in_one_query(self):
+        self._create_student_module(1)
+        self._create_student_module(0, problem=self.other_problem)
+        with self.assertNumQueries(1):
+            histograms = StudentModuleGradeCount.get_histograms([self.problem, self.other_problem, location('html')])
+        self.assertEqual(histograms, {
+            self.problem: [(1, 1)],
+            self.other_problem: [(0, 1)],
+            location('html'): [],
+        })
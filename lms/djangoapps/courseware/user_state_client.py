@@ -19,7 +19,7 @@ from edx_django_utils import monitoring as monitoring_utils
 from edx_user_state_client.interface import XBlockUserState, XBlockUserStateClient
 from xblock.fields import Scope
 
-from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule
+from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule, chunks
 
 try:
     import simplejson as json
@@ -53,6 +53,12 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
     # Use this sample rate for DataDog events.
     API_DATADOG_SAMPLE_RATE = 0.1
 
+    # The number of users and of blocks whose state is loaded by a single
+    # query in get_many_for_users.  Together, they keep each query within
+    # the limit sqlite puts on the number of query parameters.
+    BULK_USERS_PER_QUERY = 250
+    BULK_BLOCKS_PER_QUERY = 500
+
     class ServiceUnavailable(XBlockUserStateClient.ServiceUnavailable):
         """
         This error is raised if the service backing this client is currently unavailable.
@@ -106,6 +112,36 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
                 yield (student_module, usage_key)
 
+    def _get_student_modules_for_users(self, user_ids, block_keys):
+        """
+        Retrieve the :class:`~StudentModule`s for the supplied ``user_ids`` and ``block_keys``,
+        in chunked queries, and report the number of queries made.
+
+        Arguments:
+            user_ids (list of int): The ids of the users to load `StudentModule`s for.
+            block_keys (list of :class:`~UsageKey`): The set of XBlocks to load data for.
+        """
+        course_key_func = attrgetter('course_key')
+        by_course = itertools.groupby(
+            sorted(block_keys, key=course_key_func),
+            course_key_func,
+        )
+
+        num_queries = 0
+        for course_key, usage_keys in by_course:
+            for usage_keys_chunk in chunks(usage_keys, self.BULK_BLOCKS_PER_QUERY):
+                for user_ids_chunk in chunks(user_ids, self.BULK_USERS_PER_QUERY):
+                    num_queries += 1
+                    query = StudentModule.objects.filter(
+                        student_id__in=user_ids_chunk,
+                        course_id=course_key,
+                        module_state_key__in=usage_keys_chunk,
+                    )
+                    for student_module in query:
+                        usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+                        yield (student_module, usage_key)
+        self._nr_stat_accumulate('get_many_for_users', 'queries', num_queries)
+
     def _nr_metric_name(self, function_name, stat_name, block_type=None):
         """
         Return a metric name (string) representing the provided descriptors.
@@ -209,6 +245,46 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         duration = (finish_time - evt_time) * 1000  # milliseconds
         self._nr_stat_accumulate('get_many', 'duration', duration)
 
+    def get_many_for_users(self, users, block_keys, scope=Scope.user_state):
+        """
+        Retrieve the stored XBlock state of many users for the specified XBlock usages,
+        in a few chunked queries rather than one set of queries per user.
+
+        Arguments:
+            users (list of :class:`~User`): The users whose state should be retrieved
+            block_keys ([UsageKey]): A list of UsageKeys identifying which xblock states to load.
+            scope (Scope): The scope to load data from
+
+        Yields:
+            XBlockUserState tuples for each specified UsageKey in block_keys that
+            has state for one of the users.
+        """
+        if scope != Scope.user_state:
+            raise ValueError(u"Only Scope.user_state is supported, not {}".format(scope))
+
+        evt_time = time()
+        usernames = {user.id: user.username for user in users}
+
+        self._nr_stat_increment('get_many_for_users', 'calls')
+        self._nr_stat_accumulate('get_many_for_users', 'users_requested', len(usernames))
+        self._nr_stat_accumulate('get_many_for_users', 'blocks_requested', len(block_keys))
+
+        modules = self._get_student_modules_for_users(list(usernames), block_keys)
+        for module, usage_key in modules:
+            # Deleted and never-stored state are skipped, as in get_many.
+            if module.state is None:
+                continue
+            state = json.loads(module.state)
+            if state == {}:
+                continue
+
+            self._nr_block_stat_increment('get_many_for_users', usage_key.block_type, 'blocks_out')
+            self._nr_block_stat_accumulate('get_many_for_users', usage_key.block_type, 'size', len(module.state))
+            yield XBlockUserState(usernames[module.student_id], usage_key, state, module.modified, scope)
+
+        duration = (time() - evt_time) * 1000  # milliseconds
+        self._nr_stat_accumulate('get_many_for_users', 'duration', duration)
+
     def set_many(self, username, block_keys_to_state, scope=Scope.user_state):
         """
         Set fields for a particular XBlock.
@@ -3,10 +3,17 @@ Discussion settings and flags.
 """
 
 
-from openedx.core.djangoapps.waffle_utils import WaffleFlag, WaffleFlagNamespace
+from openedx.core.djangoapps.waffle_utils import CourseWaffleFlag, WaffleFlag, WaffleFlagNamespace
 
 # Namespace for course experience waffle flags.
 WAFFLE_FLAG_NAMESPACE = WaffleFlagNamespace(name='edx_discussions')
 
 # Waffle flag to enable the use of Bootstrap
 USE_BOOTSTRAP_FLAG = WaffleFlag(WAFFLE_FLAG_NAMESPACE, 'use_bootstrap', flag_undefined_default=True)
+
+# Waffle flag to build the discussion category map from the collected course
+# blocks of the course, instead of loading the discussion xblocks of the course
+# from the modulestore and checking the access to each of them.
+USE_COURSE_BLOCKS_FOR_DISCUSSION_TOPICS_FLAG = CourseWaffleFlag(
+    WAFFLE_FLAG_NAMESPACE, 'use_course_blocks_for_discussion_topics'
+)
@@ -4,11 +4,14 @@
 
 import datetime
 import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
 
 import ddt
 import mock
 import six
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
@@ -20,17 +23,21 @@ from course_modes.models import CourseMode
 from course_modes.tests.factories import CourseModeFactory
 from lms.djangoapps.courseware.tabs import get_course_tab_list
 from lms.djangoapps.courseware.tests.factories import InstructorFactory
+from lms.djangoapps.discussion.config import USE_COURSE_BLOCKS_FOR_DISCUSSION_TOPICS_FLAG
 from lms.djangoapps.discussion.django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 from lms.djangoapps.discussion.django_comment_client.tests.factories import RoleFactory
 from lms.djangoapps.discussion.django_comment_client.tests.unicode import UnicodeTestMixin
 from lms.djangoapps.discussion.django_comment_client.tests.utils import config_course_discussions, topic_name_to_id
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory
+from openedx.core.djangoapps.content.block_structure.api import clear_course_from_cache
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
 from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
     CommentClientMaintenanceError,
-    perform_request
+    perform_concurrently,
+    perform_request,
+    reset_pools
 )
 from openedx.core.djangoapps.django_comment_common.models import (
     CourseDiscussionSettings,
@@ -44,6 +51,7 @@ from openedx.core.djangoapps.django_comment_common.utils import (
     set_course_discussion_settings
 )
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
+from openedx.core.djangoapps.waffle_utils.testutils import override_waffle_flag
 from student.roles import CourseStaffRole
 from student.tests.factories import AdminFactory, CourseEnrollmentFactory, UserFactory
 from xmodule.modulestore import ModuleStoreEnum
@@ -1227,6 +1235,64 @@ class ContentGroupCategoryMapTestCase(CategoryMapTestMixin, ContentGroupTestCase
         )
 
 
+@override_waffle_flag(USE_COURSE_BLOCKS_FOR_DISCUSSION_TOPICS_FLAG, active=True)
+class CourseBlocksCategoryMapTestCase(CategoryMapTestCase):
+    """
+    Runs the tests of CategoryMapTestCase with the discussion xblocks read
+    from the collected course blocks of the course.
+    """
+    def create_discussion(self, discussion_category, discussion_target, **kwargs):
+        discussion = super(CourseBlocksCategoryMapTestCase, self).create_discussion(
+            discussion_category, discussion_target, **kwargs
+        )
+        # The course blocks are collected again on publish, which the tests don't signal.
+        clear_course_from_cache(self.course.id)
+        return discussion
+
+    def test_modulestore_not_used(self):
+        self.create_discussion("Chapter 1", "Discussion 1")
+        utils.get_discussion_categories_ids(self.course, self.instructor)
+        RequestCache.clear_all_namespaces()
+
+        with patch.object(modulestore(), 'get_items') as mock_get_items:
+            with patch.object(modulestore(), 'get_item') as mock_get_item:
+                six.assertCountEqual(
+                    self,
+                    utils.get_discussion_categories_ids(self.course, self.instructor),
+                    ["discussion1"]
+                )
+        mock_get_items.assert_not_called()
+        mock_get_item.assert_not_called()
+
+    def test_discussion_xblock_data(self):
+        discussion = self.create_discussion("Chapter 1 / Section 1", "Discussion 1", sort_key="a", start=self.later)
+        xblocks = utils.get_accessible_discussion_xblocks(self.course, self.instructor)
+        self.assertEqual(len(xblocks), 1)
+        self.assertIsInstance(xblocks[0], utils.DiscussionXBlockData)
+        self.assertEqual(xblocks[0].location.block_id, discussion.location.block_id)
+        self.assertEqual(
+            xblocks[0]._replace(location=None),
+            utils.DiscussionXBlockData(
+                location=None,
+                discussion_id="discussion1",
+                discussion_category="Chapter 1 / Section 1",
+                discussion_target="Discussion 1",
+                sort_key="a",
+                start=self.later,
+            )
+        )
+
+
+@override_waffle_flag(USE_COURSE_BLOCKS_FOR_DISCUSSION_TOPICS_FLAG, active=True)
+class CourseBlocksContentGroupCategoryMapTestCase(ContentGroupCategoryMapTestCase):
+    """
+    Runs the tests of ContentGroupCategoryMapTestCase with the discussion
+    xblocks read from the collected course blocks of the course, and filtered
+    by the group access collected for them.
+    """
+    pass
+
+
 class JsonResponseTestCase(TestCase, UnicodeTestMixin):
     def _test_unicode_data(self, text):
         response = utils.JsonResponse(text)
@@ -1839,6 +1905,98 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+class _StubForumsHandler(BaseHTTPRequestHandler):
+    """
+    Answers every request with an empty JSON object, recording the client
+    port of each request.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.server.client_ports.append(self.client_address[1])
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class _StubForumsServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), _StubForumsHandler)
+        self.client_ports = []
+
+
+@ddt.ddt
+@patch.object(ForumsConfig, 'current', Mock(return_value=Mock(enabled=True, connection_timeout=5.0, api_key='key')))
+class PooledRequestsTestCase(TestCase):
+    """Tests for the pooled session and concurrent requests to the comment service."""
+
+    def setUp(self):
+        super(PooledRequestsTestCase, self).setUp()
+        self.server = _StubForumsServer()
+        server_thread = threading.Thread(target=self.server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = 'http://127.0.0.1:{}/api/v1/threads'.format(self.server.server_address[1])
+        self.addCleanup(reset_pools)
+
+    def get(self):
+        return perform_request('get', self.url)
+
+    @ddt.data((0, 3), (2, 1))
+    @ddt.unpack
+    def test_connection_reuse(self, pool_size, expected_connections):
+        with override_settings(COMMENTS_SERVICE_HTTP_POOL_SIZE=pool_size):
+            for __ in range(3):
+                self.assertEqual(self.get(), {})
+        self.assertEqual(len(self.server.client_ports), 3)
+        self.assertEqual(len(set(self.server.client_ports)), expected_connections)
+
+    def test_perform_concurrently(self):
+        first_started = threading.Event()
+        second_started = threading.Event()
+
+        def first():
+            first_started.set()
+            return second_started.wait(5)
+
+        def second():
+            second_started.set()
+            return first_started.wait(5)
+
+        # each function only returns True once the other one has started
+        with override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=2):
+            self.assertEqual(perform_concurrently(first, second), [True, True])
+
+    def test_perform_concurrently_disabled(self):
+        with override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=1):
+            self.assertEqual(
+                perform_concurrently(threading.current_thread, threading.current_thread),
+                [threading.current_thread(), threading.current_thread()]
+            )
+
+    def test_perform_concurrently_requests(self):
+        with override_settings(COMMENTS_SERVICE_HTTP_POOL_SIZE=3, COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=3):
+            self.assertEqual(perform_concurrently(self.get, self.get, self.get), [{}, {}, {}])
+        self.assertEqual(len(self.server.client_ports), 3)
+
+    def test_perform_concurrently_error(self):
+        def fail():
+            raise CommentClientMaintenanceError('failed')
+
+        with override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=2):
+            with self.assertRaises(CommentClientMaintenanceError):
+                perform_concurrently(self.get, fail)
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
@@ -3,7 +3,7 @@
 
 import json
 import logging
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from datetime import datetime
 
 import six
@@ -19,8 +19,10 @@ from pytz import UTC
 from six import text_type
 from six.moves import map
 
+from lms.djangoapps.course_blocks.api import get_course_block_access_transformers, get_course_blocks
 from lms.djangoapps.courseware import courses
 from lms.djangoapps.courseware.access import has_access
+from lms.djangoapps.discussion.config import USE_COURSE_BLOCKS_FOR_DISCUSSION_TOPICS_FLAG
 from lms.djangoapps.discussion.django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 from lms.djangoapps.discussion.django_comment_client.permissions import (
     check_permissions_by_view,
@@ -28,6 +30,8 @@ from lms.djangoapps.discussion.django_comment_client.permissions import (
     has_permission
 )
 from lms.djangoapps.discussion.django_comment_client.settings import MAX_COMMENT_DEPTH
+from lms.djangoapps.discussion.transformer import DiscussionTopicsTransformer
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_id, get_cohort_names, is_course_cohorted
 from openedx.core.djangoapps.django_comment_common.models import (
     FORUM_ROLE_COMMUNITY_TA,
@@ -152,7 +156,15 @@ def get_accessible_discussion_xblocks_by_course_id(course_id, user=None, include
     """
     Return a list of all valid discussion xblocks in this course.
     Checks for the given user's access if include_all is False.
+
+    If the use_course_blocks_for_discussion_topics flag is enabled for the
+    course, the discussion xblocks are read from the collected course blocks
+    of the course instead, see get_discussion_xblocks_from_course_blocks.
     """
+    if user is not None and USE_COURSE_BLOCKS_FOR_DISCUSSION_TOPICS_FLAG.is_enabled(course_id):
+        all_xblocks = get_discussion_xblocks_from_course_blocks(course_id, user, include_all=include_all)
+        return [xblock for xblock in all_xblocks if has_required_keys(xblock)]
+
     all_xblocks = modulestore().get_items(course_id, qualifiers={'category': 'discussion'}, include_orphans=False)
 
     return [
@@ -161,6 +173,47 @@ def get_accessible_discussion_xblocks_by_course_id(course_id, user=None, include
     ]
 
 
+_DISCUSSION_XBLOCK_DATA_FIELDS = ['location'] + DiscussionTopicsTransformer.FIELDS_TO_COLLECT
+
+
+class DiscussionXBlockData(namedtuple('DiscussionXBlockData', _DISCUSSION_XBLOCK_DATA_FIELDS)):
+    """
+    The fields of a discussion xblock collected by the DiscussionTopicsTransformer,
+    with the same names as on the xblock itself.
+    """
+    __slots__ = ()
+
+
+def get_discussion_xblocks_from_course_blocks(course_id, user, include_all=False):  # pylint: disable=invalid-name
+    """
+    Return a list of the DiscussionXBlockData of the discussion xblocks in this
+    course, read from the collected block structure of the course rather than
+    from the modulestore.
+
+    Unless include_all is True, the block structure is transformed for the
+    given user by the course block access transformers, so that only the
+    discussion xblocks the user has access to are returned. Their access is
+    checked against the start dates, staff only flags and group access
+    collected, and merged down the course, when the course was published.
+    """
+    transformers = [] if include_all else get_course_block_access_transformers(user)
+    transformers.append(DiscussionTopicsTransformer())
+    course_blocks = get_course_blocks(
+        user,
+        modulestore().make_course_usage_key(course_id),
+        transformers=BlockStructureTransformers(transformers),
+    )
+    return [
+        DiscussionXBlockData(location=block_key, **{
+            field_name: course_blocks.get_xblock_field(block_key, field_name)
+            for field_name in DiscussionTopicsTransformer.FIELDS_TO_COLLECT
+        })
+        for block_key in course_blocks.topological_traversal(
+            filter_func=lambda block_key: block_key.block_type == 'discussion',
+        )
+    ]
+
+
 def get_discussion_id_map_entry(xblock):
     """
     Returns a tuple of (discussion_id, metadata) suitable for inclusion in the results of get_discussion_id_map().
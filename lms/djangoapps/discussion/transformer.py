@@ -0,0 +1,59 @@
+"""
+Discussion Topics Transformer
+"""
+
+
+from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+
+
+class DiscussionTopicsTransformer(BlockStructureTransformer):
+    """
+    The DiscussionTopicsTransformer collects the fields of the discussion
+    xblocks of a course that its discussion category map is built from, so
+    that the map can be built from the block structure of the course,
+    transformed for a user, without loading the discussion xblocks from the
+    modulestore.
+
+    No runtime transformations are performed.
+
+    The following values are stored as xblock_fields on their respective blocks
+    in the block structure:
+
+        discussion_id: (string) the id of the discussion.
+        discussion_category: (string) the "/" separated path of the category
+            of the discussion in the category map.
+        discussion_target: (string) the title of the discussion.
+        sort_key: (string) the key the discussion is sorted by in its category.
+        start: (datetime) when the discussion starts.
+    """
+    WRITE_VERSION = 1
+    READ_VERSION = 1
+    FIELDS_TO_COLLECT = [
+        u'discussion_id',
+        u'discussion_category',
+        u'discussion_target',
+        u'sort_key',
+        u'start',
+    ]
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return u'discussion_topics'
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects any information that's necessary to execute this
+        transformer's transform method.
+        """
+        block_structure.request_xblock_fields(*cls.FIELDS_TO_COLLECT)
+
+    def transform(self, usage_info, block_structure):
+        """
+        Perform no transformations.
+        """
+        pass
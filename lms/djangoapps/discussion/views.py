@@ -4,7 +4,7 @@ Views handling read (GET) requests for the Discussion tab and inline discussions
 
 
 import logging
-from functools import wraps
+from functools import partial, wraps
 
 import six
 from django.conf import settings
@@ -71,6 +71,9 @@ PAGES_NEARBY_DELTA = 2
 BOOTSTRAP_DISCUSSION_CSS_PATH = 'css/discussion/lms-discussion-bootstrap.css'
 TEAM_PERMISSION_MESSAGE = _("Access to this discussion is restricted to team members and staff.")
 
+# Marks that a thread has not yet been retrieved from the comments service.
+_NOT_RETRIEVED = object()
+
 
 def make_course_settings(course, user, include_category_map=True):
     """
@@ -310,7 +313,6 @@ def single_thread(request, course_key, discussion_id, thread_id):
 
     if request.is_ajax():
         cc_user = cc.User.from_django_user(request.user)
-        user_info = cc_user.to_dict()
         is_staff = has_permission(request.user, 'openclose_thread', course.id)
 
         try:
@@ -318,12 +320,18 @@ def single_thread(request, course_key, discussion_id, thread_id):
         except TeamDiscussionHiddenFromUserException:
             return HttpResponseForbidden(TEAM_PERMISSION_MESSAGE)
 
+        # The user and thread lookups are independent, so let them overlap.
+        user_info, thread = cc.utils.perform_concurrently(
+            cc_user.to_dict,
+            partial(_retrieve_thread, request, discussion_id, thread_id),
+        )
         thread = _load_thread_for_viewing(
             request,
             course,
             discussion_id=discussion_id,
             thread_id=thread_id,
             raise_event=True,
+            thread=thread,
         )
 
         with function_trace("get_annotated_content_infos"):
@@ -348,21 +356,16 @@ def single_thread(request, course_key, discussion_id, thread_id):
         return tab_view.get(request, course_id, 'discussion', discussion_id=discussion_id, thread_id=thread_id)
 
 
-def _find_thread(request, course, discussion_id, thread_id):
+def _retrieve_thread(request, discussion_id, thread_id):
     """
-    Finds the discussion thread with the specified ID.
-
-    Args:
-        request: The Django request.
-        course_id: The ID of the owning course.
-        discussion_id: The ID of the owning discussion.
-        thread_id: The ID of the thread.
+    Retrieves the discussion thread with the specified ID from the
+    comments service, without checking whether the user can see it.
 
     Returns:
-        The thread in question if the user can see it, else None.
+        The thread in question if it exists, else None.
     """
     try:
-        thread = cc.Thread.find(thread_id).retrieve(
+        return cc.Thread.find(thread_id).retrieve(
             with_responses=request.is_ajax(),
             recursive=request.is_ajax(),
             user_id=request.user.id,
@@ -374,6 +377,27 @@ def _find_thread(request, course, discussion_id, thread_id):
             thread_id=thread_id, discussion_id=discussion_id)
         )
         return None
+
+
+def _find_thread(request, course, discussion_id, thread_id, thread=_NOT_RETRIEVED):
+    """
+    Finds the discussion thread with the specified ID.
+
+    Args:
+        request: The Django request.
+        course_id: The ID of the owning course.
+        discussion_id: The ID of the owning discussion.
+        thread_id: The ID of the thread.
+        thread: The result of _retrieve_thread, if the thread was already
+                retrieved.
+
+    Returns:
+        The thread in question if the user can see it, else None.
+    """
+    if thread is _NOT_RETRIEVED:
+        thread = _retrieve_thread(request, discussion_id, thread_id)
+    if thread is None:
+        return None
     # Verify that the student has access to this thread if belongs to a course discussion module
     thread_context = getattr(thread, "context", "course")
     if thread_context == "course" and not utils.discussion_category_id_access(course, request.user, discussion_id):
@@ -396,7 +420,7 @@ def _find_thread(request, course, discussion_id, thread_id):
     return thread
 
 
-def _load_thread_for_viewing(request, course, discussion_id, thread_id, raise_event):
+def _load_thread_for_viewing(request, course, discussion_id, thread_id, raise_event, thread=_NOT_RETRIEVED):
     """
     Loads the discussion thread with the specified ID and fires an
     edx.forum.thread.viewed event.
@@ -408,6 +432,8 @@ def _load_thread_for_viewing(request, course, discussion_id, thread_id, raise_ev
         thread_id: The ID of the thread.
         raise_event: Whether an edx.forum.thread.viewed tracking event should
                      be raised
+        thread: The result of _retrieve_thread, if the thread was already
+                retrieved.
 
     Returns:
         The thread in question if the user can see it.
@@ -416,7 +442,7 @@ def _load_thread_for_viewing(request, course, discussion_id, thread_id, raise_ev
         Http404 if the thread does not exist or the user cannot
         see it.
     """
-    thread = _find_thread(request, course, discussion_id=discussion_id, thread_id=thread_id)
+    thread = _find_thread(request, course, discussion_id=discussion_id, thread_id=thread_id, thread=thread)
     if not thread:
         raise Http404
     if raise_event:
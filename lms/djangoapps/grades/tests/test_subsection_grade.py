@@ -5,7 +5,7 @@ Tests of the SubsectionGrade classes.
 
 from ddt import data, ddt, unpack
 
-from ..models import PersistentSubsectionGrade
+from ..models import PersistentSubsectionGrade, PersistentSubsectionGradeOverride
 from ..subsection_grade import CreateSubsectionGrade, ReadSubsectionGrade
 from .base import GradeTestBase
 from .utils import mock_get_score
@@ -57,3 +57,24 @@ class SubsectionGradeTest(GradeTestBase):
                 self.subsection_grade_factory._csm_scores,
             )
             self.assertEqual(grade.percent_graded, 0.0)
+
+    def test_update_with_override(self):
+        with mock_get_score(1, 2):
+            grade = CreateSubsectionGrade(
+                self.sequence,
+                self.course_structure,
+                self.subsection_grade_factory._submissions_scores,
+                self.subsection_grade_factory._csm_scores,
+            )
+            model = grade.update_or_create_model(self.request.user)
+
+            PersistentSubsectionGradeOverride.objects.create(
+                grade=model,
+                earned_graded_override=2,
+                possible_graded_override=2,
+            )
+            grade.update_or_create_model(self.request.user, force_update_subsections=True)
+
+            self.assertEqual(grade.percent_graded, 1.0)
+            # The override is applied to the totals, but is not recorded on the grade.
+            self.assertIsNone(grade.override)
@@ -0,0 +1,131 @@
+"""
+Tests for the vectorized aggregation of course grades.
+"""
+
+
+import random
+from collections import OrderedDict
+
+import ddt
+from django.test import TestCase
+
+from xmodule.graders import ProblemScore, aggregate_scores, grader_from_conf
+
+from .. import vectorized
+from ..course_grade import CourseGrade
+from ..scores import compute_percent
+
+
+class _StubSubsectionGrade(object):
+    """
+    The parts of a SubsectionGrade that are read by the course grader.
+    """
+    def __init__(self, display_name, graded_total):
+        self.display_name = display_name
+        self.graded_total = graded_total
+        self.percent_graded = compute_percent(graded_total.earned, graded_total.possible)
+
+
+@ddt.ddt
+class TestVectorizedCoursePercents(TestCase):
+    """
+    Differential tests of vectorized.course_percents against the
+    per-learner grader tree in xmodule.graders.
+    """
+    FORMATS = [u'Homework', u'Lab', u'Exam', u'']
+    NUM_LEARNERS = 50
+
+    def _random_course(self, rand):
+        """
+        Returns a random grader and (usage_key, graded, format, problem_keys)
+        subsections.
+        """
+        grader = grader_from_conf([
+            {
+                u'type': assignment_type,
+                u'min_count': rand.randint(0, 6),
+                u'drop_count': rand.randint(0, 3),
+                u'weight': rand.choice([0.0, 0.1, 0.15, 0.3, 1.0 / 3]),
+            }
+            for assignment_type in self.FORMATS[:3]
+        ])
+        subsections = [
+            (
+                u'subsection_{}'.format(index),
+                rand.random() < 0.8,
+                rand.choice(self.FORMATS),
+                [u'problem_{}_{}'.format(index, problem) for problem in range(rand.randint(0, 5))],
+            )
+            for index in range(rand.randint(0, 12))
+        ]
+        return grader, subsections
+
+    def _random_problem_scores(self, rand, problem_keys):
+        """
+        Returns random ProblemScores for some of the given problems.
+        """
+        problem_scores = OrderedDict()
+        for problem_key in problem_keys:
+            if rand.random() < 0.15:
+                # The learner cannot see this problem.
+                continue
+            possible = rand.choice([0, 1, 2, 3, 0.5, 7.0 / 3])
+            earned = rand.choice([0, possible, possible * rand.random(), round(possible * rand.random(), 1)])
+            problem_scores[problem_key] = ProblemScore(
+                raw_earned=earned,
+                raw_possible=possible,
+                weighted_earned=earned,
+                weighted_possible=possible,
+                weight=1,
+                graded=rand.random() < 0.9,
+                first_attempted=None,
+            )
+        return problem_scores
+
+    @ddt.data(*range(20))
+    def test_matches_per_learner_grader(self, seed):
+        rand = random.Random(seed)
+        grader, subsections = self._random_course(rand)
+        self.assertTrue(vectorized.is_supported(grader))
+        matrix = vectorized.ScoreMatrix(vectorized.CourseScoreLayout(subsections), self.NUM_LEARNERS)
+
+        expected_percents = []
+        for row in range(self.NUM_LEARNERS):
+            grade_sheet = {}
+            for usage_key, graded, subsection_format, problem_keys in subsections:
+                problem_scores = self._random_problem_scores(rand, problem_keys)
+                matrix.set_problem_scores(row, usage_key, problem_scores)
+                _, graded_total = aggregate_scores(list(problem_scores.values()))
+                if graded and graded_total.possible > 0:
+                    subsection_grade = _StubSubsectionGrade(usage_key, graded_total)
+                    grade_sheet.setdefault(subsection_format, OrderedDict())[usage_key] = subsection_grade
+            expected_percents.append(CourseGrade._compute_percent(grader.grade(grade_sheet)))
+
+        self.assertEqual(list(vectorized.course_percents(grader, matrix)), expected_percents)
+
+    def test_subsection_totals_take_precedence(self):
+        grader = grader_from_conf([{u'type': u'Homework', u'min_count': 2, u'drop_count': 0, u'weight': 1.0}])
+        layout = vectorized.CourseScoreLayout([
+            (u'subsection_0', True, u'Homework', [u'problem_0']),
+            (u'subsection_1', True, u'Homework', [u'problem_1']),
+        ])
+        matrix = vectorized.ScoreMatrix(layout, 2)
+        for row in range(2):
+            for index in range(2):
+                matrix.set_problem_scores(row, u'subsection_{}'.format(index), OrderedDict([
+                    (u'problem_{}'.format(index), ProblemScore(1, 4, 1, 4, 1, graded=True, first_attempted=None)),
+                ]))
+        matrix.set_subsection_total(1, u'subsection_1', 3.0, 4.0)
+
+        self.assertEqual(list(vectorized.course_percents(grader, matrix)), [0.25, 0.5])
+
+        matrix.clear_row(1)
+        self.assertEqual(list(vectorized.course_percents(grader, matrix)), [0.25, 0.0])
+
+    def test_unknown_problem(self):
+        layout = vectorized.CourseScoreLayout([(u'subsection_0', True, u'Homework', [u'problem_0'])])
+        matrix = vectorized.ScoreMatrix(layout, 1)
+        with self.assertRaises(KeyError):
+            matrix.set_problem_scores(0, u'subsection_0', OrderedDict([
+                (u'problem_1', ProblemScore(1, 1, 1, 1, 1, graded=True, first_attempted=None)),
+            ]))
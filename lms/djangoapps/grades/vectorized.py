@@ -0,0 +1,269 @@
+"""
+Vectorized computation of course grade percents for many learners at once.
+
+The per-learner path (CourseGrade.update) aggregates problem scores into
+subsection grades and then runs the course's grader tree from
+xmodule.graders in pure Python.  For batch recomputation, the weighted
+problem scores of a group of learners are instead loaded into
+learner x problem NumPy arrays, and the subsection, assignment type and
+course percents are computed for all of them in a handful of array
+operations.
+
+The results are identical to the per-learner path: sums are accumulated
+in the same order, drop-lowest ties are broken the same way and the same
+rounding is applied.  Only the graders built by grader_from_conf
+(a WeightedSubsectionsGrader of AssignmentFormatGraders) are supported;
+use `is_supported` to check before grading.
+
+CourseGradeFactory still grades each learner on their own: this module
+only aggregates scores, and pays off once the scores of a batch of
+learners are loaded in bulk rather than through per-learner subsection
+grades.
+"""
+
+
+from collections import OrderedDict
+
+import numpy as np
+import six
+
+from xmodule.graders import AssignmentFormatGrader, WeightedSubsectionsGrader
+
+from .scores import possibly_scored
+
+
+def is_supported(grader):
+    """
+    Returns whether the given course grader can be computed by this module.
+    """
+    return isinstance(grader, WeightedSubsectionsGrader) and all(
+        isinstance(subgrader, AssignmentFormatGrader) for subgrader, _, _ in grader.subgraders
+    )
+
+
+class CourseScoreLayout(object):
+    """
+    The subsections of a course and the scorable blocks within each of
+    them, which define the columns of a ScoreMatrix.
+
+    Subsections are kept in course order.  The scorable blocks of each
+    subsection are kept in the order they are aggregated by
+    CreateSubsectionGrade, so that sums are accumulated identically.
+    """
+    def __init__(self, subsections):
+        """
+        Arguments:
+            subsections (list): (usage_key, graded, format, problem_keys)
+                tuples, in course order.
+        """
+        self.subsection_keys = []
+        self.subsection_graded = np.zeros(len(subsections), dtype=bool)
+        self.subsection_formats = []
+        self.column_subsections = []
+        self._columns = {}
+
+        for subsection_index, (usage_key, graded, subsection_format, problem_keys) in enumerate(subsections):
+            self.subsection_keys.append(usage_key)
+            self.subsection_graded[subsection_index] = bool(graded)
+            self.subsection_formats.append(subsection_format)
+            for problem_key in problem_keys:
+                self._columns[(usage_key, problem_key)] = len(self.column_subsections)
+                self.column_subsections.append(subsection_index)
+
+        self.subsection_index = {usage_key: index for index, usage_key in enumerate(self.subsection_keys)}
+        self.column_subsections = np.array(self.column_subsections, dtype=int)
+
+    @classmethod
+    def from_structure(cls, course_structure, course_location):
+        """
+        Returns the layout of the given course block structure, walked the
+        same way as CourseGrade.chapter_grades.
+        """
+        subsections = OrderedDict()
+        for chapter_key in course_structure.get_children(course_location):
+            for subsection_key in course_structure.get_children(chapter_key):
+                if subsection_key in subsections:
+                    continue
+                subsection = course_structure[subsection_key]
+                subsections[subsection_key] = (
+                    subsection_key,
+                    getattr(subsection, 'graded', False),
+                    getattr(subsection, 'format', ''),
+                    [
+                        block_key
+                        for block_key in course_structure.post_order_traversal(
+                            filter_func=possibly_scored,
+                            start_node=subsection_key,
+                        )
+                        if getattr(course_structure[block_key], 'has_score', False)
+                    ],
+                )
+        return cls(list(subsections.values()))
+
+    @property
+    def num_columns(self):
+        return len(self.column_subsections)
+
+    @property
+    def num_subsections(self):
+        return len(self.subsection_keys)
+
+    def columns_for(self, subsection_key, problem_keys):
+        """
+        Returns the column indices of the given problems of the given
+        subsection.  Raises KeyError if any of them is not in the layout.
+        """
+        return [self._columns[(subsection_key, problem_key)] for problem_key in problem_keys]
+
+
+class ScoreMatrix(object):
+    """
+    Weighted problem scores of a group of learners, held as learner x
+    problem arrays laid out by a CourseScoreLayout.
+
+    Problems that a learner cannot see, or that have no score, are left
+    at zero earned and zero possible, which does not change any sum.
+    """
+    def __init__(self, layout, num_learners):
+        self.layout = layout
+        self.num_learners = num_learners
+        shape = (num_learners, layout.num_columns)
+        self.earned = np.zeros(shape)
+        self.possible = np.zeros(shape)
+        self.graded = np.zeros(shape, dtype=bool)
+        self._subsection_totals = {}
+
+    def set_problem_scores(self, row, subsection_key, problem_scores):
+        """
+        Sets the scores of a learner's problems in the given subsection.
+
+        Arguments:
+            row (int): index of the learner in the matrix.
+            subsection_key (UsageKey): location of the subsection.
+            problem_scores (OrderedDict): ProblemScore objects keyed by
+                problem location, as found on a SubsectionGrade.
+        """
+        columns = self.layout.columns_for(subsection_key, list(problem_scores))
+        for column, score in zip(columns, six.itervalues(problem_scores)):
+            self.earned[row, column] = score.earned
+            self.possible[row, column] = score.possible
+            self.graded[row, column] = score.graded
+
+    def set_subsection_total(self, row, subsection_key, earned, possible):
+        """
+        Sets a learner's graded total for the given subsection, taking
+        precedence over the sum of its problem scores.  Used for
+        subsection grades that have been overridden.
+        """
+        self._subsection_totals[(row, self.layout.subsection_index[subsection_key])] = (earned, possible)
+
+    def clear_row(self, row):
+        """
+        Resets all scores of the given learner to zero.
+        """
+        self.earned[row] = 0.0
+        self.possible[row] = 0.0
+        self.graded[row] = False
+        for row_and_subsection in [key for key in self._subsection_totals if key[0] == row]:
+            del self._subsection_totals[row_and_subsection]
+
+    def subsection_graded_totals(self):
+        """
+        Returns learner x subsection arrays of the graded earned and
+        possible totals, as computed by xmodule.graders.aggregate_scores.
+        """
+        shape = (self.num_learners, self.layout.num_subsections)
+        earned = np.zeros(shape)
+        possible = np.zeros(shape)
+        graded_earned = np.where(self.graded, self.earned, 0.0)
+        graded_possible = np.where(self.graded, self.possible, 0.0)
+
+        # Accumulate column by column, so every learner's sums are added up
+        # in the same order as the per-learner path.
+        for column, subsection_index in enumerate(self.layout.column_subsections):
+            earned[:, subsection_index] += graded_earned[:, column]
+            possible[:, subsection_index] += graded_possible[:, column]
+
+        for (row, subsection_index), (total_earned, total_possible) in six.iteritems(self._subsection_totals):
+            earned[row, subsection_index] = total_earned
+            possible[row, subsection_index] = total_possible
+        return earned, possible
+
+
+def subsection_percents(earned, possible):
+    """
+    Vectorized equivalent of scores.compute_percent.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percents = np.around(earned / possible, decimals=2)
+    return np.where(possible > 0, percents, 0.0)
+
+
+def assignment_type_percents(subgrader, layout, percents, included):
+    """
+    Vectorized equivalent of AssignmentFormatGrader.grade's percent.
+
+    Arguments:
+        subgrader (AssignmentFormatGrader): grader of the assignment type.
+        layout (CourseScoreLayout): layout of the course.
+        percents (numpy.ndarray): learner x subsection graded percents.
+        included (numpy.ndarray): learner x subsection mask of the
+            subsections that appear in each learner's grade sheet.
+
+    Returns a numpy.ndarray of the assignment type percent per learner.
+    """
+    format_mask = np.array(
+        [subsection_format == subgrader.type for subsection_format in layout.subsection_formats],
+        dtype=bool,
+    )
+    type_percents = percents[:, format_mask]
+    type_included = included[:, format_mask]
+    num_learners, num_subsections = type_percents.shape
+
+    # Compact each learner's subsections to the left, padded with the
+    # zero placeholders that min_count calls for.
+    counts = type_included.sum(axis=1)
+    num_sections = np.maximum(subgrader.min_count, counts)
+    width = max(subgrader.min_count, num_subsections)
+    compact = np.zeros((num_learners, width))
+    rows, columns = np.nonzero(type_included)
+    positions = np.cumsum(type_included, axis=1)[rows, columns] - 1
+    compact[rows, positions] = type_percents[rows, columns]
+    exists = np.arange(width)[np.newaxis, :] < num_sections[:, np.newaxis]
+
+    # Drop the lowest scores: a stable sort by descending percent, with
+    # padding beyond a learner's own sections sorted first so it is
+    # never dropped, matches AssignmentFormatGrader.total_with_drops.
+    keep = exists.copy()
+    if subgrader.drop_count > 0 and width:
+        order = np.argsort(np.where(exists, -compact, -np.inf), axis=1, kind='stable')
+        dropped = order[:, max(width - subgrader.drop_count, 0):]
+        keep[np.arange(num_learners)[:, np.newaxis], dropped] = False
+
+    totals = np.zeros(num_learners)
+    for position in range(width):
+        totals += np.where(keep[:, position], compact[:, position], 0.0)
+
+    denominators = num_sections - subgrader.drop_count
+    return np.where(denominators > 0, totals / np.maximum(denominators, 1), totals)
+
+
+def course_percents(grader, matrix):
+    """
+    Returns a numpy.ndarray of the course grade percent of every learner
+    in the given ScoreMatrix, rounded as by CourseGrade.update.
+
+    The grader must satisfy `is_supported`.
+    """
+    earned, possible = matrix.subsection_graded_totals()
+    percents = subsection_percents(earned, possible)
+    included = matrix.layout.subsection_graded[np.newaxis, :] & (possible > 0)
+
+    total = np.zeros(matrix.num_learners)
+    for subgrader, _, weight in grader.subgraders:
+        total += assignment_type_percents(subgrader, matrix.layout, percents, included) * weight
+
+    # Vectorized equivalent of CourseGrade._compute_percent.
+    total = total * 100 + 0.05
+    rounded = np.where(total >= 0, np.floor(total + 0.5), np.ceil(total - 0.5))
+    return rounded / 100
@@ -16,3 +16,8 @@ class UpdateProblemModuleStateError(Exception):
 class DuplicateTaskException(Exception):
     """Exception indicating that a task already exists or has already completed."""
     pass
+
+
+class GradeReportShardsError(Exception):
+    """Exception indicating that some shards of a grade report failed or are missing."""
+    pass
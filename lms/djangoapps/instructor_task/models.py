@@ -17,16 +17,18 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 import codecs
 import csv
 import hashlib
+import io
 import json
 import logging
 import os.path
+from tempfile import TemporaryFile
 from uuid import uuid4
 
 import six
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.db import models, transaction
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext as _
@@ -291,14 +293,46 @@ class DjangoStorageReportStore(ReportStore):
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
         """
-        output_buffer = ContentFile('')
-        # Adding unicode signature (BOM) for MS Excel 2013 compatibility
-        if six.PY2:
-            output_buffer.write(codecs.BOM_UTF8)
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        # Rows are spooled to a temporary file as they are produced, so that
+        # large reports built from generators never sit in memory at once.
+        with TemporaryFile() as output_file:
+            if six.PY2:
+                # Adding unicode signature (BOM) for MS Excel 2013 compatibility
+                output_file.write(codecs.BOM_UTF8)
+                csvwriter = csv.writer(output_file)
+                csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            else:
+                text_file = io.TextIOWrapper(output_file, encoding='utf-8', newline='')
+                csvwriter = csv.writer(text_file)
+                csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+                text_file.detach()
+            output_file.seek(0)
+            self.storage.save(self.path_to(course_id, filename), File(output_file))
+
+    def read_rows(self, course_id, filename):
+        """
+        Given a course_id and filename of a CSV written by `store_rows`,
+        yield its rows one at a time as lists of unicode strings.
+        """
+        with self.storage.open(self.path_to(course_id, filename)) as csv_file:
+            if six.PY2:
+                for row in csv.reader(csv_file):
+                    yield [item.decode('utf-8-sig') for item in row]
+            else:
+                for row in csv.reader(codecs.iterdecode(csv_file, 'utf-8')):
+                    yield row
+
+    def exists(self, course_id, filename):
+        """
+        Return whether a file named `filename` is stored for `course_id`.
+        """
+        return self.storage.exists(self.path_to(course_id, filename))
+
+    def delete(self, course_id, filename):
+        """
+        Delete the file named `filename` stored for `course_id`.
+        """
+        self.storage.delete(self.path_to(course_id, filename))
 
     def links_for(self, course_id):
         """
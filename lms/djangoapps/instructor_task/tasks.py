@@ -29,6 +29,7 @@ from django.conf import settings
 from django.utils.translation import ugettext_noop
 
 from bulk_email.tasks import perform_delegate_email_batches
+from lms.djangoapps.instructor_task.config.waffle import parallel_grade_report_enabled
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
@@ -185,10 +186,28 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(CourseGradeReport.generate, xmodule_instance_args)
+    if parallel_grade_report_enabled():
+        task_fn = partial(CourseGradeReport.queue_shards, calculate_grades_csv_shard, xmodule_instance_args)
+    else:
+        task_fn = partial(CourseGradeReport.generate, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)
+def calculate_grades_csv_shard(entry_id, xmodule_instance_args, shard_number, user_ids, subtask_status_dict):
+    """
+    Grade one shard of the learners of a course grade report queued by
+    calculate_grades_csv, and merge the report once all shards are done.
+    """
+    TASK_LOG.info(
+        u"Task: %s, InstructorTask ID: %s, Grading shard %s of %s learners",
+        subtask_status_dict['task_id'], entry_id, shard_number, len(user_ids)
+    )
+    CourseGradeReport.generate_shard(
+        xmodule_instance_args, entry_id, shard_number, user_ids, subtask_status_dict
+    )
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
@@ -3,20 +3,24 @@ Functionality for generating grade reports.
 """
 
 
+import json
 import logging
 import re
+import traceback
 from collections import OrderedDict, defaultdict
 from datetime import datetime
-from itertools import chain
+from itertools import chain, count
 from time import time
 
 import six
+from celery.states import FAILURE, READY_STATES, SUCCESS
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from lazy import lazy
 from pytz import UTC
 from six import text_type
-from six.moves import zip, zip_longest
+from six.moves import range, zip_longest
 
 from course_blocks.api import get_course_blocks
 from course_modes.models import CourseMode
@@ -27,11 +31,19 @@ from lms.djangoapps.grades.api import CourseGradeFactory
 from lms.djangoapps.grades.api import context as grades_context
 from lms.djangoapps.grades.api import prefetch_course_and_subsection_grades
 from lms.djangoapps.instructor_analytics.basic import list_problem_responses
-from lms.djangoapps.instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.instructor_task.config.waffle import (
     generate_grade_report_for_verified_only,
     optimize_get_learners_switch_enabled
 )
+from lms.djangoapps.instructor_task.exceptions import GradeReportShardsError
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SUBTASK_LOCK_EXPIRE,
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status
+)
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from opaque_keys.edx.keys import UsageKey
@@ -40,12 +52,13 @@ from openedx.core.djangoapps.course_groups.cohorts import bulk_cache_cohorts, ge
 from openedx.core.djangoapps.user_api.course_tag.api import BulkCourseTags
 from student.models import CourseEnrollment
 from student.roles import BulkRoleCache
+from util.db import outer_atomic
 from xmodule.modulestore.django import modulestore
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.split_test_module import get_split_user_partitions
 
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store
+from .utils import RowSpool, upload_csv_to_report_store
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -69,6 +82,19 @@ def _flatten(iterable):
     return list(chain.from_iterable(iterable))
 
 
+def _learner_filter_kwargs(course_id, verified_only=False):
+    """
+    Returns the User filter kwargs that select the learners enrolled in
+    the given course, optionally only in its verified track.
+    """
+    filter_kwargs = {
+        'courseenrollment__course_id': course_id,
+    }
+    if verified_only:
+        filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+    return filter_kwargs
+
+
 class _CourseGradeReportContext(object):
     """
     Internal class that provides a common context to use for a single grade
@@ -213,6 +239,124 @@ class CourseGradeReport(object):
             context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
             return CourseGradeReport()._generate(context)
 
+    @classmethod
+    def queue_shards(cls, shard_task, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+        """
+        Public method to generate a grade report by splitting the enrollees
+        into shards of settings.GRADE_REPORT_LEARNERS_PER_SUBTASK learners,
+        each graded by a `shard_task` subtask that calls `generate_shard`.
+        The subtask that completes last merges the partial CSVs written by
+        all shards into the final report, and completes the task.
+        """
+        entry = InstructorTask.objects.get(pk=_entry_id)
+
+        # As with bulk email, a requeued parent task must not queue a
+        # second set of subtasks for the same report.
+        if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+            TASK_LOG.warning(u'Task %s has already queued grade report shards', entry.task_id)
+            return json.loads(entry.task_output)
+
+        learners = get_user_model().objects.filter(
+            **_learner_filter_kwargs(course_id, generate_grade_report_for_verified_only())
+        ).order_by('id')
+        total_learners = learners.count()
+        if total_learners == 0:
+            # Subtasks never complete an empty report, so generate it inline.
+            return cls.generate(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
+
+        shard_numbers = count()
+        queued_subtask_ids = []
+
+        def _create_shard_subtask(learner_list, initial_subtask_status):
+            """Creates a subtask to grade the given shard of learners."""
+            queued_subtask_ids.append(initial_subtask_status.task_id)
+            return shard_task.subtask(
+                (
+                    _entry_id,
+                    _xmodule_instance_args,
+                    next(shard_numbers),
+                    [learner['pk'] for learner in learner_list],
+                    initial_subtask_status.to_dict(),
+                ),
+                task_id=initial_subtask_status.task_id,
+                routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+            )
+
+        progress = queue_subtasks_for_query(
+            entry,
+            action_name,
+            _create_shard_subtask,
+            [learners],
+            [],
+            settings.GRADE_REPORT_LEARNERS_PER_SUBTASK,
+            total_learners,
+        )
+
+        # If learners were unenrolled since they were counted, fewer shards
+        # were queued than expected, and they may all have completed already.
+        if cls._record_queued_shards(_entry_id, queued_subtask_ids):
+            with modulestore().bulk_operations(course_id):
+                context = _CourseGradeReportContext(
+                    _xmodule_instance_args, _entry_id, course_id, _task_input, action_name,
+                )
+                cls()._merge_shards_if_complete(context, _entry_id)
+        return progress
+
+    @staticmethod
+    def _record_queued_shards(entry_id, queued_subtask_ids):
+        """
+        Records the shards actually queued as the subtasks of the grade
+        report task, in place of the shards expected from the number of
+        learners.  Returns whether all of them have completed.
+        """
+        with outer_atomic():
+            entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+            subtask_dict = json.loads(entry.subtasks)
+            if subtask_dict['total'] != len(queued_subtask_ids):
+                TASK_LOG.info(
+                    u'Task %s: %s grade report shards queued instead of %s',
+                    entry.task_id, len(queued_subtask_ids), subtask_dict['total'],
+                )
+                subtask_dict['total'] = len(queued_subtask_ids)
+                subtask_dict['status'] = {
+                    subtask_id: status for subtask_id, status in six.iteritems(subtask_dict['status'])
+                    if subtask_id in queued_subtask_ids
+                }
+                entry.subtasks = json.dumps(subtask_dict)
+                entry.save()
+        return subtask_dict['succeeded'] + subtask_dict['failed'] >= subtask_dict['total']
+
+    @classmethod
+    def generate_shard(cls, _xmodule_instance_args, _entry_id, shard_number, user_ids, subtask_status_dict):
+        """
+        Public method to grade one shard of a grade report queued by
+        `queue_shards`, and to merge the report if this is the last shard.
+        """
+        subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+        current_task_id = subtask_status.task_id
+        check_subtask_is_valid(_entry_id, current_task_id, subtask_status)
+
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        course_id = entry.course_id
+        action_name = json.loads(entry.task_output)['action_name']
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(
+                _xmodule_instance_args, _entry_id, course_id, json.loads(entry.task_input), action_name,
+            )
+            report = cls()
+            try:
+                success_count, error_count = report._write_shard(context, _entry_id, shard_number, user_ids)
+            except Exception:
+                TASK_LOG.exception(u'%s, Grade report shard %s failed', context.task_info_string, shard_number)
+                subtask_status.increment(failed=len(user_ids), state=FAILURE)
+                update_subtask_status(_entry_id, current_task_id, subtask_status, complete_parent=False)
+                report._merge_shards_if_complete(context, _entry_id)
+                raise
+
+            subtask_status.increment(succeeded=success_count, failed=error_count, state=SUCCESS)
+            update_subtask_status(_entry_id, current_task_id, subtask_status, complete_parent=False)
+            report._merge_shards_if_complete(context, _entry_id)
+
     def _generate(self, context):
         """
         Internal method for generating a grade report for the given context.
@@ -222,11 +366,10 @@ class CourseGradeReport(object):
         error_headers = self._error_headers()
         batched_rows = self._batched_rows(context)
 
-        context.update_status(u'Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
-
-        context.update_status(u'Uploading grades')
-        self._upload(context, success_headers, success_rows, error_headers, error_rows)
+        context.update_status(u'Compiling and uploading grades')
+        with RowSpool() as error_rows:
+            success_rows = self._compile(context, batched_rows, error_rows)
+            self._upload(context, success_headers, success_rows, error_headers, error_rows)
 
         return context.update_status(u'Completed grades')
 
@@ -259,32 +402,147 @@ class CourseGradeReport(object):
             users = [u for u in users if u is not None]
             yield self._rows_for_users(context, users)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, error_rows):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        A generator of the success rows for the given batched_rows and
+        context, which appends the error rows to the given error_rows and
+        updates the task progress as each batch is consumed.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = zip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
+        for batch_success_rows, batch_error_rows in batched_rows:
+            error_rows.extend(batch_error_rows)
 
-        # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
-        context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
-        context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
+            # update metrics on task status
+            context.task_progress.succeeded += len(batch_success_rows)
+            context.task_progress.failed += len(batch_error_rows)
+            context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
+            context.task_progress.total = context.task_progress.attempted
+            for row in batch_success_rows:
+                yield row
 
     def _upload(self, context, success_headers, success_rows, error_headers, error_rows):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Creates and uploads a CSV for the given headers and rows.  The
+        error rows are only complete once the success rows are consumed.
         """
         date = datetime.now(UTC)
-        upload_csv_to_report_store([success_headers] + success_rows, 'grade_report', context.course_id, date)
+        upload_csv_to_report_store(chain([success_headers], success_rows), 'grade_report', context.course_id, date)
         if len(error_rows) > 0:
-            error_rows = [error_headers] + error_rows
-            upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
+            upload_csv_to_report_store(
+                chain([error_headers], error_rows), 'grade_report_err', context.course_id, date,
+            )
+
+    def _write_shard(self, context, entry_id, shard_number, user_ids):
+        """
+        Grades the given users and stores their success and error rows as
+        partial CSVs for the given shard.  Returns the number of rows of each.
+        """
+        def _batched_rows():
+            """A generator of batches of (success_rows, error_rows) for the shard."""
+            for start in range(0, len(user_ids), self.USER_BATCH_SIZE):
+                users = get_user_model().objects.filter(
+                    id__in=user_ids[start:start + self.USER_BATCH_SIZE],
+                ).select_related('profile').order_by('id')
+                yield self._rows_for_users(context, list(users))
+
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        with RowSpool() as error_rows:
+            success_rows = self._compile(context, _batched_rows(), error_rows)
+            report_store.store_rows(context.course_id, self._shard_filename(entry_id, shard_number), success_rows)
+            if len(error_rows) > 0:
+                report_store.store_rows(
+                    context.course_id, self._shard_filename(entry_id, shard_number, errors=True), error_rows,
+                )
+        return context.task_progress.succeeded, context.task_progress.failed
+
+    def _shard_filename(self, entry_id, shard_number, errors=False):
+        """
+        Returns the name of the partial CSV of the given shard.  Partial
+        CSVs live in a subdirectory, so they are not listed as reports.
+        """
+        return u'grade_report_shards/{entry_id}/{kind}_{shard_number:05d}.csv'.format(
+            entry_id=entry_id,
+            kind='errors' if errors else 'grades',
+            shard_number=shard_number,
+        )
+
+    def _merge_shards_if_complete(self, context, entry_id):
+        """
+        Once all shards of the grade report have completed, streams their
+        partial CSVs into the final report, deletes them and completes the
+        task.  The cache lock guarantees that only one of the last shards to
+        finish merges.
+
+        If any shard failed or its partial CSV is missing, no report is
+        uploaded and the task fails instead.  If the merge itself raises, the
+        task fails and the lock is released.
+        """
+        entry = InstructorTask.objects.get(pk=entry_id)
+        subtask_dict = json.loads(entry.subtasks)
+        if entry.task_state in READY_STATES:
+            return
+        if subtask_dict['succeeded'] + subtask_dict['failed'] < subtask_dict['total']:
+            return
+        lock_key = u'grade-report-merge-{}'.format(entry_id)
+        if not cache.add(lock_key, 'true', SUBTASK_LOCK_EXPIRE):
+            return
+
+        try:
+            TASK_LOG.info(u'%s, Task type: %s, Merging grades', context.task_info_string, context.action_name)
+            report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+            filenames = [self._shard_filename(entry_id, shard) for shard in range(subtask_dict['total'])]
+            missing_filenames = [
+                filename for filename in filenames if not report_store.exists(context.course_id, filename)
+            ]
+            error_filenames = [
+                filename for filename in (
+                    self._shard_filename(entry_id, shard, errors=True) for shard in range(subtask_dict['total'])
+                )
+                if report_store.exists(context.course_id, filename)
+            ]
+            stored_filenames = [filename for filename in filenames if filename not in missing_filenames]
+
+            if subtask_dict['failed'] or missing_filenames:
+                error = GradeReportShardsError(
+                    u'{} of {} grade report shards failed, the partial grades of {} are missing'.format(
+                        subtask_dict['failed'], subtask_dict['total'], missing_filenames,
+                    )
+                )
+                TASK_LOG.error(u'%s, Grade report not uploaded: %s', context.task_info_string, error)
+                for filename in stored_filenames + error_filenames:
+                    report_store.delete(context.course_id, filename)
+                InstructorTask.objects.filter(pk=entry_id).update(
+                    task_state=FAILURE,
+                    task_output=InstructorTask.create_output_for_failure(error, None),
+                )
+                return
+
+            def _rows(headers, filenames):
+                """Yields the headers, then the rows of every stored shard."""
+                yield headers
+                for filename in filenames:
+                    for row in report_store.read_rows(context.course_id, filename):
+                        yield row
+
+            date = datetime.now(UTC)
+            upload_csv_to_report_store(
+                _rows(self._success_headers(context), filenames), 'grade_report', context.course_id, date,
+            )
+            if error_filenames:
+                upload_csv_to_report_store(
+                    _rows(self._error_headers(), error_filenames), 'grade_report_err', context.course_id, date,
+                )
+
+            for filename in filenames + error_filenames:
+                report_store.delete(context.course_id, filename)
+            InstructorTask.objects.filter(pk=entry_id).update(task_state=SUCCESS)
+            TASK_LOG.info(u'%s, Task type: %s, Completed grades', context.task_info_string, context.action_name)
+        except Exception as exc:  # pylint: disable=broad-except
+            TASK_LOG.exception(u'%s, Grade report merge failed', context.task_info_string)
+            InstructorTask.objects.filter(pk=entry_id).update(
+                task_state=FAILURE,
+                task_output=InstructorTask.create_output_for_failure(exc, traceback.format_exc()),
+            )
+            cache.delete(lock_key)
 
     def _grades_header(self, context):
         """
@@ -344,12 +602,7 @@ class CourseGradeReport(object):
             This generator method fetches & loads the enrolled user objects on demand which in chunk
             size defined. This method is a workaround to avoid out-of-memory errors.
             """
-            filter_kwargs = {
-                'courseenrollment__course_id': course_id,
-            }
-            if verified_only:
-                filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
-
+            filter_kwargs = _learner_filter_kwargs(course_id, verified_only)
             user_ids_list = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
             user_chunks = grouper(user_ids_list)
             for user_ids in user_chunks:
@@ -561,59 +814,72 @@ class ProblemGradeReport(object):
         graded_scorable_blocks = cls._graded_scorable_blocks_to_header(course)
 
         # Just generate the static fields for now.
-        rows = [
+        header = (
             list(header_row.values()) + ['Enrollment Status', 'Grade'] + _flatten(list(graded_scorable_blocks.values()))
-        ]
-        error_rows = [list(header_row.values()) + ['error_msg']]
+        )
+        error_header = list(header_row.values()) + ['error_msg']
 
         # Bulk fetch and cache enrollment states so we can efficiently determine
         # whether each user is currently enrolled in the course.
         log_task_info(u'Fetching enrollment status')
         CourseEnrollment.bulk_fetch_enrollment_states(enrolled_students, course_id)
 
-        for student, course_grade, error in CourseGradeFactory().iter(enrolled_students, course):
-            student_fields = [getattr(student, field_name) for field_name in header_row]
-            task_progress.attempted += 1
-
-            if not course_grade:
-                err_msg = text_type(error)
-                # There was an error grading this student.
-                if not err_msg:
-                    err_msg = u'Unknown error'
-                error_rows.append(student_fields + [err_msg])
-                task_progress.failed += 1
-                continue
-
-            enrollment_status = _user_enrollment_status(student, course_id)
-
-            earned_possible_values = []
-            for block_location in graded_scorable_blocks:
-                try:
-                    problem_score = course_grade.problem_scores[block_location]
-                except KeyError:
-                    earned_possible_values.append([u'Not Available', u'Not Available'])
-                else:
-                    if problem_score.first_attempted:
-                        earned_possible_values.append([problem_score.earned, problem_score.possible])
-                    else:
-                        earned_possible_values.append([u'Not Attempted', problem_score.possible])
+        def student_rows(error_rows):
+            """
+            A generator of the rows of the successfully graded students,
+            which appends the rows of the others to error_rows.
+            """
+            for student, course_grade, error in CourseGradeFactory().iter(enrolled_students, course):
+                student_fields = [getattr(student, field_name) for field_name in header_row]
+                task_progress.attempted += 1
 
-            rows.append(student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values))
+                if not course_grade:
+                    err_msg = text_type(error)
+                    # There was an error grading this student.
+                    if not err_msg:
+                        err_msg = u'Unknown error'
+                    error_rows.append(student_fields + [err_msg])
+                    task_progress.failed += 1
+                    continue
 
-            task_progress.succeeded += 1
-            if task_progress.attempted % status_interval == 0:
-                step = u'Calculating Grades'
-                task_progress.update_task_state(extra_meta={'step': step})
-                log_message = u'{0} {1}/{2}'.format(step, task_progress.attempted, task_progress.total)
-                log_task_info(log_message)
+                enrollment_status = _user_enrollment_status(student, course_id)
 
-        log_task_info('Uploading CSV to store')
-        # Perform the upload if any students have been successfully graded
-        if len(rows) > 1:
-            upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-        # If there are any error rows, write them out as well
-        if len(error_rows) > 1:
-            upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+                earned_possible_values = []
+                for block_location in graded_scorable_blocks:
+                    try:
+                        problem_score = course_grade.problem_scores[block_location]
+                    except KeyError:
+                        earned_possible_values.append([u'Not Available', u'Not Available'])
+                    else:
+                        if problem_score.first_attempted:
+                            earned_possible_values.append([problem_score.earned, problem_score.possible])
+                        else:
+                            earned_possible_values.append([u'Not Attempted', problem_score.possible])
+
+                task_progress.succeeded += 1
+                if task_progress.attempted % status_interval == 0:
+                    step = u'Calculating Grades'
+                    task_progress.update_task_state(extra_meta={'step': step})
+                    log_message = u'{0} {1}/{2}'.format(step, task_progress.attempted, task_progress.total)
+                    log_task_info(log_message)
+
+                yield student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values)
+
+        with RowSpool() as error_rows:
+            rows = student_rows(error_rows)
+            # Perform the upload if any students have been successfully graded,
+            # streaming the rows into the report as the students are graded.
+            first_row = next(rows, None)
+            if first_row is not None:
+                log_task_info('Uploading CSV to store')
+                upload_csv_to_report_store(
+                    chain([header, first_row], rows), 'problem_grade_report', course_id, start_date,
+                )
+            # If there are any error rows, write them out as well
+            if len(error_rows) > 0:
+                upload_csv_to_report_store(
+                    chain([error_header], error_rows), 'problem_grade_report_err', course_id, start_date,
+                )
 
         return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
 
@@ -672,7 +938,7 @@ class ProblemResponses(object):
                 yield result
 
     @classmethod
-    def _build_student_data(cls, user_id, course_key, usage_key_str):
+    def _build_student_data(cls, user_id, course_key, usage_key_str, student_data=None):
         """
         Generate a list of problem responses for all problem under the
         ``problem_location`` root.
@@ -683,6 +949,8 @@ class ProblemResponses(object):
                 is being generated
             usage_key_str (str): The generated report will include this
                 block and it child blocks.
+            student_data (list): Optional list-like object, such as a
+                ``RowSpool``, that the student data is appended to.
 
         Returns:
               Tuple[List[Dict], List[str]]: Returns a list of dictionaries
@@ -693,7 +961,8 @@ class ProblemResponses(object):
         user = get_user_model().objects.get(pk=user_id)
         course_blocks = get_course_blocks(user, usage_key)
 
-        student_data = []
+        if student_data is None:
+            student_data = []
         max_count = settings.FEATURES.get('MAX_PROBLEM_RESPONSES_COUNT')
 
         store = modulestore()
@@ -743,7 +1012,7 @@ class ProblemResponses(object):
                     else:
                         responses.append(response)
 
-                student_data += responses
+                student_data.extend(responses)
 
                 if max_count is not None:
                     max_count -= len(responses)
@@ -775,31 +1044,31 @@ class ProblemResponses(object):
         task_progress.update_task_state(extra_meta=current_step)
         problem_location = task_input.get('problem_location')
 
-        # Compute result table and format it
-        student_data, student_data_keys = cls._build_student_data(
-            user_id=task_input.get('user_id'),
-            course_key=course_id,
-            usage_key_str=problem_location
-        )
-
-        for data in student_data:
-            for key in student_data_keys:
-                data.setdefault(key, '')
-
-        header, rows = format_dictlist(student_data, student_data_keys)
+        # Compute result table and format it.  The columns are only known once
+        # all the student data is computed, so it is spooled to disk meanwhile.
+        with RowSpool() as spooled_student_data:
+            student_data, student_data_keys = cls._build_student_data(
+                user_id=task_input.get('user_id'),
+                course_key=course_id,
+                usage_key_str=problem_location,
+                student_data=spooled_student_data,
+            )
 
-        task_progress.attempted = task_progress.succeeded = len(rows)
-        task_progress.skipped = task_progress.total - task_progress.attempted
+            task_progress.attempted = task_progress.succeeded = len(student_data)
+            task_progress.skipped = task_progress.total - task_progress.attempted
 
-        rows.insert(0, header)
+            rows = chain(
+                [student_data_keys],
+                ([data.get(key, '') for key in student_data_keys] for data in student_data),
+            )
 
-        current_step = {'step': 'Uploading CSV'}
-        task_progress.update_task_state(extra_meta=current_step)
+            current_step = {'step': 'Uploading CSV'}
+            task_progress.update_task_state(extra_meta=current_step)
 
-        # Perform the upload
-        problem_location = re.sub(r'[:/]', '_', problem_location)
-        csv_name = 'student_state_from_{}'.format(problem_location)
-        report_name = upload_csv_to_report_store(rows, csv_name, course_id, start_date)
+            # Perform the upload
+            problem_location = re.sub(r'[:/]', '_', problem_location)
+            csv_name = 'student_state_from_{}'.format(problem_location)
+            report_name = upload_csv_to_report_store(rows, csv_name, course_id, start_date)
         current_step = {'step': 'CSV uploaded', 'report_name': report_name}
 
         return task_progress.update_task_state(extra_meta=current_step)
@@ -21,7 +21,7 @@ from pytz import UTC
 
 from lms.djangoapps.instructor_analytics.basic import get_proctored_exam_results
 from lms.djangoapps.instructor_analytics.csvs import format_dictlist
-from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from openedx.core.djangoapps.course_groups.cohorts import BULK_COHORT_ASSIGNMENT_CHUNK_SIZE, add_users_to_cohorts
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from survey.models import SurveyAnswer
 from util.file import UniversalNewlineIterator
@@ -199,6 +199,8 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
         else:
             reader = unicodecsv.DictReader(_get_csv_file_content(f), encoding='utf-8')
 
+        # Rows of existing cohorts, as (cohort_name, username_or_email), to be added in bulk.
+        assignments = []
         for row in reader:
             # Try to use the 'email' field to identify the user.  If it's not present, use 'username'.
             username_or_email = row.get('email') or row.get('username')
@@ -227,31 +229,37 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
                 task_progress.failed += 1
                 continue
 
-            try:
-                # If add_user_to_cohort successfully adds a user, a user object is returned.
-                # If a user is preassigned to a cohort, no user object is returned (we already have the email address).
-                (user, previous_cohort, preassigned) = add_user_to_cohort(cohorts_status[cohort_name]['cohort'], username_or_email)
-                if preassigned:
-                    cohorts_status[cohort_name]['Preassigned Learners'].add(username_or_email)
-                    task_progress.preassigned += 1
-                else:
-                    cohorts_status[cohort_name]['Learners Added'] += 1
-                    task_progress.succeeded += 1
-            except User.DoesNotExist:
-                # Raised when a user with the username could not be found, and the email is not valid
-                cohorts_status[cohort_name]['Learners Not Found'].add(username_or_email)
-                task_progress.failed += 1
-            except ValidationError:
-                # Raised when a user with the username could not be found, and the email is not valid,
-                # but the entered string contains an "@"
-                # Since there is no way to know if the entered string is an invalid username or an invalid email,
-                # assume that a string with the "@" symbol in it is an attempt at entering an email
-                cohorts_status[cohort_name]['Invalid Email Addresses'].add(username_or_email)
-                task_progress.failed += 1
-            except ValueError:
-                # Raised when the user is already in the given cohort
-                task_progress.skipped += 1
+            assignments.append((cohort_name, username_or_email))
+
+    results = add_users_to_cohorts(
+        course_id,
+        ((cohorts_status[cohort_name]['cohort'], username_or_email) for cohort_name, username_or_email in assignments),
+    )
+    for index, ((cohort_name, username_or_email), result) in enumerate(zip(assignments, results)):
+        # A successful assignment is a (user, previous_cohort, preassigned) tuple.  If a user is
+        # preassigned to a cohort, no user object is returned (we already have the email address).
+        if isinstance(result, User.DoesNotExist):
+            # Raised when a user with the username could not be found, and the email is not valid
+            cohorts_status[cohort_name]['Learners Not Found'].add(username_or_email)
+            task_progress.failed += 1
+        elif isinstance(result, ValidationError):
+            # Raised when a user with the username could not be found, and the email is not valid,
+            # but the entered string contains an "@"
+            # Since there is no way to know if the entered string is an invalid username or an invalid email,
+            # assume that a string with the "@" symbol in it is an attempt at entering an email
+            cohorts_status[cohort_name]['Invalid Email Addresses'].add(username_or_email)
+            task_progress.failed += 1
+        elif isinstance(result, ValueError):
+            # Raised when the user is already in the given cohort
+            task_progress.skipped += 1
+        elif result[2]:
+            cohorts_status[cohort_name]['Preassigned Learners'].add(username_or_email)
+            task_progress.preassigned += 1
+        else:
+            cohorts_status[cohort_name]['Learners Added'] += 1
+            task_progress.succeeded += 1
 
+        if (index + 1) % BULK_COHORT_ASSIGNMENT_CHUNK_SIZE == 0:
             task_progress.update_task_state(extra_meta=current_step)
 
     current_step['step'] = 'Uploading CSV'
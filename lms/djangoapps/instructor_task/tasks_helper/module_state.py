@@ -15,8 +15,8 @@ from xblock.scorable import Score
 
 from capa.responsetypes import LoncapaProblemError, ResponseError, StudentInputError
 from lms.djangoapps.courseware.courses import get_course_by_id, get_problems_in_section
-from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache
-from lms.djangoapps.courseware.models import StudentModule
+from lms.djangoapps.courseware.model_data import BulkUserStateCache, DjangoKeyValueStore, FieldDataCache
+from lms.djangoapps.courseware.models import StudentModule, chunks
 from lms.djangoapps.courseware.module_render import get_module_for_descriptor_internal
 from lms.djangoapps.grades.api import events as grades_events
 from student.models import get_user_by_username_or_email
@@ -31,6 +31,10 @@ from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED,
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# The number of student modules whose users' state is prefetched at once
+# for the update functions that load module instances.
+STUDENT_MODULES_PER_PREFETCH = 100
+
 
 def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
     """
@@ -39,9 +43,12 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     The student modules are fetched for update the `update_fcn` is called on each StudentModule
     that passes the resulting filtering. It is passed four arguments:  the module_descriptor for
     the module pointed to by the module_state_key, the particular StudentModule to update, the
-    xmodule_instance_args, and the task_input being passed through.  If the value returned by the
-    update function evaluates to a boolean True, the update is successful; False indicates the update
-    on the particular student module failed.
+    xmodule_instance_args, and the task_input being passed through.  It is also passed a
+    `bulk_user_state` keyword argument: a BulkUserStateCache for the users of a batch of student
+    modules, from which module instances can be created without querying state per user, as long
+    as it has not changed since the batch was prefetched.
+    If the value returned by the update function evaluates to a boolean True, the update is
+    successful; False indicates the update on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
     The return value is a dict containing the task's results, with the following keys:
@@ -89,28 +96,41 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        module_descriptor = problems[six.text_type(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        update_status = update_fcn(module_descriptor, module_to_update, task_input)
-        if update_status == UPDATE_STATUS_SUCCEEDED:
-            # If the update_fcn returns true, then it performed some kind of work.
-            # Logging of failures is left to the update_fcn itself.
-            task_progress.succeeded += 1
-        elif update_status == UPDATE_STATUS_FAILED:
-            task_progress.failed += 1
-        elif update_status == UPDATE_STATUS_SKIPPED:
-            task_progress.skipped += 1
-        else:
-            raise UpdateProblemModuleStateError(u"Unexpected update_status returned: {}".format(update_status))
+    for modules_chunk in chunks(modules_to_update, STUDENT_MODULES_PER_PREFETCH):
+        # State is only loaded if the update_fcn asks for it.
+        bulk_user_state = BulkUserStateCache.for_descriptor_descendents(
+            [module_to_update.student for module_to_update in modules_chunk],
+            course_id,
+            [
+                problems[module_state_key]
+                for module_state_key in set(
+                    six.text_type(module_to_update.module_state_key) for module_to_update in modules_chunk
+                )
+            ],
+        )
+        for module_to_update in modules_chunk:
+            task_progress.attempted += 1
+            module_descriptor = problems[six.text_type(module_to_update.module_state_key)]
+            # There is no try here:  if there's an error, we let it throw, and the task will
+            # be marked as FAILED, with a stack trace.
+            update_status = update_fcn(module_descriptor, module_to_update, task_input, bulk_user_state=bulk_user_state)
+            if update_status == UPDATE_STATUS_SUCCEEDED:
+                # If the update_fcn returns true, then it performed some kind of work.
+                # Logging of failures is left to the update_fcn itself.
+                task_progress.succeeded += 1
+            elif update_status == UPDATE_STATUS_FAILED:
+                task_progress.failed += 1
+            elif update_status == UPDATE_STATUS_SKIPPED:
+                task_progress.skipped += 1
+            else:
+                raise UpdateProblemModuleStateError(u"Unexpected update_status returned: {}".format(update_status))
 
     return task_progress.update_task_state()
 
 
 @outer_atomic
-def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, task_input):
+def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, task_input,
+                                 bulk_user_state=None):
     '''
     Takes an XModule descriptor and a corresponding StudentModule object, and
     performs rescoring on the student's problem submission.
@@ -138,7 +158,8 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
             module_descriptor,
             xmodule_instance_args,
             grade_bucket_type='rescore',
-            course=course
+            course=course,
+            bulk_user_state=bulk_user_state,
         )
 
         if instance is None:
@@ -197,7 +218,8 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
 
 
 @outer_atomic
-def override_score_module_state(xmodule_instance_args, module_descriptor, student_module, task_input):
+def override_score_module_state(xmodule_instance_args, module_descriptor, student_module, task_input,
+                                bulk_user_state=None):
     '''
     Takes an XModule descriptor and a corresponding StudentModule object, and
     performs an override on the student's problem score.
@@ -223,7 +245,8 @@ def override_score_module_state(xmodule_instance_args, module_descriptor, studen
             student,
             module_descriptor,
             xmodule_instance_args,
-            course=course
+            course=course,
+            bulk_user_state=bulk_user_state,
         )
 
         if instance is None:
@@ -277,7 +300,8 @@ def override_score_module_state(xmodule_instance_args, module_descriptor, studen
 
 
 @outer_atomic
-def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, student_module, _task_input):
+def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, student_module, _task_input,
+                                bulk_user_state=None):  # pylint: disable=unused-argument
     """
     Resets problem attempts to zero for specified `student_module`.
 
@@ -304,7 +328,8 @@ def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, stude
 
 
 @outer_atomic
-def delete_problem_module_state(xmodule_instance_args, _module_descriptor, student_module, _task_input):
+def delete_problem_module_state(xmodule_instance_args, _module_descriptor, student_module, _task_input,
+                                bulk_user_state=None):  # pylint: disable=unused-argument
     """
     Delete the StudentModule entry.
 
@@ -319,16 +344,24 @@ def delete_problem_module_state(xmodule_instance_args, _module_descriptor, stude
 
 
 def _get_module_instance_for_task(course_id, student, module_descriptor, xmodule_instance_args=None,
-                                  grade_bucket_type=None, course=None):
+                                  grade_bucket_type=None, course=None, bulk_user_state=None):
     """
     Fetches a StudentModule instance for a given `course_id`, `student` object, and `module_descriptor`.
 
     `xmodule_instance_args` is used to provide information for creating a track function and an XQueue callback.
     These are passed, along with `grade_bucket_type`, to get_module_for_descriptor_internal, which sidesteps
     the need for a Request object when instantiating an xmodule instance.
+
+    If `bulk_user_state` is given, the student's state is taken from that BulkUserStateCache,
+    unless it was found to have changed since it was prefetched.
     """
     # reconstitute the problem's corresponding XModule:
-    field_data_cache = FieldDataCache.cache_for_descriptor_descendents(course_id, student, module_descriptor)
+    field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+        course_id,
+        student,
+        module_descriptor,
+        user_state_cache=bulk_user_state.for_user(student) if bulk_user_state is not None else None,
+    )
     student_data = KvsFieldData(DjangoKeyValueStore(field_data_cache))
 
     # get request-related tracking information from args passthrough, and supplement with task-specific
@@ -420,7 +453,7 @@ def _get_modules_to_update(course_id, usage_keys, student_identifier, filter_fcn
     if student:
         module_query_params['student_id'] = student.id
 
-    student_modules = StudentModule.get_state_by_params(**module_query_params)
+    student_modules = StudentModule.get_state_by_params(**module_query_params).select_related('student')
     if filter_fcn is not None:
         student_modules = filter_fcn(student_modules)
 
@@ -3,6 +3,9 @@ Utility methods for instructor tasks
 """
 
 
+import pickle
+from tempfile import TemporaryFile
+
 from eventtracking import tracker
 
 from lms.djangoapps.instructor_task.models import ReportStore
@@ -30,6 +33,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            Any iterable of rows, such as a generator, may be used; rows
+            are written out one at a time as they are produced.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
 
@@ -48,6 +53,56 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
     return report_name
 
 
+class RowSpool(object):
+    """
+    List-like store of report rows that keeps them in a temporary file
+    rather than in memory, for rows that have to be held until the report
+    is ready to be written, e.g. error rows or rows whose headers are only
+    known once all of them have been computed.  All rows are expected to
+    be appended before they are read back.
+
+    Use it as a context manager to remove the temporary file once done.
+    """
+    def __init__(self):
+        self._file = TemporaryFile()
+        self._count = 0
+
+    def append(self, row):
+        """
+        Add the given row, which may be any picklable value, to the end.
+        """
+        self._file.seek(0, 2)
+        pickle.dump(row, self._file, pickle.HIGHEST_PROTOCOL)
+        self._count += 1
+
+    def extend(self, rows):
+        """
+        Add the given rows to the end.
+        """
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        self._file.seek(0)
+        for _ in range(self._count):
+            yield pickle.load(self._file)
+
+    def close(self):
+        """
+        Remove the temporary file.
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 def tracker_emit(report_name):
     """
     Emits a 'report.requested' event for the given report.
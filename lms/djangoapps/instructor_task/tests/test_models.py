@@ -69,6 +69,22 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_read_rows(self):
+        """
+        Test that rows stored with ReportStore.store_rows() can be read
+        back and deleted.
+        """
+        report_store = self.create_report_store()
+        rows = [[u'Student ID', u'Name'], [u'1', u'ni\xf1o'], [u'2', u'line\nbreak']]
+        report_store.store_rows(self.course_id, 'parts/rows.csv', rows)
+
+        self.assertTrue(report_store.exists(self.course_id, 'parts/rows.csv'))
+        self.assertEqual(list(report_store.read_rows(self.course_id, 'parts/rows.csv')), rows)
+        self.assertEqual(report_store.links_for(self.course_id), [])
+
+        report_store.delete(self.course_id, 'parts/rows.csv')
+        self.assertFalse(report_store.exists(self.course_id, 'parts/rows.csv'))
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -9,11 +9,13 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import json
 import os
 import shutil
 import tempfile
 from contextlib import contextmanager
 from datetime import datetime, timedelta
+from uuid import uuid4
 
 from six import text_type
 from six.moves import range, zip
@@ -23,9 +25,12 @@ import ddt
 import openedx.core.djangoapps.user_api.course_tag.api as course_tag_api
 import unicodecsv
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
+from celery.states import FAILURE, SUCCESS
 from course_modes.models import CourseMode
 from course_modes.tests.factories import CourseModeFactory
 from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
 from django.test.utils import override_settings
 from django.urls import reverse
 from edx_django_utils.cache import RequestCache
@@ -57,6 +62,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_course_survey_report,
     upload_ora2_data
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -91,8 +97,8 @@ from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, chec
 from xmodule.partitions.partitions import Group, UserPartition
 
 from ..config.waffle import GENERATE_GRADE_REPORT_VERIFIED_ONLY
-from ..models import ReportStore
-from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED
+from ..models import InstructorTask, ReportStore
+from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED, RowSpool
 
 _TEAMS_CONFIG = TeamsConfig({
     'max_size': 2,
@@ -484,6 +490,163 @@ class TestTeamGradeReport(InstructorGradeReportTestCase):
         self._verify_cell_data_for_user(self.student2.username, self.course.id, 'Team Name', team2.name)
 
 
+class TestParallelGradeReport(InstructorGradeReportTestCase):
+    """ Test that a grade report graded in shards by subtasks matches the sequential report. """
+
+    def setUp(self):
+        super(TestParallelGradeReport, self).setUp()
+        self.course = CourseFactory.create()
+        for index in range(5):
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='grade_course',
+        )
+        self.report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    def _report_rows(self, csv_name, timestamp):
+        """
+        Returns the rows of the report with the given name and timestamp.
+        """
+        report_name = [
+            name for name, __ in self.report_store.links_for(self.course.id)
+            if u'_{}_{}'.format(csv_name, timestamp) in name
+        ]
+        self.assertEqual(len(report_name), 1)
+        return list(self.report_store.read_rows(self.course.id, report_name[0]))
+
+    def _queue_shards(self):
+        """
+        Queues the grade report shards, and returns the arguments of each.
+        """
+        queued_shards = []
+        shard_task = Mock()
+        shard_task.subtask.side_effect = lambda args, **kwargs: Mock(
+            apply_async=lambda: queued_shards.append(args)
+        )
+        with override_settings(GRADE_REPORT_LEARNERS_PER_SUBTASK=2):
+            CourseGradeReport.queue_shards(shard_task, None, self.entry.id, self.course.id, {}, 'graded')
+        self.assertEqual(len(queued_shards), 3)
+        return queued_shards
+
+    def _run_shard(self, args):
+        """
+        Runs the grade report shard queued with the given arguments, as
+        calculate_grades_csv_shard does.
+        """
+        entry_id, xmodule_instance_args = args[:2]
+        CourseGradeReport.generate_shard(xmodule_instance_args, entry_id, *args[2:])
+
+    def _generate_in_shards(self):
+        """
+        Queues the grade report shards, then runs them in reverse order.
+        """
+        for args in reversed(self._queue_shards()):
+            self._run_shard(args)
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_matches_sequential_report(self, _mock_current_task):
+        with freeze_time('2020-01-01 00:00:00'):
+            self._generate_in_shards()
+        with freeze_time('2020-01-01 00:01:00'):
+            CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+
+        sharded_rows = self._report_rows('grade_report', '2020-01-01-0000')
+        self.assertEqual(len(sharded_rows), 6)
+        self.assertEqual(sharded_rows, self._report_rows('grade_report', '2020-01-01-0001'))
+
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(entry.task_output))
+        # The partial CSVs are removed once merged.
+        self.assertFalse(
+            self.report_store.exists(self.course.id, u'grade_report_shards/{}/grades_00000.csv'.format(self.entry.id))
+        )
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    @patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.iter')
+    def test_grading_failure(self, mock_grades_iter, _mock_current_task):
+        mock_grades_iter.side_effect = lambda users, **kwargs: [
+            (user, None, TypeError('Cannot grade student')) for user in users
+        ]
+        with freeze_time('2020-01-01 00:00:00'):
+            self._generate_in_shards()
+
+        self.assertEqual(len(self._report_rows('grade_report', '2020-01-01-0000')), 1)
+        error_rows = self._report_rows('grade_report_err', '2020-01-01-0000')
+        self.assertEqual(error_rows[0], ['Student ID', 'Username', 'Error'])
+        self.assertEqual(len(error_rows), 6)
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_task_completed_after_merge(self, _mock_current_task):
+        queued_shards = self._queue_shards()
+        for args in queued_shards[:-1]:
+            self._run_shard(args)
+        self.assertNotEqual(InstructorTask.objects.get(pk=self.entry.id).task_state, SUCCESS)
+
+        with patch.object(CourseGradeReport, '_merge_shards_if_complete') as mock_merge:
+            self._run_shard(queued_shards[-1])
+        self.assertTrue(mock_merge.called)
+        # The last shard leaves completing the task to the merge.
+        self.assertNotEqual(InstructorTask.objects.get(pk=self.entry.id).task_state, SUCCESS)
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_shard_failure(self, _mock_current_task):
+        queued_shards = self._queue_shards()
+        write_shard = CourseGradeReport._write_shard
+
+        def _write_shard(report, context, entry_id, shard_number, user_ids):
+            if shard_number == 1:
+                raise TypeError('Cannot grade shard')
+            return write_shard(report, context, entry_id, shard_number, user_ids)
+
+        with freeze_time('2020-01-01 00:00:00'):
+            with patch.object(CourseGradeReport, '_write_shard', _write_shard):
+                for args in reversed(queued_shards):
+                    if args[2] == 1:
+                        with self.assertRaises(TypeError):
+                            self._run_shard(args)
+                    else:
+                        self._run_shard(args)
+
+        # No partial report is uploaded, and the partial CSVs are removed.
+        self.assertEqual(self.report_store.links_for(self.course.id), [])
+        self.assertFalse(
+            self.report_store.exists(self.course.id, u'grade_report_shards/{}/grades_00000.csv'.format(self.entry.id))
+        )
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['exception'], 'GradeReportShardsError')
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    @patch('lms.djangoapps.instructor_task.tasks_helper.grades.upload_csv_to_report_store')
+    def test_merge_failure(self, mock_upload, _mock_current_task):
+        mock_upload.side_effect = ValueError('Cannot upload grade report')
+        self._generate_in_shards()
+
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['exception'], 'ValueError')
+        # The merge lock is released.
+        self.assertIsNone(cache.get(u'grade-report-merge-{}'.format(self.entry.id)))
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_fewer_learners_than_counted(self, _mock_current_task):
+        # 7 learners are counted, but only 5 remain enrolled when the shards are built
+        with patch('django.db.models.query.QuerySet.count', return_value=7):
+            queued_shards = self._queue_shards()
+        self.assertEqual(json.loads(InstructorTask.objects.get(pk=self.entry.id).subtasks)['total'], 3)
+
+        with freeze_time('2020-01-01 00:00:00'):
+            for args in queued_shards:
+                self._run_shard(args)
+
+        self.assertEqual(len(self._report_rows('grade_report', '2020-01-01-0000')), 6)
+        self.assertEqual(InstructorTask.objects.get(pk=self.entry.id).task_state, SUCCESS)
+
+
 # pylint: disable=protected-access
 class TestProblemResponsesReport(TestReportMixin, InstructorTaskModuleTestCase):
     """
@@ -2832,3 +2995,18 @@ class TestInstructorOra2Report(SharedModuleStoreTestCase):
 
                     self.assertEqual(return_val, UPDATE_STATUS_SUCCEEDED)
                     mock_store_rows.assert_called_once_with(self.course.id, filename, [test_header] + test_rows)
+
+
+class TestRowSpool(TestCase):
+    """
+    Tests for the RowSpool used to hold report rows on disk.
+    """
+    def test_rows_round_trip(self):
+        rows = [[1, u'ni\xf1o'], {'username': 'student', 'state': None}]
+        with RowSpool() as spool:
+            spool.extend(rows)
+            spool.append([2.5])
+            self.assertEqual(len(spool), 3)
+            self.assertEqual(list(spool), rows + [[2.5]])
+            # The rows can be read back more than once.
+            self.assertEqual(list(spool), rows + [[2.5]])
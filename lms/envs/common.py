@@ -471,6 +471,8 @@ NODE_PATH = ':'.join(node_paths)
 
 # For geolocation ip database
 GEOIP_PATH = REPO_ROOT / "common/static/data/geoip/GeoLite2-Country.mmdb"
+# Maximum number of IP addresses whose country each process keeps in memory
+GEOIP_COUNTRY_CACHE_SIZE = 10000
 # Where to look for a status message
 STATUS_MESSAGE_PATH = ENV_ROOT / "status_message.json"
 
@@ -538,6 +540,11 @@ CACHES = {
     },
 }
 
+# Maximum total size, in bytes of pickled data, of the per-process LRU cache of
+# split modulestore course structures that sits in front of the
+# course_structure_cache. Set to 0 to disable the per-process cache.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 0
+
 ############################ OpenID Provider  ##################################
 OPENID_PROVIDER_TRUSTED_ROOTS = ['cs50.net', '*.cs50.net']
 
@@ -996,6 +1003,13 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# Directory of the per-node disk cache of course assets served by the contentserver, or None to disable it.
+COURSE_ASSETS_DISK_CACHE_DIR = None
+# Maximum total size in bytes of the assets in the disk cache, above which the least recently served are removed
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+# Assets larger than this many bytes are not stored in the disk cache
+COURSE_ASSETS_DISK_CACHE_MAX_ITEM_SIZE = 4 * 1024 * 1024
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -1095,6 +1109,10 @@ CODE_JAIL = {
 #   ]
 COURSES_WITH_UNSAFE_CODE = []
 
+# Maximum number of sandboxed code execution results that each process keeps in
+# memory, in front of the django cache. Set to 0 to disable the per-process cache.
+SAFE_EXEC_LOCAL_CACHE_SIZE = 500
+
 ############################### DJANGO BUILT-INS ###############################
 # Change DEBUG in your environment settings files, not here
 DEBUG = False
@@ -2797,8 +2815,15 @@ BADGR_TIMEOUT = 10
 # the ones that contain information other than grades.
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Number of learners graded by each subtask of a course grade report when the
+# instructor_task.parallel_grade_report waffle switch is enabled.
+GRADE_REPORT_LEARNERS_PER_SUBTASK = 5000
+
 POLICY_CHANGE_GRADES_ROUTING_KEY = 'edx.lms.core.default'
 
+# Queue to use for updating the grade counts of the grade histograms shown to staff
+GRADE_COUNTS_ROUTING_KEY = 'edx.lms.core.default'
+
 RECALCULATE_GRADES_ROUTING_KEY = 'edx.lms.core.default'
 
 GRADES_DOWNLOAD = {
@@ -3297,6 +3322,15 @@ CREDENTIALS_PUBLIC_SERVICE_URL = 'http://localhost:8005'
 
 COMMENTS_SERVICE_URL = 'http://localhost:18080'
 COMMENTS_SERVICE_KEY = 'password'
+# Maximum number of keep-alive connections to the comments service kept by each
+# process. Set to 0 to open a new connection for every request.
+COMMENTS_SERVICE_HTTP_POOL_SIZE = 0
+# Number of times a request to the comments service is retried when connecting
+# fails. Only used when COMMENTS_SERVICE_HTTP_POOL_SIZE is set.
+COMMENTS_SERVICE_HTTP_MAX_RETRIES = 0
+# Maximum number of independent comments service requests a discussion view may
+# issue concurrently. Set to 1 to issue them one after the other.
+COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS = 1
 
 # Reverification checkpoint name pattern
 CHECKPOINT_PATTERN = r'(?P<checkpoint_name>[^/]+)'
@@ -244,6 +244,10 @@ if 'loc_cache' not in CACHES:
 if 'staticfiles' in CACHES:
     CACHES['staticfiles']['KEY_PREFIX'] = EDX_PLATFORM_REVISION
 
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES', COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES
+)
+
 # In order to transition from local disk asset storage to S3 backed asset storage,
 # we need to run asset collection twice, once for local disk and once for S3.
 # Once we have migrated to service assets off S3, then we can convert this back to
@@ -391,6 +395,13 @@ LOGGING = get_logger_config(LOG_DIR,
 COURSE_LISTINGS = ENV_TOKENS.get('COURSE_LISTINGS', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_HTTP_POOL_SIZE = ENV_TOKENS.get('COMMENTS_SERVICE_HTTP_POOL_SIZE', COMMENTS_SERVICE_HTTP_POOL_SIZE)
+COMMENTS_SERVICE_HTTP_MAX_RETRIES = ENV_TOKENS.get(
+    'COMMENTS_SERVICE_HTTP_MAX_RETRIES', COMMENTS_SERVICE_HTTP_MAX_RETRIES
+)
+COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS = ENV_TOKENS.get(
+    'COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS', COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS
+)
 CERT_NAME_SHORT = ENV_TOKENS.get('CERT_NAME_SHORT', CERT_NAME_SHORT)
 CERT_NAME_LONG = ENV_TOKENS.get('CERT_NAME_LONG', CERT_NAME_LONG)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
@@ -421,9 +432,20 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
         CODE_JAIL[name] = value
 
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
+SAFE_EXEC_LOCAL_CACHE_SIZE = ENV_TOKENS.get('SAFE_EXEC_LOCAL_CACHE_SIZE', SAFE_EXEC_LOCAL_CACHE_SIZE)
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
 
+GEOIP_COUNTRY_CACHE_SIZE = ENV_TOKENS.get('GEOIP_COUNTRY_CACHE_SIZE', GEOIP_COUNTRY_CACHE_SIZE)
+
+COURSE_ASSETS_DISK_CACHE_DIR = ENV_TOKENS.get('COURSE_ASSETS_DISK_CACHE_DIR', COURSE_ASSETS_DISK_CACHE_DIR)
+COURSE_ASSETS_DISK_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_ASSETS_DISK_CACHE_MAX_SIZE', COURSE_ASSETS_DISK_CACHE_MAX_SIZE
+)
+COURSE_ASSETS_DISK_CACHE_MAX_ITEM_SIZE = ENV_TOKENS.get(
+    'COURSE_ASSETS_DISK_CACHE_MAX_ITEM_SIZE', COURSE_ASSETS_DISK_CACHE_MAX_ITEM_SIZE
+)
+
 # Event Tracking
 if "TRACKING_IGNORE_URL_PATTERNS" in ENV_TOKENS:
     TRACKING_IGNORE_URL_PATTERNS = ENV_TOKENS.get("TRACKING_IGNORE_URL_PATTERNS")
@@ -672,9 +694,15 @@ DISABLE_ACCOUNT_ACTIVATION_REQUIREMENT_SWITCH = ENV_TOKENS.get(
 
 # Grades download
 GRADES_DOWNLOAD_ROUTING_KEY = ENV_TOKENS.get('GRADES_DOWNLOAD_ROUTING_KEY', HIGH_MEM_QUEUE)
+GRADE_REPORT_LEARNERS_PER_SUBTASK = ENV_TOKENS.get(
+    'GRADE_REPORT_LEARNERS_PER_SUBTASK', GRADE_REPORT_LEARNERS_PER_SUBTASK
+)
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
 
+# Queue to use for updating the grade counts of the grade histograms shown to staff
+GRADE_COUNTS_ROUTING_KEY = ENV_TOKENS.get('GRADE_COUNTS_ROUTING_KEY', DEFAULT_PRIORITY_QUEUE)
+
 # Rate limit for regrading tasks that a grading policy change can kick off
 POLICY_CHANGE_TASK_RATE_LIMIT = ENV_TOKENS.get('POLICY_CHANGE_TASK_RATE_LIMIT', POLICY_CHANGE_TASK_RATE_LIMIT)
 
@@ -4,6 +4,12 @@ PROGRAM_CACHE_KEY_TPL = 'program-{uuid}'
 # Cache key used to locate an item containing a list of all program UUIDs for a site.
 SITE_PROGRAM_UUIDS_CACHE_KEY_TPL = 'program-uuids-{domain}'
 
+# Cache key used to locate an item containing the time the programs of a site were last cached successfully.
+SITE_PROGRAMS_LAST_CACHED_CACHE_KEY_TPL = 'programs-last-cached-{domain}'
+
+# Cache key used to locate an item containing the time all the programs of a site were last requested and cached.
+SITE_PROGRAMS_LAST_FULL_REFRESH_CACHE_KEY_TPL = 'programs-last-full-refresh-{domain}'
+
 # Template used to create cache keys for individual pathways
 PATHWAY_CACHE_KEY_TPL = 'pathway-{id}'
 
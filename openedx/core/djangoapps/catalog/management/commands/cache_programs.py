@@ -4,12 +4,18 @@
 import logging
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from time import sleep
 
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
 from django.core.cache import cache
 from django.core.management import BaseCommand
+from pytz import UTC
 from six import text_type
+from six.moves import range
+from slumber.exceptions import HttpClientError
 
 from openedx.core.djangoapps.catalog.cache import (
     COURSE_PROGRAMS_CACHE_KEY_TPL,
@@ -18,7 +24,9 @@ from openedx.core.djangoapps.catalog.cache import (
     PROGRAMS_BY_ORGANIZATION_CACHE_KEY_TPL,
     PROGRAMS_BY_TYPE_CACHE_KEY_TPL,
     SITE_PATHWAY_IDS_CACHE_KEY_TPL,
-    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
+    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL,
+    SITE_PROGRAMS_LAST_CACHED_CACHE_KEY_TPL,
+    SITE_PROGRAMS_LAST_FULL_REFRESH_CACHE_KEY_TPL
 )
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.djangoapps.catalog.utils import (
@@ -30,6 +38,27 @@ from openedx.core.djangoapps.catalog.utils import (
 logger = logging.getLogger(__name__)
 User = get_user_model()  # pylint: disable=invalid-name
 
+# Number of program details requested at the same time from the catalog of a site.
+DEFAULT_WORKERS = 1
+
+# Number of times the request for the details of a program is retried after a
+# server or connection error, and the seconds waited before the first retry,
+# doubled before each following one.  Retries are opt-in, as they add load to
+# a catalog that is already failing.
+DEFAULT_RETRIES = 0
+DEFAULT_RETRY_BACKOFF = 1.0
+
+# Number of cache entries written by each cache.set_many call.
+DEFAULT_CACHE_CHUNK_SIZE = 500
+
+# Number of days after which incremental runs request the details of all the
+# programs of a site again.
+DEFAULT_FULL_REFRESH_DAYS = 1
+
+# Query parameter of the program listing endpoint of the catalog restricting
+# the programs listed to those modified since the given time.
+PROGRAMS_MODIFIED_SINCE_QUERY_PARAM = 'modified__gte'
+
 
 class Command(BaseCommand):
     """Management command used to cache program data.
@@ -38,12 +67,62 @@ class Command(BaseCommand):
     service, writing each to its own cache entry with an indefinite expiration.
     It is meant to be run on a scheduled basis and should be the only code
     updating these cache entries.
+
+    Example usage:
+        $ ./manage.py lms cache_programs --workers 8 --incremental
+
+    With --incremental, only the details of the programs modified since the
+    programs of a site were last cached successfully are requested again; the
+    cached details of the other programs are reused.  The modification time of
+    a program doesn't change when only the course runs nested in its details
+    do, so incremental runs still request the details of all the programs of a
+    site when they were not all requested in the last --full-refresh-days days.
     """
     help = "Rebuild the LMS' cache of program data."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS,
+            help=u'Number of program details requested at the same time from the catalog of a site.',
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=DEFAULT_RETRIES,
+            help=u'Number of times a program details request is retried after a server or connection error.',
+        )
+        parser.add_argument(
+            '--retry-backoff',
+            type=float,
+            default=DEFAULT_RETRY_BACKOFF,
+            help=u'Seconds waited before retrying a program details request, doubled for each following retry.',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help=u'Only request the details of the programs modified since the programs were last cached.',
+        )
+        parser.add_argument(
+            '--full-refresh-days',
+            type=int,
+            default=DEFAULT_FULL_REFRESH_DAYS,
+            help=u'Number of days after which an incremental run requests the details of all the programs again.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CACHE_CHUNK_SIZE,
+            help=u'Number of cache entries written at a time.',
+        )
+
     # pylint: disable=unicode-format-string
     def handle(self, *args, **options):
         failure = False
+        run_started_at = datetime.now(UTC)
+        run_started = run_started_at.isoformat()
+        chunk_size = options.get('chunk_size', DEFAULT_CACHE_CHUNK_SIZE)
         logger.info('populate-multitenant-programs switch is ON')
 
         catalog_integration = CatalogIntegration.current()
@@ -62,6 +141,8 @@ class Command(BaseCommand):
         courses = {}
         programs_by_type = {}
         organizations = {}
+        last_cached = {}
+        last_full_refresh = {}
         for site in Site.objects.all():
             site_config = getattr(site, 'configuration', None)
             if site_config is None or not site_config.get_value('COURSE_CATALOG_API_URL'):
@@ -72,18 +153,37 @@ class Command(BaseCommand):
 
             client = create_catalog_api_client(user, site=site)
             uuids, program_uuids_failed = self.get_site_program_uuids(client, site)
-            new_programs, program_details_failed = self.fetch_program_details(client, uuids)
+            new_programs = {}
+            if options.get('incremental') and not program_uuids_failed:
+                new_programs = self.get_unmodified_programs(
+                    client, site, uuids, options.get('full_refresh_days', DEFAULT_FULL_REFRESH_DAYS),
+                )
+            full_refresh = not new_programs
+            fetched_programs, program_details_failed = self.fetch_program_details(
+                client,
+                [uuid for uuid in uuids if PROGRAM_CACHE_KEY_TPL.format(uuid=uuid) not in new_programs],
+                workers=options.get('workers', DEFAULT_WORKERS),
+                retries=options.get('retries', DEFAULT_RETRIES),
+                retry_backoff=options.get('retry_backoff', DEFAULT_RETRY_BACKOFF),
+            )
+            new_programs.update(fetched_programs)
             new_pathways, pathways_failed = self.get_pathways(client, site)
             new_pathways, new_programs, pathway_processing_failed = self.process_pathways(
                 site, new_pathways, new_programs
             )
 
-            failure = any([
+            site_failure = any([
                 program_uuids_failed,
                 program_details_failed,
                 pathways_failed,
                 pathway_processing_failed,
             ])
+            failure = failure or site_failure
+            if not site_failure:
+                last_cached[SITE_PROGRAMS_LAST_CACHED_CACHE_KEY_TPL.format(domain=site.domain)] = run_started
+                if full_refresh:
+                    last_full_refresh_key = SITE_PROGRAMS_LAST_FULL_REFRESH_CACHE_KEY_TPL.format(domain=site.domain)
+                    last_full_refresh[last_full_refresh_key] = run_started_at
 
             programs.update(new_programs)
             pathways.update(new_pathways)
@@ -105,19 +205,24 @@ class Command(BaseCommand):
             cache.set(SITE_PATHWAY_IDS_CACHE_KEY_TPL.format(domain=site.domain), pathway_ids, None)
 
         logger.info(u'Caching details for {} programs.'.format(len(programs)))
-        cache.set_many(programs, None)
+        self.set_many(programs, chunk_size)
 
         logger.info(u'Caching details for {} pathways.'.format(len(pathways)))
-        cache.set_many(pathways, None)
+        self.set_many(pathways, chunk_size)
 
         logger.info(u'Caching programs uuids for {} courses.'.format(len(courses)))
-        cache.set_many(courses, None)
+        self.set_many(courses, chunk_size)
 
         logger.info(text_type('Caching program UUIDs by {} program types.'.format(len(programs_by_type))))
-        cache.set_many(programs_by_type, None)
+        self.set_many(programs_by_type, chunk_size)
 
         logger.info(u'Caching programs uuids for {} organizations'.format(len(organizations)))
-        cache.set_many(organizations, None)
+        self.set_many(organizations, chunk_size)
+
+        # Only once the programs are cached, so that an interrupted run is not
+        # mistaken for a successful one by the next incremental run.
+        self.set_many(last_cached, chunk_size)
+        self.set_many(last_full_refresh, chunk_size)
 
         if failure:
             sys.exit(1)
@@ -144,23 +249,125 @@ class Command(BaseCommand):
         ))
         return uuids, failure
 
-    def fetch_program_details(self, client, uuids):
+    def get_unmodified_programs(self, client, site, uuids, full_refresh_days=DEFAULT_FULL_REFRESH_DAYS):
+        """
+        Returns the cached details of the programs with the given uuids which
+        have not been modified since the programs of the site were last cached
+        successfully, by cache key.
+
+        Nothing is returned, so that all the programs are requested again, if
+        the programs of the site were never cached, if they were not all
+        requested in the last full_refresh_days days, or if the modified
+        programs cannot be retrieved.
+        """
+        last_cached = cache.get(SITE_PROGRAMS_LAST_CACHED_CACHE_KEY_TPL.format(domain=site.domain))
+        if last_cached is None:
+            logger.info(u'Programs were never cached for site {domain}.'.format(domain=site.domain))
+            return {}
+
+        last_full_refresh = cache.get(SITE_PROGRAMS_LAST_FULL_REFRESH_CACHE_KEY_TPL.format(domain=site.domain))
+        if last_full_refresh is None or last_full_refresh < datetime.now(UTC) - timedelta(days=full_refresh_days):
+            logger.info(u'Programs were not all requested in the last {days} days for site {domain}.'.format(
+                days=full_refresh_days,
+                domain=site.domain,
+            ))
+            return {}
+
+        try:
+            querystring = {
+                'exclude_utm': 1,
+                'status': ('active', 'retired'),
+                'uuids_only': 1,
+                PROGRAMS_MODIFIED_SINCE_QUERY_PARAM: last_cached,
+            }
+
+            logger.info(u'Requesting UUIDs of programs modified since {last_cached} for {domain}.'.format(
+                last_cached=last_cached,
+                domain=site.domain,
+            ))
+            modified_uuids = set(client.programs.get(**querystring))
+        except:  # pylint: disable=bare-except
+            logger.exception(u'Failed to retrieve modified program UUIDs for site: {domain}.'.format(
+                domain=site.domain
+            ))
+            return {}
+
+        programs = cache.get_many([
+            PROGRAM_CACHE_KEY_TPL.format(uuid=uuid) for uuid in uuids if uuid not in modified_uuids
+        ])
+        for program in programs.values():
+            # pathways get added in process_pathways
+            program['pathway_ids'] = []
+
+        logger.info(u'Reusing the cached details of {total} unmodified programs for site {domain}.'.format(
+            total=len(programs),
+            domain=site.domain,
+        ))
+        return programs
+
+    def fetch_program_details(self, client, uuids, workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES,
+                              retry_backoff=DEFAULT_RETRY_BACKOFF):
+        """
+        Requests the details of the programs with the given uuids, making up
+        to `workers` requests at the same time.
+        """
         programs = {}
         failure = False
-        for uuid in uuids:
-            try:
-                cache_key = PROGRAM_CACHE_KEY_TPL.format(uuid=uuid)
-                logger.info(u'Requesting details for program {uuid}.'.format(uuid=uuid))
-                program = client.programs(uuid).get(exclude_utm=1)
-                # pathways get added in process_pathways
-                program['pathway_ids'] = []
-                programs[cache_key] = program
-            except:  # pylint: disable=bare-except
-                logger.exception(u'Failed to retrieve details for program {uuid}.'.format(uuid=uuid))
+
+        def fetch(uuid):
+            """
+            Requests the details of a program, returns None if they cannot be retrieved.
+            """
+            return self.fetch_program(client, uuid, retries, retry_backoff)
+
+        if workers > 1 and len(uuids) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fetched_programs = list(executor.map(fetch, uuids))
+        else:
+            fetched_programs = [fetch(uuid) for uuid in uuids]
+
+        for uuid, program in zip(uuids, fetched_programs):
+            if program is None:
                 failure = True
                 continue
+            # pathways get added in process_pathways
+            program['pathway_ids'] = []
+            programs[PROGRAM_CACHE_KEY_TPL.format(uuid=uuid)] = program
         return programs, failure
 
+    def fetch_program(self, client, uuid, retries, retry_backoff):
+        """
+        Requests the details of the program with the given uuid, returns None
+        if they cannot be retrieved.
+
+        Requests failing with a server or connection error are retried up to
+        `retries` times, waiting retry_backoff seconds before the first retry,
+        and twice as long before each following one.
+        """
+        for attempt in range(retries + 1):
+            try:
+                logger.info(u'Requesting details for program {uuid}.'.format(uuid=uuid))
+                return client.programs(uuid).get(exclude_utm=1)
+            except Exception as error:  # pylint: disable=broad-except
+                if isinstance(error, HttpClientError) or attempt == retries:
+                    logger.exception(u'Failed to retrieve details for program {uuid}.'.format(uuid=uuid))
+                    return None
+                delay = retry_backoff * 2 ** attempt
+                logger.warning(u'Failed to retrieve details for program {uuid}, retrying in {delay}s: {error}'.format(
+                    uuid=uuid,
+                    delay=delay,
+                    error=error,
+                ))
+                sleep(delay)
+
+    def set_many(self, data, chunk_size):
+        """
+        Caches the given entries, which never expire, chunk_size entries at a time.
+        """
+        items = list(data.items())
+        for start in range(0, len(items), chunk_size):
+            cache.set_many(dict(items[start:start + chunk_size]), None)
+
     def get_pathways(self, client, site):
         """
         Get all pathways for the current client
@@ -3,8 +3,10 @@ Test cases for cache_programs command.
 """
 
 import json
+from datetime import timedelta
 
 import httpretty
+import mock
 from django.core.cache import cache
 from django.core.management import call_command
 
@@ -15,7 +17,9 @@ from openedx.core.djangoapps.catalog.cache import (
     PROGRAM_CACHE_KEY_TPL,
     PROGRAMS_BY_TYPE_CACHE_KEY_TPL,
     SITE_PATHWAY_IDS_CACHE_KEY_TPL,
-    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
+    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL,
+    SITE_PROGRAMS_LAST_CACHED_CACHE_KEY_TPL,
+    SITE_PROGRAMS_LAST_FULL_REFRESH_CACHE_KEY_TPL
 )
 from openedx.core.djangoapps.catalog.utils import normalize_program_type
 from openedx.core.djangoapps.catalog.tests.factories import OrganizationFactory, PathwayFactory, ProgramFactory
@@ -69,8 +73,11 @@ class TestCachePrograms(CatalogIntegrationMixin, CacheIsolationTestCase, SiteMix
         self.pathways[0]['programs'].extend([self.programs[0], self.programs[1]])
         self.pathways[1]['programs'].append(self.programs[0])
 
-    def mock_list(self):
-        """ Mock the data returned by the program listing API endpoint. """
+    def mock_list(self, modified_uuids=None):
+        """
+        Mock the data returned by the program listing API endpoint, listing
+        modified_uuids when asked for the programs modified since a time.
+        """
         # pylint: disable=unused-argument
         def list_callback(request, uri, headers):
             """ The mock listing callback. """
@@ -79,6 +86,15 @@ class TestCachePrograms(CatalogIntegrationMixin, CacheIsolationTestCase, SiteMix
                 'status': ['active', 'retired'],
                 'uuids_only': ['1']
             }
+            if modified_uuids is not None and 'modified__gte' in request.querystring:
+                self.assertEqual(
+                    request.querystring['modified__gte'],
+                    [cache.get(SITE_PROGRAMS_LAST_CACHED_CACHE_KEY_TPL.format(domain=self.site_domain))]
+                )
+                del request.querystring['modified__gte']
+                self.assertEqual(request.querystring, expected)
+                return (200, headers, json.dumps(modified_uuids))
+
             self.assertEqual(request.querystring, expected)
 
             return (200, headers, json.dumps(self.uuids))
@@ -404,3 +420,181 @@ class TestCachePrograms(CatalogIntegrationMixin, CacheIsolationTestCase, SiteMix
             # cached programs have a pathways field added to them, remove before comparing
             del program['pathway_ids']
             self.assertEqual(program, partial_programs[key])
+
+    def mock_programs(self, modified_uuids=None):
+        """
+        Mock the program listing, program detail and pathways API endpoints.
+        """
+        self.mock_list(modified_uuids)
+        self.mock_pathways(self.pathways)
+        for program in self.programs:
+            self.mock_detail(program['uuid'], program)
+
+    def assert_programs_cached(self, programs):
+        """
+        Verify that the given programs are cached.
+        """
+        cached_programs = cache.get_many([PROGRAM_CACHE_KEY_TPL.format(uuid=program['uuid']) for program in programs])
+        self.assertEqual(len(cached_programs), len(programs))
+        for program in programs:
+            cached_program = cached_programs[PROGRAM_CACHE_KEY_TPL.format(uuid=program['uuid'])]
+            del cached_program['pathway_ids']
+            self.assertEqual(cached_program, program)
+
+    def test_handle_programs_concurrently(self):
+        """
+        Verify that the command caches the same programs when requesting their details concurrently.
+        """
+        UserFactory(username=self.catalog_integration.service_username)
+        self.mock_programs()
+
+        call_command('cache_programs', workers=4)
+
+        self.assertEqual(
+            set(cache.get(SITE_PROGRAM_UUIDS_CACHE_KEY_TPL.format(domain=self.site_domain))),
+            set(self.uuids)
+        )
+        self.assert_programs_cached(self.programs)
+
+    @mock.patch('openedx.core.djangoapps.catalog.management.commands.cache_programs.sleep')
+    def test_retry_program_details(self, mock_sleep):
+        """
+        Verify that the command retries program details requests failing with a server error, with backoff.
+        """
+        UserFactory(username=self.catalog_integration.service_username)
+        self.mock_programs()
+        program = self.programs[0]
+        httpretty.register_uri(
+            httpretty.GET,
+            self.detail_tpl.format(uuid=program['uuid']),
+            responses=[
+                httpretty.Response(body='', status=500),
+                httpretty.Response(body='', status=503),
+                httpretty.Response(body=json.dumps(program), content_type='application/json'),
+            ]
+        )
+
+        call_command('cache_programs', retries=2, retry_backoff=0.5)
+
+        self.assertEqual(mock_sleep.call_args_list, [mock.call(0.5), mock.call(1.0)])
+        self.assert_programs_cached(self.programs)
+
+    @mock.patch('openedx.core.djangoapps.catalog.management.commands.cache_programs.sleep')
+    def test_no_retry_by_default(self, mock_sleep):
+        """
+        Verify that the command doesn't retry program details requests unless asked to.
+        """
+        UserFactory(username=self.catalog_integration.service_username)
+        self.mock_programs()
+        program = self.programs[0]
+        httpretty.register_uri(
+            httpretty.GET,
+            self.detail_tpl.format(uuid=program['uuid']),
+            responses=[
+                httpretty.Response(body='', status=500),
+                httpretty.Response(body=json.dumps(program), content_type='application/json'),
+            ]
+        )
+
+        with self.assertRaises(SystemExit) as context:
+            call_command('cache_programs')
+        self.assertEqual(context.exception.code, 1)
+
+        mock_sleep.assert_not_called()
+        self.assert_programs_cached(self.programs[1:])
+
+    @mock.patch('openedx.core.djangoapps.catalog.management.commands.cache_programs.sleep')
+    def test_no_retry_on_client_error(self, mock_sleep):
+        """
+        Verify that the command doesn't retry program details requests failing with a client error.
+        """
+        UserFactory(username=self.catalog_integration.service_username)
+        self.mock_programs()
+        httpretty.register_uri(
+            httpretty.GET,
+            self.detail_tpl.format(uuid=self.programs[0]['uuid']),
+            body='',
+            status=404,
+        )
+
+        with self.assertRaises(SystemExit) as context:
+            call_command('cache_programs', retries=2)
+        self.assertEqual(context.exception.code, 1)
+
+        mock_sleep.assert_not_called()
+        self.assert_programs_cached(self.programs[1:])
+        self.assertIsNone(cache.get(SITE_PROGRAMS_LAST_CACHED_CACHE_KEY_TPL.format(domain=self.site_domain)))
+
+    def test_incremental(self):
+        """
+        Verify that an incremental run only requests the details of the programs modified since the last run.
+        """
+        UserFactory(username=self.catalog_integration.service_username)
+        modified_program, unmodified_program = self.programs[:2]
+        self.mock_programs(modified_uuids=[modified_program['uuid']])
+
+        call_command('cache_programs')
+        self.assertIsNotNone(cache.get(SITE_PROGRAMS_LAST_CACHED_CACHE_KEY_TPL.format(domain=self.site_domain)))
+
+        cached_unmodified_program = dict(unmodified_program)
+        modified_program['title'] = 'Modified title'
+        unmodified_program['title'] = 'Title modified without listing the program as modified'
+        cache.delete(PROGRAM_CACHE_KEY_TPL.format(uuid=self.programs[2]['uuid']))
+
+        call_command('cache_programs', incremental=True)
+
+        # The modified program and the program missing from the cache are requested again, not the other ones.
+        self.assert_programs_cached([modified_program, cached_unmodified_program] + self.programs[2:])
+        for pathway in self.pathways:
+            for program in pathway['programs']:
+                cached_program = cache.get(PROGRAM_CACHE_KEY_TPL.format(uuid=program['uuid']))
+                self.assertEqual(cached_program['pathway_ids'].count(pathway['id']), 1)
+
+    def test_incremental_after_full_refresh_days(self):
+        """
+        Verify that an incremental run requests the details of all programs when they were
+        not all requested in the last full_refresh_days days.
+        """
+        UserFactory(username=self.catalog_integration.service_username)
+        self.mock_programs(modified_uuids=[])
+
+        call_command('cache_programs')
+        last_full_refresh_key = SITE_PROGRAMS_LAST_FULL_REFRESH_CACHE_KEY_TPL.format(domain=self.site_domain)
+        last_full_refresh = cache.get(last_full_refresh_key)
+        self.assertIsNotNone(last_full_refresh)
+
+        # Changes of the course runs of a program don't make it listed as modified.
+        self.programs[0]['title'] = 'Title modified without listing the program as modified'
+        cache.set(last_full_refresh_key, last_full_refresh - timedelta(days=2), None)
+
+        call_command('cache_programs', incremental=True, full_refresh_days=3)
+        self.assertLess(cache.get(last_full_refresh_key), last_full_refresh)
+
+        call_command('cache_programs', incremental=True, full_refresh_days=1)
+        self.assert_programs_cached(self.programs)
+        self.assertGreater(cache.get(last_full_refresh_key), last_full_refresh)
+
+    def test_incremental_without_previous_run(self):
+        """
+        Verify that an incremental run requests the details of all programs when programs were never cached.
+        """
+        UserFactory(username=self.catalog_integration.service_username)
+        self.mock_programs(modified_uuids=[])
+
+        call_command('cache_programs', incremental=True)
+
+        self.assert_programs_cached(self.programs)
+
+    def test_chunked_cache_writes(self):
+        """
+        Verify that the command writes the cache entries in chunks of the given size.
+        """
+        UserFactory(username=self.catalog_integration.service_username)
+        self.mock_programs()
+
+        with mock.patch.object(cache, 'set_many', wraps=cache.set_many) as mock_set_many:
+            call_command('cache_programs', chunk_size=2)
+
+        for call in mock_set_many.call_args_list:
+            self.assertLessEqual(len(call[0][0]), 2)
+        self.assert_programs_cached(self.programs)
@@ -6,6 +6,7 @@ Module with family of classes for block structures.
 
 The following internal data structures are implemented:
     _BlockRelations - Data structure for a single block's relations.
+    _BlockGraph - Integer-indexed data structure for all blocks' relations.
     _BlockData - Data structure for a single block's data.
 """
 
@@ -26,6 +27,11 @@ logger = getLogger(__name__)  # pylint: disable=invalid-name
 # A dictionary key value for storing a transformer's version number.
 TRANSFORMER_VERSION_KEY = '_version'
 
+# The name of the xBlock attribute holding the version of the
+# modulestore structure in which the block was last changed. It is
+# collected for every block to support partial collection.
+BLOCK_VERSION_FIELD = 'update_version'
+
 
 class _BlockRelations(object):
     """
@@ -43,6 +49,133 @@ class _BlockRelations(object):
         self.children = []
 
 
+class _BlockGraph(object):
+    """
+    Data structure to encapsulate the relationships of all blocks in a
+    block structure, with each block identified by an interned integer
+    index.  Traversing and mutating the graph then only hashes and
+    compares integers, rather than usage keys.
+    """
+    def __init__(self):
+
+        # List of usage keys, indexed by each block's integer index.
+        # Entries of removed blocks are set to None.
+        # list [UsageKey]
+        self.keys = []
+
+        # Map of a block's usage key to its integer index. The
+        # existence of a block in the graph is determined by its
+        # presence in this map.
+        # dict {UsageKey: int}
+        self.index = {}
+
+        # Lists of indices of each block's parents, indexed by the
+        # block's integer index.
+        # list [list [int]]
+        self.parents = []
+
+        # Lists of indices of each block's children, indexed by the
+        # block's integer index.
+        # list [list [int]]
+        self.children = []
+
+    @classmethod
+    def from_relations(cls, block_relations):
+        """
+        Returns a new graph with the relations in the given
+        block_relations map, in the same order.
+        """
+        graph = cls()
+        for usage_key in block_relations:
+            graph.add_block(usage_key)
+        index = graph.index
+        for usage_key, relations in six.iteritems(block_relations):
+            block_index = index[usage_key]
+            graph.parents[block_index] = [index[parent] for parent in relations.parents]
+            graph.children[block_index] = [index[child] for child in relations.children]
+        return graph
+
+    def to_relations(self):
+        """
+        Returns a block relations map with the relations in this graph.
+        """
+        keys = self.keys
+        block_relations = {}
+        for usage_key, block_index in six.iteritems(self.index):
+            relations = _BlockRelations()
+            relations.parents = [keys[parent] for parent in self.parents[block_index]]
+            relations.children = [keys[child] for child in self.children[block_index]]
+            block_relations[usage_key] = relations
+        return block_relations
+
+    def copy(self):
+        """
+        Returns a copy of this graph.
+        """
+        graph = _BlockGraph()
+        graph.keys = list(self.keys)
+        graph.index = dict(self.index)
+        graph.parents = [list(parents) for parents in self.parents]
+        graph.children = [list(children) for children in self.children]
+        return graph
+
+    def add_block(self, usage_key):
+        """
+        Adds the given usage_key to the graph, if not already present,
+        and returns its integer index.
+        """
+        try:
+            return self.index[usage_key]
+        except KeyError:
+            block_index = len(self.keys)
+            self.index[usage_key] = block_index
+            self.keys.append(usage_key)
+            self.parents.append([])
+            self.children.append([])
+            return block_index
+
+    def add_relation(self, parent_index, child_index):
+        """
+        Adds a parent to child relationship between the given indices.
+        """
+        self.parents[child_index].append(parent_index)
+        self.children[parent_index].append(child_index)
+
+    def remove_block(self, block_index):
+        """
+        Removes the block with the given index and its relations from
+        the graph and returns its former (parents, children) indices.
+        """
+        parents = self.parents[block_index]
+        children = self.children[block_index]
+
+        for child in children:
+            self.parents[child].remove(block_index)
+        for parent in parents:
+            self.children[parent].remove(block_index)
+
+        del self.index[self.keys[block_index]]
+        self.keys[block_index] = None
+        self.parents[block_index] = []
+        self.children[block_index] = []
+        return parents, children
+
+    def pruned(self, start_index):
+        """
+        Returns a new graph with only the blocks reachable from the
+        given start_index, indexed in post-order.
+        """
+        graph = _BlockGraph()
+        new_indices = {}
+        for block_index in traverse_post_order(start_index, self.children.__getitem__):
+            new_index = graph.add_block(self.keys[block_index])
+            new_indices[block_index] = new_index
+            for child in self.children[block_index]:
+                if child in new_indices:
+                    graph.add_relation(new_index, new_indices[child])
+        return graph
+
+
 class BlockStructure(object):
     """
     Base class for a block structure.  BlockStructures are constructed
@@ -65,6 +198,11 @@ class BlockStructure(object):
         # dict {UsageKey: _BlockRelations}
         self._block_relations = {}
 
+        # Integer-indexed graph of the block relations, when enabled via
+        # _use_block_graph. While set, it supersedes _block_relations.
+        # _BlockGraph
+        self._block_graph = None
+
         # Add the root block.
         self._add_block(self._block_relations, root_block_usage_key)
 
@@ -77,8 +215,27 @@ class BlockStructure(object):
         return self.get_block_keys()
 
     def __len__(self):
+        if self._block_graph is not None:
+            return len(self._block_graph.index)
         return len(self._block_relations)
 
+    @property
+    def _block_relations(self):
+        """
+        Map of a block's usage key to its block relations. When the
+        integer-indexed graph is in use, accessing the map converts the
+        structure back to using the map.
+        """
+        if self._block_graph is not None:
+            self._block_relations_map = self._block_graph.to_relations()
+            self._block_graph = None
+        return self._block_relations_map
+
+    @_block_relations.setter
+    def _block_relations(self, block_relations):
+        self._block_relations_map = block_relations
+        self._block_graph = None
+
     #--- Block structure relation methods ---#
 
     def get_parents(self, usage_key):
@@ -94,6 +251,10 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's parents.
         """
+        graph = self._block_graph
+        if graph is not None:
+            block_index = graph.index.get(usage_key)
+            return [graph.keys[parent] for parent in graph.parents[block_index]] if block_index is not None else []
         return self._block_relations[usage_key].parents if usage_key in self else []
 
     def get_children(self, usage_key):
@@ -108,6 +269,10 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's children.
         """
+        graph = self._block_graph
+        if graph is not None:
+            block_index = graph.index.get(usage_key)
+            return [graph.keys[child] for child in graph.children[block_index]] if block_index is not None else []
         return self._block_relations[usage_key].children if usage_key in self else []
 
     def set_root_block(self, usage_key):
@@ -123,7 +288,10 @@ class BlockStructure(object):
                 new root of the block structure.
         """
         self.root_block_usage_key = usage_key
-        self._block_relations[usage_key].parents = []
+        if self._block_graph is not None:
+            self._block_graph.parents[self._block_graph.index[usage_key]] = []
+        else:
+            self._block_relations[usage_key].parents = []
 
     def __contains__(self, usage_key):
         """
@@ -138,6 +306,8 @@ class BlockStructure(object):
             bool - Whether or not a block with the given usage_key
                 is present in this block structure.
         """
+        if self._block_graph is not None:
+            return usage_key in self._block_graph.index
         return usage_key in self._block_relations
 
     def get_block_keys(self):
@@ -148,6 +318,8 @@ class BlockStructure(object):
             iterator(UsageKey) - An iterator of the usage
             keys of all the blocks in the block structure.
         """
+        if self._block_graph is not None:
+            return six.iterkeys(self._block_graph.index)
         return six.iterkeys(self._block_relations)
 
     #--- Block structure traversal methods ---#
@@ -170,8 +342,18 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_topologically method.
         """
+        start_node = start_node or self.root_block_usage_key
+        graph = self._block_graph
+        if graph is not None and start_node in graph.index:
+            return self._keys_of_indices(traverse_topologically(
+                start_node=graph.index[start_node],
+                get_parents=graph.parents.__getitem__,
+                get_children=graph.children.__getitem__,
+                filter_func=self._index_filter(filter_func),
+                yield_descendants_of_unyielded=yield_descendants_of_unyielded,
+            ))
         return traverse_topologically(
-            start_node=start_node or self.root_block_usage_key,
+            start_node=start_node,
             get_parents=self.get_parents,
             get_children=self.get_children,
             filter_func=filter_func,
@@ -195,8 +377,16 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_post_order method.
         """
+        start_node = start_node or self.root_block_usage_key
+        graph = self._block_graph
+        if graph is not None and start_node in graph.index:
+            return self._keys_of_indices(traverse_post_order(
+                start_node=graph.index[start_node],
+                get_children=graph.children.__getitem__,
+                filter_func=self._index_filter(filter_func),
+            ))
         return traverse_post_order(
-            start_node=start_node or self.root_block_usage_key,
+            start_node=start_node,
             get_children=self.get_children,
             filter_func=filter_func,
         )
@@ -204,10 +394,44 @@ class BlockStructure(object):
     #--- Internal methods ---#
     # To be used within the block_structure framework or by tests.
 
+    def _use_block_graph(self):
+        """
+        Switches this block structure to store its relations in an
+        integer-indexed _BlockGraph, which is faster to traverse and
+        mutate.  The public interface of the structure is unchanged.
+        """
+        if self._block_graph is None:
+            graph = _BlockGraph.from_relations(self._block_relations_map)
+            self._block_relations_map = {}
+            self._block_graph = graph
+
+    def _keys_of_indices(self, block_indices):
+        """
+        Returns a generator of the usage keys of the blocks with the
+        given indices in the integer-indexed graph.
+        """
+        keys = self._block_graph.keys
+        return (keys[block_index] for block_index in block_indices)
+
+    def _index_filter(self, filter_func):
+        """
+        Returns the given filter_func, which takes a usage key, adapted
+        to take an index in the integer-indexed graph.
+        """
+        if filter_func is None:
+            return None
+        keys = self._block_graph.keys
+        return lambda block_index: filter_func(keys[block_index])
+
     def _prune_unreachable(self):
         """
         Mutates this block structure by removing any unreachable blocks.
         """
+        graph = self._block_graph
+        if graph is not None:
+            root_index = graph.index.get(self.root_block_usage_key)
+            self._block_graph = graph.pruned(root_index) if root_index is not None else _BlockGraph()
+            return
 
         # Create a new block relations map to store only those blocks
         # that are still linked
@@ -240,7 +464,11 @@ class BlockStructure(object):
             parent_key (UsageKey) - Usage key of the parent block.
             child_key (UsageKey) - Usage key of the child block.
         """
-        self._add_to_relations(self._block_relations, parent_key, child_key)
+        graph = self._block_graph
+        if graph is not None:
+            graph.add_relation(graph.add_block(parent_key), graph.add_block(child_key))
+        else:
+            self._add_to_relations(self._block_relations, parent_key, child_key)
 
     @staticmethod
     def _add_to_relations(block_relations, parent_key, child_key):
@@ -423,6 +651,15 @@ class BlockStructureBlockData(BlockStructure):
         deep-copy of this instance's contents.
         """
         from .factory import BlockStructureFactory
+        if self._block_graph is not None:
+            block_structure = BlockStructureFactory.create_new(
+                self.root_block_usage_key,
+                {},
+                deepcopy(self.transformer_data),
+                deepcopy(self._block_data_map),
+            )
+            block_structure._block_graph = self._block_graph.copy()
+            return block_structure
         return BlockStructureFactory.create_new(
             self.root_block_usage_key,
             deepcopy(self._block_relations),
@@ -621,6 +858,16 @@ class BlockStructureBlockData(BlockStructure):
                 removed block's children become children of the
                 removed block's parents.
         """
+        graph = self._block_graph
+        if graph is not None:
+            parents, children = graph.remove_block(graph.index[usage_key])
+            self._block_data_map.pop(usage_key, None)
+            if keep_descendants:
+                for child in children:
+                    for parent in parents:
+                        graph.add_relation(parent, child)
+            return
+
         children = self._block_relations[usage_key].children
         parents = self._block_relations[usage_key].parents
 
@@ -787,7 +1034,17 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         # Set of xBlock field names that have been requested for
         # collection.
         # set(string)
-        self._requested_xblock_fields = set()
+        self._requested_xblock_fields = {BLOCK_VERSION_FIELD}
+
+        # The previously collected block structure, whose data may be
+        # reused for unchanged blocks during a partial collection.
+        # BlockStructureBlockData
+        self._previous_block_structure = None
+
+        # Set of usage keys of the blocks that changed since the
+        # previous collection, if any.
+        # set(UsageKey)
+        self._changed_block_keys = None
 
     def request_xblock_fields(self, *field_names):
         """
@@ -815,6 +1072,28 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         return self._xblock_map[usage_key]
 
+    def reuse_collected_transformer_block_data(self, transformer):
+        """
+        Copies the given transformer's data, for all blocks that have not
+        changed since the previous collection, from the previously
+        collected block structure.  To be called by transformers from
+        their collect_partial method.
+
+        Arguments:
+            transformer (BlockStructureTransformer) - The transformer
+                whose block data is to be reused.
+        """
+        previous_block_structure = self._previous_block_structure
+        for usage_key in self:
+            if usage_key in self._changed_block_keys:
+                continue
+            try:
+                previous_data = previous_block_structure.get_transformer_block_data(usage_key, transformer)
+            except KeyError:
+                continue
+            for key, value in six.iteritems(previous_data.fields):
+                self.set_transformer_block_field(usage_key, transformer, key, value)
+
     #--- Internal methods ---#
     # To be used within the block_structure framework or by tests.
 
@@ -833,15 +1112,46 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         self._xblock_map[usage_key] = xblock
 
+    def _set_previous_block_structure(self, previous_block_structure):
+        """
+        Records the given previously collected block structure and
+        returns the usage keys of all blocks that changed since it was
+        collected: blocks that are new or whose version differs, along
+        with all of their descendants.
+
+        Blocks whose version is unknown are always considered changed.
+        """
+        changed_block_keys = set()
+        for usage_key in self.topological_traversal():
+            version = getattr(self._xblock_map[usage_key], BLOCK_VERSION_FIELD, None)
+            if (
+                    version is None or
+                    version != previous_block_structure.get_xblock_field(usage_key, BLOCK_VERSION_FIELD) or
+                    any(parent in changed_block_keys for parent in self.get_parents(usage_key))
+            ):
+                changed_block_keys.add(usage_key)
+
+        self._previous_block_structure = previous_block_structure
+        self._changed_block_keys = changed_block_keys
+        return changed_block_keys
+
     def _collect_requested_xblock_fields(self):
         """
         Iterates through all instantiated xBlocks that were added and
-        collects all xBlock fields that were requested.
+        collects all xBlock fields that were requested.  For blocks that
+        have not changed since a previous collection, the previously
+        collected values are reused instead.
         """
         for xblock_usage_key, xblock in six.iteritems(self._xblock_map):
             block_data = self._get_or_create_block(xblock_usage_key)
-            for field_name in self._requested_xblock_fields:
-                self._set_xblock_field(block_data, xblock, field_name)
+            if self._changed_block_keys is not None and xblock_usage_key not in self._changed_block_keys:
+                previous_block_data = self._previous_block_structure[xblock_usage_key]
+                for field_name in self._requested_xblock_fields:
+                    if hasattr(previous_block_data, field_name):
+                        setattr(block_data, field_name, getattr(previous_block_data, field_name))
+            else:
+                for field_name in self._requested_xblock_fields:
+                    self._set_xblock_field(block_data, xblock, field_name)
 
     def _set_xblock_field(self, block_data, xblock, field_name):
         """
@@ -9,7 +9,7 @@ class BlockStructureFactory(object):
     Factory class for BlockStructure objects.
     """
     @classmethod
-    def create_from_modulestore(cls, root_block_usage_key, modulestore):
+    def create_from_modulestore(cls, root_block_usage_key, modulestore, lazy=False):
         """
         Creates and returns a block structure from the modulestore
         starting at the given root_block_usage_key.
@@ -22,6 +22,10 @@ class BlockStructureFactory(object):
                 contains the data for the xBlocks within the block
                 structure starting at root_block_usage_key.
 
+            lazy (bool) - Whether the modulestore may defer loading
+                the xBlocks' definitions until their content fields are
+                accessed.
+
         Returns:
             BlockStructureModulestoreData - The created block structure
                 with instantiated xBlocks from the given modulestore
@@ -53,7 +57,7 @@ class BlockStructureFactory(object):
                 block_structure._add_relation(xblock.location, child.location)  # pylint: disable=protected-access
                 build_block_structure(child)
 
-        root_xblock = modulestore.get_item(root_block_usage_key, depth=None, lazy=False)
+        root_xblock = modulestore.get_item(root_block_usage_key, depth=None, lazy=lazy)
         build_block_structure(root_xblock)
         return block_structure
 
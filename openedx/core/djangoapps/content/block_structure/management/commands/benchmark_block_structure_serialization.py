@@ -0,0 +1,105 @@
+"""
+Command to compare the load performance of the block structure
+serialization formats.
+"""
+
+
+import gc
+import timeit
+import tracemalloc
+
+import six
+from django.core.management.base import BaseCommand
+
+import openedx.core.djangoapps.content.block_structure.api as api
+from openedx.core.djangoapps.content.block_structure import serialization
+from openedx.core.djangoapps.content.block_structure.store import BlockStructureStore
+from openedx.core.lib.cache_utils import zpickle
+from openedx.core.lib.command_utils import parse_course_keys
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_serialization 'course-v1:edX+DemoX+Demo_Course' --settings=devstack
+
+    For each format, reports the serialized size, the time to load the
+    structure, the time to load it and read one xBlock field of every
+    block, and the peak memory allocated while loading.
+    """
+    help = u'Compares zpickle and columnar serialization of collected block structures.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'courses',
+            nargs='+',
+            help=u'Course keys of the block structures to benchmark.',
+        )
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of times to load each serialized structure.',
+            default=20,
+            type=int,
+        )
+        parser.add_argument(
+            '--field',
+            help=u'Name of the xBlock field to read from every block after loading.',
+            default='display_name',
+        )
+
+    def handle(self, *args, **options):
+        for course_key in parse_course_keys(options['courses']):
+            block_structure = api.get_course_in_cache(course_key)
+            data = (
+                block_structure._block_relations,  # pylint: disable=protected-access
+                block_structure.transformer_data,
+                block_structure._block_data_map,  # pylint: disable=protected-access
+            )
+            self.stdout.write(u'{}: {} blocks'.format(six.text_type(course_key), len(block_structure)))
+            for format_name, serialized_data in (
+                    ('zpickle', zpickle(data)),
+                    ('columnar', serialization.serialize(*data)),
+            ):
+                self._benchmark(
+                    format_name,
+                    serialized_data,
+                    block_structure.root_block_usage_key,
+                    options['iterations'],
+                    options['field'],
+                )
+
+    def _benchmark(self, format_name, serialized_data, root_block_usage_key, iterations, field_name):
+        """
+        Reports the load performance of the given serialized data.
+        """
+        store = BlockStructureStore(cache=None)
+
+        def load():
+            return store._deserialize(serialized_data, root_block_usage_key)  # pylint: disable=protected-access
+
+        def load_and_read():
+            loaded = load()
+            for block_key in loaded:
+                loaded.get_xblock_field(block_key, field_name)
+
+        load_time = min(timeit.repeat(load, number=1, repeat=iterations))
+        load_and_read_time = min(timeit.repeat(load_and_read, number=1, repeat=iterations))
+
+        gc.collect()
+        tracemalloc.start()
+        loaded = load()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del loaded
+
+        self.stdout.write(
+            u'  {:<10} size: {:>10} bytes, load: {:>8.2f} ms, load and read {}: {:>8.2f} ms, '
+            u'peak memory: {:>10} bytes'.format(
+                format_name,
+                len(serialized_data),
+                load_time * 1000,
+                field_name,
+                load_and_read_time * 1000,
+                peak_memory,
+            )
+        )
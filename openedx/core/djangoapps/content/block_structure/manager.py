@@ -5,6 +5,7 @@ BlockStructures.
 
 
 from contextlib import contextmanager
+from logging import getLogger
 
 import six
 
@@ -14,6 +15,8 @@ from .factory import BlockStructureFactory
 from .store import BlockStructureStore
 from .transformers import BlockStructureTransformers
 
+logger = getLogger(__name__)  # pylint: disable=C0103
+
 
 class BlockStructureManager(object):
     """
@@ -124,14 +127,52 @@ class BlockStructureManager(object):
         the modulestore.
         """
         with self._bulk_operations():
-            block_structure = BlockStructureFactory.create_from_modulestore(
-                self.root_block_usage_key,
-                self.modulestore,
-            )
-            BlockStructureTransformers.collect(block_structure)
+            block_structure = None
+            if config.waffle().is_enabled(config.INCREMENTAL_COLLECT):
+                block_structure = self._collect_partially()
+
+            if block_structure is None:
+                block_structure = BlockStructureFactory.create_from_modulestore(
+                    self.root_block_usage_key,
+                    self.modulestore,
+                )
+                BlockStructureTransformers.collect(block_structure)
+
             self.store.add(block_structure)
             return block_structure
 
+    def _collect_partially(self):
+        """
+        Returns a block structure collected from the modulestore,
+        re-collecting only the blocks that changed since the collection
+        currently in the store. Returns None if the stored collection
+        cannot be reused.
+        """
+        try:
+            previous_block_structure = self.store.get(self.root_block_usage_key)
+        except BlockStructureNotFound:
+            return None
+
+        if not BlockStructureTransformers.supports_partial_collect(previous_block_structure):
+            return None
+
+        block_structure = BlockStructureFactory.create_from_modulestore(
+            self.root_block_usage_key,
+            self.modulestore,
+            lazy=True,
+        )
+        changed_block_keys = block_structure._set_previous_block_structure(  # pylint: disable=protected-access
+            previous_block_structure,
+        )
+        logger.info(
+            u"BlockStructure: Partially collecting %d of %d blocks; %s.",
+            len(changed_block_keys),
+            len(block_structure),
+            self.root_block_usage_key,
+        )
+        BlockStructureTransformers.collect_partial(block_structure, changed_block_keys)
+        return block_structure
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
@@ -0,0 +1,530 @@
+"""
+Module for the columnar serialization format of collected BlockStructure
+data.
+
+The format avoids pickling the object graph of a collected block
+structure.  Instead, it stores:
+
+    * An interned table of all usage keys in the structure, so each
+      key is encoded (and decoded) exactly once.
+    * Integer-indexed, CSR-style parent/child adjacency arrays that
+      refer to the positions of keys in the key table.
+    * One compressed value column per collected field, for both xBlock
+      fields and transformer block fields.
+
+Value columns are decoded lazily, the first time any block's value for
+that field is accessed, so a request that only reads a handful of
+fields never pays for decoding the rest of the collected data.
+
+Values are encoded with a small tagged JSON codec that natively
+supports the types commonly collected by transformers (primitives,
+containers, dates and opaque keys).  Only values of any other type
+fall back to being pickled individually.
+
+Layout of the serialized bytes:
+
+    MAGIC | version (uint16) | header length (uint32) | header | sections
+
+where the header is a JSON document describing the sections, each of
+which is an independently zlib-compressed blob.
+"""
+
+
+import base64
+import json
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date, datetime, timedelta
+
+import six
+from opaque_keys import OpaqueKey
+from opaque_keys.edx.keys import AssetKey, CourseKey, DefinitionKey, UsageKey
+from pytz import FixedOffset, utc
+from six.moves import cPickle as pickle
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap, _BlockRelations
+
+# Prefix identifying columnar serialized data.  zlib streams (and
+# therefore zpickled data) never start with a null byte.
+MAGIC = b'\x00BSC'
+
+# The latest version of the columnar format.  Incrementally update
+# this value whenever the layout changes.
+FORMAT_VERSION = 1
+
+_PREAMBLE = struct.Struct('>HI')
+
+# Key used to mark tagged (non-JSON-native) values in encoded data.
+_TAG = u'__bs__'
+
+_KEY_CLASSES = {
+    key_class.KEY_TYPE: key_class
+    for key_class in (UsageKey, CourseKey, DefinitionKey, AssetKey)
+}
+
+_JSON_NATIVE_TYPES = (bool, float, type(None)) + six.integer_types + (six.text_type,)
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given serialized data is in the columnar format.
+    """
+    return serialized_data[:len(MAGIC)] == MAGIC
+
+
+def serialize(block_relations, transformer_data, block_data_map):
+    """
+    Returns the columnar serialization of the given block structure
+    internals.
+
+    Arguments:
+        block_relations (dict {UsageKey: _BlockRelations})
+        transformer_data (TransformerDataMap)
+        block_data_map (dict {UsageKey: BlockData})
+    """
+    keys = list(block_relations)
+    keys.extend(key for key in block_data_map if key not in block_relations)
+    key_index = {key: index for index, key in enumerate(keys)}
+
+    sections = _SectionWriter()
+    sections.add_value(u'keys', keys)
+    sections.add_adjacency(u'children', [block_relations[key].children for key in block_relations], key_index)
+    sections.add_adjacency(u'parents', [block_relations[key].parents for key in block_relations], key_index)
+    sections.add_value(u'transformer_data', {
+        name: data.fields for name, data in six.iteritems(transformer_data)
+    })
+    sections.add_int_array(u'blocks', [key_index[key] for key in block_data_map])
+
+    xblock_columns = {}
+    transformer_blocks = {}
+    transformer_columns = {}
+    for usage_key, block_data in six.iteritems(block_data_map):
+        index = key_index[usage_key]
+        for field_name, value in six.iteritems(block_data.fields):
+            xblock_columns.setdefault(field_name, []).append([index, value])
+        for name, block_transformer_data in six.iteritems(block_data.transformer_data):
+            transformer_blocks.setdefault(name, []).append(index)
+            columns = transformer_columns.setdefault(name, {})
+            for field_name, value in six.iteritems(block_transformer_data.fields):
+                columns.setdefault(field_name, []).append([index, value])
+
+    columns = []
+    for field_name, column in six.iteritems(xblock_columns):
+        columns.append([None, field_name, sections.add_value(None, column)])
+    for name, blocks in six.iteritems(transformer_blocks):
+        sections.add_int_array(u'transformer_blocks:' + name, blocks)
+        for field_name, column in six.iteritems(transformer_columns[name]):
+            columns.append([name, field_name, sections.add_value(None, column)])
+
+    header = json.dumps({
+        u'sections': sections.index,
+        u'columns': columns,
+        u'transformers': list(transformer_blocks),
+    }, separators=(',', ':')).encode('utf-8')
+    return b''.join(
+        [MAGIC, _PREAMBLE.pack(FORMAT_VERSION, len(header)), header] + sections.blobs
+    )
+
+
+def deserialize(serialized_data):
+    """
+    Returns a tuple of (block_relations, transformer_data, block_data_map)
+    parsed from the given columnar serialization.  Values of collected
+    fields are not decoded until they are first accessed.
+
+    Raises:
+        ValueError if the data is not in a supported columnar format.
+    """
+    if not is_columnar(serialized_data):
+        raise ValueError(u'Block structure data is not in the columnar format.')
+
+    offset = len(MAGIC)
+    version, header_length = _PREAMBLE.unpack_from(serialized_data, offset)
+    if version != FORMAT_VERSION:
+        raise ValueError(u'Unsupported columnar format version {}.'.format(version))
+    offset += _PREAMBLE.size
+    header = json.loads(serialized_data[offset:offset + header_length].decode('utf-8'))
+    sections = _SectionReader(serialized_data, offset + header_length, header[u'sections'])
+
+    keys = sections.get_value(u'keys')
+    block_relations = {}
+    children = sections.get_adjacency(u'children')
+    parents = sections.get_adjacency(u'parents')
+    for index in range(len(children)):
+        relations = _BlockRelations()
+        relations.children = [keys[child] for child in children[index]]
+        relations.parents = [keys[parent] for parent in parents[index]]
+        block_relations[keys[index]] = relations
+
+    transformer_data = TransformerDataMap()
+    for name, fields in six.iteritems(sections.get_value(u'transformer_data')):
+        transformer_data[name] = TransformerData()
+        transformer_data[name].fields = fields
+
+    columns = _LazyColumns(sections, header[u'columns'])
+    block_data_list = [None] * len(keys)
+    block_data_map = {}
+    for index in sections.get_int_array(u'blocks'):
+        block_data = _LazyBlockData.create(keys[index], columns)
+        block_data_list[index] = block_data
+        block_data_map[keys[index]] = block_data
+    columns.add_targets(None, block_data_list)
+
+    for name in header[u'transformers']:
+        transformer_data_list = [None] * len(keys)
+        for index in sections.get_int_array(u'transformer_blocks:' + name):
+            block_transformer_data = _LazyTransformerData.create(name, columns)
+            block_data_list[index].transformer_data[name] = block_transformer_data
+            transformer_data_list[index] = block_transformer_data
+        columns.add_targets(name, transformer_data_list)
+
+    return block_relations, transformer_data, block_data_map
+
+
+def encode_value(value):
+    """
+    Returns a JSON-compatible encoding of the given value.
+    """
+    value_type = type(value)
+    if value_type in _JSON_NATIVE_TYPES:
+        return value
+    elif value_type is list:
+        return [encode_value(item) for item in value]
+    elif value_type is dict:
+        if all(type(key) is six.text_type and key != _TAG for key in value):
+            return {key: encode_value(item) for key, item in six.iteritems(value)}
+        return _tagged(u'dict', [[encode_value(key), encode_value(item)] for key, item in six.iteritems(value)])
+    elif value_type in (tuple, set, frozenset):
+        return _tagged(value_type.__name__, [encode_value(item) for item in value])
+    elif value_type is datetime:
+        offset = value.utcoffset()
+        return _tagged(u'datetime', [
+            value.year, value.month, value.day,
+            value.hour, value.minute, value.second, value.microsecond,
+            None if offset is None else int(offset.total_seconds() // 60),
+        ])
+    elif value_type is date:
+        return _tagged(u'date', [value.year, value.month, value.day])
+    elif value_type is timedelta:
+        return _tagged(u'timedelta', [value.days, value.seconds, value.microseconds])
+    elif value_type is six.binary_type:
+        return _tagged(u'bytes', base64.b64encode(value).decode('ascii'))
+    elif isinstance(value, OpaqueKey) and value.KEY_TYPE in _KEY_CLASSES and not getattr(value, 'deprecated', False):
+        # Deprecated keys are excluded since their string form does
+        # not round-trip (it does not include the course run).
+        return _tagged(u'key', [value.KEY_TYPE, six.text_type(value)])
+    return _tagged(u'pickle', base64.b64encode(pickle.dumps(value, 2)).decode('ascii'))
+
+
+def decode_value(encoded):
+    """
+    Returns the value for the given output of encode_value.
+    """
+    if type(encoded) is list:
+        return [decode_value(item) for item in encoded]
+    elif type(encoded) is dict:
+        if _TAG not in encoded:
+            return {key: decode_value(item) for key, item in six.iteritems(encoded)}
+        tag, payload = encoded[_TAG]
+        return _DECODERS[tag](payload)
+    return encoded
+
+
+def _tagged(tag, payload):
+    """
+    Returns the encoding of a non-JSON-native value.
+    """
+    return {_TAG: [tag, payload]}
+
+
+def _decode_datetime(payload):
+    """
+    Returns the datetime for the given encoded payload.
+    """
+    offset = payload[7]
+    if offset is None:
+        tzinfo = None
+    elif offset == 0:
+        tzinfo = utc
+    else:
+        tzinfo = FixedOffset(offset)
+    return datetime(*payload[:7], tzinfo=tzinfo)
+
+
+_DECODERS = {
+    u'dict': lambda payload: {decode_value(key): decode_value(item) for key, item in payload},
+    u'tuple': lambda payload: tuple(decode_value(item) for item in payload),
+    u'set': lambda payload: set(decode_value(item) for item in payload),
+    u'frozenset': lambda payload: frozenset(decode_value(item) for item in payload),
+    u'datetime': _decode_datetime,
+    u'date': lambda payload: date(*payload),
+    u'timedelta': lambda payload: timedelta(*payload),
+    u'bytes': lambda payload: base64.b64decode(payload),
+    u'key': lambda payload: _KEY_CLASSES[payload[0]].from_string(payload[1]),
+    u'pickle': lambda payload: pickle.loads(base64.b64decode(payload)),
+}
+
+
+def _to_little_endian(int_array):
+    """
+    Byte-swaps the given array in place on big-endian platforms so the
+    serialized layout is platform independent.
+    """
+    if sys.byteorder == 'big':
+        int_array.byteswap()
+    return int_array
+
+
+class _SectionWriter(object):
+    """
+    Accumulates the compressed sections of a columnar serialization.
+    """
+    def __init__(self):
+        self.blobs = []
+
+        # List of [name, length] of each section, in order.
+        self.index = []
+
+    def add(self, name, raw_bytes):
+        """
+        Adds a section with the given raw bytes and returns its name.
+        Sections added without a name are given a positional one.
+        """
+        if name is None:
+            name = six.text_type(len(self.index))
+        blob = zlib.compress(raw_bytes)
+        self.blobs.append(blob)
+        self.index.append([name, len(blob)])
+        return name
+
+    def add_value(self, name, value):
+        """
+        Adds a section holding the encoding of the given value.
+        """
+        return self.add(name, json.dumps(encode_value(value), separators=(',', ':')).encode('utf-8'))
+
+    def add_int_array(self, name, values):
+        """
+        Adds a section holding the given list of integers.
+        """
+        return self.add(name, _to_little_endian(array('i', values)).tobytes())
+
+    def add_adjacency(self, name, relations_list, key_index):
+        """
+        Adds a section holding the given per-block lists of related
+        keys in compressed sparse row form: the number of blocks,
+        followed by the offset of each block's relations, followed by
+        the indices of all related keys.
+        """
+        offsets = [0]
+        indices = []
+        for related_keys in relations_list:
+            indices.extend(key_index[key] for key in related_keys)
+            offsets.append(len(indices))
+        return self.add_int_array(name, [len(relations_list)] + offsets + indices)
+
+
+class _SectionReader(object):
+    """
+    Provides access to the sections of a columnar serialization,
+    decompressing each section only when requested.
+    """
+    def __init__(self, serialized_data, offset, index):
+        self._data = serialized_data
+        self._sections = {}
+        for name, length in index:
+            self._sections[name] = (offset, length)
+            offset += length
+
+    def get(self, name):
+        """
+        Returns the raw bytes of the requested section.
+        """
+        offset, length = self._sections[name]
+        return zlib.decompress(self._data[offset:offset + length])
+
+    def get_value(self, name):
+        """
+        Returns the decoded value of the requested section.
+        """
+        return decode_value(json.loads(self.get(name).decode('utf-8')))
+
+    def get_int_array(self, name):
+        """
+        Returns the array of integers in the requested section.
+        """
+        int_array = array('i')
+        int_array.frombytes(self.get(name))
+        return _to_little_endian(int_array)
+
+    def get_adjacency(self, name):
+        """
+        Returns a list, indexed by block, of lists of related block
+        indices from the requested adjacency section.
+        """
+        int_array = self.get_int_array(name)
+        num_blocks = int_array[0]
+        offsets = int_array[1:num_blocks + 2]
+        indices = int_array[num_blocks + 2:]
+        return [indices[offsets[index]:offsets[index + 1]] for index in range(num_blocks)]
+
+
+class _LazyColumns(object):
+    """
+    Registry of the value columns of a deserialized block structure.
+    A column is decoded in its entirety, and its values distributed to
+    the blocks' field data, the first time any of its values is needed.
+    """
+    def __init__(self, sections, columns):
+        self._sections = sections
+
+        # Map of (transformer name or None, field name) to the section
+        # holding the column, for columns that are not yet decoded.
+        self._pending = {(owner, field_name): section for owner, field_name, section in columns}
+
+        # Map of transformer name (or None for xBlock fields) to a
+        # list, indexed by block, of the field data objects to fill.
+        self._targets = {}
+
+    def add_targets(self, owner, field_data_list):
+        """
+        Registers the field data objects to fill for the given owner.
+        """
+        self._targets[owner] = field_data_list
+
+    def load(self, owner, field_name):
+        """
+        Decodes the column for the given owner and field name, if not
+        already decoded.
+        """
+        section = self._pending.pop((owner, field_name), None)
+        if section is None:
+            return
+        targets = self._targets[owner]
+        for index, value in self._sections.get_value(section):
+            # Values set or removed since deserialization take precedence.
+            targets[index]._fields.setdefault(field_name, value)  # pylint: disable=protected-access
+
+    def load_all(self, owner):
+        """
+        Decodes all remaining columns for the given owner.
+        """
+        for pending_owner, field_name in list(self._pending):
+            if pending_owner == owner:
+                self.load(owner, field_name)
+
+
+def _identity(value):
+    """
+    Returns the given value.  Used when reducing lazy field data objects
+    to their plain counterparts.
+    """
+    return value
+
+
+class _LazyFieldDataMixin(object):
+    """
+    Mixin for FieldData classes whose field values are decoded from
+    _LazyColumns on first access.
+
+    Copying or pickling an instance yields its plain, fully decoded
+    counterpart.
+    """
+    def class_field_names(self):
+        return super(_LazyFieldDataMixin, self).class_field_names() + ['_fields', '_columns', '_column_owner']
+
+    @property
+    def fields(self):
+        """
+        Returns the dict of all field values, decoding any pending ones.
+        """
+        self._columns.load_all(self._column_owner)
+        return self._fields
+
+    def __getattr__(self, field_name):
+        if self._is_own_field(field_name):
+            raise AttributeError(field_name)
+        fields = self._fields
+        if field_name not in fields:
+            self._columns.load(self._column_owner, field_name)
+        try:
+            return fields[field_name]
+        except KeyError:
+            raise AttributeError(u"Field {0} does not exist".format(field_name))
+
+    def __setattr__(self, field_name, field_value):
+        if self._is_own_field(field_name):
+            object.__setattr__(self, field_name, field_value)
+        else:
+            self._fields[field_name] = field_value
+
+    def __delattr__(self, field_name):
+        if self._is_own_field(field_name):
+            object.__delattr__(self, field_name)
+        else:
+            self._columns.load(self._column_owner, field_name)
+            del self._fields[field_name]
+
+    def __reduce_ex__(self, protocol):
+        return _identity, (self.materialize(),)
+
+    def _init_lazy(self, owner, columns):
+        """
+        Initializes the lazy loading state of this instance.
+        """
+        object.__setattr__(self, '_fields', {})
+        object.__setattr__(self, '_columns', columns)
+        object.__setattr__(self, '_column_owner', owner)
+
+
+class _LazyTransformerData(_LazyFieldDataMixin, TransformerData):
+    """
+    TransformerData for a single block, decoded on first access.
+    """
+    @classmethod
+    def create(cls, transformer_name, columns):
+        """
+        Returns a new instance for the given transformer's columns.
+        """
+        instance = cls.__new__(cls)
+        instance._init_lazy(transformer_name, columns)  # pylint: disable=protected-access
+        return instance
+
+    def materialize(self):
+        """
+        Returns a plain TransformerData with all field values decoded.
+        """
+        transformer_data = TransformerData()
+        transformer_data.fields = dict(self.fields)
+        return transformer_data
+
+
+class _LazyBlockData(_LazyFieldDataMixin, BlockData):
+    """
+    BlockData whose xBlock field values are decoded on first access.
+    """
+    @classmethod
+    def create(cls, usage_key, columns):
+        """
+        Returns a new instance for the given block.
+        """
+        instance = cls.__new__(cls)
+        instance._init_lazy(None, columns)  # pylint: disable=protected-access
+        instance.location = usage_key
+        instance.transformer_data = TransformerDataMap()
+        return instance
+
+    def materialize(self):
+        """
+        Returns a plain BlockData with all field values decoded.
+        """
+        block_data = BlockData(self.location)
+        block_data.fields = dict(self.fields)
+        for name, transformer_data in six.iteritems(self.transformer_data):
+            block_data.transformer_data[name] = (
+                transformer_data.materialize() if isinstance(transformer_data, _LazyTransformerData)
+                else transformer_data
+            )
+        return block_data
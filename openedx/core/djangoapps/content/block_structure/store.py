@@ -11,7 +11,7 @@ import six
 from django.utils.encoding import python_2_unicode_compatible
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
@@ -194,34 +194,45 @@ class BlockStructureStore(object):
 
     def _serialize(self, block_structure):
         """
-        Serializes the data for the given block_structure.
+        Serializes the data for the given block_structure, using the
+        columnar format if enabled and zpickle otherwise.
         """
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
             block_structure._block_data_map,
         )
+        if _is_columnar_serialization_enabled():
+            return serialization.serialize(*data_to_cache)
         return zpickle(data_to_cache)
 
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+        Data in either the columnar or zpickle format is supported,
+        regardless of which format is currently enabled for writing.
         """
 
         try:
-            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            if serialization.is_columnar(serialized_data):
+                block_relations, transformer_data, block_data_map = serialization.deserialize(serialized_data)
+            else:
+                block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
             bs_model = self._get_model(root_block_usage_key)
             logger.exception(u"BlockStructure: Failed to load data from cache for %s", bs_model)
             raise BlockStructureNotFound(bs_model.data_usage_key)
 
-        return BlockStructureFactory.create_new(
+        block_structure = BlockStructureFactory.create_new(
             root_block_usage_key,
             block_relations,
             transformer_data,
             block_data_map,
         )
+        if _is_integer_block_graph_enabled():
+            block_structure._use_block_graph()
+        return block_structure
 
     @staticmethod
     def _encode_root_cache_key(bs_model):
@@ -267,3 +278,19 @@ def _is_storage_backing_enabled():
     Returns whether storage backing for Block Structures is enabled.
     """
     return config.waffle().is_enabled(config.STORAGE_BACKING_FOR_CACHE)
+
+
+def _is_columnar_serialization_enabled():
+    """
+    Returns whether block structures are serialized using the columnar
+    format rather than zpickle.
+    """
+    return config.waffle().is_enabled(config.COLUMNAR_SERIALIZATION)
+
+
+def _is_integer_block_graph_enabled():
+    """
+    Returns whether block structures loaded from the store keep their
+    relations in an integer-indexed graph.
+    """
+    return config.waffle().is_enabled(config.INTEGER_BLOCK_GRAPH)
@@ -209,16 +209,19 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
                 ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
                 ChildrenMapTestMixin.DAG_CHILDREN_MAP,
             ],
+            [True, False],
         )
     )
     @ddt.unpack
-    def test_remove_block(self, keep_descendants, block_to_remove, children_map):
+    def test_remove_block(self, keep_descendants, block_to_remove, children_map, use_block_graph):
         ### skip test if invalid
         if (block_to_remove >= len(children_map)) or (keep_descendants and block_to_remove == 0):
             return
 
         ### create structure
         block_structure = self.create_block_structure(children_map)
+        if use_block_graph:
+            block_structure._use_block_graph()
         parents_map = self.get_parents_map(children_map)
 
         ### verify blocks pre-exist
@@ -263,12 +266,54 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
 
         self.assert_block_structure(block_structure, pruned_children_map, missing_blocks)
 
-    def test_remove_block_traversal(self):
+    @ddt.data(True, False)
+    def test_remove_block_traversal(self, use_block_graph):
         block_structure = self.create_block_structure(ChildrenMapTestMixin.LINEAR_CHILDREN_MAP)
+        if use_block_graph:
+            block_structure._use_block_graph()
         block_structure.remove_block_traversal(lambda block: block == 2)
         self.assert_block_structure(block_structure, [[1], [], [], []], missing_blocks=[2])
 
-    def test_copy(self):
+    @ddt.data(
+        *itertools.product(
+            [
+                ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+                ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+                ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+            ],
+            [True, False],
+        )
+    )
+    @ddt.unpack
+    def test_block_graph_traversals(self, children_map, yield_descendants_of_unyielded):
+        block_structure = self.create_block_structure(children_map)
+        graph_structure = self.create_block_structure(children_map)
+        graph_structure._use_block_graph()
+
+        def filter_func(block_key):
+            return block_key != 1
+
+        self.assertEqual(list(graph_structure), list(block_structure))
+        self.assertEqual(len(graph_structure), len(block_structure))
+        self.assertEqual(
+            list(graph_structure.topological_traversal(filter_func, yield_descendants_of_unyielded)),
+            list(block_structure.topological_traversal(filter_func, yield_descendants_of_unyielded)),
+        )
+        self.assertEqual(
+            list(graph_structure.post_order_traversal(filter_func)),
+            list(block_structure.post_order_traversal(filter_func)),
+        )
+
+        # accessing the relations map converts back from the graph
+        self.assertEqual(
+            {key: relations.children for key, relations in six.iteritems(graph_structure._block_relations)},
+            {key: relations.children for key, relations in six.iteritems(block_structure._block_relations)},
+        )
+        self.assertIsNone(graph_structure._block_graph)
+        self.assert_block_structure(graph_structure, children_map)
+
+    @ddt.data(True, False)
+    def test_copy(self, use_block_graph):
         def _set_value(structure, value):
             """
             Sets a test transformer block field to the given value in the given structure.
@@ -283,6 +328,8 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
 
         # create block structure and verify blocks pre-exist
         block_structure = self.create_block_structure(ChildrenMapTestMixin.LINEAR_CHILDREN_MAP)
+        if use_block_graph:
+            block_structure._use_block_graph()
         self.assert_block_structure(block_structure, [[1], [2], [3], []])
         _set_value(block_structure, 'original_value')
 
@@ -8,7 +8,7 @@ import six
 from django.test import TestCase
 
 from ..block_structure import BlockStructureBlockData
-from ..config import RAISE_ERROR_WHEN_NOT_FOUND, STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import INCREMENTAL_COLLECT, RAISE_ERROR_WHEN_NOT_FOUND, STORAGE_BACKING_FOR_CACHE, waffle
 from ..exceptions import BlockStructureNotFound, UsageKeyNotInBlockStructure
 from ..manager import BlockStructureManager
 from ..transformers import BlockStructureTransformers
@@ -94,6 +94,28 @@ class TestTransformer1(MockTransformer):
         return data_key + 't1.val1.' + six.text_type(block_key)
 
 
+class TestPartialTransformer(TestTransformer1):
+    """
+    Test Transformer class that supports partial collection.
+    """
+    SUPPORTS_PARTIAL_COLLECT = True
+    collect_data_key = 'partial.collect'
+    transform_data_key = 'partial.transform'
+    partially_collected_block_keys = None
+
+    @classmethod
+    def collect_partial(cls, block_structure, changed_block_keys):
+        """
+        Collects block data only for the changed blocks.
+        """
+        block_structure.reuse_collected_transformer_block_data(cls)
+        for block_key in changed_block_keys:
+            block_structure.set_transformer_block_field(
+                block_key, cls, cls.collect_data_key, cls._create_block_value(block_key, cls.collect_data_key)
+            )
+        cls.partially_collected_block_keys = set(changed_block_keys)
+
+
 @ddt.ddt
 class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
     """
@@ -226,3 +248,34 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         assert TestTransformer1.collect_call_count == 2
+
+    @ddt.data(
+        ({0: 'v2'}, [0, 1, 2, 3, 4]),
+        ({1: 'v2'}, [1, 3, 4]),
+        ({2: 'v2', 4: None}, [2, 4]),
+    )
+    @ddt.unpack
+    def test_update_collected_partially(self, new_versions, expected_changed_blocks):
+        self.registered_transformers = [TestTransformer1(), TestPartialTransformer()]
+        TestPartialTransformer.partially_collected_block_keys = None
+        for xblock in six.itervalues(self.modulestore.blocks):
+            xblock.field_map['update_version'] = 'v1'
+
+        with waffle().override(INCREMENTAL_COLLECT, active=True):
+            with mock_registered_transformers(self.registered_transformers):
+                self.bs_manager.update_collected_if_needed()
+                assert TestTransformer1.collect_call_count == 1
+                assert TestPartialTransformer.partially_collected_block_keys is None
+
+                for block_id, version in six.iteritems(new_versions):
+                    self.modulestore.blocks[self.block_key_factory(block_id)].field_map['update_version'] = version
+
+                self.bs_manager.update_collected_if_needed()
+                assert TestTransformer1.collect_call_count == 2
+                assert TestPartialTransformer.partially_collected_block_keys == {
+                    self.block_key_factory(block_id) for block_id in expected_changed_blocks
+                }
+
+                block_structure = self.bs_manager.get_collected()
+                TestTransformer1.assert_collected(block_structure)
+                TestPartialTransformer.assert_collected(block_structure)
@@ -0,0 +1,174 @@
+"""
+Tests for block_structure/serialization.py
+"""
+
+
+# pylint: disable=protected-access
+import pickle
+from copy import deepcopy
+from datetime import date, datetime, timedelta
+from unittest import TestCase
+
+import ddt
+from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
+from pytz import UTC
+
+from .. import serialization
+from ..block_structure import BlockData, BlockStructureBlockData
+from ..factory import BlockStructureFactory
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+class _Unsupported(object):
+    """
+    A value type not natively supported by the columnar codec.
+    """
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, _Unsupported) and self.value == other.value
+
+
+@ddt.ddt
+class TestValueCodec(TestCase):
+    """
+    Tests for encode_value and decode_value.
+    """
+    @ddt.data(
+        None,
+        True,
+        7,
+        1.5,
+        u'text',
+        b'bytes',
+        [1, [u'a', None]],
+        (1, 2),
+        {1, 2},
+        frozenset([u'a']),
+        {u'str_key': [1]},
+        {1: [2, 3], u'mixed': 4},
+        {u'__bs__': 1},
+        datetime(2020, 1, 2, 3, 4, 5, 6, tzinfo=UTC),
+        datetime(2020, 1, 2),
+        date(2020, 1, 2),
+        timedelta(days=1, seconds=2),
+        CourseLocator(u'org', u'course', u'run'),
+        BlockUsageLocator(CourseLocator(u'org', u'course', u'run'), u'problem', u'p1'),
+        _Unsupported([1, 2]),
+    )
+    def test_round_trip(self, value):
+        decoded = serialization.decode_value(serialization.encode_value(value))
+        self.assertEqual(decoded, value)
+        self.assertEqual(type(decoded), type(value))
+
+    def test_deprecated_key_is_pickled(self):
+        key = CourseLocator(u'org', u'course', u'run', deprecated=True)
+        encoded = serialization.encode_value(key)
+        self.assertEqual(encoded[u'__bs__'][0], u'pickle')
+        self.assertEqual(serialization.decode_value(encoded), key)
+
+
+@ddt.ddt
+class TestColumnarSerialization(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for serialize and deserialize.
+    """
+    def create_collected_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map with
+        collected xBlock and transformer data.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        for block_id in range(len(children_map)):
+            block_key = self.block_key_factory(block_id)
+            block_data = block_structure._get_or_create_block(block_key)
+            block_data.display_name = u'Block {}'.format(block_id)
+            block_data.start = datetime(2020, 1, block_id + 1, tzinfo=UTC)
+            if block_id % 2:
+                block_structure.set_transformer_block_field(block_key, MockTransformer, 'odd', block_id)
+        return block_structure
+
+    def round_trip(self, block_structure):
+        """
+        Returns the block structure resulting from serializing and
+        deserializing the given block structure.
+        """
+        serialized_data = serialization.serialize(
+            block_structure._block_relations,
+            block_structure.transformer_data,
+            block_structure._block_data_map,
+        )
+        self.assertTrue(serialization.is_columnar(serialized_data))
+        return BlockStructureFactory.create_new(
+            block_structure.root_block_usage_key,
+            *serialization.deserialize(serialized_data)
+        )
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_structure(children_map)
+        deserialized = self.round_trip(block_structure)
+
+        self.assert_block_structure(deserialized, children_map)
+        self.assertEqual(list(deserialized), list(block_structure))
+        self.assertEqual(deserialized._get_transformer_data_version(MockTransformer), MockTransformer.WRITE_VERSION)
+        for block_key in block_structure:
+            for field_name in ('display_name', 'start'):
+                self.assertEqual(
+                    deserialized.get_xblock_field(block_key, field_name),
+                    block_structure.get_xblock_field(block_key, field_name),
+                )
+            self.assertEqual(
+                deserialized.get_transformer_block_field(block_key, MockTransformer, 'odd'),
+                block_structure.get_transformer_block_field(block_key, MockTransformer, 'odd'),
+            )
+            self.assertEqual(deserialized[block_key].location, block_key)
+
+    def test_lazy_decoding(self):
+        deserialized = self.round_trip(self.create_collected_structure(self.SIMPLE_CHILDREN_MAP))
+        block_data = deserialized[self.block_key_factory(1)]
+        self.assertEqual(block_data._fields, {})
+
+        self.assertEqual(block_data.display_name, u'Block 1')
+        self.assertEqual(block_data._fields, {'display_name': u'Block 1'})
+        self.assertEqual(set(deserialized[self.block_key_factory(2)]._fields), {'display_name'})
+
+        self.assertEqual(set(block_data.fields), {'display_name', 'start'})
+        self.assertIsNone(deserialized.get_xblock_field(block_data.location, 'missing'))
+
+    def test_updates_take_precedence(self):
+        deserialized = self.round_trip(self.create_collected_structure(self.SIMPLE_CHILDREN_MAP))
+        block_key = self.block_key_factory(1)
+
+        deserialized.override_xblock_field(block_key, 'display_name', u'Overridden')
+        deserialized.remove_transformer_block_field(block_key, MockTransformer, 'odd')
+        del deserialized[block_key].start
+
+        self.assertEqual(deserialized.get_xblock_field(block_key, 'display_name'), u'Overridden')
+        self.assertIsNone(deserialized.get_transformer_block_field(block_key, MockTransformer, 'odd'))
+        self.assertIsNone(deserialized.get_xblock_field(block_key, 'start'))
+
+    def test_copy(self):
+        block_structure = self.create_collected_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = self.round_trip(block_structure)
+
+        for copied in (deserialized.copy(), pickle.loads(pickle.dumps(deepcopy(deserialized)))):
+            self.assertIsInstance(copied[self.block_key_factory(1)], BlockData)
+            self.assertIsInstance(copied, BlockStructureBlockData)
+            self.assert_block_structure(copied, self.SIMPLE_CHILDREN_MAP)
+            self.assertEqual(
+                copied.get_transformer_block_field(self.block_key_factory(1), MockTransformer, 'odd'),
+                1,
+            )
+
+    def test_unsupported_version(self):
+        serialized_data = serialization.serialize({}, {}, {})
+        serialized_data = serialization.MAGIC + b'\xff' + serialized_data[len(serialization.MAGIC) + 1:]
+        with self.assertRaises(ValueError):
+            serialization.deserialize(serialized_data)
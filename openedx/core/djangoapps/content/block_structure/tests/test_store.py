@@ -3,11 +3,13 @@ Tests for block_structure/cache.py
 """
 
 
+import itertools
+
 import ddt
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import COLUMNAR_SERIALIZATION, STORAGE_BACKING_FOR_CACHE, waffle
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
 from ..store import BlockStructureStore
@@ -59,6 +61,19 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             self.assertIsNotNone(stored_value)
             self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(*itertools.product((True, False), repeat=2))
+    @ddt.unpack
+    def test_columnar_serialization(self, write_columnar, read_columnar):
+        with waffle().override(COLUMNAR_SERIALIZATION, active=write_columnar):
+            self.store.add(self.block_structure)
+        with waffle().override(COLUMNAR_SERIALIZATION, active=read_columnar):
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(stored_value, self.children_map)
+        self.assertEqual(
+            stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+            u'{} val'.format(MockTransformer.name()),
+        )
+
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
         with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
@@ -57,6 +57,11 @@ class BlockStructureTransformer(object):
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer implements collect_partial, allowing the
+    # framework to re-collect only the blocks that changed since the
+    # previous collection. See collect_partial.
+    SUPPORTS_PARTIAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -107,6 +112,35 @@ class BlockStructureTransformer(object):
         """
         pass
 
+    @classmethod
+    def collect_partial(cls, block_structure, changed_block_keys):
+        """
+        Collects data into the block_structure, similar to collect,
+        except that data only needs to be computed for the blocks in
+        changed_block_keys. Data collected for the remaining blocks in
+        the previous collection can be reused by calling
+        block_structure.reuse_collected_transformer_block_data.
+
+        Called instead of collect only for transformers that set
+        SUPPORTS_PARTIAL_COLLECT, and only when the previously collected
+        data was written by the transformer's current WRITE_VERSION.
+
+        The changed blocks include all descendants of any block that
+        changed, so data percolated down from ancestors can be safely
+        recomputed for them. Transformers that aggregate data up from
+        descendants should not support partial collection, or must
+        account for it themselves.
+
+        Arguments:
+            block_structure (BlockStructureModulestoreData) - A mutable
+                block structure that is to be modified with collected
+                data to be cached for the transformer.
+
+            changed_block_keys (set(UsageKey)) - Usage keys of the
+                blocks whose data is to be collected.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def transform(self, usage_info, block_structure):
         """
@@ -83,6 +83,43 @@ class BlockStructureTransformers(object):
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def collect_partial(cls, block_structure, changed_block_keys):
+        """
+        Collects data for each registered transformer, re-collecting
+        only the data of the given changed blocks for transformers that
+        support partial collection.
+
+        The given block_structure must have been set up with its previous
+        collection via _set_previous_block_structure.
+        """
+        for transformer in TransformerRegistry.get_registered_transformers():
+            block_structure._add_transformer(transformer)  # pylint: disable=protected-access
+            if transformer.SUPPORTS_PARTIAL_COLLECT:
+                transformer.collect_partial(block_structure, changed_block_keys)
+            else:
+                transformer.collect(block_structure)
+
+        # Collect all fields that were requested by the transformers.
+        block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
+
+    @classmethod
+    def supports_partial_collect(cls, previous_block_structure):
+        """
+        Returns whether data in the given previously collected block
+        structure can be reused for a partial collection, which requires
+        it to have been collected by the current version of every
+        registered transformer and at least one of them to support
+        partial collection.
+        """
+        registered_transformers = TransformerRegistry.get_registered_transformers()
+        return any(
+            transformer.SUPPORTS_PARTIAL_COLLECT for transformer in registered_transformers
+        ) and all(
+            previous_block_structure._get_transformer_data_version(transformer) == transformer.WRITE_VERSION  # pylint: disable=protected-access
+            for transformer in registered_transformers
+        )
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
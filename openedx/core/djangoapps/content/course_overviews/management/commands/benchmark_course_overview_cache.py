@@ -0,0 +1,78 @@
+"""
+Command to compare the time and queries of CourseOverview.get_from_ids for a
+dashboard of many enrollments, with cold, cross-request and request caches.
+"""
+
+
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from edx_django_utils.cache import RequestCache
+
+from openedx.core.djangoapps.content.course_overviews.models import (
+    COURSE_OVERVIEW_REQUEST_CACHE_NAMESPACE,
+    CourseOverview
+)
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_course_overview_cache --enrollments 500 --settings=devstack
+
+    Gets the overviews of up to the given number of existing courses, as the
+    learner dashboard does for a learner with as many enrollments:
+        - cold: with no cached overviews,
+        - cross-request: with the overviews in the django cache only,
+        - request: with the overviews in the request cache.
+    """
+    help = u'Compares CourseOverview.get_from_ids with cold, cross-request and request caches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--enrollments',
+            help=u'Number of courses to get the overviews of.',
+            default=500,
+            type=int,
+        )
+        parser.add_argument(
+            '--repeat',
+            help=u'Number of times each case is timed, of which the fastest is reported.',
+            default=5,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        course_ids = list(CourseOverview.get_all_course_keys()[:options['enrollments']])
+        if not course_ids:
+            raise CommandError(u'There are no course overviews to get.')
+
+        def clear_request_cache():
+            RequestCache(COURSE_OVERVIEW_REQUEST_CACHE_NAMESPACE).clear()
+
+        def clear_caches():
+            clear_request_cache()
+            for course_id in course_ids:
+                CourseOverview.invalidate_cache(course_id)
+
+        self.stdout.write(u'{} course overviews'.format(len(course_ids)))
+        for name, setup in [
+            (u'cold', clear_caches),
+            (u'cross-request', clear_request_cache),
+            (u'request', lambda: None),
+        ]:
+            setup()
+            with CaptureQueriesContext(connection) as queries:
+                CourseOverview.get_from_ids(course_ids)
+            duration = min(timeit.repeat(
+                lambda: CourseOverview.get_from_ids(course_ids),
+                setup=setup,
+                number=1,
+                repeat=options['repeat'],
+            ))
+            self.stdout.write(u'  {:<14} {:>10.2f} ms, {:>4} queries'.format(
+                name + u':', duration * 1000, len(queries),
+            ))
+        clear_request_cache()
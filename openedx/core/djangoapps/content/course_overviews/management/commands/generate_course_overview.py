@@ -4,6 +4,7 @@ Command to load course overviews.
 
 
 import logging
+from time import time
 
 import six
 from django.core.management.base import BaseCommand, CommandError
@@ -13,7 +14,9 @@ from openedx.core.djangoapps.content.course_overviews.tasks import (
     DEFAULT_ALL_COURSES,
     DEFAULT_CHUNK_SIZE,
     DEFAULT_FORCE_UPDATE,
-    enqueue_async_course_overview_update_tasks
+    enqueue_async_course_overview_update_tasks,
+    get_course_keys,
+    update_course_overviews_in_processes
 )
 
 log = logging.getLogger(__name__)
@@ -24,7 +27,15 @@ class Command(BaseCommand):
     Example usage:
         $ ./manage.py lms generate_course_overview --all-courses --settings=devstack --chunk-size=100
         $ ./manage.py lms generate_course_overview 'edX/DemoX/Demo_Course' --settings=devstack
+        $ ./manage.py lms generate_course_overview --all-courses --settings=devstack --processes=8
+
+    By default, the overviews are generated by celery tasks of --chunk-size
+    courses each.  With --processes, they are generated by this command instead,
+    in as many processes, with the progress and time of each course reported.
     """
+    # Number of slowest courses reported when generating overviews in processes.
+    NUM_SLOWEST_COURSES = 10
+
     args = '<course_id course_id ...>'
     help = 'Generates and stores course overview for one or more courses.'
 
@@ -57,11 +68,21 @@ class Command(BaseCommand):
             dest='routing_key',
             help=u'The celery routing key to use.'
         )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=0,
+            help=u'Generate the course overviews in this number of processes, instead of in celery tasks.'
+        )
 
     def handle(self, *args, **options):
         if not options.get('all_courses') and len(args) < 1:
             raise CommandError('At least one course or --all-courses must be specified.')
 
+        if options.get('processes'):
+            self._generate_in_processes(args, options)
+            return
+
         kwargs = {}
         for key in ('all_courses', 'force_update', 'chunk_size', 'routing_key'):
             if options.get(key):
@@ -74,3 +95,43 @@ class Command(BaseCommand):
             )
         except InvalidKeyError as exc:
             raise CommandError(u'Invalid Course Key: ' + six.text_type(exc))
+
+    def _generate_in_processes(self, course_ids, options):
+        """
+        Generates the course overviews in options['processes'] processes, and
+        reports the time taken for each course.
+        """
+        try:
+            course_keys = get_course_keys(course_ids, options.get('all_courses', DEFAULT_ALL_COURSES))
+        except InvalidKeyError as exc:
+            raise CommandError(u'Invalid Course Key: ' + six.text_type(exc))
+
+        start_time = time()
+        timings = []
+        failures = []
+        results = update_course_overviews_in_processes(
+            course_keys,
+            force_update=options.get('force_update', DEFAULT_FORCE_UPDATE),
+            processes=options['processes'],
+        )
+        for index, (course_key, duration, error) in enumerate(results, 1):
+            timings.append((duration, course_key))
+            if error is None:
+                self.stdout.write(u'[{}/{}] {} generated in {:.2f}s'.format(
+                    index, len(course_keys), course_key, duration
+                ))
+            else:
+                failures.append(course_key)
+                self.stderr.write(u'[{}/{}] {} failed in {:.2f}s: {}'.format(
+                    index, len(course_keys), course_key, duration, error
+                ))
+
+        self.stdout.write(u'Generated {} of {} course overviews in {:.2f}s with {} processes.'.format(
+            len(course_keys) - len(failures), len(course_keys), time() - start_time, options['processes']
+        ))
+        if timings:
+            self.stdout.write(u'Slowest courses:')
+            for duration, course_key in sorted(timings, reverse=True)[:self.NUM_SLOWEST_COURSES]:
+                self.stdout.write(u'  {:>8.2f}s {}'.format(duration, course_key))
+        if failures:
+            raise CommandError(u'Failed to generate the course overviews of: ' + u', '.join(failures))
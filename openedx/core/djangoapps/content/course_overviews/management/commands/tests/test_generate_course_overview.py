@@ -6,6 +6,7 @@ Tests that the generate_course_overview management command actually generates co
 import six
 from django.core.management.base import CommandError
 from mock import patch
+from six import StringIO
 
 from openedx.core.djangoapps.content.course_overviews.management.commands import generate_course_overview
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
@@ -117,3 +118,32 @@ class TestGenerateCourseOverview(ModuleStoreTestCase):
         }, called_kwargs
         )
         self.assertEqual(1, mock_async_task.apply_async.call_count)
+
+    def test_generate_in_processes(self):
+        """
+        Test that courses are loaded into course overviews by the command itself, with their times reported.
+        """
+        self._assert_courses_not_in_overview(self.course_key_1, self.course_key_2)
+        out = StringIO()
+        command = generate_course_overview.Command(stdout=out)
+        with patch('openedx.core.djangoapps.content.course_overviews.tasks.async_course_overview_update') as mock_task:
+            command.handle(all_courses=True, processes=1)
+
+        self.assertFalse(mock_task.apply_async.called)
+        self._assert_courses_in_overview(self.course_key_1, self.course_key_2)
+        output = out.getvalue()
+        for course_key in (self.course_key_1, self.course_key_2):
+            self.assertIn(u'{} generated in'.format(course_key), output)
+        self.assertIn(u'[2/2]', output)
+        self.assertIn(u'Generated 2 of 2 course overviews', output)
+
+    def test_generate_in_processes_failure(self):
+        """
+        Test that the courses whose overviews could not be generated are reported.
+        """
+        err = StringIO()
+        command = generate_course_overview.Command(stdout=StringIO(), stderr=err)
+        with self.assertRaisesRegex(CommandError, 'fake/course/id'):
+            command.handle(six.text_type(self.course_key_1), 'fake/course/id', all_courses=False, processes=1)
+        self.assertIn(u'fake/course/id failed in', err.getvalue())
+        self._assert_courses_in_overview(self.course_key_1)
@@ -5,11 +5,13 @@ Declaration of CourseOverview model
 
 import json
 import logging
+from time import time
 
 import six
 from ccx_keys.locator import CCXLocator
 from config_models.models import ConfigurationModel
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models import Q
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, FloatField, IntegerField, TextField
@@ -17,6 +19,7 @@ from django.db.utils import IntegrityError
 from django.template import defaultfilters
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.functional import cached_property
+from edx_django_utils.cache import RequestCache
 from model_utils.models import TimeStampedModel
 from opaque_keys.edx.django.models import CourseKeyField, UsageKeyField
 from six import text_type  # pylint: disable=ungrouped-imports
@@ -37,6 +40,13 @@ from xmodule.tabs import CourseTab
 
 log = logging.getLogger(__name__)
 
+# CourseOverviews are cached across requests, along with their image sets, under
+# their course id and CourseOverview.VERSION.  Within a request, the same
+# instances are returned to every caller.
+COURSE_OVERVIEW_CACHE_KEY = u'course_overviews.course_overview.{version}.{course_id}'
+COURSE_OVERVIEW_CACHE_TIMEOUT = 60 * 60
+COURSE_OVERVIEW_REQUEST_CACHE_NAMESPACE = u'course_overviews.course_overview'
+
 
 @python_2_unicode_compatible
 class CourseOverview(TimeStampedModel):
@@ -323,10 +333,13 @@ class CourseOverview(TimeStampedModel):
         """
         Load a CourseOverview object for a given course ID.
 
-        First, we try to load the CourseOverview from the database. If it
-        doesn't exist, we load the entire course from the modulestore, create a
-        CourseOverview object from it, and then cache it in the database for
-        future use.
+        First, we try to load the CourseOverview from the cache, then from the
+        database. If it doesn't exist, we load the entire course from the
+        modulestore, create a CourseOverview object from it, and then cache it
+        in the database for future use.
+
+        The returned CourseOverview may be shared with other callers, and must
+        not be modified.
 
         Arguments:
             course_id (CourseKey): the ID of the course overview to be loaded.
@@ -340,13 +353,16 @@ class CourseOverview(TimeStampedModel):
             - IOError if some other error occurs while trying to load the
                 course from the module store.
         """
-        try:
-            course_overview = cls.objects.select_related('image_set').get(id=course_id)
-            if course_overview.version < cls.VERSION:
-                # Reload the overview from the modulestore to update the version
-                course_overview = cls.load_from_module_store(course_id)
-        except cls.DoesNotExist:
-            course_overview = None
+        course_overview = cls._get_cached([course_id]).get(course_id)
+        cached = course_overview is not None
+        if not cached:
+            try:
+                course_overview = cls.objects.select_related('image_set').get(id=course_id)
+                if course_overview.version < cls.VERSION:
+                    # Reload the overview from the modulestore to update the version
+                    course_overview = cls.load_from_module_store(course_id)
+            except cls.DoesNotExist:
+                course_overview = None
 
         # Regenerate the thumbnail images if they're missing (either because
         # they were never generated, or because they were flushed out after
@@ -354,15 +370,19 @@ class CourseOverview(TimeStampedModel):
         if course_overview and not hasattr(course_overview, 'image_set'):
             CourseOverviewImageSet.create(course_overview)
 
-        return course_overview or cls.load_from_module_store(course_id)
+        if not cached:
+            course_overview = course_overview or cls.load_from_module_store(course_id)
+            cls._set_cached([course_overview])
+        return course_overview
 
     @classmethod
     def get_from_ids(cls, course_ids):
         """
         Return a dict mapping course_ids to CourseOverviews.
 
-        Tries to select all CourseOverviews in one query,
-        then fetches remaining (uncached) overviews from the modulestore.
+        Gets the cached CourseOverviews with one cache lookup, then tries to
+        select all remaining CourseOverviews in one query, then fetches remaining
+        (uncached) overviews from the modulestore.
 
         Course IDs for non-existant courses will map to None.
 
@@ -371,13 +391,16 @@ class CourseOverview(TimeStampedModel):
 
         Returns: dict[CourseKey, CourseOverview|None]
         """
-        overviews = {
-            overview.id: overview
-            for overview in cls.objects.select_related('image_set').filter(
-                id__in=course_ids,
+        course_ids = list(course_ids)
+        overviews = cls._get_cached(course_ids)
+        uncached_ids = [course_id for course_id in course_ids if course_id not in overviews]
+        if uncached_ids:
+            selected_overviews = list(cls.objects.select_related('image_set').filter(
+                id__in=uncached_ids,
                 version__gte=cls.VERSION
-            )
-        }
+            ))
+            cls._set_cached(selected_overviews)
+            overviews.update((overview.id, overview) for overview in selected_overviews)
         for course_id in course_ids:
             if course_id not in overviews:
                 try:
@@ -386,6 +409,52 @@ class CourseOverview(TimeStampedModel):
                     overviews[course_id] = None
         return overviews
 
+    @classmethod
+    def _cache_key(cls, course_id):
+        """
+        Returns the key of the cached CourseOverview of the course.
+        """
+        return COURSE_OVERVIEW_CACHE_KEY.format(version=cls.VERSION, course_id=six.text_type(course_id))
+
+    @classmethod
+    def _get_cached(cls, course_ids):
+        """
+        Returns a dict of the cached CourseOverviews of the given courses, from
+        the request cache or else the django cache.
+        """
+        request_cache = RequestCache(COURSE_OVERVIEW_REQUEST_CACHE_NAMESPACE).data
+        overviews = {
+            course_id: request_cache[course_id] for course_id in course_ids if course_id in request_cache
+        }
+        cache_keys = {cls._cache_key(course_id): course_id for course_id in course_ids if course_id not in overviews}
+        if cache_keys:
+            for cache_key, overview in six.iteritems(cache.get_many(list(cache_keys))):
+                overviews[cache_keys[cache_key]] = request_cache[cache_keys[cache_key]] = overview
+        return overviews
+
+    @classmethod
+    def _set_cached(cls, course_overviews):
+        """
+        Caches the given CourseOverviews for the rest of the request, and for
+        other requests.
+        """
+        request_cache = RequestCache(COURSE_OVERVIEW_REQUEST_CACHE_NAMESPACE).data
+        for course_overview in course_overviews:
+            request_cache[course_overview.id] = course_overview
+        cache.set_many(
+            {cls._cache_key(course_overview.id): course_overview for course_overview in course_overviews},
+            COURSE_OVERVIEW_CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    def invalidate_cache(cls, course_id):
+        """
+        Removes the cached CourseOverview of the course, so that it is read
+        from the database again.
+        """
+        RequestCache(COURSE_OVERVIEW_REQUEST_CACHE_NAMESPACE).data.pop(course_id, None)
+        cache.delete(cls._cache_key(course_id))
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
@@ -586,6 +655,7 @@ class CourseOverview(TimeStampedModel):
         action = CourseOverview.load_from_module_store if force_update else CourseOverview.get_from_id
 
         for course_key in course_keys:
+            start_time = time()
             try:
                 action(course_key)
             except Exception as ex:  # pylint: disable=broad-except
@@ -594,6 +664,12 @@ class CourseOverview(TimeStampedModel):
                     six.text_type(course_key),
                     text_type(ex),
                 )
+            else:
+                log.info(
+                    u'Generated course overview for %s in %.2f seconds.',
+                    six.text_type(course_key),
+                    time() - start_time,
+                )
 
         log.info('Finished generating course overviews.')
 
@@ -5,12 +5,14 @@ Signal handler for invalidating cached course overviews
 
 import logging
 
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal
 from django.dispatch.dispatcher import receiver
 
 from xmodule.modulestore.django import SignalHandler
 
-from .models import CourseOverview
+from .models import CourseOverview, CourseOverviewImageSet
 
 LOG = logging.getLogger(__name__)
 
@@ -25,6 +27,7 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
     Catches the signal that a course has been published in Studio and
     updates the corresponding CourseOverview cache entry.
     """
+    CourseOverview.invalidate_cache(course_key)
     try:
         previous_course_overview = CourseOverview.objects.get(id=course_key)
     except CourseOverview.DoesNotExist:
@@ -46,6 +49,31 @@ def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=
     CourseAboutSearchIndexer.remove_deleted_items(course_key)
 
 
+@receiver(post_save, sender=CourseOverview)
+@receiver(post_delete, sender=CourseOverview)
+def _invalidate_course_overview_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes the cached copy of a CourseOverview when it changes.
+
+    It is removed again once the transaction is committed, so that a copy
+    cached by another process before the commit is not used.
+    """
+    course_key = instance.id
+    CourseOverview.invalidate_cache(course_key)
+    transaction.on_commit(lambda: CourseOverview.invalidate_cache(course_key))
+
+
+@receiver(post_save, sender=CourseOverviewImageSet)
+@receiver(post_delete, sender=CourseOverviewImageSet)
+def _invalidate_course_overview_image_set_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes the cached copy of a CourseOverview when its image set changes.
+    """
+    course_key = instance.course_overview_id
+    CourseOverview.invalidate_cache(course_key)
+    transaction.on_commit(lambda: CourseOverview.invalidate_cache(course_key))
+
+
 def _check_for_course_changes(previous_course_overview, updated_course_overview):
     if previous_course_overview:
         _check_for_course_date_changes(previous_course_overview, updated_course_overview)
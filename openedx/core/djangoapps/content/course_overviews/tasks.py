@@ -1,16 +1,19 @@
 
 
 import logging
+import multiprocessing
+from time import time
 
 import six
 from celery import task
 from celery_utils.persist_on_failure import LoggedPersistOnFailureTask
 from django.conf import settings
+from django.db import connections
 from opaque_keys.edx.keys import CourseKey
 from six.moves import range  # pylint: disable=ungrouped-imports
 
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import clear_existing_modulestores, modulestore
 
 log = logging.getLogger(__name__)
 
@@ -35,6 +38,15 @@ def _task_options(routing_key):
     return task_options
 
 
+def get_course_keys(course_ids, all_courses=False):
+    """
+    Returns the keys of the given course ids, or of all courses in the modulestore.
+    """
+    if all_courses:
+        return [course.id for course in modulestore().get_course_summaries()]
+    return [CourseKey.from_string(id) for id in course_ids]
+
+
 def enqueue_async_course_overview_update_tasks(
         course_ids,
         all_courses=False,
@@ -42,10 +54,7 @@ def enqueue_async_course_overview_update_tasks(
         chunk_size=DEFAULT_CHUNK_SIZE,
         routing_key=None
 ):
-    if all_courses:
-        course_keys = [course.id for course in modulestore().get_course_summaries()]
-    else:
-        course_keys = [CourseKey.from_string(id) for id in course_ids]
+    course_keys = get_course_keys(course_ids, all_courses)
 
     for course_key_group in chunks(course_keys, chunk_size):
         course_key_strings = [six.text_type(key) for key in course_key_group]
@@ -62,3 +71,74 @@ def enqueue_async_course_overview_update_tasks(
 def async_course_overview_update(*args, **kwargs):
     course_keys = [CourseKey.from_string(arg) for arg in args]
     CourseOverview.update_select_courses(course_keys, force_update=kwargs['force_update'])
+
+
+def update_course_overview(course_key_string, force_update=DEFAULT_FORCE_UPDATE):
+    """
+    Updates the CourseOverview of a course, as CourseOverview.update_select_courses does.
+
+    Returns:
+        (course_key_string, seconds, error): the seconds it took to update the
+            overview, and the text of the error that prevented it, or None.
+    """
+    start_time = time()
+    error = None
+    try:
+        course_key = CourseKey.from_string(course_key_string)
+        if force_update:
+            CourseOverview.load_from_module_store(course_key)
+        else:
+            CourseOverview.get_from_id(course_key)
+    except Exception as exc:  # pylint: disable=broad-except
+        log.exception(u'An error occurred while generating course overview for %s', course_key_string)
+        error = six.text_type(exc) or exc.__class__.__name__
+    return course_key_string, time() - start_time, error
+
+
+def _init_update_process():
+    """
+    Initializes a process of update_course_overviews_in_processes.
+
+    The connections to the modulestore that were inherited from the parent
+    process are dropped, so that each process opens its own.
+    """
+    clear_existing_modulestores()
+
+
+def _update_course_overview_in_process(args):
+    """
+    Calls update_course_overview with the (course_key_string, force_update) args.
+    """
+    return update_course_overview(*args)
+
+
+def update_course_overviews_in_processes(course_keys, force_update=DEFAULT_FORCE_UPDATE, processes=1):
+    """
+    Updates the CourseOverviews of the given courses in a pool of processes.
+
+    Arguments:
+        course_keys (list[CourseKey]): the courses to update the overviews of.
+        force_update (bool): whether the overviews are reloaded from the
+            modulestore even when they are up to date.
+        processes (int): the number of processes that update overviews at once.
+
+    Yields:
+        The result of update_course_overview for each course, in the order
+        that they finish.
+    """
+    args = [(six.text_type(course_key), force_update) for course_key in course_keys]
+    if processes <= 1:
+        for course_args in args:
+            yield update_course_overview(*course_args)
+        return
+
+    # The database connections of this process must not be shared with the
+    # forked processes, which open their own.
+    connections.close_all()
+    pool = multiprocessing.Pool(processes, initializer=_init_update_process)
+    try:
+        for result in pool.imap_unordered(_update_course_overview_in_process, args):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
@@ -13,9 +13,12 @@ import mock
 import pytz
 import six
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
 from django.db.utils import IntegrityError
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils import timezone
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 from PIL import Image
 from six.moves import range  # pylint: disable=ungrouped-imports
@@ -42,7 +45,12 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls_range
 
-from ..models import CourseOverview, CourseOverviewImageConfig, CourseOverviewImageSet
+from ..models import (
+    COURSE_OVERVIEW_REQUEST_CACHE_NAMESPACE,
+    CourseOverview,
+    CourseOverviewImageConfig,
+    CourseOverviewImageSet
+)
 from .factories import CourseOverviewFactory
 
 
@@ -1108,3 +1116,100 @@ class CourseOverviewTabTestCase(ModuleStoreTestCase):
             actual_tabs = {tab.tab_id for tab in course_overview.tab_set.all()}
             self.assertEqual(actual_tabs, expected_tabs)
             self.assertNotEqual(course_overview.display_name, course.display_name)
+
+
+@ddt.ddt
+class CourseOverviewCacheTestCase(ModuleStoreTestCase, CacheIsolationTestCase):
+    """
+    Tests for the request and cross-request caches of CourseOverviews.
+    """
+    ENABLED_CACHES = ['default']
+    ENABLED_SIGNALS = ['course_deleted', 'course_published']
+
+    def setUp(self):
+        super(CourseOverviewCacheTestCase, self).setUp()
+        self.courses = [CourseFactory.create(emit_signals=True) for __ in range(3)]
+        self.course_ids = [course.id for course in self.courses]
+
+    def _overview_queries(self, get_overviews):
+        """
+        Returns the result of get_overviews, and the number of queries of the
+        course overview table that it made.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            result = get_overviews()
+        table_name = connection.ops.quote_name(CourseOverview._meta.db_table)  # pylint: disable=protected-access
+        return result, len([query for query in queries.captured_queries if table_name in query['sql']])
+
+    def _clear_request_cache(self):
+        """
+        Clears the request cache of CourseOverviews, as happens at the end of a request.
+        """
+        RequestCache(COURSE_OVERVIEW_REQUEST_CACHE_NAMESPACE).clear()
+
+    @ddt.data(True, False)
+    def test_get_from_id(self, clear_request_cache):
+        course_id = self.course_ids[0]
+        overview, num_queries = self._overview_queries(lambda: CourseOverview.get_from_id(course_id))
+        self.assertEqual(num_queries, 1)
+
+        if clear_request_cache:
+            self._clear_request_cache()
+        cached_overview, num_queries = self._overview_queries(lambda: CourseOverview.get_from_id(course_id))
+        self.assertEqual(num_queries, 0)
+        self.assertEqual(cached_overview.id, course_id)
+        self.assertEqual(cached_overview.display_name, overview.display_name)
+        self.assertEqual(cached_overview is overview, not clear_request_cache)
+
+    @ddt.data(True, False)
+    def test_get_from_ids(self, clear_request_cache):
+        CourseOverview.get_from_id(self.course_ids[0])
+        if clear_request_cache:
+            self._clear_request_cache()
+
+        # Only the uncached overviews are selected, with one query.
+        overviews, num_queries = self._overview_queries(lambda: CourseOverview.get_from_ids(self.course_ids))
+        self.assertEqual(num_queries, 1)
+        self.assertEqual(set(overviews), set(self.course_ids))
+
+        self._clear_request_cache()
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as mock_get_many:
+            cached_overviews, num_queries = self._overview_queries(
+                lambda: CourseOverview.get_from_ids(self.course_ids)
+            )
+        self.assertEqual(num_queries, 0)
+        self.assertEqual(mock_get_many.call_count, 1)
+        self.assertEqual(
+            {course_id: overview.display_name for course_id, overview in cached_overviews.items()},
+            {course_id: overview.display_name for course_id, overview in overviews.items()},
+        )
+
+    def test_invalidated_on_publish(self):
+        course = self.courses[0]
+        CourseOverview.get_from_id(course.id)
+
+        course.display_name = u'Updated display name'
+        with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+            self.store.update_item(course, ModuleStoreEnum.UserID.test)
+
+        self.assertEqual(CourseOverview.get_from_id(course.id).display_name, u'Updated display name')
+        self._clear_request_cache()
+        self.assertEqual(CourseOverview.get_from_id(course.id).display_name, u'Updated display name')
+
+    def test_invalidated_on_save(self):
+        course_id = self.course_ids[0]
+        overview = CourseOverview.objects.get(id=course_id)
+        CourseOverview.get_from_id(course_id)
+
+        overview.display_name = u'Updated display name'
+        overview.save()
+
+        __, num_queries = self._overview_queries(lambda: CourseOverview.get_from_id(course_id))
+        self.assertEqual(num_queries, 1)
+        self.assertEqual(CourseOverview.get_from_id(course_id).display_name, u'Updated display name')
+
+    def test_invalidated_on_delete(self):
+        course_id = self.course_ids[0]
+        CourseOverview.get_from_id(course_id)
+        self.store.delete_course(course_id, ModuleStoreEnum.UserID.test)
+        self.assertIsNone(CourseOverview.get_from_ids([course_id])[course_id])
@@ -2,12 +2,15 @@
 
 import mock
 import six
+from opaque_keys.edx.keys import CourseKey
+from six.moves import range
 
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
-from ..tasks import enqueue_async_course_overview_update_tasks
+from ..models import CourseOverview
+from ..tasks import enqueue_async_course_overview_update_tasks, update_course_overviews_in_processes
 
 
 class BatchedAsyncCourseOverviewUpdateTests(ModuleStoreTestCase):
@@ -43,3 +46,36 @@ class BatchedAsyncCourseOverviewUpdateTests(ModuleStoreTestCase):
             mock.call([self.course_1.id], force_update=True),
             mock.call([self.course_2.id], force_update=True)
         ])
+
+
+class UpdateCourseOverviewsInProcessesTests(ModuleStoreTestCase):
+    def setUp(self):
+        super(UpdateCourseOverviewsInProcessesTests, self).setUp()
+        self.course_keys = [CourseFactory.create().id for __ in range(3)]
+
+    @mock.patch('openedx.core.djangoapps.content.course_overviews.tasks.multiprocessing.Pool')
+    def test_update_in_pool(self, mock_pool):
+        # The pool runs the updates in this process, one after the other.
+        mock_pool.return_value.imap_unordered.side_effect = lambda func, args: (func(arg) for arg in args)
+
+        results = list(update_course_overviews_in_processes(self.course_keys, force_update=True, processes=2))
+
+        self.assertEqual(mock_pool.call_args[0], (2,))
+        self.assertEqual(
+            [course_key for course_key, __, __ in results],
+            [six.text_type(course_key) for course_key in self.course_keys],
+        )
+        self.assertEqual([error for __, __, error in results], [None] * 3)
+        self.assertTrue(mock_pool.return_value.terminate.called)
+        self.assertEqual(
+            set(CourseOverview.get_all_course_keys()),
+            set(self.course_keys),
+        )
+
+    def test_update_failure(self):
+        course_key = CourseKey.from_string('course-v1:This+Course+IsFake')
+        results = list(update_course_overviews_in_processes(self.course_keys[:1] + [course_key]))
+
+        self.assertEqual(results[0][2], None)
+        self.assertEqual(results[1][0], six.text_type(course_key))
+        self.assertIsNotNone(results[1][2])
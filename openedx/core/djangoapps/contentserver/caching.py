@@ -1,15 +1,30 @@
 """
 Helper functions for caching course assets.
+
+Besides the shared cache of small assets, assets can be cached on the disk of
+each node, in COURSE_ASSETS_DISK_CACHE_DIR.  The files on disk are addressed
+by the location and modification time of the assets, while the attributes of
+the assets are kept in the shared cache, so that deleting the cached content
+of an asset makes every node stop serving its previous version.
 """
 
 
-import six
+import errno
+import hashlib
+import logging
+import os
+import tempfile
+import time
 
+import six
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.content import STATIC_CONTENT_VERSION, STREAM_DATA_CHUNK_SIZE, StaticContentStream
+
+log = logging.getLogger(__name__)
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -51,4 +66,194 @@ def del_cached_content(location):
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
+    # Deleting the attributes of the content stops it from being served from the disk cache of any node.
+    locations.extend([_disk_attributes_key(loc) for loc in locations])
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+
+
+# The attributes of the content that are kept in the shared cache for the disk cache.
+DISK_CACHED_ATTRIBUTES = (
+    'name', 'content_type', 'last_modified_at', 'thumbnail_location', 'import_path', 'length', 'locked',
+    'content_digest',
+)
+
+# The number of seconds for which the modification time of a file in the disk cache
+# isn't updated again when it is served.
+DISK_CACHE_TOUCH_INTERVAL = 60
+
+
+class DiskCachedContent(StaticContentStream):
+    """
+    Content that is streamed from a file in the disk cache.
+
+    The file is only opened once the data of the content is read, and is
+    closed once it has been streamed, so that responses which don't send
+    it, such as "304 Not Modified", leave no file open.
+    """
+    def __init__(self, loc, path, **attributes):
+        super(DiskCachedContent, self).__init__(loc, stream=None, **attributes)
+        self.path = path
+
+    @property
+    def file(self):
+        """
+        The open file of the content, which can be sent without being copied by the server.
+        """
+        self._open()
+        return self._stream
+
+    def _open(self):
+        """
+        Opens the file of the content, unless it is already open.
+        """
+        if self._stream is None:
+            self._stream = open(self.path, 'rb')
+
+    def stream_data(self, chunk_size=STREAM_DATA_CHUNK_SIZE):
+        self._open()
+        try:
+            for chunk in super(DiskCachedContent, self).stream_data(chunk_size=chunk_size):
+                yield chunk
+        finally:
+            self.close()
+
+    def stream_data_in_range(self, first_byte, last_byte, chunk_size=STREAM_DATA_CHUNK_SIZE):
+        self._open()
+        try:
+            chunks = super(DiskCachedContent, self).stream_data_in_range(first_byte, last_byte, chunk_size=chunk_size)
+            for chunk in chunks:
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def copy_to_in_mem(self):
+        self._open()
+        return super(DiskCachedContent, self).copy_to_in_mem()
+
+
+def _disk_attributes_key(location_str):
+    """
+    Returns the key of the attributes of the content at the location in the shared cache.
+    """
+    return location_str + b':disk'
+
+
+def _disk_cache_path(location, last_modified_at):
+    """
+    Returns the path of the file of the given version of the content in the disk cache.
+    """
+    key = u'{}:{}:{}'.format(location, last_modified_at.isoformat(), STATIC_CONTENT_VERSION)
+    return os.path.join(settings.COURSE_ASSETS_DISK_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+
+def get_disk_cached_content(location):
+    """
+    Returns the content at the given location from the disk cache, or None
+    if the disk cache is disabled or doesn't have the current version of the content.
+    """
+    if not settings.COURSE_ASSETS_DISK_CACHE_DIR:
+        return None
+
+    attributes = CONTENT_CACHE.get(
+        _disk_attributes_key(six.text_type(location).encode("utf-8")), version=STATIC_CONTENT_VERSION
+    )
+    if attributes is None:
+        return None
+
+    path = _disk_cache_path(location, attributes['last_modified_at'])
+    try:
+        # The modification time of the files orders them from least to most recently served.
+        # It is only updated once in a while, rather than on every request for popular assets.
+        if os.stat(path).st_mtime < time.time() - DISK_CACHE_TOUCH_INTERVAL:
+            os.utime(path, None)
+    except (IOError, OSError):
+        # The file was never written on this node, or was culled.
+        return None
+    return DiskCachedContent(location, path, **attributes)
+
+
+def set_disk_cached_content(content):
+    """
+    Stores the given content in the disk cache, if it is enabled and the content is small enough.
+
+    Returns the content, as served from the disk cache, or None if it wasn't stored.
+    """
+    cache_dir = settings.COURSE_ASSETS_DISK_CACHE_DIR
+    if not cache_dir or content.last_modified_at is None:
+        return None
+    if content.length is None or content.length > settings.COURSE_ASSETS_DISK_CACHE_MAX_ITEM_SIZE:
+        return None
+
+    path = _disk_cache_path(content.location, content.last_modified_at)
+    if not os.path.exists(path):
+        try:
+            _write_disk_cache_file(cache_dir, path, content)
+        except (IOError, OSError):
+            log.exception(u'Could not store %s in the disk cache.', content.location)
+            return None
+        _cull_disk_cache(cache_dir)
+
+    attributes = {name: getattr(content, name) for name in DISK_CACHED_ATTRIBUTES}
+    CONTENT_CACHE.set(
+        _disk_attributes_key(six.text_type(content.location).encode("utf-8")), attributes,
+        version=STATIC_CONTENT_VERSION
+    )
+    return DiskCachedContent(content.location, path, **attributes)
+
+
+def _write_disk_cache_file(cache_dir, path, content):
+    """
+    Writes the data of the content to the path, atomically so that partly
+    written files are never served.
+    """
+    try:
+        os.makedirs(cache_dir)
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+
+    fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            for chunk in content.stream_data():
+                temp_file.write(chunk)
+        os.rename(temp_path, path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+
+def _cull_disk_cache(cache_dir):
+    """
+    Removes the least recently served files of the disk cache, until their
+    total size is within COURSE_ASSETS_DISK_CACHE_MAX_SIZE.
+    """
+    files = []
+    total_size = 0
+    for filename in os.listdir(cache_dir):
+        if filename.startswith('.tmp'):
+            continue
+        path = os.path.join(cache_dir, filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # The file was culled by another process.
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+        total_size += stat.st_size
+
+    files.sort()
+    max_size = settings.COURSE_ASSETS_DISK_CACHE_MAX_SIZE
+    for _, size, path in files:
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total_size -= size
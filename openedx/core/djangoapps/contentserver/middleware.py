@@ -5,15 +5,19 @@ Middleware to serve assets.
 
 import datetime
 import logging
+import time
+import uuid
 
 import six
 from django.http import (
+    FileResponse,
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseForbidden,
     HttpResponseNotFound,
     HttpResponseNotModified,
-    HttpResponsePermanentRedirect
+    HttpResponsePermanentRedirect,
+    StreamingHttpResponse
 )
 from django.utils.deprecation import MiddlewareMixin
 from opaque_keys import InvalidKeyError
@@ -28,7 +32,13 @@ from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import InvalidLocationError
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
-from .caching import get_cached_content, set_cached_content
+from .caching import (
+    DiskCachedContent,
+    get_cached_content,
+    get_disk_cached_content,
+    set_cached_content,
+    set_disk_cached_content
+)
 from .models import CdnUserAgentsConfig, CourseAssetCacheTtlConfig
 
 log = logging.getLogger(__name__)
@@ -43,6 +53,13 @@ except ImportError:
 
 HTTP_DATE_FORMAT = u"%a, %d %b %Y %H:%M:%S GMT"
 
+# Size of the chunks that assets are streamed in, which matches the default chunk size of GridFS
+# so that each chunk is read from a single GridFS document.
+STREAMING_CHUNK_SIZE = 255 * 1024
+
+# Maximum number of ranges served from a single Range header.
+MAX_BYTE_RANGES = 20
+
 
 class StaticContentServer(MiddlewareMixin):
     """
@@ -61,6 +78,7 @@ class StaticContentServer(MiddlewareMixin):
     # pylint: disable=too-many-statements
     def process_request(self, request):
         """Process the given request"""
+        start_time = time.time()
         asset_path = request.path
 
         if self.is_asset_request(request):
@@ -133,11 +151,8 @@ class StaticContentServer(MiddlewareMixin):
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
+            content_type = content.content_type
             if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -151,46 +166,69 @@ class StaticContentServer(MiddlewareMixin):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, text_type(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
+                    elif len(ranges) > MAX_BYTE_RANGES:
+                        # Serving many small ranges costs more than the full content, so send that back.
                         log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, text_type(loc)
+                            u"Too many ranges in Range header: %s for content: %s", header_value, text_type(loc)
                         )
                     else:
-                        first, last = ranges[0]
+                        # Unsatisfiable ranges are ignored, as long as one of the ranges is satisfiable.
+                        # https://tools.ietf.org/html/rfc7233#section-4.4
+                        ranges = [(first, last) for first, last in ranges if 0 <= first <= last < content.length]
+                        if not ranges:
+                            log.warning(
+                                u"Cannot satisfy ranges in Range header: %s for content: %s",
+                                header_value, text_type(loc)
+                            )
+                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                        if len(ranges) == 1:
+                            first, last = ranges[0]
+                            response = StreamingHttpResponse(
+                                content.stream_data_in_range(first, last, chunk_size=STREAMING_CHUNK_SIZE)
+                            )
                             response['Content-Range'] = u'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
                             response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            if newrelic:
-                                newrelic.agent.add_custom_parameter('contentserver.ranged', True)
                         else:
-                            log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s",
-                                header_value, text_type(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                            # According to Http/1.1 spec content for multiple ranges should be sent as a
+                            # multipart message.
+                            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                            boundary = uuid.uuid4().hex
+                            response = StreamingHttpResponse(stream_byte_ranges(content, ranges, boundary))
+                            response['Content-Length'] = str(byte_ranges_length(content, ranges, boundary))
+                            content_type = u'multipart/byteranges; boundary={}'.format(boundary)
+                        response.status_code = 206  # Partial Content
+
+                        if newrelic:
+                            newrelic.agent.add_custom_parameter('contentserver.ranged', True)
+                            newrelic.agent.add_custom_parameter('contentserver.range_count', len(ranges))
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                if isinstance(content, DiskCachedContent):
+                    # Files are sent by the server without being copied, when it supports it.
+                    response = FileResponse(content.file)
+                else:
+                    response = StreamingHttpResponse(content.stream_data(chunk_size=STREAMING_CHUNK_SIZE))
                 response['Content-Length'] = content.length
 
             if newrelic:
                 newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
                 newrelic.agent.add_custom_parameter('contentserver.content_type', content.content_type)
+                newrelic.agent.add_custom_parameter(
+                    'contentserver.disk_cached', isinstance(content, DiskCachedContent)
+                )
+                if isinstance(response, FileResponse):
+                    # Wrapping the file in a generator would prevent the server from sending it directly.
+                    newrelic.agent.add_custom_parameter('contentserver.bytes_sent', content.length)
+                else:
+                    response.streaming_content = monitor_streamed_bytes(response.streaming_content, start_time)
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
+            response['Content-Type'] = content_type
             response['X-Frame-Options'] = 'ALLOW'
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
@@ -286,6 +324,11 @@ class StaticContentServer(MiddlewareMixin):
         or loading it directly from the contentstore.
         """
 
+        # See if this node has the current version of the item on disk.
+        content = get_disk_cached_content(location)
+        if content is not None:
+            return content
+
         # See if we can load this item from cache.
         content = get_cached_content(location)
         if content is None:
@@ -302,7 +345,8 @@ class StaticContentServer(MiddlewareMixin):
                 content = content.copy_to_in_mem()
                 set_cached_content(content)
 
-        return content
+        # Serve the item from disk, if it was stored there, to not keep it in memory.
+        return set_disk_cached_content(content) or content
 
 
 def parse_range_header(header_value, content_length):
@@ -346,3 +390,62 @@ def parse_range_header(header_value, content_length):
         raise ValueError('Invalid syntax')
 
     return unit, ranges
+
+
+def _byte_range_headers(content, ranges, boundary):
+    """
+    Returns the (headers, first, last) of each part of a multipart/byteranges
+    response for the given ranges, and the final boundary of the response.
+    """
+    parts = []
+    for first, last in ranges:
+        headers = (
+            u'--{boundary}\r\n'
+            u'Content-Type: {content_type}\r\n'
+            u'Content-Range: bytes {first}-{last}/{length}\r\n'
+            u'\r\n'
+        ).format(boundary=boundary, content_type=content.content_type, first=first, last=last, length=content.length)
+        parts.append((headers.encode('utf-8'), first, last))
+    return parts, u'--{}--\r\n'.format(boundary).encode('utf-8')
+
+
+def byte_ranges_length(content, ranges, boundary):
+    """
+    Returns the Content-Length of a multipart/byteranges response for the given ranges.
+    """
+    parts, closing = _byte_range_headers(content, ranges, boundary)
+    # Each part is its headers, its bytes and the CRLF that ends them.
+    return sum(len(headers) + last - first + 1 + 2 for headers, first, last in parts) + len(closing)
+
+
+def stream_byte_ranges(content, ranges, boundary):
+    """
+    Streams the given ranges of the content as the body of a multipart/byteranges response.
+
+    See spec for details: https://tools.ietf.org/html/rfc7233#appendix-A
+    """
+    parts, closing = _byte_range_headers(content, ranges, boundary)
+    for headers, first, last in parts:
+        yield headers
+        for chunk in content.stream_data_in_range(first, last, chunk_size=STREAMING_CHUNK_SIZE):
+            yield chunk
+        yield b'\r\n'
+    yield closing
+
+
+def monitor_streamed_bytes(chunks, start_time):
+    """
+    Yields the given chunks of a response, reporting the time to the first
+    byte and the number of bytes sent to New Relic.
+    """
+    bytes_sent = 0
+    first_byte_sent = False
+    try:
+        for chunk in chunks:
+            if not first_byte_sent:
+                first_byte_sent = True
+                newrelic.agent.add_custom_parameter('contentserver.time_to_first_byte', time.time() - start_time)
+            bytes_sent += len(chunk)
+            yield chunk
+    finally:
+        newrelic.agent.add_custom_parameter('contentserver.bytes_sent', bytes_sent)
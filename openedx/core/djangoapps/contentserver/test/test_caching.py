@@ -0,0 +1,145 @@
+"""
+Tests for the disk cache of course assets.
+"""
+
+
+import datetime
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase, override_settings
+from mock import patch
+from opaque_keys.edx.locator import AssetLocator, CourseLocator
+from pytz import UTC
+
+from xmodule.contentstore.content import StaticContent
+
+from .. import caching
+
+
+class DiskCacheTest(TestCase):
+    """
+    Tests of get_disk_cached_content and set_disk_cached_content.
+    """
+    location = AssetLocator(CourseLocator(u'edX', u'toy', u'2012_Fall'), u'asset', u'sample.txt')
+
+    def setUp(self):
+        super(DiskCacheTest, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+        settings_override = override_settings(
+            COURSE_ASSETS_DISK_CACHE_DIR=self.cache_dir,
+            COURSE_ASSETS_DISK_CACHE_MAX_SIZE=130,
+            COURSE_ASSETS_DISK_CACHE_MAX_ITEM_SIZE=50,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        cache_patcher = patch.object(caching, 'CONTENT_CACHE', LocMemCache('disk_cache_test', {}))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def _content(self, data, location=None, last_modified_at=datetime.datetime(2020, 1, 1, tzinfo=UTC)):
+        """
+        Returns in-memory content with the given data.
+        """
+        return StaticContent(
+            location or self.location, u'sample.txt', u'text/plain', data,
+            last_modified_at=last_modified_at, length=len(data), locked=True, content_digest=u'digest',
+        )
+
+    def _read(self, content):
+        """
+        Returns the data of content from the disk cache, and closes its file.
+        """
+        data = b''.join(content.stream_data())
+        content.close()
+        return data
+
+    def test_set_and_get(self):
+        content = self._content(b'0123456789')
+        self.assertEqual(self._read(caching.set_disk_cached_content(content)), b'0123456789')
+
+        cached = caching.get_disk_cached_content(self.location)
+        self.assertIsInstance(cached, caching.DiskCachedContent)
+        for name in caching.DISK_CACHED_ATTRIBUTES:
+            self.assertEqual(getattr(cached, name), getattr(content, name))
+        self.assertEqual(self._read(cached), b'0123456789')
+
+    def test_disabled(self):
+        with override_settings(COURSE_ASSETS_DISK_CACHE_DIR=None):
+            self.assertIsNone(caching.set_disk_cached_content(self._content(b'0123456789')))
+            self.assertIsNone(caching.get_disk_cached_content(self.location))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_large_content_not_cached(self):
+        self.assertIsNone(caching.set_disk_cached_content(self._content(b'0' * 51)))
+        self.assertIsNone(caching.get_disk_cached_content(self.location))
+
+    def test_deleted_content_not_served(self):
+        self._read(caching.set_disk_cached_content(self._content(b'0123456789')))
+        caching.del_cached_content(self.location)
+        self.assertIsNone(caching.get_disk_cached_content(self.location))
+
+    def test_modified_content_not_served(self):
+        self._read(caching.set_disk_cached_content(self._content(b'0123456789')))
+        modified_content = self._content(b'9876543210', last_modified_at=datetime.datetime(2020, 1, 2, tzinfo=UTC))
+        self._read(caching.set_disk_cached_content(modified_content))
+
+        self.assertEqual(self._read(caching.get_disk_cached_content(self.location)), b'9876543210')
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_missing_file_not_served(self):
+        self._read(caching.set_disk_cached_content(self._content(b'0123456789')))
+        for filename in os.listdir(self.cache_dir):
+            os.remove(os.path.join(self.cache_dir, filename))
+        self.assertIsNone(caching.get_disk_cached_content(self.location))
+
+    def test_least_recently_served_culled(self):
+        locations = [
+            self.location.course_key.make_asset_key(u'asset', u'sample{}.txt'.format(index)) for index in range(3)
+        ]
+        for index, location in enumerate(locations):
+            self._read(caching.set_disk_cached_content(self._content(b'0' * 40, location=location)))
+            # Order the files by their modification time, regardless of the resolution of the file system.
+            cached = caching.get_disk_cached_content(location)
+            cached.close()
+            os.utime(cached.path, (index, index))
+
+        # Serving the first content makes the second the least recently served,
+        # which is removed to keep the cache within COURSE_ASSETS_DISK_CACHE_MAX_SIZE.
+        self._read(caching.get_disk_cached_content(locations[0]))
+        self._read(caching.set_disk_cached_content(self._content(b'1' * 40)))
+
+        self.assertEqual(self._read(caching.get_disk_cached_content(locations[0])), b'0' * 40)
+        self.assertIsNone(caching.get_disk_cached_content(locations[1]))
+        self.assertEqual(self._read(caching.get_disk_cached_content(locations[2])), b'0' * 40)
+        self.assertEqual(self._read(caching.get_disk_cached_content(self.location)), b'1' * 40)
+
+    def test_file_opened_when_streamed(self):
+        self._read(caching.set_disk_cached_content(self._content(b'0123456789')))
+
+        cached = caching.get_disk_cached_content(self.location)
+        self.assertIsNone(cached._stream)  # pylint: disable=protected-access
+        self.assertEqual(b''.join(cached.stream_data_in_range(2, 4)), b'234')
+        self.assertIsNone(cached._stream)  # pylint: disable=protected-access
+        self.assertEqual(cached.file.read(), b'0123456789')
+        cached.close()
+
+    def test_recently_served_file_not_touched(self):
+        self._read(caching.set_disk_cached_content(self._content(b'0123456789')))
+        path = caching.get_disk_cached_content(self.location).path
+
+        recently = int(time.time()) - caching.DISK_CACHE_TOUCH_INTERVAL // 2
+        os.utime(path, (recently, recently))
+        caching.get_disk_cached_content(self.location)
+        self.assertEqual(os.stat(path).st_mtime, recently)
+
+        long_ago = int(time.time()) - caching.DISK_CACHE_TOUCH_INTERVAL * 2
+        os.utime(path, (long_ago, long_ago))
+        caching.get_disk_cached_content(self.location)
+        self.assertGreater(os.stat(path).st_mtime, recently)
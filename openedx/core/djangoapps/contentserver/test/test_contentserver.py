@@ -8,11 +8,15 @@ import copy
 import datetime
 import ddt
 import logging
+import shutil
 import six
+import tempfile
 import unittest
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import FileResponse
 from django.test import RequestFactory
 from django.test.client import Client
 from django.test.utils import override_settings
@@ -30,7 +34,8 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
-from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
+from .. import caching
+from ..middleware import MAX_BYTE_RANGES, parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
 
@@ -103,6 +108,7 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         cls.url_unlocked_versioned = get_versioned_asset_url(cls.url_unlocked)
         cls.url_unlocked_versioned_old_style = get_old_style_versioned_asset_url(cls.url_unlocked)
         cls.length_unlocked = cls.contentstore.get_attr(cls.unlocked_asset, 'length')
+        cls.data_unlocked = cls.contentstore.find(cls.unlocked_asset).data
 
     def setUp(self):
         """
@@ -240,17 +246,69 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart message of the ranges.
         """
-        first_byte = self.length_unlocked / 4
-        last_byte = self.length_unlocked / 2
-        # pylint: disable=unicode-format-string
+        first_byte = self.length_unlocked // 4
+        last_byte = self.length_unlocked // 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertNotIn('Content-Range', resp)
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        self.assertEqual(content_type, 'multipart/byteranges')
+
+        body = b''.join(resp.streaming_content)
+        self.assertEqual(resp['Content-Length'], str(len(body)))
+        expected_parts = [(first_byte, last_byte), (self.length_unlocked - 100, self.length_unlocked - 1)]
+        expected_body = b''.join(
+            u'--{boundary}\r\nContent-Type: text/plain\r\nContent-Range: bytes {first}-{last}/{length}\r\n\r\n'.format(
+                boundary=boundary, first=first, last=last, length=self.length_unlocked
+            ).encode('utf-8') + self.data_unlocked[first:last + 1] + b'\r\n'
+            for first, last in expected_parts
+        ) + u'--{}--\r\n'.format(boundary).encode('utf-8')
+        self.assertEqual(body, expected_body)
+
+    def test_range_request_unsatisfiable_ranges_ignored(self):
+        """
+        Test that the unsatisfiable ranges of a request are ignored, if any range is satisfiable.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=10-20, {first}-'.format(
+            first=self.length_unlocked))
+
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertEqual(resp['Content-Range'], u'bytes 10-20/{}'.format(self.length_unlocked))
+        self.assertEqual(b''.join(resp.streaming_content), self.data_unlocked[10:21])
+
+    def test_range_request_too_many_ranges(self):
+        """
+        Test that a request for more than MAX_BYTE_RANGES ranges outputs the full content.
+        """
+        header_value = 'bytes=' + ', '.join('{0}-{0}'.format(byte) for byte in range(MAX_BYTE_RANGES + 1))
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE=header_value)
+
         self.assertEqual(resp.status_code, 200)
         self.assertNotIn('Content-Range', resp)
-        self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+        self.assertEqual(b''.join(resp.streaming_content), self.data_unlocked)
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.STREAMING_CHUNK_SIZE', 10)
+    @ddt.data(
+        (None, 0, None),
+        ('bytes=5-', 5, None),
+        ('bytes=5-34', 5, 35),
+    )
+    @ddt.unpack
+    def test_content_streamed_in_chunks(self, header_value, first_byte, end_byte):
+        """
+        Test that assets are streamed in chunks of STREAMING_CHUNK_SIZE bytes.
+        """
+        headers = {'HTTP_RANGE': header_value} if header_value else {}
+        resp = self.client.get(self.url_unlocked, **headers)
+
+        self.assertTrue(resp.streaming)
+        chunks = list(resp.streaming_content)
+        self.assertEqual(b''.join(chunks), self.data_unlocked[first_byte:end_byte])
+        self.assertTrue(all(len(chunk) == 10 for chunk in chunks[:-1]))
 
     @ddt.data(
         'bytes 0-',
@@ -284,6 +342,29 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
             first=(self.length_unlocked), last=(self.length_unlocked)))
         self.assertEqual(resp.status_code, 416)
 
+    def test_disk_cached_asset(self):
+        """
+        Test that assets are served from the disk cache, once they were stored in it.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        with override_settings(COURSE_ASSETS_DISK_CACHE_DIR=cache_dir):
+            with patch.object(caching, 'CONTENT_CACHE', LocMemCache('test_disk_cached_asset', {})):
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(b''.join(resp.streaming_content), self.data_unlocked)
+
+                with patch('openedx.core.djangoapps.contentserver.middleware.AssetManager.find') as mock_find:
+                    resp = self.client.get(self.url_unlocked)
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertIsInstance(resp, FileResponse)
+                    self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+                    self.assertEqual(b''.join(resp.streaming_content), self.data_unlocked)
+
+                    resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=10-20')
+                    self.assertEqual(resp.status_code, 206)
+                    self.assertEqual(b''.join(resp.streaming_content), self.data_unlocked[10:21])
+                self.assertFalse(mock_find.called)
+
     def test_vary_header_sent(self):
         """
         Tests that we're properly setting the Vary header to ensure browser requests don't get
@@ -6,12 +6,16 @@ forums, and to the cohort admin views.
 
 import logging
 import random
+from collections import defaultdict
+from itertools import islice
 
 import six
+from django.apps import apps
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.db.models.signals import m2m_changed, post_save
 from django.dispatch import receiver
 from django.http import Http404
@@ -21,7 +25,7 @@ from eventtracking import tracker
 
 from lms.djangoapps.courseware import courses
 from openedx.core.lib.cache_utils import request_cached
-from student.models import get_user_by_username_or_email
+from student.models import get_user_by_username_or_email, strip_if_string
 
 from .models import (
     CohortMembership,
@@ -481,27 +485,7 @@ def add_user_to_cohort(cohort, username_or_email_or_user):
         # If username_or_email is an email address, store in database.
         try:
             validate_email(username_or_email_or_user)
-
-            try:
-                assignment = UnregisteredLearnerCohortAssignments.objects.get(
-                    email=username_or_email_or_user, course_id=cohort.course_id
-                )
-                assignment.course_user_group = cohort
-                assignment.save()
-            except UnregisteredLearnerCohortAssignments.DoesNotExist:
-                assignment = UnregisteredLearnerCohortAssignments.objects.create(
-                    course_user_group=cohort, email=username_or_email_or_user, course_id=cohort.course_id
-                )
-
-            tracker.emit(
-                "edx.cohort.email_address_preassigned",
-                {
-                    "user_email": assignment.email,
-                    "cohort_id": cohort.id,
-                    "cohort_name": cohort.name,
-                }
-            )
-
+            _preassign_email_to_cohort(cohort, username_or_email_or_user)
             return (None, None, True)
         except ValidationError as invalid:
             if "@" in username_or_email_or_user:
@@ -510,6 +494,240 @@ def add_user_to_cohort(cohort, username_or_email_or_user):
                 raise ex
 
 
+def _preassign_email_to_cohort(cohort, email):
+    """
+    Stores that the learner with the given email address, who hasn't registered yet,
+    is to be added to the cohort once they enroll in its course.
+    """
+    try:
+        assignment = UnregisteredLearnerCohortAssignments.objects.get(
+            email=email, course_id=cohort.course_id
+        )
+        assignment.course_user_group = cohort
+        assignment.save()
+    except UnregisteredLearnerCohortAssignments.DoesNotExist:
+        assignment = UnregisteredLearnerCohortAssignments.objects.create(
+            course_user_group=cohort, email=email, course_id=cohort.course_id
+        )
+
+    tracker.emit(
+        "edx.cohort.email_address_preassigned",
+        {
+            "user_email": assignment.email,
+            "cohort_id": cohort.id,
+            "cohort_name": cohort.name,
+        }
+    )
+
+
+# Number of assignments that add_users_to_cohorts applies at once.
+BULK_COHORT_ASSIGNMENT_CHUNK_SIZE = 1000
+
+
+def add_users_to_cohorts(course_key, assignments, chunk_size=BULK_COHORT_ASSIGNMENT_CHUNK_SIZE):
+    """
+    Adds users to cohorts of a course, with the same results as calling
+    add_user_to_cohort for each of the assignments in turn, but with a few
+    queries for each chunk of assignments.
+
+    The users of a chunk are looked up together, and the memberships they end
+    up with are created and updated in bulk.  Tracking events and
+    COHORT_MEMBERSHIP_UPDATED signals are sent for the net changes to the
+    memberships of each chunk.
+
+    Arguments:
+        course_key: CourseKey of the course of the cohorts
+        assignments: iterable of (cohort, username_or_email_or_user) pairs
+        chunk_size: number of assignments applied at once
+
+    Yields:
+        For each assignment in turn, the (user, previous_cohort_name, preassigned)
+        tuple that add_user_to_cohort returns for it, or the exception it raises:
+        User.DoesNotExist, ValidationError or ValueError.
+    """
+    assignments = iter(assignments)
+    while True:
+        chunk = list(islice(assignments, chunk_size))
+        if not chunk:
+            return
+        for cohort, __ in chunk:
+            if cohort.course_id != course_key or cohort.group_type != CourseUserGroup.COHORT:
+                raise ValueError(u"{} is not a cohort of course {}".format(cohort, course_key))
+        try:
+            results = _add_users_to_cohorts_chunk(course_key, chunk)
+        except IntegrityError:
+            # Users were added to cohorts of the course while this chunk was applied.
+            log.warning(u"Cohort memberships of %s changed during a bulk assignment, assigning users one by one.",
+                        course_key)
+            results = [_add_user_to_cohort_result(cohort, user) for cohort, user in chunk]
+        for result in results:
+            yield result
+
+
+def _add_user_to_cohort_result(cohort, username_or_email_or_user):
+    """
+    Returns the result of add_user_to_cohort, or the exception that it raises
+    for an assignment that can't be made.
+    """
+    try:
+        return add_user_to_cohort(cohort, username_or_email_or_user)
+    except (User.DoesNotExist, ValidationError, ValueError) as exception:
+        return exception
+
+
+def _get_users_by_username_or_email(usernames_or_emails):
+    """
+    Looks up the users that get_user_by_username_or_email returns for the given
+    usernames or emails, with a few queries.
+
+    Returns a dict of the users found, by stripped username or email, and the
+    set of lowercased usernames and emails of the users that matched, which the
+    database may have matched case-insensitively.
+    """
+    values = set(strip_if_string(value) for value in usernames_or_emails)
+    if not values:
+        return {}, set()
+
+    matches = defaultdict(set)
+    matched_by_username = set()
+    candidates = User.objects.filter(Q(email__in=values) | Q(username__in=values))
+    for user in candidates:
+        if user.email in values:
+            matches[user.email].add(user)
+        if user.username in values:
+            matches[user.username].add(user)
+            matched_by_username.add(user)
+
+    UserRetirementRequest = apps.get_model('user_api', 'UserRetirementRequest')
+    retiring_user_ids = set(
+        UserRetirementRequest.objects.filter(user__in=matched_by_username).values_list('user_id', flat=True)
+    )
+
+    users = {}
+    for value, value_matches in six.iteritems(matches):
+        if len(value_matches) == 1:
+            user = value_matches.pop()
+            if user.username == value and user.id in retiring_user_ids:
+                continue
+            users[value] = user
+    lowercase_matches = set(
+        value.lower() for user in candidates for value in (user.email, user.username)
+    )
+    return users, lowercase_matches
+
+
+def _add_users_to_cohorts_chunk(course_key, chunk):
+    """
+    Applies a chunk of the assignments of add_users_to_cohorts, and returns their results.
+    """
+    users, lowercase_matches = _get_users_by_username_or_email(
+        value for __, value in chunk if not hasattr(value, 'email')
+    )
+
+    results = [None] * len(chunk)
+    preassignments = []
+    requested = []
+    for index, (cohort, value) in enumerate(chunk):
+        if hasattr(value, 'email'):
+            requested.append((index, cohort, value))
+            continue
+        username_or_email = strip_if_string(value)
+        user = users.get(username_or_email)
+        if user is None and isinstance(username_or_email, six.string_types) and \
+                username_or_email.lower() in lowercase_matches:
+            # The user isn't matched exactly, but may be by the database: look them up as add_user_to_cohort does.
+            try:
+                user = get_user_by_username_or_email(value)
+            except User.DoesNotExist:
+                pass
+        if user is None:
+            preassignments.append((index, cohort, value))
+        else:
+            requested.append((index, cohort, user))
+
+    with transaction.atomic():
+        memberships = {
+            membership.user_id: membership
+            for membership in CohortMembership.objects.select_for_update().filter(
+                course_id=course_key, user__in=[user for __, __, user in requested]
+            ).select_related('course_user_group')
+        }
+
+        # Work out the cohort of each user after each assignment, in turn.
+        cohorts = {user_id: membership.course_user_group for user_id, membership in six.iteritems(memberships)}
+        users_by_id = {}
+        add_requests = []
+        for index, cohort, user in requested:
+            previous_cohort = cohorts.get(user.id)
+            if previous_cohort is not None and previous_cohort.id == cohort.id:
+                results[index] = ValueError(u"User {user_name} already present in cohort {cohort_name}".format(
+                    user_name=user.username,
+                    cohort_name=cohort.name))
+                continue
+            cohorts[user.id] = cohort
+            users_by_id[user.id] = user
+            add_requests.append((user, cohort, previous_cohort))
+            results[index] = (user, getattr(previous_cohort, 'name', None), False)
+
+        # Apply the net changes to the memberships, grouped by cohort.
+        changed_user_ids = [
+            user_id for user_id in users_by_id
+            if user_id not in memberships or memberships[user_id].course_user_group_id != cohorts[user_id].id
+        ]
+        CohortMembership.objects.bulk_create([
+            CohortMembership(user_id=user_id, course_id=course_key, course_user_group=cohorts[user_id])
+            for user_id in changed_user_ids if user_id not in memberships
+        ])
+        removed_user_ids = defaultdict(list)
+        added_user_ids = defaultdict(list)
+        moved_membership_ids = defaultdict(list)
+        cohorts_by_id = {}
+        for user_id in changed_user_ids:
+            cohort = cohorts[user_id]
+            cohorts_by_id[cohort.id] = cohort
+            added_user_ids[cohort.id].append(user_id)
+            if user_id in memberships:
+                previous_cohort = memberships[user_id].course_user_group
+                cohorts_by_id[previous_cohort.id] = previous_cohort
+                removed_user_ids[previous_cohort.id].append(user_id)
+                moved_membership_ids[cohort.id].append(memberships[user_id].id)
+        for cohort_id, membership_ids in six.iteritems(moved_membership_ids):
+            CohortMembership.objects.filter(id__in=membership_ids).update(course_user_group=cohorts_by_id[cohort_id])
+        # The m2m_changed signals of these emit the user_removed and user_added tracking events.
+        for cohort_id, user_ids in six.iteritems(removed_user_ids):
+            cohorts_by_id[cohort_id].users.remove(*user_ids)
+        for cohort_id, user_ids in six.iteritems(added_user_ids):
+            cohorts_by_id[cohort_id].users.add(*user_ids)
+
+    for user, cohort, previous_cohort in add_requests:
+        tracker.emit(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": user.id,
+                "cohort_id": cohort.id,
+                "cohort_name": cohort.name,
+                "previous_cohort_id": getattr(previous_cohort, 'id', None),
+                "previous_cohort_name": getattr(previous_cohort, 'name', None),
+            }
+        )
+    cache = RequestCache(COHORT_CACHE_NAMESPACE).data
+    for user_id in changed_user_ids:
+        cache[_cohort_cache_key(user_id, course_key)] = cohorts[user_id]
+        COHORT_MEMBERSHIP_UPDATED.send(sender=None, user=users_by_id[user_id], course_key=course_key)
+
+    for index, cohort, value in preassignments:
+        try:
+            validate_email(value)
+            _preassign_email_to_cohort(cohort, value)
+            results[index] = (None, None, True)
+        except ValidationError as invalid:
+            if "@" in value:
+                results[index] = invalid
+            else:
+                results[index] = User.DoesNotExist(u"User matching query does not exist.")
+    return results
+
+
 def get_group_info_for_cohort(cohort, use_cached=False):
     """
     Get the ids of the group and partition to which this cohort has been linked
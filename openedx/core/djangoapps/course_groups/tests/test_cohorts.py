@@ -6,9 +6,11 @@ Tests for cohorts
 
 import ddt
 from django.contrib.auth.models import AnonymousUser, User
-from django.db import IntegrityError
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection
 from django.http import Http404
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from mock import call, patch
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import CourseLocator
@@ -690,6 +692,123 @@ class TestCohorts(ModuleStoreTestCase):
             lambda: cohorts.add_user_to_cohort(first_cohort, "non_existent_username")
         )
 
+    def _results(self, assignments, chunk_size=cohorts.BULK_COHORT_ASSIGNMENT_CHUNK_SIZE):
+        """
+        Returns the results of cohorts.add_users_to_cohorts, with exceptions replaced by their types.
+        """
+        return [
+            type(result) if isinstance(result, Exception) else result
+            for result in cohorts.add_users_to_cohorts(self.toy_course_key, assignments, chunk_size=chunk_size)
+        ]
+
+    @ddt.data(1, 2, 100)
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    @patch("openedx.core.djangoapps.course_groups.cohorts.COHORT_MEMBERSHIP_UPDATED")
+    def test_add_users_to_cohorts(self, chunk_size, mock_signal, mock_tracker):
+        """
+        Make sure cohorts.add_users_to_cohorts() has the same results as
+        cohorts.add_user_to_cohort() for each of the assignments in turn.
+        """
+        new_user = UserFactory(username="Username", email="a@b.com")
+        moved_user = UserFactory(username="MovedUsername", email="b@b.com")
+        present_user = UserFactory(username="PresentUsername", email="c@b.com")
+        first_cohort = CohortFactory(course_id=self.toy_course_key, name="FirstCohort")
+        second_cohort = CohortFactory(course_id=self.toy_course_key, name="SecondCohort")
+        cohorts.add_user_to_cohort(first_cohort, moved_user)
+        cohorts.add_user_to_cohort(second_cohort, present_user)
+        mock_signal.reset_mock()
+        mock_tracker.reset_mock()
+
+        results = self._results([
+            (first_cohort, " Username "),
+            (second_cohort, "b@b.com"),
+            (second_cohort, present_user),
+            (first_cohort, "new_email@example.com"),
+            (first_cohort, "non_existent_username"),
+            (first_cohort, "invalid@email"),
+            (second_cohort, "Username"),
+        ], chunk_size=chunk_size)
+
+        self.assertEqual(results, [
+            (new_user, None, False),
+            (moved_user, "FirstCohort", False),
+            ValueError,
+            (None, None, True),
+            User.DoesNotExist,
+            ValidationError,
+            (new_user, "FirstCohort", False),
+        ])
+        self.assertEqual(cohorts.get_cohort(new_user, self.toy_course_key), second_cohort)
+        self.assertEqual(cohorts.get_cohort(moved_user, self.toy_course_key), second_cohort)
+        self.assertEqual(set(first_cohort.users.all()), set())
+        self.assertEqual(set(second_cohort.users.all()), {new_user, moved_user, present_user})
+        self.assertTrue(UnregisteredLearnerCohortAssignments.objects.filter(
+            email="new_email@example.com", course_user_group=first_cohort
+        ).exists())
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": moved_user.id,
+                "cohort_id": second_cohort.id,
+                "cohort_name": second_cohort.name,
+                "previous_cohort_id": first_cohort.id,
+                "previous_cohort_name": first_cohort.name,
+            }
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.email_address_preassigned",
+            {
+                "user_email": "new_email@example.com",
+                "cohort_id": first_cohort.id,
+                "cohort_name": first_cohort.name,
+            }
+        )
+        mock_signal.send.assert_has_calls([
+            call(sender=None, user=new_user, course_key=self.toy_course_key),
+            call(sender=None, user=moved_user, course_key=self.toy_course_key),
+        ], any_order=True)
+
+    @patch("openedx.core.djangoapps.course_groups.cohorts.COHORT_MEMBERSHIP_UPDATED")
+    def test_add_users_to_cohorts_queries(self, __):
+        """
+        Make sure the number of queries of cohorts.add_users_to_cohorts() doesn't grow with the number of users.
+        """
+        cohort = CohortFactory(course_id=self.toy_course_key, name="Cohort")
+        other_cohort = CohortFactory(course_id=self.toy_course_key, name="OtherCohort")
+
+        def num_queries(num_users):
+            """
+            Returns the number of queries to add the given number of users to the cohort, half of whom are moved.
+            """
+            users = [UserFactory() for __ in range(num_users)]
+            for user in users[:num_users // 2]:
+                cohorts.add_user_to_cohort(other_cohort, user)
+            with CaptureQueriesContext(connection) as queries:
+                results = self._results([(cohort, user.username) for user in users])
+            self.assertEqual(results, [
+                (user, "OtherCohort" if index < num_users // 2 else None, False) for index, user in enumerate(users)
+            ])
+            return len(queries)
+
+        self.assertEqual(num_queries(2), num_queries(20))
+
+    def test_add_users_to_cohorts_of_other_course(self):
+        other_cohort = CohortFactory(course_id=CourseLocator("dummy", "dummy", "dummy"), name="Cohort")
+        with self.assertRaises(ValueError):
+            self._results([(other_cohort, "new_email@example.com")])
+
+    @patch("openedx.core.djangoapps.course_groups.cohorts._add_users_to_cohorts_chunk", side_effect=IntegrityError)
+    def test_add_users_to_cohorts_concurrently(self, __):
+        """
+        Make sure the users of a chunk are added one by one if memberships were changed concurrently.
+        """
+        user = UserFactory(username="Username")
+        cohort = CohortFactory(course_id=self.toy_course_key, name="Cohort")
+        self.assertEqual(
+            self._results([(cohort, "Username"), (cohort, "Username")]),
+            [(user, None, False), ValueError],
+        )
+
     def test_set_cohorted_with_invalid_data_type(self):
         """
         Test that cohorts.set_course_cohorted raises exception if argument is not a boolean.
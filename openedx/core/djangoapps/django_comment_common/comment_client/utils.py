@@ -3,11 +3,17 @@
 
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 
 import requests
 import six
-from django.utils.translation import get_language
+from django.conf import settings
+from django.db import connections
+from django.utils.translation import get_language, override
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .settings import SERVICE_HOST as COMMENTS_SERVICE
 
@@ -31,6 +37,127 @@ def extract(dic, keys):
         return strip_none({k: dic.get(k) for k in keys})
 
 
+_session_lock = threading.Lock()
+_session = None
+_session_config = None
+_executor = None
+_executor_size = None
+
+
+def _pool_config():
+    """
+    Returns the (pool size, max retries) configured for connections to the
+    comments service. A pool size of 0 disables the pooled session.
+    """
+    return (
+        getattr(settings, 'COMMENTS_SERVICE_HTTP_POOL_SIZE', 0),
+        getattr(settings, 'COMMENTS_SERVICE_HTTP_MAX_RETRIES', 0),
+    )
+
+
+def get_session():
+    """
+    Returns the keep-alive session shared by all threads of this process
+    for requests to the comments service, or None if pooling is disabled.
+
+    The session is rebuilt whenever the pool settings change.
+    """
+    global _session, _session_config  # pylint: disable=global-statement
+    pool_size, max_retries = config = _pool_config()
+    if not pool_size:
+        return None
+    with _session_lock:
+        if _session is None or _session_config != config:
+            if _session is not None:
+                _session.close()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=pool_size,
+                max_retries=Retry(total=max_retries, read=False),
+            )
+            _session = requests.Session()
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+            _session_config = config
+        return _session
+
+
+def _send_request(method, url, **kwargs):
+    """
+    Sends the request through the pooled session, if enabled.
+    """
+    session = get_session()
+    if session is None:
+        return requests.request(method, url, **kwargs)
+    return session.request(method, url, **kwargs)
+
+
+def _get_executor():
+    """
+    Returns the thread pool used to issue concurrent requests to the
+    comments service, or None if concurrent requests are disabled.
+    """
+    global _executor, _executor_size  # pylint: disable=global-statement
+    max_workers = getattr(settings, 'COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS', 1)
+    if max_workers <= 1:
+        return None
+    with _session_lock:
+        if _executor is None or _executor_size != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=max_workers)
+            _executor_size = max_workers
+        return _executor
+
+
+def reset_pools():
+    """
+    Closes the pooled session and shuts down the thread pool, which are
+    created again when next needed.
+    """
+    global _session, _session_config, _executor, _executor_size  # pylint: disable=global-statement
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _session = _session_config = _executor = _executor_size = None
+
+
+def _call_in_worker(language, func):
+    """
+    Calls func in a worker thread with the caller's language activated.
+    """
+    try:
+        with override(language):
+            return func()
+    finally:
+        # Connections opened while reading the forums configuration belong
+        # to this worker thread and would otherwise be left open.
+        connections.close_all()
+
+
+def perform_concurrently(*funcs):
+    """
+    Calls the given functions, each of which issues independent requests
+    to the comments service, and returns their results in the same order.
+
+    When COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS is greater than 1, the
+    functions run on a shared thread pool so that their requests overlap;
+    otherwise they are called one after the other in the current thread.
+    The first exception raised, in argument order, is re-raised.
+
+    Functions passed here must not depend on each other's side effects
+    or on thread-local state other than the active language.
+    """
+    executor = _get_executor()
+    if executor is None or len(funcs) <= 1:
+        return [func() for func in funcs]
+    language = get_language()
+    futures = [executor.submit(_call_in_worker, language, func) for func in funcs]
+    return [future.result() for future in futures]
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
     # To avoid dependency conflict
@@ -63,7 +190,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = data_or_params.copy()
         params.update(request_id_dict)
-    response = requests.request(
+    response = _send_request(
         method,
         url,
         data=data,
@@ -14,7 +14,7 @@ from ipware.ip import get_ip
 from rest_framework import status
 from rest_framework.response import Response
 
-import geoip2.database
+from openedx.core.djangoapps.geoinfo.api import country_code_from_ip
 from student.auth import has_course_author_access
 
 from .models import CountryAccessRule, RestrictedCourse
@@ -79,7 +79,7 @@ def check_course_access(course_key, user=None, ip_address=None, url=None):
     if ip_address is not None:
         # Retrieve the country code from the IP address
         # and check it against the allowed countries list for a course
-        user_country_from_ip = _country_code_from_ip(ip_address)
+        user_country_from_ip = country_code_from_ip(ip_address)
 
         if not CountryAccessRule.check_country_access(course_key, user_country_from_ip):
             log.info(
@@ -159,30 +159,6 @@ def _get_user_country_from_profile(user):
     return profile_country
 
 
-def _country_code_from_ip(ip_addr):
-    """
-    Return the country code associated with an IP address.
-    Handles both IPv4 and IPv6 addresses.
-
-    Args:
-        ip_addr (str): The IP address to look up.
-
-    Returns:
-        str: A 2-letter country code.
-
-    """
-    reader = geoip2.database.Reader(settings.GEOIP_PATH)
-
-    try:
-        response = reader.country(ip_addr)
-        # pylint: disable=no-member
-        country_code = response.country.iso_code
-    except geoip2.errors.AddressNotFoundError:
-        country_code = ""
-    reader.close()
-    return country_code
-
-
 def get_embargo_response(request, course_id, user):
     """
     Check whether any country access rules block the user from enrollment.
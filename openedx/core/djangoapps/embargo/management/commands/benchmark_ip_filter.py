@@ -0,0 +1,103 @@
+"""
+Command to compare the lookup performance of the compiled IPFilter lists with
+a linear scan of their networks.
+"""
+
+
+import ipaddress
+import random
+import timeit
+
+import six
+from django.core.management.base import BaseCommand
+from six.moves import range
+
+from openedx.core.djangoapps.embargo.models import IPFilter
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_ip_filter --networks 10000 --lookups 1000 --settings=devstack
+
+    Builds a blacklist of random IPv4 and IPv6 networks, then reports the time
+    to compile it, and the time to look up random addresses in it, both with
+    the compiled list and with a linear scan of its networks.
+    """
+    help = u'Compares compiled IPFilter lookups with a linear scan of the networks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--networks',
+            help=u'Number of networks in the blacklist.',
+            default=10000,
+            type=int,
+        )
+        parser.add_argument(
+            '--lookups',
+            help=u'Number of random addresses to look up.',
+            default=1000,
+            type=int,
+        )
+        parser.add_argument(
+            '--seed',
+            help=u'Seed of the random networks and addresses.',
+            default=0,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        rand = random.Random(options['seed'])
+        networks = [self._random_network(rand) for _ in range(options['networks'])]
+        blacklist = u', '.join(six.text_type(network) for network in networks)
+        addresses = [
+            six.text_type(ipaddress.ip_address(rand.getrandbits(rand.choice([32, 128]))))
+            for _ in range(options['lookups'])
+        ]
+
+        compile_time = min(timeit.repeat(
+            lambda: IPFilter.IPFilterList([addr.strip() for addr in blacklist.split(',')]),
+            number=1,
+            repeat=3,
+        ))
+        ip_filter_list = IPFilter.IPFilterList([addr.strip() for addr in blacklist.split(',')])
+
+        def compiled_lookups():
+            return sum(1 for address in addresses if address in ip_filter_list)
+
+        def linear_lookups():
+            matches = 0
+            for address in addresses:
+                ip_addr = ipaddress.ip_address(address)
+                if any(ip_addr in network for network in ip_filter_list.networks):
+                    matches += 1
+            return matches
+
+        compiled_matches = compiled_lookups()
+        linear_matches = linear_lookups()
+        if compiled_matches != linear_matches:
+            self.stderr.write(
+                u'Compiled lookups found {} matches, but a linear scan found {}.'.format(
+                    compiled_matches, linear_matches,
+                )
+            )
+
+        compiled_time = min(timeit.repeat(compiled_lookups, number=1, repeat=3))
+        linear_time = min(timeit.repeat(linear_lookups, number=1, repeat=1))
+
+        self.stdout.write(u'{} networks, {} lookups, {} matches'.format(
+            len(networks), len(addresses), compiled_matches,
+        ))
+        self.stdout.write(u'  compile:  {:>10.2f} ms'.format(compile_time * 1000))
+        self.stdout.write(u'  compiled: {:>10.2f} us per lookup'.format(compiled_time * 1e6 / max(len(addresses), 1)))
+        self.stdout.write(u'  linear:   {:>10.2f} us per lookup'.format(linear_time * 1e6 / max(len(addresses), 1)))
+
+    def _random_network(self, rand):
+        """
+        Returns a random IPv4 or IPv6 network.
+        """
+        if rand.random() < 0.8:
+            address, prefix_length = ipaddress.IPv4Address(rand.getrandbits(32)), rand.randint(16, 32)
+        else:
+            address, prefix_length = ipaddress.IPv6Address(rand.getrandbits(128)), rand.randint(32, 128)
+        return ipaddress.ip_network(u'{}/{}'.format(address, prefix_length), strict=False)
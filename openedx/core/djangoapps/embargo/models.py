@@ -12,6 +12,7 @@ file and check it in at the same time as your model changes. To do that,
 """
 
 
+import bisect
 import ipaddress
 import json
 import logging
@@ -701,13 +702,38 @@ class IPFilter(ConfigurationModel):
         help_text=u"A comma-separated list of IP addresses that should fall under embargo restrictions."
     )
 
+    # Compiled IPFilterLists, keyed by the comma-separated addresses they
+    # were built from.  A configuration change produces different text, so
+    # entries never need to be invalidated; old ones are simply dropped.
+    _ip_filter_lists = {}
+    MAX_CACHED_IP_FILTER_LISTS = 4
+
     class IPFilterList(object):
         """
         Represent a list of IP addresses with support of networks.
+
+        For fast lookups, the networks of each IP version are compiled into
+        sorted, non-overlapping ranges of integer addresses, which are
+        searched with bisect.
         """
 
         def __init__(self, ips):
             self.networks = [ipaddress.ip_network(ip) for ip in ips]
+            self._ranges = {}
+            for version in (4, 6):
+                starts = []
+                ends = []
+                for start, end in sorted(
+                        (int(network.network_address), int(network.broadcast_address))
+                        for network in self.networks if network.version == version
+                ):
+                    if ends and start <= ends[-1] + 1:
+                        # Merge ranges that overlap or touch.
+                        ends[-1] = max(ends[-1], end)
+                    else:
+                        starts.append(start)
+                        ends.append(end)
+                self._ranges[version] = (starts, ends)
 
         def __iter__(self):
             for network in self.networks:
@@ -719,11 +745,23 @@ class IPFilter(ConfigurationModel):
             except ValueError:
                 return False
 
-            for network in self.networks:
-                if ip_addr in network:
-                    return True
+            starts, ends = self._ranges[ip_addr.version]
+            ip_int = int(ip_addr)
+            index = bisect.bisect_right(starts, ip_int) - 1
+            return index >= 0 and ip_int <= ends[index]
 
-            return False
+    @classmethod
+    def _get_ip_filter_list(cls, addresses):
+        """
+        Return the compiled IPFilterList of the given comma-separated addresses.
+        """
+        ip_filter_list = cls._ip_filter_lists.get(addresses)
+        if ip_filter_list is None:
+            ip_filter_list = cls.IPFilterList([addr.strip() for addr in addresses.split(',')])
+            if len(cls._ip_filter_lists) >= cls.MAX_CACHED_IP_FILTER_LISTS:
+                cls._ip_filter_lists.clear()
+            cls._ip_filter_lists[addresses] = ip_filter_list
+        return ip_filter_list
 
     @property
     def whitelist_ips(self):
@@ -732,7 +770,7 @@ class IPFilter(ConfigurationModel):
         """
         if self.whitelist == '':
             return []
-        return self.IPFilterList([addr.strip() for addr in self.whitelist.split(',')])
+        return self._get_ip_filter_list(self.whitelist)
 
     @property
     def blacklist_ips(self):
@@ -741,7 +779,7 @@ class IPFilter(ConfigurationModel):
         """
         if self.blacklist == '':
             return []
-        return self.IPFilterList([addr.strip() for addr in self.blacklist.split(',')])
+        return self._get_ip_filter_list(self.blacklist)
 
     def __str__(self):
         return "Whitelist: {} - Blacklist: {}".format(self.whitelist_ips, self.blacklist_ips)
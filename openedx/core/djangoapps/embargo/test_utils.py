@@ -9,6 +9,8 @@ from django.urls import reverse
 import geoip2.database
 from mock import MagicMock, patch
 
+from openedx.core.djangoapps.geoinfo.api import clear_country_cache
+
 from .models import Country, CountryAccessRule, RestrictedCourse
 
 
@@ -46,6 +48,7 @@ def restrict_course(course_key, access_point="enrollment", disable_access_check=
     # Clear the cache to ensure that previous tests don't interfere
     # with this test.
     cache.clear()
+    clear_country_cache()
 
     # pylint: disable=unused-argument
     def mock_country(reader, country):
@@ -100,3 +103,4 @@ def restrict_course(course_key, access_point="enrollment", disable_access_check=
     yield redirect_url
     patcher.stop()
     country_patcher.stop()
+    clear_country_cache()
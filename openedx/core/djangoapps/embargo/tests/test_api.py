@@ -16,6 +16,7 @@ from django.test.utils import override_settings
 from django.core.cache import cache
 from django.db import connection
 
+from openedx.core.djangoapps.geoinfo.api import clear_country_cache
 from openedx.core.djangolib.testing.utils import skip_unless_lms
 from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -256,6 +257,8 @@ class EmbargoCheckAccessApiTests(ModuleStoreTestCase):
         country_patcher.start()
         self.addCleanup(patcher.stop)
         self.addCleanup(country_patcher.stop)
+        clear_country_cache()
+        self.addCleanup(clear_country_cache)
         yield
 
 
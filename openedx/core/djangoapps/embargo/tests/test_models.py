@@ -1,7 +1,9 @@
 """Test of models for embargo app"""
 
 
+import ipaddress
 import json
+import random
 
 import six
 from django.db.utils import IntegrityError
@@ -115,6 +117,45 @@ class EmbargoModelsTest(CacheIsolationTestCase):
         self.assertIn(u'1.1.1.0', cblacklist)
         self.assertNotIn(u'1.2.0.0', cblacklist)
 
+    def test_ip_network_boundaries(self):
+        ip_filter = IPFilter(
+            whitelist=u'1.0.0.0/24, 1.0.1.0/24, 1.0.0.128/25, 2002:c0a8::/32',
+            blacklist=u'10.0.0.1, 10.0.0.3',
+        )
+        cwhitelist = ip_filter.whitelist_ips
+        for addr in [u'1.0.0.0', u'1.0.0.255', u'1.0.1.0', u'1.0.1.255', u'2002:c0a8::', u'2002:c0a8:ffff::1']:
+            self.assertIn(addr, cwhitelist)
+        for addr in [u'0.255.255.255', u'1.0.2.0', u'2002:c0a7:ffff::', u'::1.0.0.1', u'not an ip']:
+            self.assertNotIn(addr, cwhitelist)
+
+        cblacklist = ip_filter.blacklist_ips
+        self.assertIn(u'10.0.0.1', cblacklist)
+        self.assertNotIn(u'10.0.0.2', cblacklist)
+        self.assertIn(u'10.0.0.3', cblacklist)
+
+    def test_ip_network_lookup_matches_networks(self):
+        rand = random.Random(0)
+        networks = set()
+        for _ in range(300):
+            prefix_length = rand.randint(8, 32)
+            address = ipaddress.ip_address(rand.getrandbits(32))
+            networks.add(ipaddress.ip_network(u'{}/{}'.format(address, prefix_length), strict=False))
+        cblacklist = IPFilter(blacklist=u','.join(six.text_type(network) for network in networks)).blacklist_ips
+
+        addresses = [ipaddress.ip_address(rand.getrandbits(32)) for _ in range(1000)]
+        addresses.extend(network.network_address for network in networks)
+        addresses.extend(network.broadcast_address for network in networks)
+        for address in addresses:
+            self.assertEqual(
+                six.text_type(address) in cblacklist,
+                any(address in network for network in networks),
+            )
+
+    def test_ip_filter_list_cached(self):
+        whitelist = u'1.0.0.0/24, 127.0.0.1'
+        self.assertIs(IPFilter(whitelist=whitelist).whitelist_ips, IPFilter(whitelist=whitelist).whitelist_ips)
+        self.assertIsNot(IPFilter(whitelist=whitelist).whitelist_ips, IPFilter(whitelist=u'1.0.0.0/24').whitelist_ips)
+
 
 class RestrictedCourseTest(CacheIsolationTestCase):
     """Test RestrictedCourse model. """
@@ -12,6 +12,7 @@ from mock import patch, MagicMock
 from .factories import CountryAccessRuleFactory, RestrictedCourseFactory
 from .. import messages
 from lms.djangoapps.course_api.tests.mixins import CourseApiFactoryMixin
+from openedx.core.djangoapps.geoinfo.api import clear_country_cache
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
 from openedx.core.djangoapps.theming.tests.test_util import with_comprehensive_theme
 from student.tests.factories import UserFactory
@@ -145,6 +146,8 @@ class CheckCourseAccessViewTest(CourseApiFactoryMixin, ModuleStoreTestCase):
         country_patcher.start()
         self.addCleanup(patcher.stop)
         self.addCleanup(country_patcher.stop)
+        clear_country_cache()
+        self.addCleanup(clear_country_cache)
 
         response = self.client.get(self.url, data=self.request_data)
 
@@ -0,0 +1,150 @@
+"""
+Lookup of the country of IP addresses in the GeoIP database at GEOIP_PATH.
+
+The database is opened, memory-mapped, once per process and reopened when
+its file is modified.  Up to GEOIP_COUNTRY_CACHE_SIZE looked up countries are
+kept in a per-process LRU cache.
+"""
+
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import geoip2.database
+import geoip2.errors
+from django.conf import settings
+from edx_django_utils import monitoring as monitoring_utils
+
+log = logging.getLogger(__name__)
+
+# Minimum number of seconds between checks of the database file for changes.
+RELOAD_CHECK_INTERVAL = 60
+
+
+class GeoIPCountryLookup(object):
+    """
+    A process-wide, thread-safe reader of the GeoIP database, with an LRU
+    cache of the countries of IP addresses.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reader = None
+        self._reader_path = None
+        self._reader_mtime = None
+        self._next_reload_check = 0
+        self._countries = OrderedDict()
+
+    def country_code(self, ip_addr):
+        """
+        Returns the 2-letter country code of the given IP address, or an
+        empty string if the address is not in the database.
+        """
+        start_time = time.time()
+        reader = self._get_reader()
+        with self._lock:
+            cached = ip_addr in self._countries
+            if cached:
+                # Re-insert the entry to mark it as the most recently used.
+                country_code = self._countries.pop(ip_addr)
+                self._countries[ip_addr] = country_code
+        if not cached:
+            monitoring_utils.accumulate('geoip.country_cache_misses', 1)
+            try:
+                response = reader.country(ip_addr)
+                # pylint: disable=no-member
+                country_code = response.country.iso_code
+            except geoip2.errors.AddressNotFoundError:
+                country_code = ""
+            self._cache_country_code(ip_addr, country_code)
+        else:
+            monitoring_utils.accumulate('geoip.country_cache_hits', 1)
+        monitoring_utils.accumulate('geoip.lookup_time', time.time() - start_time)
+        return country_code
+
+    def clear(self):
+        """
+        Closes the database and removes all cached countries.
+        """
+        with self._lock:
+            self._close_reader()
+            self._countries.clear()
+
+    def _cache_country_code(self, ip_addr, country_code):
+        """
+        Caches the country of the IP address, evicting the least recently
+        looked up countries to stay within GEOIP_COUNTRY_CACHE_SIZE.
+        """
+        max_size = getattr(settings, 'GEOIP_COUNTRY_CACHE_SIZE', 0)
+        if max_size <= 0:
+            return
+        with self._lock:
+            self._countries.pop(ip_addr, None)
+            while len(self._countries) >= max_size:
+                self._countries.popitem(last=False)
+            self._countries[ip_addr] = country_code
+
+    def _get_reader(self):
+        """
+        Returns the reader of the database at GEOIP_PATH, opening it if it
+        has not been opened yet, or has been modified since.
+        """
+        path = settings.GEOIP_PATH
+        now = time.time()
+        with self._lock:
+            if self._reader is not None and self._reader_path == path and now < self._next_reload_check:
+                return self._reader
+
+            mtime = os.path.getmtime(path)
+            if self._reader is None or self._reader_path != path or self._reader_mtime != mtime:
+                if self._reader is not None:
+                    # The previous reader may still be in use by other
+                    # threads, so it is left to be closed when released.
+                    log.info(u'Reloading the GeoIP database at %s', path)
+                self._reader = geoip2.database.Reader(path)
+                self._reader_path = path
+                self._reader_mtime = mtime
+                # Countries may have changed in the new database.
+                self._countries.clear()
+            self._next_reload_check = now + RELOAD_CHECK_INTERVAL
+            return self._reader
+
+    def _close_reader(self):
+        """
+        Closes the database, if it is open.  Must be called with the lock held.
+        """
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = None
+        self._reader_path = None
+        self._reader_mtime = None
+        self._next_reload_check = 0
+
+
+GEOIP_COUNTRY_LOOKUP = GeoIPCountryLookup()
+
+
+def country_code_from_ip(ip_addr):
+    """
+    Return the country code associated with an IP address.
+    Handles both IPv4 and IPv6 addresses.
+
+    Args:
+        ip_addr (str): The IP address to look up.
+
+    Returns:
+        str: A 2-letter country code, or an empty string if the IP address
+            is not in the database.
+
+    """
+    return GEOIP_COUNTRY_LOOKUP.country_code(ip_addr)
+
+
+def clear_country_cache():
+    """
+    Close the GeoIP database and forget all looked up countries, so that the
+    next lookup reopens the database.
+    """
+    GEOIP_COUNTRY_LOOKUP.clear()
@@ -12,12 +12,12 @@ decorator `django.utils.decorators.decorator_from_middleware(middleware_class)`
 
 
 import logging
-import geoip2.database
 
-from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 from ipware.ip import get_real_ip
 
+from openedx.core.djangoapps.geoinfo.api import country_code_from_ip
+
 log = logging.getLogger(__name__)
 
 
@@ -38,15 +38,7 @@ class CountryMiddleware(MiddlewareMixin):
             del request.session['ip_address']
             del request.session['country_code']
         elif new_ip_address != old_ip_address:
-            reader = geoip2.database.Reader(settings.GEOIP_PATH)
-            try:
-                response = reader.country(new_ip_address)
-                # pylint: disable=no-member
-                country_code = response.country.iso_code
-            except geoip2.errors.AddressNotFoundError:
-                country_code = ""
-
+            country_code = country_code_from_ip(new_ip_address)
             request.session['country_code'] = country_code
             request.session['ip_address'] = new_ip_address
             log.debug(u'Country code for IP: %s is set to %s', new_ip_address, country_code)
-            reader.close()
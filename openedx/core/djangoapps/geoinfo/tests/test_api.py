@@ -0,0 +1,99 @@
+"""
+Tests for the GeoIP country lookup.
+"""
+
+
+import os
+import shutil
+import tempfile
+
+import geoip2.database
+import geoip2.errors
+from django.conf import settings
+from django.test import TestCase, override_settings
+from mock import MagicMock, PropertyMock, patch
+
+from openedx.core.djangoapps.geoinfo import api as geoinfo_api
+
+
+class CountryCodeFromIpTests(TestCase):
+    """
+    Tests of country_code_from_ip.
+    """
+    IP_COUNTRIES = {
+        '117.79.83.1': 'CN',
+        '4.0.0.0': 'SD',
+        '2001:da8:20f:1502:edcf:550b:4a9c:207d': 'CN',
+    }
+
+    def setUp(self):
+        super(CountryCodeFromIpTests, self).setUp()
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.geoip_path = os.path.join(temp_dir, 'GeoLite2-Country.mmdb')
+        shutil.copyfile(settings.GEOIP_PATH, self.geoip_path)
+
+        settings_override = override_settings(GEOIP_PATH=self.geoip_path, GEOIP_COUNTRY_CACHE_SIZE=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.mock_country = MagicMock(side_effect=self._country)
+        country_patcher = patch.object(geoip2.database.Reader, 'country', self.mock_country)
+        country_patcher.start()
+        self.addCleanup(country_patcher.stop)
+
+        geoinfo_api.clear_country_cache()
+        self.addCleanup(geoinfo_api.clear_country_cache)
+
+    def _country(self, ip_address):
+        """
+        Mock implementation of Reader.country.
+        """
+        if ip_address not in self.IP_COUNTRIES:
+            raise geoip2.errors.AddressNotFoundError(ip_address)
+        response = MagicMock()
+        type(response.country).iso_code = PropertyMock(return_value=self.IP_COUNTRIES[ip_address])
+        return response
+
+    def test_country_code(self):
+        for ip_address, country_code in self.IP_COUNTRIES.items():
+            self.assertEqual(geoinfo_api.country_code_from_ip(ip_address), country_code)
+        self.assertEqual(geoinfo_api.country_code_from_ip('127.0.0.1'), '')
+
+    def test_database_opened_once(self):
+        with patch.object(geoip2.database, 'Reader', wraps=geoip2.database.Reader) as mock_reader:
+            for ip_address in self.IP_COUNTRIES:
+                geoinfo_api.country_code_from_ip(ip_address)
+        self.assertEqual(mock_reader.call_count, 1)
+
+    def test_lookups_cached(self):
+        for _ in range(3):
+            self.assertEqual(geoinfo_api.country_code_from_ip('117.79.83.1'), 'CN')
+            self.assertEqual(geoinfo_api.country_code_from_ip('127.0.0.1'), '')
+        self.assertEqual(self.mock_country.call_count, 2)
+
+    def test_least_recently_used_evicted(self):
+        for ip_address in ['117.79.83.1', '4.0.0.0', '117.79.83.1', '127.0.0.1']:
+            geoinfo_api.country_code_from_ip(ip_address)
+        self.mock_country.reset_mock()
+
+        # Only '4.0.0.0' was evicted, to stay within GEOIP_COUNTRY_CACHE_SIZE.
+        for ip_address in ['117.79.83.1', '127.0.0.1', '4.0.0.0']:
+            geoinfo_api.country_code_from_ip(ip_address)
+        self.mock_country.assert_called_once_with('4.0.0.0')
+
+    @patch.object(geoinfo_api, 'RELOAD_CHECK_INTERVAL', 0)
+    def test_reloaded_when_modified(self):
+        with patch.object(geoip2.database, 'Reader', wraps=geoip2.database.Reader) as mock_reader:
+            geoinfo_api.country_code_from_ip('117.79.83.1')
+            geoinfo_api.country_code_from_ip('117.79.83.1')
+            self.assertEqual(mock_reader.call_count, 1)
+            self.assertEqual(self.mock_country.call_count, 1)
+
+            modified_time = os.path.getmtime(self.geoip_path) + 60
+            os.utime(self.geoip_path, (modified_time, modified_time))
+
+            # The database is reopened, and its countries looked up again.
+            geoinfo_api.country_code_from_ip('117.79.83.1')
+            self.assertEqual(mock_reader.call_count, 2)
+            self.assertEqual(self.mock_country.call_count, 2)
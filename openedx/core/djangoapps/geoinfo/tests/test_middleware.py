@@ -10,6 +10,7 @@ from django.test import TestCase
 from django.test.client import RequestFactory
 from mock import MagicMock, PropertyMock, patch
 
+from openedx.core.djangoapps.geoinfo.api import clear_country_cache
 from openedx.core.djangoapps.geoinfo.middleware import CountryMiddleware
 from student.tests.factories import AnonymousUserFactory, UserFactory
 
@@ -31,6 +32,8 @@ class CountryMiddlewareTests(TestCase):
         country_patcher.start()
         self.addCleanup(patcher.stop)
         self.addCleanup(country_patcher.stop)
+        clear_country_cache()
+        self.addCleanup(clear_country_cache)
 
     def mock_country(self, ip_address):
         """
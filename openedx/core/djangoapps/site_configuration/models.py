@@ -5,10 +5,12 @@ Django models for site configurations.
 
 import collections
 from logging import getLogger
+from uuid import uuid4
 
 from django.contrib.sites.models import Site
-from django.db import models
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils.encoding import python_2_unicode_compatible
 from jsonfield.fields import JSONField
@@ -16,6 +18,13 @@ from model_utils.models import TimeStampedModel
 
 logger = getLogger(__name__)  # pylint: disable=invalid-name
 
+# The index of enabled site configurations by org is versioned. Every change to
+# a site configuration sets a new version, after which each process rebuilds its
+# copy of the index, or fetches it from the cache if another process already has.
+ORG_INDEX_VERSION_CACHE_KEY = u'site_configuration.org_index.version'
+ORG_INDEX_CACHE_KEY = u'site_configuration.org_index.{version}'
+ORG_INDEX_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 @python_2_unicode_compatible
 class SiteConfiguration(models.Model):
@@ -37,6 +46,9 @@ class SiteConfiguration(models.Model):
         load_kwargs={'object_pairs_hook': collections.OrderedDict}
     )
 
+    # The (version, org index) last used by this process.
+    _org_index = (None, None)
+
     def __str__(self):
         return u"<SiteConfiguration: {site} >".format(site=self.site)  # xss-lint: disable=python-wrap-html
 
@@ -67,27 +79,64 @@ class SiteConfiguration(models.Model):
         return default
 
     @classmethod
-    def get_configuration_for_org(cls, org, select_related=None):
+    def get_configuration_for_org(cls, org, select_related=None):  # pylint: disable=unused-argument
         """
         This returns a SiteConfiguration object which has an org_filter that matches
         the supplied org
 
+        The configuration is shared by all callers in this process, and must not be
+        modified.
+
         Args:
             org (str): Org to use to filter SiteConfigurations
-            select_related (list or None): A list of values to pass as arguments to select_related
+            select_related (list or None): Unused, configurations are always loaded
+                with their site.
         """
-        query = cls.objects.filter(values__contains=org, enabled=True).all()
-        if select_related is not None:
-            query = query.select_related(*select_related)
+        return cls.get_org_index().get(org)
+
+    @classmethod
+    def get_org_index(cls):
+        """
+        Returns a dict of the enabled SiteConfigurations keyed by each of the orgs in
+        their `course_org_filter`. When an org is in more than one configuration, the
+        one created first is used.
+
+        The index is kept in this process until a site configuration is changed.
+        """
+        version = cache.get(ORG_INDEX_VERSION_CACHE_KEY)
+        if version is None:
+            version = set_org_index_version()
+
+        local_version, org_index = cls._org_index
+        if local_version == version:
+            return org_index
+
+        cache_key = ORG_INDEX_CACHE_KEY.format(version=version)
+        org_index = cache.get(cache_key)
+        if org_index is None:
+            org_index = cls._build_org_index()
+            cache.set(cache_key, org_index, ORG_INDEX_CACHE_TIMEOUT)
+        cls._org_index = (version, org_index)
+        return org_index
+
+    @classmethod
+    def _build_org_index(cls):
+        """
+        Builds the index of enabled SiteConfigurations by org from the database.
+        """
+        org_index = {}
+        query = cls.objects.filter(
+            values__contains='course_org_filter', enabled=True,
+        ).select_related('site').order_by('id')
         for configuration in query:
             course_org_filter = configuration.get_value('course_org_filter', [])
             # The value of 'course_org_filter' can be configured as a string representing
             # a single organization or a list of strings representing multiple organizations.
             if not isinstance(course_org_filter, list):
                 course_org_filter = [course_org_filter]
-            if org in course_org_filter:
-                return configuration
-        return None
+            for org in course_org_filter:
+                org_index.setdefault(org, configuration)
+        return org_index
 
     @classmethod
     def get_value_for_org(cls, org, name, default=None):
@@ -118,14 +167,7 @@ class SiteConfiguration(models.Model):
         Returns:
             A set of all organizations present in site configuration.
         """
-        org_filter_set = set()
-
-        for configuration in cls.objects.filter(values__contains='course_org_filter', enabled=True).all():
-            course_org_filter = configuration.get_value('course_org_filter', [])
-            if not isinstance(course_org_filter, list):
-                course_org_filter = [course_org_filter]
-            org_filter_set.update(course_org_filter)
-        return org_filter_set
+        return set(cls.get_org_index())
 
     @classmethod
     def has_org(cls, org):
@@ -135,7 +177,7 @@ class SiteConfiguration(models.Model):
         Returns:
             True if given organization is present in site configurations otherwise False.
         """
-        return org in cls.get_all_orgs()
+        return org in cls.get_org_index()
 
 
 @python_2_unicode_compatible
@@ -188,3 +230,25 @@ def update_site_configuration_history(sender, instance, **kwargs):  # pylint: di
         values=instance.values,
         enabled=instance.enabled,
     )
+
+
+def set_org_index_version():
+    """
+    Sets and returns a new version of the index of site configurations by org.
+    """
+    version = uuid4().hex
+    cache.set(ORG_INDEX_VERSION_CACHE_KEY, version, None)
+    return version
+
+
+@receiver(post_save, sender=SiteConfiguration)
+@receiver(post_delete, sender=SiteConfiguration)
+def invalidate_org_index(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the index of site configurations by org when a configuration changes.
+
+    The version is set again once the transaction is committed, so that an index
+    rebuilt by another process before the commit is not used.
+    """
+    set_org_index_version()
+    transaction.on_commit(set_org_index_version)
@@ -12,6 +12,7 @@ from django.contrib.sites.models import Site
 
 from openedx.core.djangoapps.site_configuration.models import SiteConfigurationHistory, SiteConfiguration
 from openedx.core.djangoapps.site_configuration.tests.factories import SiteConfigurationFactory
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
 
 class SiteConfigurationTests(TestCase):
@@ -342,3 +343,58 @@ class SiteConfigurationTests(TestCase):
 
         # Test that the default value is returned if the value for the given key is not found in the configuration
         six.assertCountEqual(self, SiteConfiguration.get_all_orgs(), expected_orgs)
+
+
+class SiteConfigurationOrgIndexTests(CacheIsolationTestCase):
+    """
+    Tests for the index of site configurations by org.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(SiteConfigurationOrgIndexTests, self).setUp()
+        SiteConfiguration._org_index = (None, None)  # pylint: disable=protected-access
+        self.config1 = SiteConfigurationFactory.create(
+            site=Site.objects.create(domain='test1.localhost', name='test1.localhost'),
+            values={'course_org_filter': ['TestX', 'SharedX'], 'platform_name': 'Test 1'},
+        )
+        self.config2 = SiteConfigurationFactory.create(
+            site=Site.objects.create(domain='test2.localhost', name='test2.localhost'),
+            values={'course_org_filter': 'SharedX', 'platform_name': 'Test 2'},
+        )
+
+    def test_index_built_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(SiteConfiguration.get_configuration_for_org('TestX'), self.config1)
+        with self.assertNumQueries(0):
+            self.assertEqual(SiteConfiguration.get_configuration_for_org('TestX'), self.config1)
+            self.assertEqual(SiteConfiguration.get_configuration_for_org('SharedX'), self.config1)
+            self.assertIsNone(SiteConfiguration.get_configuration_for_org('OtherX'))
+            self.assertEqual(SiteConfiguration.get_value_for_org('TestX', 'platform_name'), 'Test 1')
+            self.assertEqual(SiteConfiguration.get_configuration_for_org('TestX').site.domain, 'test1.localhost')
+            self.assertEqual(SiteConfiguration.get_all_orgs(), {'TestX', 'SharedX'})
+            self.assertTrue(SiteConfiguration.has_org('SharedX'))
+
+    def test_index_shared_through_cache(self):
+        SiteConfiguration.get_all_orgs()
+
+        # Another process gets the index from the cache.
+        SiteConfiguration._org_index = (None, None)  # pylint: disable=protected-access
+        with self.assertNumQueries(0):
+            self.assertEqual(SiteConfiguration.get_configuration_for_org('TestX'), self.config1)
+
+    def test_index_rebuilt_on_save(self):
+        self.assertEqual(SiteConfiguration.get_all_orgs(), {'TestX', 'SharedX'})
+
+        self.config1.enabled = False
+        self.config1.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(SiteConfiguration.get_configuration_for_org('SharedX'), self.config2)
+        self.assertEqual(SiteConfiguration.get_all_orgs(), {'SharedX'})
+
+    def test_index_rebuilt_on_delete(self):
+        self.assertEqual(SiteConfiguration.get_configuration_for_org('SharedX'), self.config1)
+
+        self.config1.delete()
+        self.assertEqual(SiteConfiguration.get_configuration_for_org('SharedX'), self.config2)
+        self.assertIsNone(SiteConfiguration.get_configuration_for_org('TestX'))
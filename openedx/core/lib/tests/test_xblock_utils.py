@@ -8,15 +8,20 @@ import uuid
 import ddt
 from django.conf import settings
 from django.test.client import RequestFactory
+from edx_django_utils.cache import RequestCache
 from mock import patch
 from web_fragments.fragment import Fragment
 
+from lms.djangoapps.courseware.models import StudentModule
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from openedx.core.lib.url_utils import quote_slashes
 from openedx.core.lib.xblock_builtin import get_css_dependencies, get_js_dependencies
 from openedx.core.lib.xblock_utils import (
+    GRADE_HISTOGRAMS_REQUEST_CACHE_NAMESPACE,
     is_xblock_aside,
     get_aside_from_xblock,
+    grade_histogram,
+    prefetch_grade_histograms,
     replace_course_urls,
     replace_jump_to_id_urls,
     replace_static_urls,
@@ -177,6 +182,24 @@ class TestXblockUtils(SharedModuleStoreTestCase):
         self.assertIsInstance(test_replace, Fragment)
         self.assertEqual(test_replace.content, anchor_tag)
 
+    def test_prefetch_grade_histograms(self):
+        problem = self.course_split.id.make_usage_key('problem', 'first_problem')
+        other_problem = self.course_split.id.make_usage_key('problem', 'second_problem')
+        # Test transactions are never committed, so run the commit hooks right away.
+        with patch('lms.djangoapps.courseware.models.transaction.on_commit', lambda func: func()):
+            for student_id, grade in [(1, 1), (2, 0.5), (3, 1)]:
+                StudentModule.objects.create(
+                    student_id=student_id, course_id=self.course_split.id, module_state_key=problem, grade=grade,
+                )
+        request_cache = RequestCache(GRADE_HISTOGRAMS_REQUEST_CACHE_NAMESPACE)
+        request_cache.clear()
+        self.addCleanup(request_cache.clear)
+
+        with self.assertNumQueries(1):
+            prefetch_grade_histograms([problem, other_problem])
+            self.assertEqual(grade_histogram(problem), [(0.5, 1), (1.0, 2)])
+            self.assertEqual(grade_histogram(other_problem), [])
+
     def test_sanitize_html_id(self):
         """
         Verify that colons and dashes are replaced.
@@ -17,6 +17,7 @@ from contracts import contract
 from django.conf import settings
 from django.urls import reverse
 from django.utils.html import escape
+from edx_django_utils.cache import RequestCache
 from django.contrib.auth.models import User
 from django.contrib.staticfiles.storage import staticfiles_storage
 from pytz import UTC
@@ -38,6 +39,9 @@ from six import text_type
 
 log = logging.getLogger(__name__)
 
+# The namespace of the request cache of the grade histograms of problems.
+GRADE_HISTOGRAMS_REQUEST_CACHE_NAMESPACE = u'xblock_utils.grade_histograms'
+
 
 def wrap_fragment(fragment, new_content):
     """
@@ -273,31 +277,52 @@ def replace_static_urls(data_dir, block, view, frag, context, course_id=None, st
     ))
 
 
+def replace_urls(  # pylint: disable=unused-argument
+    data_dir, block, view, frag, context, course_id=None, static_asset_path='', jump_to_id_base_url=None
+):
+    """
+    Updates the supplied module with a new get_html function that wraps
+    the old get_html function and substitutes, in a single pass, the urls
+    replaced by replace_static_urls, replace_course_urls and, if
+    jump_to_id_base_url is given, replace_jump_to_id_urls.
+    """
+    return wrap_fragment(frag, static_replace.replace_urls(
+        frag.content,
+        data_dir,
+        course_id,
+        static_asset_path=static_asset_path,
+        jump_to_id_base_url=jump_to_id_base_url,
+    ))
+
+
 def grade_histogram(module_id):
     '''
-    Print out a histogram of grades on a given problem in staff member debug info.
+    Return a histogram of grades on a given problem in staff member debug info,
+    as a list of (grade, number of learners with it) sorted by grade.
 
-    Warning: If a student has just looked at an xmodule and not attempted
-    it, their grade is None. Since there will always be at least one such student
-    this function almost always returns [].
+    Learners who have looked at the problem without attempting it have no
+    grade, and aren't counted.  The histogram is returned from those
+    prefetched by prefetch_grade_histograms during the request, if it was.
     '''
-    from django.db import connection
-    cursor = connection.cursor()
+    from lms.djangoapps.courseware.models import StudentModuleGradeCount
+
+    histograms = RequestCache(GRADE_HISTOGRAMS_REQUEST_CACHE_NAMESPACE).data
+    if module_id in histograms:
+        return histograms[module_id]
+    return StudentModuleGradeCount.get_histograms([module_id])[module_id]
 
-    query = u"""\
-        SELECT courseware_studentmodule.grade,
-        COUNT(courseware_studentmodule.student_id)
-        FROM courseware_studentmodule
-        WHERE courseware_studentmodule.module_id=%s
-        GROUP BY courseware_studentmodule.grade"""
-    # Passing module_id this way prevents sql-injection.
-    cursor.execute(query, [text_type(module_id)])
 
-    grades = list(cursor.fetchall())
-    grades.sort(key=lambda x: x[0])  # Add ORDER BY to sql query?
-    if len(grades) >= 1 and grades[0][0] is None:
-        return []
-    return grades
+def prefetch_grade_histograms(module_ids):
+    """
+    Get the grade histograms of the given problems, such as those of a unit,
+    in a single query, for grade_histogram to return during the request.
+    """
+    from lms.djangoapps.courseware.models import StudentModuleGradeCount
+
+    histograms = RequestCache(GRADE_HISTOGRAMS_REQUEST_CACHE_NAMESPACE).data
+    module_ids = [module_id for module_id in module_ids if module_id not in histograms]
+    if module_ids:
+        histograms.update(StudentModuleGradeCount.get_histograms(module_ids))
 
 
 def sanitize_html_id(html_id):
@@ -347,6 +372,9 @@ def add_staff_markup(user, disable_staff_debug_info, block, view, frag, context)
 
     block_id = block.location
     if block.has_score and settings.FEATURES.get('DISPLAY_HISTOGRAMS_TO_STAFF'):
+        # Get the histograms of all the problems of the unit along with the first of them.
+        parent = block.get_parent()
+        prefetch_grade_histograms(parent.children if parent is not None else [block_id])
         histogram = grade_histogram(block_id)
         render_histogram = len(histogram) > 0
     else: